@@ -24,10 +24,86 @@
 #
 # --------------------------------------------------------------------------
 from collections.abc import AsyncIterator
+import asyncio
+import collections
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+
+class _AsyncPagePrefetcher(object):
+    """Fetches pages in a background task, ahead of the consumer.
+
+    :param callable async_get_next: Coroutine function to retrieve a page from a link.
+    :param callable extract_page: Function returning the next link and items of a page.
+    :param str next_link: Link of the first page to fetch.
+    :param int depth: Maximum number of pages buffered ahead of the consumer.
+    """
+    def __init__(self, async_get_next, extract_page, next_link, depth):
+        self._async_get_next = async_get_next
+        self._extract_page = extract_page
+        self._pages = asyncio.Queue(maxsize=depth)
+        self._task = asyncio.ensure_future(self._run(next_link))
+
+    async def _run(self, next_link):
+        try:
+            while next_link is not None:
+                response = await self._async_get_next(next_link)
+                next_link, items = self._extract_page(response)
+                await self._pages.put((response, next_link, items, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            await self._pages.put((None, None, None, err))
+
+    async def next_page(self):
+        """Return the next page as a (response, next_link, items) tuple, waiting for it if needed.
+
+        :raises: The error raised while fetching or deserializing the page.
+        """
+        response, next_link, items, error = await self._pages.get()
+        if error is not None:
+            raise error
+        return response, next_link, items
+
+    def close(self):
+        """Cancel the background task."""
+        self._task.cancel()
+
+class _AsyncStreamedItems(object):
+    """Items of a list response, decoded one at a time as the response body is streamed asynchronously.
+
+    :param chunks: An async iterator of the body chunks.
+    :param decoder: An incremental decoder, from ContentDecodePolicy.items_decoder.
+    """
+    def __init__(self, chunks, decoder):
+        self._chunks = chunks.__aiter__()
+        self._decoder = decoder
+        self._items = collections.deque()
+        self._complete = False
+
+    @property
+    def document(self):
+        """The document without its items."""
+        return self._decoder.document
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._items:
+            if self._complete:
+                raise StopAsyncIteration()
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._complete = True
+                self._items.extend(self._decoder.close())
+            else:
+                self._items.extend(self._decoder.feed(chunk))
+        return self._items.popleft()
+
+
 class AsyncPagedMixin(AsyncIterator):
     """Bring async to Paging.
 
@@ -37,10 +113,17 @@ class AsyncPagedMixin(AsyncIterator):
     """
     def __init__(self, *args, **kwargs): # pylint: disable=unused-argument
         self._async_get_next = kwargs.get("async_command")
+        self._async_prefetcher = None
         if not self._async_get_next:
             _LOGGER.debug("Paging async iterator protocol is not available for %s",
                           self.__class__.__name__)
 
+    def close(self):
+        """Stop fetching pages ahead. Only needed if iteration is stopped before the last page."""
+        if getattr(self, '_async_prefetcher', None) is not None:
+            self._async_prefetcher.close()
+            self._async_prefetcher = None
+
     async def _async_advance_page(self):
         if not self._async_get_next:
             raise NotImplementedError(
@@ -49,8 +132,27 @@ class AsyncPagedMixin(AsyncIterator):
         if self.next_link is None:
             raise StopAsyncIteration("End of paging")
         self._current_page_iter_index = 0
+        if getattr(self, '_prefetch', 0):
+            if self._async_prefetcher is None:
+                self._async_prefetcher = _AsyncPagePrefetcher(
+                    self._async_get_next, self._page_extractor(), self.next_link, self._prefetch)
+            try:
+                self._response, self.next_link, self.current_page = await self._async_prefetcher.next_page()
+            except Exception:
+                # The prefetcher stops at the failed page: the next call requests it again, from a
+                # new prefetcher, without returning the items of the page already consumed.
+                self.close()
+                self._current_page_iter_index = len(self.current_page)
+                raise
+            return self.current_page
         self._response = await self._async_get_next(self.next_link)
-        self._deserializer(self, self._response)
+        if getattr(self, '_streamed', False):
+            self.current_page = []
+            self._streamed_page = self._stream_page(self._response)
+        elif getattr(self, '_raw', False):
+            self.next_link, self.current_page = self._page_extractor()(self._response)
+        else:
+            self._deserializer(self, self._response)
         return self.current_page
 
     async def __anext__(self):
@@ -58,6 +160,11 @@ class AsyncPagedMixin(AsyncIterator):
         # Storing the list iterator might work out better, but there's no
         # guarantee that some code won't replace the list entirely with a copy,
         # invalidating an list iterator that might be saved between iterations.
+        if getattr(self, '_streamed_page', None) is not None:
+            try:
+                return self._streamed_item(await self._streamed_page.__anext__())
+            except StopAsyncIteration:
+                self._end_streamed_page()
         if self.current_page and self._current_page_iter_index < len(self.current_page):
             response = self.current_page[self._current_page_iter_index]
             self._current_page_iter_index += 1
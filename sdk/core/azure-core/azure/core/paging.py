@@ -23,14 +23,22 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
+import functools
+import re
 import sys
+import threading
+import xml.etree.ElementTree as ET
 try:
     from collections.abc import Iterator
     xrange = range
 except ImportError:
     from collections import Iterator
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # type: ignore
 
-from typing import Dict, Any, List, Callable, Optional, TYPE_CHECKING  # pylint: disable=unused-import
+from typing import Dict, Any, List, Callable, Optional, Tuple, TYPE_CHECKING  # pylint: disable=unused-import
 
 if TYPE_CHECKING:
     from .pipeline.transport.base import HttpResponse
@@ -41,7 +49,116 @@ if sys.version_info >= (3, 5, 2):
     from .async_paging import AsyncPagedMixin  # type: ignore
 else:
     class AsyncPagedMixin(object):  # type: ignore
-        pass
+        def close(self):
+            pass
+
+class _PageHolder(object):
+    """Deserialization target for a page fetched ahead, so that the Paged object is left untouched."""
+
+    def __init__(self, paged_type):
+        self._attribute_map = paged_type._attribute_map
+        self._validation = paged_type._validation
+        self.next_link = None
+        self.current_page = []  # type: List[Model]
+
+
+def _extract_page(deserializer, paged_type, response):
+    # type: (Deserializer, type, HttpResponse) -> Tuple[Optional[str], List[Model]]
+    """Deserialize a page, returning its next link and its items."""
+    page = _PageHolder(paged_type)
+    deserializer(page, response)
+    return page.next_link, page.current_page
+
+
+# Dots not preceded by a backslash separate the levels of a flattened attribute map key
+_FLATTEN = re.compile(r"(?<!\\)\.")
+
+
+def _get_raw_value(data, key):
+    # type: (Any, str) -> Any
+    """Get a value from deserialized JSON or XML, following a (possibly flattened) attribute map key.
+
+    The value of a XML element is its text.
+    """
+    for part in _FLATTEN.split(key):
+        part = part.replace('\\.', '.')
+        if isinstance(data, dict):
+            data = data.get(part)
+        elif ET.iselement(data):
+            data = data.find(part)
+        else:
+            return None
+    if ET.iselement(data):
+        return data.text
+    return data
+
+
+def _extract_raw_page(deserializer, paged_type, fields, response):
+    # type: (Deserializer, type, Optional[List[str]], HttpResponse) -> Tuple[Optional[str], List[Any]]
+    """Extract a page without building models, returning its next link and its items as dicts."""
+    data = deserializer._unpack_content(response)  # pylint: disable=protected-access
+    next_link = _get_raw_value(data, paged_type._attribute_map['next_link']['key'])
+    items = _get_raw_value(data, paged_type._attribute_map['current_page']['key']) or []
+    if fields:
+        items = [{field: _get_raw_value(item, field) for field in fields} for item in items]
+    return next_link, items
+
+
+class _PagePrefetcher(object):
+    """Fetches pages in a background thread, ahead of the consumer.
+
+    The worker does not reference the Paged object, so dropping the iterator lets it be
+    collected and stop the worker.
+
+    :param callable get_next: Function to retrieve a page from a link.
+    :param callable extract_page: Function returning the next link and items of a page.
+    :param str next_link: Link of the first page to fetch.
+    :param int depth: Maximum number of pages buffered ahead of the consumer.
+    """
+    _POLL_INTERVAL = 0.1
+
+    def __init__(self, get_next, extract_page, next_link, depth):
+        self._get_next = get_next
+        self._extract_page = extract_page
+        self._pages = queue.Queue(maxsize=depth)  # type: queue.Queue
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, args=(next_link,))
+        self._worker.daemon = True
+        self._worker.start()
+
+    def _put(self, item):
+        while not self._stopped.is_set():
+            try:
+                self._pages.put(item, timeout=self._POLL_INTERVAL)
+                return
+            except queue.Full:
+                pass
+
+    def _run(self, next_link):
+        try:
+            while next_link is not None and not self._stopped.is_set():
+                response = self._get_next(next_link)
+                next_link, items = self._extract_page(response)
+                self._put((response, next_link, items, None))
+        except Exception as err:  # pylint: disable=broad-except
+            self._put((None, None, None, err))
+
+    def next_page(self):
+        # type: () -> Tuple[HttpResponse, Optional[str], List[Model]]
+        """Return the next page as a (response, next_link, items) tuple, waiting for it if needed.
+
+        :raises: The error raised while fetching or deserializing the page.
+        """
+        response, next_link, items, error = self._pages.get()
+        if error is not None:
+            raise error
+        return response, next_link, items
+
+    def close(self):
+        # type: () -> None
+        """Stop fetching. A request already in flight completes, but its page is discarded."""
+        self._stopped.set()
+
 
 class Paged(AsyncPagedMixin, Iterator):
     """A container for paged REST responses.
@@ -50,12 +167,21 @@ class Paged(AsyncPagedMixin, Iterator):
     :type response: ~azure.core.pipeline.transport.HttpResponse
     :param callable command: Function to retrieve the next page of items.
     :param Deserializer deserializer: a Deserializer instance to use
+
+    **Keyword argument:**
+
+    *prefetch (int)* - Number of pages to fetch ahead, in a background thread (or task when iterating
+    asynchronously), while the current page is consumed. At most this many pages are buffered.
+    Defaults to 0, no prefetch. Not supported by subclasses overriding _advance_page.
     """
+    _streamed_page = None  # type: Optional[Iterator[Any]]
     _validation = {}  # type: Dict[str, Dict[str, Any]]
     _attribute_map = {}  # type: Dict[str, Dict[str, Any]]
 
     def __init__(self, command, deserializer, **kwargs):
         # type: (Callable[[str], HttpResponse], Deserializer, Any) -> None
+        self._prefetch = kwargs.pop('prefetch', 0)
+        self._prefetcher = None  # type: Optional[_PagePrefetcher]
         super(Paged, self).__init__(**kwargs)  # type: ignore
         # Sets next_link, current_page, and _current_page_iter_index.
         self.next_link = ""
@@ -64,6 +190,9 @@ class Paged(AsyncPagedMixin, Iterator):
         self._deserializer = deserializer
         self._get_next = command
         self._response = None  # type: Optional[HttpResponse]
+        self._raw = False
+        self._raw_fields = None  # type: Optional[List[str]]
+        self._streamed = False
 
     def __iter__(self):
         """Return 'self'."""
@@ -89,15 +218,166 @@ class Paged(AsyncPagedMixin, Iterator):
         if self.next_link is None:
             raise StopIteration("End of paging")
         self._current_page_iter_index = 0
+        if self._prefetch:
+            if self._prefetcher is None:
+                self._prefetcher = _PagePrefetcher(
+                    self._get_next, self._page_extractor(), self.next_link, self._prefetch)
+            try:
+                self._response, self.next_link, self.current_page = self._prefetcher.next_page()
+            except Exception:
+                # The prefetcher stops at the failed page: the next call requests it again, from a
+                # new prefetcher, without returning the items of the page already consumed.
+                self._prefetcher.close()
+                self._prefetcher = None
+                self._current_page_iter_index = len(self.current_page)
+                raise
+            return self.current_page
         self._response = self._get_next(self.next_link)
-        self._deserializer(self, self._response)
+        if self._streamed:
+            self.current_page = []
+            self._streamed_page = self._stream_page(self._response)
+        elif self._raw:
+            self.next_link, self.current_page = self._page_extractor()(self._response)
+        else:
+            self._deserializer(self, self._response)
         return self.current_page
 
+    def _page_extractor(self):
+        # type: () -> Callable[[HttpResponse], Tuple[Optional[str], List[Model]]]
+        """Function deserializing a page fetched ahead. Must not hold a reference to self."""
+        if self._raw:
+            return functools.partial(_extract_raw_page, self._deserializer, type(self), self._raw_fields)
+        return functools.partial(_extract_page, self._deserializer, type(self))
+
+    def raw(self, fields=None):
+        # type: (Optional[List[str]]) -> Paged
+        """Switch to raw mode: items are returned as plain dicts, without building models.
+
+        The dicts are the JSON objects returned by the service, so keys are the REST API
+        attribute names rather than the model attribute names. Must be called before iterating.
+
+        :param list[str] fields: Only keep these REST API attributes of each item. Nested attributes
+         can be selected with a dotted path, e.g. "properties.provisioningState".
+        :return: This iterator, now in raw mode.
+        :raises: ValueError if iteration already started.
+        """
+        if self._response is not None:
+            raise ValueError("Raw mode must be selected before iterating.")
+        self._raw = True
+        self._raw_fields = fields
+        return self
+
+    def streamed(self):
+        # type: () -> Paged
+        """Switch to streamed mode: the items of a page are decoded one at a time, as the response
+        body is received, instead of deserializing the whole page at once.
+
+        The command must return responses whose body was not read yet (i.e. sent with stream=True),
+        and the items must be a top-level member of the page. JSON and XML pages are decoded according
+        to the content type of the response, JSON if not declared. Can be combined with :meth:`raw`,
+        in which case the raw items of a XML page are elements. Must be called before iterating.
+
+        :return: This iterator, now in streamed mode.
+        :raises: ValueError if iteration already started, if prefetch is enabled or if the items
+         are not a top-level member of the page.
+        """
+        if self._response is not None:
+            raise ValueError("Streamed mode must be selected before iterating.")
+        if self._prefetch:
+            raise ValueError("Streamed mode can't be combined with prefetch.")
+        if len(_FLATTEN.split(self._attribute_map['current_page']['key'])) > 1:
+            raise ValueError("Streamed mode requires the items to be a top-level member of the page.")
+        self._streamed = True
+        return self
+
+    def _stream_page(self, response):
+        # type: (HttpResponse) -> Any
+        """Start decoding the items of a page from the response stream.
+
+        :return: A StreamedItems, or an async iterator of the items if the response is async.
+        """
+        from .pipeline.policies.universal import ContentDecodePolicy, _response_content_type
+        content_type = _response_content_type(response) or "application/json"
+        page_map = self._attribute_map['current_page']
+        items_path = page_map['key'].replace('\\.', '.')
+        if "xml" in content_type:
+            # The items are the children of the list element, or the list elements themselves
+            xml_map = page_map.get('xml', {})
+            items_path = xml_map.get('name', items_path)
+            if xml_map.get('wrapped', False):
+                items_path += '/' + xml_map.get('itemsName', page_map['type'][1:-1])
+            else:
+                items_path = xml_map.get('itemsName', items_path)
+        return ContentDecodePolicy.deserialize_items_from_stream(response, items_path, content_type)
+
+    def _streamed_item(self, item):
+        # type: (Any) -> Any
+        """Build an item decoded in streamed mode."""
+        if self._raw:
+            if self._raw_fields:
+                return {field: _get_raw_value(item, field) for field in self._raw_fields}
+            return item
+        return self._deserializer(self._attribute_map['current_page']['type'][1:-1], item)
+
+    def _end_streamed_page(self):
+        # type: () -> None
+        """Read the next link once all the items of a streamed page were decoded."""
+        document = self._streamed_page.document  # type: ignore
+        self.next_link = _get_raw_value(document, self._attribute_map['next_link']['key'])
+        self._streamed_page = None
+
+    def by_page(self):
+        # type: () -> Iterator[List[Model]]
+        """Iterate over whole pages rather than over items.
+
+        If item iteration already started, the remaining items of the current page are yielded first.
+
+        :return: An iterator of lists of items.
+        """
+        if self._streamed_page is not None:
+            page = [self._streamed_item(item) for item in self._streamed_page]
+            self._end_streamed_page()
+            yield page
+        elif self.current_page and self._current_page_iter_index < len(self.current_page):
+            page = self.current_page[self._current_page_iter_index:]
+            self._current_page_iter_index = len(self.current_page)
+            yield page
+        while True:
+            try:
+                page = self._advance_page()
+            except StopIteration:
+                return
+            if self._streamed_page is not None:
+                page = [self._streamed_item(item) for item in self._streamed_page]
+                self._end_streamed_page()
+            page = page or []
+            self._current_page_iter_index = len(page)
+            yield page
+
+    def close(self):
+        # type: () -> None
+        """Stop fetching pages ahead. Only needed if iteration is stopped before the last page."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+        super(Paged, self).close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
     def __next__(self):
         """Iterate through responses."""
         # Storing the list iterator might work out better, but there's no
         # guarantee that some code won't replace the list entirely with a copy,
         # invalidating an list iterator that might be saved between iterations.
+        if self._streamed_page is not None:
+            try:
+                return self._streamed_item(next(self._streamed_page))
+            except StopIteration:
+                self._end_streamed_page()
         if self.current_page and self._current_page_iter_index < len(self.current_page):
             response = self.current_page[self._current_page_iter_index]
             self._current_page_iter_index += 1
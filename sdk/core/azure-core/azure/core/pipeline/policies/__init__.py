@@ -29,6 +29,7 @@ from .authentication import BearerTokenCredentialPolicy
 from .custom_hook import CustomHookPolicy
 from .redirect import RedirectPolicy
 from .retry import RetryPolicy
+from .retry_budget import RetryBudget, CircuitState
 from .universal import (
     HeadersPolicy,
     UserAgentPolicy,
@@ -46,6 +47,8 @@ __all__ = [
     'NetworkTraceLoggingPolicy',
     'ContentDecodePolicy',
     'RetryPolicy',
+    'RetryBudget',
+    'CircuitState',
     'RedirectPolicy',
     'ProxyPolicy',
     'CustomHookPolicy'
@@ -28,7 +28,7 @@
 from azure.core.pipeline import PipelineRequest, PipelineResponse
 from azure.core.tracing.context import tracing_context
 from azure.core.tracing.abstract_span import AbstractSpan
-from azure.core.tracing.common import set_span_contexts
+from azure.core.tracing.common import set_span_contexts, should_sample
 from azure.core.pipeline.policies import SansIOHTTPPolicy
 from azure.core.settings import settings
 
@@ -66,18 +66,23 @@ class DistributedTracingPolicy(SansIOHTTPPolicy):
 
     def on_request(self, request):
         # type: (PipelineRequest[HttpRequest], Any) -> None
+        tracing = settings.tracing_snapshot()
+        wrapper_class = tracing.implementation
         parent_span = tracing_context.current_span.get()
-        wrapper_class = settings.tracing_implementation()
         original_context = [parent_span, None]
         if parent_span is None and wrapper_class is not None:
+            if tracing_context.sampled_out.get():
+                return
             current_span_instance = wrapper_class.get_current_span()
+            if current_span_instance is None and not should_sample(tracing.sampling_rate):
+                return
             original_context[1] = current_span_instance
             parent_span = wrapper_class(current_span_instance)
 
         if parent_span is None:
             return
 
-        only_propagate = settings.tracing_should_only_propagate()
+        only_propagate = tracing.should_only_propagate
         if only_propagate:
             self.set_header(request, parent_span)
             return
@@ -96,7 +101,7 @@ class DistributedTracingPolicy(SansIOHTTPPolicy):
         # type: (HttpRequest, Optional[HttpResponse]) -> None
         """Ends the span that is tracing the network and updates its status."""
         span = tracing_context.current_span.get()  # type: AbstractSpan
-        only_propagate = settings.tracing_should_only_propagate()
+        only_propagate = settings.tracing_snapshot().should_only_propagate
         if span and not only_propagate:
             span.set_http_attributes(request, response=response)
             request_id = request.headers.get(self._request_id)
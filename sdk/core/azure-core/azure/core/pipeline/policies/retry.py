@@ -41,6 +41,7 @@ from azure.core.exceptions import (
 )
 
 from .base import HTTPPolicy, RequestHistory
+from .retry_budget import CircuitState, decorrelated_jitter, retry_host
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -74,6 +75,15 @@ class RetryPolicy(HTTPPolicy):
 
     *retry_backoff_max (int)* - The maximum back off time. Default value is 120 seconds (2 minutes).
 
+    *retry_mode (str)* - How the back off time grows: 'exponential' (the default) or 'decorrelated',
+    which draws each back off between `{backoff factor}` and three times the previous one
+    (capped by retry_backoff_max) so that clients failing together do not retry together.
+
+    *retry_budget (~azure.core.pipeline.policies.RetryBudget)* - A retry budget shared by all
+    the requests sent through this policy. Pass the same instance to several policies to share it
+    across clients. Retries refused by the budget or by the circuit breaker of the host are not sent.
+    Default value is None (no budget).
+
     Example:
         .. literalinclude:: ../examples/test_example_sync.py
             :start-after: [START retry_policy]
@@ -93,6 +103,8 @@ class RetryPolicy(HTTPPolicy):
         self.status_retries = kwargs.pop('retry_status', 3)
         self.backoff_factor = kwargs.pop('retry_backoff_factor', 0.8)
         self.backoff_max = kwargs.pop('retry_backoff_max', self.BACKOFF_MAX)
+        self.retry_mode = kwargs.pop('retry_mode', 'exponential')
+        self.retry_budget = kwargs.pop('retry_budget', None)
 
         safe_codes = [i for i in range(500) if i != 408] + [501, 505]
         retry_codes = [i for i in range(999) if i not in safe_codes]
@@ -121,8 +133,10 @@ class RetryPolicy(HTTPPolicy):
             'read': options.pop("retry_read", self.read_retries),
             'status': options.pop("retry_status", self.status_retries),
             'backoff': options.pop("retry_backoff_factor", self.backoff_factor),
-            'max_backoff': options.pop("retry_backoff_max", self.BACKOFF_MAX),
+            'max_backoff': options.pop("retry_backoff_max", self.backoff_max),
             'methods': options.pop("retry_on_methods", self._method_whitelist),
+            'mode': options.pop("retry_mode", self.retry_mode),
+            'last_backoff': 0,
             'history': []
         }
 
@@ -138,6 +152,11 @@ class RetryPolicy(HTTPPolicy):
         if consecutive_errors_len <= 1:
             return 0
 
+        if settings.get('mode') == 'decorrelated':
+            backoff_value = decorrelated_jitter(
+                settings['backoff'], settings['last_backoff'] or settings['backoff'], settings['max_backoff'])
+            settings['last_backoff'] = backoff_value
+            return backoff_value
         backoff_value = settings['backoff'] * (2 ** (consecutive_errors_len - 1))
         return min(settings['max_backoff'], backoff_value)
 
@@ -318,7 +337,64 @@ class RetryPolicy(HTTPPolicy):
                 settings['status'] -= 1
                 settings['history'].append(RequestHistory(response.http_request, http_response=response.http_response))
 
-        return not self.is_exhausted(settings)
+        self._record_retry_budget_failure(settings, response)
+        if self.is_exhausted(settings):
+            return False
+        return self._acquire_retry_budget(settings, response, error)
+
+    def _record_retry_budget_failure(self, settings, response):
+        """Records a failed attempt in the retry budget.
+
+        :param dict settings: The retry settings.
+        :param response: The PipelineResponse, or the PipelineRequest if an error was raised.
+        """
+        if self.retry_budget is not None:
+            self.retry_budget.record_failure(retry_host(response.http_request))
+            settings['budget_probe'] = None
+
+    def _acquire_retry_budget(self, settings, response, error=None):
+        """Asks the retry budget whether a retry can be sent.
+
+        If the retry probes a half-open circuit, its host is kept in the settings until the
+        outcome of the retry is recorded.
+
+        :param dict settings: The retry settings.
+        :param response: The PipelineResponse, or the PipelineRequest if an error was raised.
+        :param error: The error raised, if any.
+        :return: True if there is no budget or if it allows the retry.
+        :rtype: bool
+        """
+        if self.retry_budget is None:
+            return True
+        host = retry_host(response.http_request)
+        timeout = error is not None and (self._is_connection_error(error) or self._is_read_error(error))
+        grant = self.retry_budget.acquire(host, timeout=timeout)
+        if not grant:
+            return False
+        if grant == CircuitState.HALF_OPEN:
+            settings['budget_probe'] = host
+        return True
+
+    def _record_retry_budget_success(self, settings, response):
+        """Refills the retry budget if the final response is not a retryable failure.
+
+        :param dict settings: The retry settings.
+        :param response: The PipelineResponse object.
+        :type response: ~azure.core.pipeline.PipelineResponse
+        """
+        if self.retry_budget is not None and \
+                response.http_response.status_code not in self._retry_on_status_codes:
+            self.retry_budget.record_success(retry_host(response.http_request))
+            settings['budget_probe'] = None
+
+    def _release_retry_budget_probe(self, settings):
+        """Gives back the probe of a half-open circuit if the outcome of the probing retry was not recorded.
+
+        :param dict settings: The retry settings.
+        """
+        if settings.get('budget_probe'):
+            self.retry_budget.release_probe(settings['budget_probe'])
+            settings['budget_probe'] = None
 
     def update_context(self, context, retry_settings):
         """Updates retry history in pipeline context.
@@ -344,26 +420,32 @@ class RetryPolicy(HTTPPolicy):
         retry_active = True
         response = None
         retry_settings = self.configure_retries(request.context.options)
-        while retry_active:
-            try:
-                response = self.next.send(request)
-                if self.is_retry(retry_settings, response):
-                    retry_active = self.increment(retry_settings, response=response)
-                    if retry_active:
-                        self.sleep(retry_settings, request.context.transport, response=response)
-                        continue
-                break
-            except ClientAuthenticationError:  # pylint:disable=try-except-raise
-                # the authentication policy failed such that the client's request can't
-                # succeed--we'll never have a response to it, so propagate the exception
-                raise
-            except AzureError as err:
-                if self._is_method_retryable(retry_settings, request.http_request):
-                    retry_active = self.increment(retry_settings, response=request, error=err)
-                    if retry_active:
-                        self.sleep(retry_settings, request.context.transport)
-                        continue
-                raise err
-
+        try:
+            while retry_active:
+                try:
+                    response = self.next.send(request)
+                    if self.is_retry(retry_settings, response):
+                        retry_active = self.increment(retry_settings, response=response)
+                        if retry_active:
+                            self.sleep(retry_settings, request.context.transport, response=response)
+                            continue
+                    break
+                except ClientAuthenticationError:  # pylint:disable=try-except-raise
+                    # the authentication policy failed such that the client's request can't
+                    # succeed--we'll never have a response to it, so propagate the exception
+                    raise
+                except AzureError as err:
+                    if self._is_method_retryable(retry_settings, request.http_request):
+                        retry_active = self.increment(retry_settings, response=request, error=err)
+                        if retry_active:
+                            self.sleep(retry_settings, request.context.transport)
+                            continue
+                    else:
+                        self._record_retry_budget_failure(retry_settings, request)
+                    raise err
+
+            self._record_retry_budget_success(retry_settings, response)
+        finally:
+            self._release_retry_budget_probe(retry_settings)
         self.update_context(response.context, retry_settings)
         return response
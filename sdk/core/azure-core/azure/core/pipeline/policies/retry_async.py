@@ -67,6 +67,11 @@ class AsyncRetryPolicy(RetryPolicy, AsyncHTTPPolicy):  # type: ignore
 
     *retry_backoff_max (int)* - The maximum back off time. Default value is 120 seconds (2 minutes).
 
+    *retry_mode (str)* - How the back off time grows: 'exponential' (the default) or 'decorrelated'.
+
+    *retry_budget (~azure.core.pipeline.policies.RetryBudget)* - A retry budget shared by all
+    the requests sent through this policy. Default value is None (no budget).
+
     Example:
         .. literalinclude:: ../examples/test_example_async.py
             :start-after: [START async_retry_policy]
@@ -132,26 +137,32 @@ class AsyncRetryPolicy(RetryPolicy, AsyncHTTPPolicy):  # type: ignore
         retry_active = True
         response = None
         retry_settings = self.configure_retries(request.context.options)
-        while retry_active:
-            try:
-                response = await self.next.send(request)
-                if self.is_retry(retry_settings, response):
-                    retry_active = self.increment(retry_settings, response=response)
-                    if retry_active:
-                        await self.sleep(retry_settings, request.context.transport, response=response)
-                        continue
-                break
-            except ClientAuthenticationError:  # pylint:disable=try-except-raise
-                # the authentication policy failed such that the client's request can't
-                # succeed--we'll never have a response to it, so propagate the exception
-                raise
-            except AzureError as err:
-                if self._is_method_retryable(retry_settings, request.http_request):
-                    retry_active = self.increment(retry_settings, response=request, error=err)
-                    if retry_active:
-                        await self.sleep(retry_settings, request.context.transport)
-                        continue
-                raise err
-
+        try:
+            while retry_active:
+                try:
+                    response = await self.next.send(request)
+                    if self.is_retry(retry_settings, response):
+                        retry_active = self.increment(retry_settings, response=response)
+                        if retry_active:
+                            await self.sleep(retry_settings, request.context.transport, response=response)
+                            continue
+                    break
+                except ClientAuthenticationError:  # pylint:disable=try-except-raise
+                    # the authentication policy failed such that the client's request can't
+                    # succeed--we'll never have a response to it, so propagate the exception
+                    raise
+                except AzureError as err:
+                    if self._is_method_retryable(retry_settings, request.http_request):
+                        retry_active = self.increment(retry_settings, response=request, error=err)
+                        if retry_active:
+                            await self.sleep(retry_settings, request.context.transport)
+                            continue
+                    else:
+                        self._record_retry_budget_failure(retry_settings, request)
+                    raise err
+
+            self._record_retry_budget_success(retry_settings, response)
+        finally:
+            self._release_retry_budget_probe(retry_settings)
         self.update_context(response.context, retry_settings)
         return response
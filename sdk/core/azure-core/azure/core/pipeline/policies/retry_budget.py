@@ -0,0 +1,219 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+"""
+This module contains the retry budget shared by the retry policies of a client.
+"""
+import random
+import threading
+import time
+from typing import Dict, Optional, Union  # pylint: disable=unused-import
+
+try:
+    from urlparse import urlparse  # type: ignore
+except ImportError:
+    from urllib.parse import urlparse
+
+_now = getattr(time, 'monotonic', time.time)
+
+
+class CircuitState(object):
+    """The states a per-host circuit breaker can be in."""
+
+    CLOSED = 'closed'  #: Retries are allowed as long as the budget has tokens.
+    OPEN = 'open'  #: The host is failing, retries are refused until the recovery time elapsed.
+    HALF_OPEN = 'half-open'  #: A single probing retry is allowed to decide whether to close the circuit.
+
+
+class _HostCircuit(object):
+    __slots__ = ('state', 'failures', 'opened_at')
+
+    def __init__(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+
+def retry_host(request):
+    """Returns the key used to track the circuit of a request.
+
+    :param request: The HTTP request (or any object with an ``url`` attribute).
+    :rtype: str
+    """
+    return urlparse(request.url).netloc
+
+
+def decorrelated_jitter(base, previous, maximum):
+    """Computes a "decorrelated jitter" backoff.
+
+    The next sleep is drawn uniformly between ``base`` and three times the previous sleep,
+    capped by ``maximum``. Unlike a plain exponential backoff, clients that failed at the
+    same moment quickly spread their retries apart.
+
+    :param float base: The minimum backoff, in seconds.
+    :param float previous: The previous backoff, in seconds. Use ``base`` for the first one.
+    :param float maximum: The maximum backoff, in seconds.
+    :rtype: float
+    """
+    upper = max(base, previous * 3)
+    return min(maximum, random.uniform(base, upper))
+
+
+class RetryBudget(object):
+    """A retry budget shared by all the requests going through one client or transport.
+
+    The budget is a token bucket: every retry withdraws tokens, every successful request
+    deposits some back. When the bucket is empty, requests fail on their first error
+    instead of retrying, so that a brownout is not amplified by a storm of retries.
+    On top of the bucket, a circuit breaker is kept per host: after a number of consecutive
+    failures the circuit opens and no retry is sent to that host until the recovery time has
+    elapsed, after which a single retry is allowed to probe it. First attempts are never refused.
+
+    The same instance can be given to several retry policies (or clients) to share the budget.
+    The budget is thread-safe.
+
+    **Keyword arguments:**
+
+    *capacity (float)* - The maximum number of tokens in the bucket. Default value is 500.
+
+    *retry_cost (float)* - The tokens withdrawn by a retry. Default value is 5.
+
+    *timeout_retry_cost (float)* - The tokens withdrawn by a retry after a connection or read error.
+    Default value is 10.
+
+    *success_refill (float)* - The tokens deposited by a successful request. Default value is 1.
+
+    *circuit_failure_threshold (int)* - The number of consecutive failures opening the circuit of a host.
+    Default value is 5.
+
+    *circuit_recovery_time (float)* - How long, in seconds, a circuit stays open before a probing retry
+    is allowed. Default value is 30.
+    """
+
+    def __init__(self, **kwargs):
+        self.capacity = float(kwargs.pop('capacity', 500))
+        self.retry_cost = float(kwargs.pop('retry_cost', 5))
+        self.timeout_retry_cost = float(kwargs.pop('timeout_retry_cost', 10))
+        self.success_refill = float(kwargs.pop('success_refill', 1))
+        self.circuit_failure_threshold = kwargs.pop('circuit_failure_threshold', 5)
+        self.circuit_recovery_time = kwargs.pop('circuit_recovery_time', 30)
+        self._tokens = self.capacity
+        self._circuits = {}  # type: Dict[str, _HostCircuit]
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self):
+        # type: () -> float
+        """The tokens currently available in the bucket."""
+        return self._tokens
+
+    def circuit_state(self, host):
+        # type: (str) -> str
+        """Returns the state of the circuit of a host.
+
+        :param str host: The host, as returned by :func:`retry_host`.
+        :rtype: str
+        """
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None:
+                return CircuitState.CLOSED
+            if circuit.state == CircuitState.OPEN and \
+                    _now() - circuit.opened_at >= self.circuit_recovery_time:
+                return CircuitState.HALF_OPEN
+            return circuit.state
+
+    def acquire(self, host, timeout=False):
+        # type: (str, bool) -> Union[bool, str]
+        """Asks the permission to retry a request to a host.
+
+        The grant tells whether the retry is the probe of a half-open circuit, whose outcome
+        must then be recorded, or the probe released.
+
+        :param str host: The host, as returned by :func:`retry_host`.
+        :param bool timeout: Whether the retry follows a connection or read error.
+        :return: False if the budget or the circuit refuses the retry. Otherwise the state of the
+         circuit the retry is sent through: CircuitState.HALF_OPEN for the probe, else CircuitState.CLOSED.
+        :rtype: bool or str
+        """
+        cost = self.timeout_retry_cost if timeout else self.retry_cost
+        with self._lock:
+            circuit = self._circuits.get(host)
+            probing = False
+            if circuit is not None and circuit.state != CircuitState.CLOSED:
+                if circuit.state == CircuitState.HALF_OPEN:
+                    # A probe is already in flight
+                    return False
+                if _now() - circuit.opened_at < self.circuit_recovery_time:
+                    return False
+                probing = True
+            if self._tokens < cost:
+                return False
+            self._tokens -= cost
+            if probing:
+                circuit.state = CircuitState.HALF_OPEN
+                return CircuitState.HALF_OPEN
+            return CircuitState.CLOSED
+
+    def record_success(self, host):
+        # type: (str) -> None
+        """Records a successful request to a host, refilling the bucket and closing its circuit.
+
+        :param str host: The host, as returned by :func:`retry_host`.
+        """
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.success_refill)
+            circuit = self._circuits.get(host)
+            if circuit is not None:
+                circuit.state = CircuitState.CLOSED
+                circuit.failures = 0
+
+    def release_probe(self, host):
+        # type: (str) -> None
+        """Gives back the probe of a half-open circuit when the probing retry got no verdict from the host,
+        e.g. because it was not sent. The next retry to the host may probe it.
+
+        :param str host: The host, as returned by :func:`retry_host`.
+        """
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is not None and circuit.state == CircuitState.HALF_OPEN:
+                circuit.state = CircuitState.OPEN
+
+    def record_failure(self, host):
+        # type: (str) -> None
+        """Records a failed request to a host, possibly opening its circuit.
+
+        :param str host: The host, as returned by :func:`retry_host`.
+        """
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None:
+                circuit = self._circuits[host] = _HostCircuit()
+            circuit.failures += 1
+            if circuit.state == CircuitState.HALF_OPEN or \
+                    (circuit.state == CircuitState.CLOSED and circuit.failures >= self.circuit_failure_threshold):
+                circuit.state = CircuitState.OPEN
+                circuit.opened_at = _now()
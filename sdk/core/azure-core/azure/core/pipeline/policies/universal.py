@@ -27,6 +27,8 @@
 This module is the requests implementation of Pipeline ABC
 """
 from __future__ import absolute_import  # we have a "requests" module that conflicts with "requests" on Py2.7
+import codecs
+import collections
 import json
 import logging
 import os
@@ -263,6 +265,297 @@ class NetworkTraceLoggingPolicy(SansIOHTTPPolicy):
                 _LOGGER.debug("Failed to log response: %s", repr(err))
 
 
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+_JSON_STRUCTURE = re.compile(r'["{}\[\]]')
+_JSON_STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_JSON_PRIMITIVE_END = re.compile(r'[\s,\]}]')
+
+# States of the JSON items decoder
+_JSON_START, _JSON_KEY, _JSON_COLON, _JSON_VALUE, _JSON_ITEMS, _JSON_DONE = range(6)
+
+
+class _JsonItemsDecoder(object):
+    """Incremental decoder of the items of an array in a JSON document.
+
+    Only one item is held in memory at a time. The other members of the
+    top-level object are decoded in `document`.
+
+    :param str items_key: The top-level member holding the array of items.
+     If None, the document is expected to be the array itself.
+    """
+
+    def __init__(self, items_key):
+        # type: (Optional[str]) -> None
+        self.items_key = items_key
+        self.document = {}  # type: Dict[str, Any]
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._buffer = ''
+        self._pos = 0
+        self._state = _JSON_START
+        self._key = None  # type: Optional[str]
+        # Progress through an incomplete value, relative to _pos
+        self._scanned = 0
+        self._depth = 0
+
+    def feed(self, data):
+        # type: (Union[bytes, str]) -> List[Any]
+        """Decode a chunk of the document.
+
+        :return: The items completed by this chunk.
+        :raises ValueError: If the document is not valid JSON.
+        """
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        self._buffer = self._buffer[self._pos:] + data
+        self._pos = 0
+        return list(self._parse())
+
+    def close(self):
+        # type: () -> List[Any]
+        """Signal the end of the document.
+
+        :return: The items completed by the end of the document.
+        :raises ValueError: If the document is truncated.
+        """
+        items = self.feed(self._decoder.decode(b'', final=True))
+        if self._state != _JSON_DONE:
+            raise ValueError("JSON document is truncated")
+        return items
+
+    def _parse(self):
+        buffer = self._buffer
+        while True:
+            self._pos = _JSON_WS.match(buffer, self._pos).end()
+            if self._pos >= len(buffer):
+                return
+            char = buffer[self._pos]
+            if self._state == _JSON_START:
+                if char == '{' and self.items_key is not None:
+                    self._state = _JSON_KEY
+                elif char == '[' and self.items_key is None:
+                    self._state = _JSON_ITEMS
+                else:
+                    raise ValueError("Unexpected {!r} at the start of the JSON document".format(char))
+                self._pos += 1
+            elif self._state == _JSON_KEY:
+                if char in '},':
+                    self._pos += 1
+                    if char == '}':
+                        self._state = _JSON_DONE
+                    continue
+                raw = self._take_value()
+                if raw is None:
+                    return
+                self._key = json.loads(raw)
+                self._state = _JSON_COLON
+            elif self._state == _JSON_COLON:
+                if char != ':':
+                    raise ValueError("Expected ':' in JSON document, got {!r}".format(char))
+                self._pos += 1
+                self._state = _JSON_VALUE
+            elif self._state == _JSON_VALUE:
+                if self._key == self.items_key and char == '[':
+                    self._pos += 1
+                    self._state = _JSON_ITEMS
+                    continue
+                raw = self._take_value()
+                if raw is None:
+                    return
+                self.document[self._key] = json.loads(raw)  # type: ignore
+                self._state = _JSON_KEY
+            elif self._state == _JSON_ITEMS:
+                if char in '],':
+                    self._pos += 1
+                    if char == ']':
+                        self._state = _JSON_DONE if self.items_key is None else _JSON_KEY
+                    continue
+                raw = self._take_value()
+                if raw is None:
+                    return
+                yield json.loads(raw)
+            else:
+                raise ValueError("Extra data after the JSON document")
+
+    def _take_value(self):
+        # type: () -> Optional[str]
+        """Consume the value starting at the current position, or return None if it is incomplete."""
+        buffer, start = self._buffer, self._pos
+        char = buffer[start]
+        if char == '"':
+            match = _JSON_STRING_END.match(buffer, start + 1)
+            if match is None:
+                return None
+            end = match.end()
+        elif char in '{[':
+            pos, depth = start + self._scanned, self._depth
+            end = None
+            while end is None:
+                match = _JSON_STRUCTURE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == '"':
+                    string_end = _JSON_STRING_END.match(buffer, match.end())
+                    if string_end is None:
+                        pos = match.start()
+                        break
+                    pos = string_end.end()
+                    continue
+                pos = match.end()
+                depth += 1 if match.group() in '{[' else -1
+                if depth == 0:
+                    end = pos
+            if end is None:
+                self._scanned, self._depth = pos - start, depth
+                return None
+            self._scanned, self._depth = 0, 0
+        else:
+            match = _JSON_PRIMITIVE_END.search(buffer, start)
+            if match is None:
+                return None
+            end = match.start()
+        self._pos = end
+        return buffer[start:end]
+
+
+class _XmlItemsTarget(object):
+    """XMLParser target building the tree, but detaching the items at the given path from it."""
+
+    def __init__(self, path):
+        # type: (List[str]) -> None
+        self.items = []  # type: List[ET.Element]
+        self._path = path
+        self._builder = ET.TreeBuilder()
+        self._stack = []  # type: List[ET.Element]
+
+    def start(self, tag, attrib):
+        element = self._builder.start(tag, attrib)
+        self._stack.append(element)
+        return element
+
+    def end(self, tag):
+        element = self._builder.end(tag)
+        self._stack.pop()
+        if len(self._stack) == len(self._path) and [e.tag for e in self._stack[1:]] + [tag] == self._path:
+            self.items.append(element)
+            self._stack[-1].remove(element)
+        return element
+
+    def data(self, data):
+        self._builder.data(data)
+
+    def close(self):
+        return self._builder.close()
+
+
+class _XmlItemsDecoder(object):
+    """Incremental decoder of the items of a list in a XML document.
+
+    Each item is detached from the tree once decoded, so only one item is held in memory at
+    a time. The rest of the tree is available in `document` once the decoder is closed.
+
+    :param str items_path: The path of the items, relative to the root element, e.g. "Blobs/Blob".
+    """
+
+    def __init__(self, items_path):
+        # type: (str) -> None
+        self.document = None  # type: Optional[ET.Element]
+        self._target = _XmlItemsTarget(items_path.split('/'))
+        self._parser = ET.XMLParser(target=self._target)
+
+    def _take_items(self):
+        # type: () -> List[ET.Element]
+        items, self._target.items = self._target.items, []
+        return items
+
+    def feed(self, data):
+        # type: (Union[bytes, str]) -> List[ET.Element]
+        """Decode a chunk of the document.
+
+        :return: The items completed by this chunk.
+        :raises xml.etree.ElementTree.ParseError: If the document is not valid XML.
+        """
+        self._parser.feed(data)
+        return self._take_items()
+
+    def close(self):
+        # type: () -> List[ET.Element]
+        """Signal the end of the document.
+
+        :return: The items completed by the end of the document.
+        :raises xml.etree.ElementTree.ParseError: If the document is truncated.
+        """
+        self.document = self._parser.close()
+        return self._take_items()
+
+
+def _response_content_type(response):
+    # type: (Any) -> Optional[str]
+    """Return the content type of a response, without its parameters, or None if not declared."""
+    content_type = getattr(response, 'content_type', None)
+    if not content_type:
+        return None
+    if isinstance(content_type, list):
+        content_type = content_type[0]
+    return content_type.split(";")[0].strip().lower()
+
+
+def _iter_body(response):
+    # type: (Any) -> Any
+    """Iterate over the body of a response, without loading it in memory when the transport streams it.
+
+    This is an async iterator if the response is the response of an async transport.
+    """
+    if hasattr(response, 'iter_content'):
+        # A requests response
+        return response.iter_content(4096)
+    chunks = response.stream_download(None) if hasattr(response, 'stream_download') else None
+    if chunks is None:
+        chunks = iter([response.body()])
+    return chunks
+
+
+class StreamedItems(object):
+    """Items of a list response, decoded one at a time as the response body is streamed.
+
+    Obtained from :meth:`ContentDecodePolicy.deserialize_items_from_stream`. The other parts of
+    the document (e.g. the link to the next page) are available in `document` once all the items
+    have been iterated.
+
+    :param chunks: An iterator of the body chunks.
+    :param decoder: An incremental decoder, from :meth:`ContentDecodePolicy.items_decoder`.
+    """
+
+    def __init__(self, chunks, decoder):
+        self._chunks = iter(chunks)
+        self._decoder = decoder
+        self._items = collections.deque()  # type: collections.deque
+        self._complete = False
+
+    @property
+    def document(self):
+        # type: () -> Any
+        """The document without its items: a dict for JSON, an Element for XML."""
+        return self._decoder.document
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self._items:
+            if self._complete:
+                raise StopIteration()
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._complete = True
+                self._items.extend(self._decoder.close())
+            else:
+                self._items.extend(self._decoder.feed(chunk))
+        return self._items.popleft()
+
+    next = __next__  # Python 2 compatibility.
+
+
 class ContentDecodePolicy(SansIOHTTPPolicy):
     """Policy for decoding unstreamed response content.
     """
@@ -273,6 +566,54 @@ class ContentDecodePolicy(SansIOHTTPPolicy):
     # Name used in context
     CONTEXT_NAME = "deserialized_data"
 
+    @classmethod
+    def items_decoder(cls, items_path, content_type=None):
+        # type: (Optional[str], Optional[str]) -> Any
+        """Return an incremental decoder for the items of a list document.
+
+        The decoder has a `feed(data)` method returning the items completed by a chunk of the body,
+        a `close()` method returning the last ones, and a `document` attribute holding the rest
+        of the document once closed.
+
+        :param str items_path: For JSON, the top-level member holding the array of items (None if the
+         document is the array). For XML, the path of the items relative to the root element.
+        :param str content_type: The content type. Default is JSON.
+        :raises: ~azure.core.exceptions.DecodeError if the content type is not JSON nor XML.
+        """
+        if content_type is None or content_type in cls.JSON_MIMETYPES:
+            return _JsonItemsDecoder(items_path)
+        if "xml" in content_type:
+            if not items_path:
+                raise ValueError("The path of the items is required to decode XML.")
+            return _XmlItemsDecoder(items_path)
+        raise DecodeError("Cannot deserialize content-type: {}".format(content_type))
+
+    @classmethod
+    def deserialize_items_from_stream(cls, response, items_path, content_type=None):
+        # type: (Type[ContentDecodePolicyType], Any, Optional[str], Optional[str]) -> Any
+        """Decode the items of a list response incrementally, as the body is streamed.
+
+        Unlike :meth:`deserialize_from_text`, the body is not loaded in memory: only the item being
+        decoded is. The response should have been received with stream=True.
+
+        :param response: The HTTP response.
+        :type response: ~azure.core.pipeline.transport.HttpResponse
+        :param str items_path: For JSON, the top-level member holding the array of items. For XML,
+         the path of the items relative to the root element, e.g. "Blobs/Blob".
+        :param str content_type: The content type. Default is the content-type header, or JSON.
+        :return: A StreamedItems, or an async iterator of the items if the response is the response
+         of an async transport.
+        :rtype: ~azure.core.pipeline.policies.universal.StreamedItems
+        """
+        if content_type is None:
+            content_type = _response_content_type(response)
+        decoder = cls.items_decoder(items_path, content_type)
+        chunks = _iter_body(response)
+        if hasattr(chunks, '__aiter__'):
+            from ...async_paging import _AsyncStreamedItems
+            return _AsyncStreamedItems(chunks, decoder)
+        return StreamedItems(chunks, decoder)
+
     @classmethod
     def deserialize_from_text(cls, response, content_type=None):
         # type: (Type[ContentDecodePolicyType], PipelineResponse, Optional[str]) -> Any
@@ -361,10 +702,26 @@ class ContentDecodePolicy(SansIOHTTPPolicy):
 
         return cls.deserialize_from_text(response, content_type)
 
+    def on_request(self, request):
+        # type: (PipelineRequest) -> None
+        """Set up the streaming decode of the items of a list response.
+
+        If the "stream_items" option is given, the response is streamed and the context data
+        is a :class:`StreamedItems` decoding the items found at this path as they arrive (an async
+        iterator of the items on an async pipeline).
+
+        :param request: The PipelineRequest object.
+        :type request: ~azure.core.pipeline.PipelineRequest
+        """
+        items_path = request.context.options.pop("stream_items", None)
+        if items_path is not None:
+            request.context["stream_items"] = items_path
+            request.context.options["stream"] = True
+
     def on_response(self, request, response):
         # type: (PipelineRequest, PipelineResponse) -> None
         """Extract data from the body of a REST response object.
-        This will load the entire payload in memory.
+        This will load the entire payload in memory, unless the "stream_items" option was given.
         Will follow Content-Type to parse.
         We assume everything is UTF8 (BOM acceptable).
 
@@ -378,6 +735,12 @@ class ContentDecodePolicy(SansIOHTTPPolicy):
         :raises UnicodeDecodeError: If bytes is not UTF8
         :raises xml.etree.ElementTree.ParseError: If bytes is not valid XML
         """
+        items_path = response.context.get("stream_items")
+        if items_path is not None:
+            response.context[self.CONTEXT_NAME] = self.deserialize_items_from_stream(
+                response.http_response, items_path)
+            return
+
         # If response was asked as stream, do NOT read anything and quit now
         if response.context.options.get("stream", True): # type: ignore
             return
@@ -64,5 +64,14 @@ try:
         ])
     except ImportError:
         pass  # Aiohttp not installed
+
+    try:
+        from .h2_asyncio import AsyncioH2Transport, AsyncioH2TransportResponse
+        __all__.extend([
+            'AsyncioH2Transport',
+            'AsyncioH2TransportResponse',
+        ])
+    except ImportError:
+        pass  # h2 not installed
 except (ImportError, SyntaxError):
     pass  # Asynchronous pipelines not supported.
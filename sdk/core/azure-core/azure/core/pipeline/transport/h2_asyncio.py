@@ -0,0 +1,528 @@
+# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+from typing import Any, Dict, List, Optional, Tuple, AsyncIterator as AsyncIteratorType
+from collections.abc import AsyncIterator
+from http.client import responses
+from urllib.parse import urlparse
+
+import asyncio
+import logging
+import ssl
+
+import h2.config  # type: ignore
+import h2.connection  # type: ignore
+import h2.events  # type: ignore
+import h2.exceptions  # type: ignore
+from h2.errors import ErrorCodes  # type: ignore
+
+from requests.models import RequestEncodingMixin
+from requests.structures import CaseInsensitiveDict
+
+from azure.core.configuration import ConnectionConfiguration
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+from azure.core.pipeline import Pipeline
+
+from .base import HttpRequest
+from .base_async import (
+    AsyncHttpTransport,
+    AsyncHttpResponse,
+    _ResponseStopIteration)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Headers that are meaningless, or forbidden, in HTTP/2 (RFC 7540 8.1.2.2)
+_CONNECTION_HEADERS = frozenset(['connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'])
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+_READ_SIZE = 64 * 1024
+
+
+class _H2Stream(object):
+    """State of one request/response exchange on a HTTP/2 connection."""
+
+    def __init__(self, connection: '_H2Connection', stream_id: int) -> None:
+        self.connection = connection
+        self.stream_id = stream_id
+        self.response = connection.loop.create_future()  # type: asyncio.Future
+        self.data = asyncio.Queue()  # type: asyncio.Queue
+        self.ended = False
+
+    def receive_headers(self, headers: List[Tuple[bytes, bytes]]) -> None:
+        if not self.response.done():
+            self.response.set_result(headers)
+
+    def fail(self, error: Exception) -> None:
+        self.ended = True
+        if not self.response.done():
+            self.response.set_exception(error)
+        self.data.put_nowait(error)
+
+    async def read(self, timeout: Optional[float]) -> bytes:
+        """Return the next chunk of the body, or b'' at the end of the stream.
+
+        Flow control credit is returned to the server only once data is consumed,
+        so a slow reader applies back-pressure instead of buffering the whole body.
+        """
+        try:
+            item = await asyncio.wait_for(self.data.get(), timeout)
+        except asyncio.TimeoutError as err:
+            self.close()
+            raise ServiceResponseError("Timed out reading the response body.", error=err)
+        if item is None:
+            return b''
+        if isinstance(item, Exception):
+            raise item
+        data, flow_controlled_length = item
+        self.connection.acknowledge_received_data(self.stream_id, flow_controlled_length)
+        return data
+
+    def close(self) -> None:
+        """Cancel the stream if the body was not fully received."""
+        if not self.ended:
+            self.ended = True
+            self.connection.reset_stream(self.stream_id)
+
+
+class _H2Connection(object):
+    """A single HTTP/2 connection multiplexing concurrent streams.
+
+    All protocol state is only touched from the event loop, so the h2 state machine
+    needs no locking. Writes are buffered by the StreamWriter; draining is serialized.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.loop = asyncio.get_event_loop()
+        self._reader = reader
+        self._writer = writer
+        self._conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=True))
+        self._streams = {}  # type: Dict[int, _H2Stream]
+        self._drain_lock = asyncio.Lock()
+        self._changed = self.loop.create_future()  # type: asyncio.Future
+        self._closed_error = None  # type: Optional[Exception]
+        self._conn.initiate_connection()
+        self._writer.write(self._conn.data_to_send())
+        self._read_task = self.loop.create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, host: str, port: int, ssl_context: Optional[ssl.SSLContext],
+                      timeout: Optional[float]) -> '_H2Connection':
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=ssl_context, server_hostname=host if ssl_context else None),
+                timeout)
+        except (OSError, asyncio.TimeoutError) as err:
+            raise ServiceRequestError(err, error=err)
+        if ssl_context:
+            ssl_object = writer.get_extra_info('ssl_object')
+            if ssl_object.selected_alpn_protocol() != 'h2':
+                writer.close()
+                raise ServiceRequestError("Server {}:{} does not support HTTP/2.".format(host, port))
+        return cls(reader, writer)
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed_error is not None
+
+    @property
+    def open_streams(self) -> int:
+        return len(self._streams)
+
+    @property
+    def has_capacity(self) -> bool:
+        return not self.is_closed and self._conn.open_outbound_streams < self._conn.remote_settings.max_concurrent_streams
+
+    def _notify(self) -> None:
+        """Wake up every coroutine waiting for stream capacity or flow control window."""
+        if not self._changed.done():
+            self._changed.set_result(None)
+        self._changed = self.loop.create_future()
+
+    async def _wait_changed(self) -> None:
+        if self._closed_error:
+            raise self._closed_error
+        await asyncio.shield(self._changed)
+
+    def _write_pending(self) -> None:
+        data = self._conn.data_to_send()
+        if data and not self._writer.is_closing():
+            self._writer.write(data)
+
+    async def _flush(self) -> None:
+        self._write_pending()
+        async with self._drain_lock:
+            try:
+                await self._writer.drain()
+            except OSError as err:
+                self._terminate(ServiceRequestError(err, error=err))
+                raise self._closed_error  # type: ignore
+
+    def acknowledge_received_data(self, stream_id: int, length: int) -> None:
+        if self.is_closed:
+            return
+        self._conn.acknowledge_received_data(length, stream_id)
+        self._write_pending()
+
+    def reset_stream(self, stream_id: int) -> None:
+        self._streams.pop(stream_id, None)
+        if not self.is_closed:
+            try:
+                self._conn.reset_stream(stream_id, error_code=ErrorCodes.CANCEL)
+            except h2.exceptions.StreamClosedError:
+                pass
+            self._write_pending()
+        self._notify()
+
+    async def send_request(self, headers: List[Tuple[str, str]], body: Optional[Any]) -> _H2Stream:
+        while not self.has_capacity:
+            await self._wait_changed()
+        stream_id = self._conn.get_next_available_stream_id()
+        stream = _H2Stream(self, stream_id)
+        self._streams[stream_id] = stream
+        self._conn.send_headers(stream_id, headers, end_stream=body is None)
+        try:
+            await self._flush()
+            if body is not None:
+                for chunk in body:
+                    await self._send_data(stream_id, chunk)
+                self._conn.end_stream(stream_id)
+                await self._flush()
+        except h2.exceptions.StreamClosedError:
+            # The server answered (and closed the stream) before reading the whole body
+            pass
+        return stream
+
+    async def _send_data(self, stream_id: int, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            if self._closed_error:
+                raise self._closed_error
+            window = self._conn.local_flow_control_window(stream_id)
+            if window <= 0:
+                await self._wait_changed()
+                continue
+            size = min(window, len(view), self._conn.max_outbound_frame_size)
+            self._conn.send_data(stream_id, view[:size].tobytes())
+            view = view[size:]
+            await self._flush()
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                data = await self._reader.read(_READ_SIZE)
+                if not data:
+                    raise ConnectionResetError("Connection closed by the server.")
+                for event in self._conn.receive_data(data):
+                    self._handle_event(event)
+                self._write_pending()
+                self._notify()
+        except asyncio.CancelledError:
+            self._terminate(ServiceResponseError("Connection closed."))
+        except (OSError, h2.exceptions.ProtocolError) as err:
+            self._terminate(ServiceResponseError(err, error=err))
+
+    def _handle_event(self, event: Any) -> None:
+        stream = self._streams.get(getattr(event, 'stream_id', None))
+        if isinstance(event, h2.events.ResponseReceived):
+            if stream:
+                stream.receive_headers(event.headers)
+        elif isinstance(event, h2.events.DataReceived):
+            if stream:
+                stream.data.put_nowait((event.data, event.flow_controlled_length))
+            else:
+                self._conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+        elif isinstance(event, h2.events.StreamEnded):
+            if stream:
+                stream.ended = True
+                stream.data.put_nowait(None)
+                del self._streams[event.stream_id]
+        elif isinstance(event, h2.events.StreamReset):
+            if stream:
+                stream.fail(ServiceResponseError("Stream reset by the server, error code {}.".format(event.error_code)))
+                del self._streams[event.stream_id]
+        elif isinstance(event, h2.events.ConnectionTerminated):
+            self._terminate(ServiceResponseError(
+                "Connection terminated by the server, error code {}.".format(event.error_code)))
+
+    def _terminate(self, error: Exception) -> None:
+        if self._closed_error:
+            return
+        self._closed_error = error
+        for stream in self._streams.values():
+            stream.fail(error)
+        self._streams.clear()
+        self._writer.close()
+        self._notify()
+
+    async def close(self) -> None:
+        if not self.is_closed:
+            self._conn.close_connection()
+            self._write_pending()
+        self._read_task.cancel()
+        try:
+            await self._read_task
+        except asyncio.CancelledError:
+            pass
+        self._terminate(ServiceRequestError("Connection closed."))
+
+
+class AsyncioH2Transport(AsyncHttpTransport):
+    """Native asyncio HTTP/2 sender implementation, using the h2 protocol library.
+
+    Requests to the same host are multiplexed as concurrent streams over a small number
+    of connections. HTTPS connections negotiate HTTP/2 with ALPN; plain HTTP connections
+    assume the server speaks HTTP/2 ("prior knowledge"). There is no fallback to HTTP/1.1
+    and proxies are not supported.
+
+    **Keyword argument:**
+
+    *max_connections_per_host (int)* - Number of connections opened to a host before new requests
+    wait for a free stream on an existing one. Defaults to 2.
+
+    Example:
+        .. literalinclude:: ../examples/test_example_async.py
+            :start-after: [START h2_asyncio]
+            :end-before: [END h2_asyncio]
+            :language: python
+            :dedent: 4
+            :caption: Asynchronous HTTP/2 transport with asyncio.
+    """
+    def __init__(self, **kwargs):
+        self.connection_config = ConnectionConfiguration(**kwargs)
+        self._max_connections_per_host = kwargs.pop('max_connections_per_host', 2)
+        self._connections = {}  # type: Dict[Tuple[str, str, int], List[_H2Connection]]
+        self._connect_locks = {}  # type: Dict[Tuple[str, str, int], asyncio.Lock]
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args):  # pylint: disable=arguments-differ
+        await self.close()
+
+    async def open(self):
+        """Connections are opened on demand, per host."""
+
+    async def close(self):
+        """Closes all the connections.
+        """
+        connections = [conn for conns in self._connections.values() for conn in conns]
+        self._connections = {}
+        for conn in connections:
+            await conn.close()
+
+    def _build_ssl_config(self, cert, verify):  # pylint: disable=no-self-use
+        if verify not in (True, False):
+            ssl_ctx = ssl.create_default_context(cafile=verify)
+        else:
+            ssl_ctx = ssl.create_default_context()
+            if not verify:
+                ssl_ctx.check_hostname = False
+                ssl_ctx.verify_mode = ssl.CERT_NONE
+        if cert:
+            if isinstance(cert, str):
+                ssl_ctx.load_cert_chain(cert)
+            else:
+                ssl_ctx.load_cert_chain(*cert)
+        ssl_ctx.set_alpn_protocols(['h2'])
+        return ssl_ctx
+
+    async def _get_connection(self, scheme, host, port, cert, verify, timeout):
+        # Connections are only shared by requests with the same TLS settings
+        key = (scheme, host, port) + ((cert, verify) if scheme == 'https' else ())
+        connections = self._connections.setdefault(key, [])
+        connections[:] = [conn for conn in connections if not conn.is_closed]
+        available = [conn for conn in connections if conn.has_capacity]
+        if available:
+            return min(available, key=lambda conn: conn.open_streams)
+        lock = self._connect_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if len(connections) < self._max_connections_per_host:
+                ssl_ctx = None
+                if scheme == 'https':
+                    ssl_ctx = self._build_ssl_config(cert=cert, verify=verify)
+                conn = await _H2Connection.connect(host, port, ssl_ctx, timeout)
+                connections.append(conn)
+                return conn
+        return min(connections, key=lambda conn: conn.open_streams)
+
+    @staticmethod
+    def _build_headers(request, parsed, body_length):
+        headers = [
+            (':method', request.method),
+            (':scheme', parsed.scheme),
+            (':authority', parsed.netloc),
+            (':path', (parsed.path or '/') + ('?' + parsed.query if parsed.query else '')),
+        ]
+        for name, value in request.headers.items():
+            name = name.lower()
+            if name in _CONNECTION_HEADERS or name == 'host':
+                continue
+            headers.append((name, str(value)))
+        if body_length is not None and 'content-length' not in request.headers:
+            headers.append(('content-length', str(body_length)))
+        return headers
+
+    @staticmethod
+    def _get_request_body(request):
+        """Return the body as an iterable of bytes and its length if known, or (None, None)."""
+        data = request.data
+        if request.files:
+            data, content_type = RequestEncodingMixin._encode_files(request.files, {})  # pylint: disable=protected-access
+            request.headers['Content-Type'] = content_type
+        if data is None:
+            return None, None
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return [data], len(data)
+        if hasattr(data, 'read'):
+            return iter(lambda: data.read(_READ_SIZE), b''), None
+        return data, None
+
+    async def send(self, request: HttpRequest, **config: Any) -> Optional[AsyncHttpResponse]:
+        """Send the request using this HTTP sender.
+
+        Will pre-load the body into memory to be available with a sync method.
+        Pass stream=True to avoid this behavior.
+
+        :param request: The HttpRequest object
+        :type request: ~azure.core.pipeline.transport.HttpRequest
+        :param config: Any keyword arguments
+        :return: The AsyncHttpResponse
+        :rtype: ~azure.core.pipeline.transport.AsyncHttpResponse
+
+        **Keyword argument:**
+
+        *stream (bool)* - Defaults to False.
+        """
+        parsed = urlparse(request.url)
+        if parsed.scheme not in _DEFAULT_PORTS:
+            raise ServiceRequestError("Unsupported URL scheme for HTTP/2: {}".format(request.url))
+        port = parsed.port or _DEFAULT_PORTS[parsed.scheme]
+        stream_response = config.pop("stream", False)
+        timeout = config.pop('connection_timeout', self.connection_config.timeout)
+        cert = config.pop('connection_cert', self.connection_config.cert)
+        verify = config.pop('connection_verify', self.connection_config.verify)
+
+        conn = await self._get_connection(parsed.scheme, parsed.hostname, port, cert, verify, timeout)
+        body, body_length = self._get_request_body(request)
+        stream = await conn.send_request(self._build_headers(request, parsed, body_length), body)
+        try:
+            headers = await asyncio.wait_for(asyncio.shield(stream.response), timeout)
+        except asyncio.TimeoutError as err:
+            stream.close()
+            raise ServiceResponseError("Timed out waiting for the response.", error=err)
+
+        response = AsyncioH2TransportResponse(
+            request, stream, headers, self.connection_config.data_block_size, timeout=timeout)
+        if not stream_response:
+            await response.load_body()
+        return response
+
+
+class AsyncioH2StreamDownloadGenerator(AsyncIterator):
+    """Streams the response body data.
+
+    :param pipeline: The pipeline object
+    :param request: The request object
+    :param response: The response object.
+    :type response: ~azure.core.pipeline.transport.AsyncioH2TransportResponse
+    """
+    def __init__(self, pipeline: Pipeline, request: HttpRequest, response: 'AsyncioH2TransportResponse') -> None:
+        self.pipeline = pipeline
+        self.request = request
+        self.response = response
+        self.content_length = int(response.headers.get('Content-Length', 0))
+        self.downloaded = 0
+
+    def __len__(self):
+        return self.content_length
+
+    async def __anext__(self):
+        try:
+            chunk = await self.response.internal_response.read(self.response.timeout)
+            if not chunk:
+                raise _ResponseStopIteration()
+            self.downloaded += len(chunk)
+            return chunk
+        except _ResponseStopIteration:
+            self.response.internal_response.close()
+            raise StopAsyncIteration()
+        except Exception as err:
+            _LOGGER.warning("Unable to stream download: %s", err)
+            self.response.internal_response.close()
+            raise
+
+
+class AsyncioH2TransportResponse(AsyncHttpResponse):
+    """Methods for accessing response body data.
+
+    :param request: The HttpRequest object
+    :type request: ~azure.core.pipeline.transport.HttpRequest
+    :param stream: The HTTP/2 stream the response is received on.
+    :param headers: The raw response headers, including pseudo-headers.
+    :param block_size: block size of data sent over connection.
+    :type block_size: int
+    """
+    def __init__(self, request: HttpRequest, stream: _H2Stream, headers: List[Tuple[bytes, bytes]],
+                 block_size=None, timeout=None) -> None:
+        super(AsyncioH2TransportResponse, self).__init__(request, stream, block_size=block_size)
+        self.headers = CaseInsensitiveDict()
+        for name, value in headers:
+            name, value = name.decode('utf-8'), value.decode('utf-8')
+            if name == ':status':
+                self.status_code = int(value)
+            elif name in self.headers:
+                self.headers[name] = self.headers[name] + ', ' + value
+            else:
+                self.headers[name] = value
+        self.reason = responses.get(self.status_code, '')
+        self.content_type = self.headers.get('content-type')
+        self.timeout = timeout
+        self._body = None  # type: Optional[bytes]
+
+    def body(self) -> bytes:
+        """Return the whole body as bytes in memory.
+        """
+        if self._body is None:
+            raise ValueError("Body is not available. Call async method load_body, or do your call with stream=False.")
+        return self._body
+
+    async def load_body(self) -> None:
+        """Load in memory the body, so it could be accessible from sync methods."""
+        chunks = []
+        chunk = await self.internal_response.read(self.timeout)
+        while chunk:
+            chunks.append(chunk)
+            chunk = await self.internal_response.read(self.timeout)
+        self._body = b''.join(chunks)
+
+    def stream_download(self, pipeline) -> AsyncIteratorType[bytes]:
+        """Generator for streaming response body data.
+
+        :param pipeline: The pipeline object
+        :type pipeline: azure.core.pipeline
+        """
+        return AsyncioH2StreamDownloadGenerator(pipeline, self.request, self)
@@ -25,14 +25,21 @@
 # --------------------------------------------------------------------------
 from __future__ import absolute_import
 import logging
-from typing import Iterator, Optional, Any, Union, TypeVar
+import threading
+from typing import Iterator, Optional, Any, Union, TypeVar, Callable, Dict, Tuple
 import time
+try:
+    from urlparse import urlparse # type: ignore
+except ImportError:
+    from urllib.parse import urlparse
 import urllib3 # type: ignore
 from urllib3.util.retry import Retry # type: ignore
 import requests
 
 from azure.core.configuration import ConnectionConfiguration
 from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceModifiedError,
     ServiceRequestError,
     ServiceResponseError
 )
@@ -78,15 +85,82 @@ class _RequestsTransportResponseBase(_HttpResponseBase):
         return self.internal_response.text
 
 
+_RANGE_HEADERS = ('x-ms-range', 'range')
+
+# Errors raised by requests (iteration) or urllib3 (readinto) when the connection drops mid-body
+_STREAM_ERRORS = (
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ConnectionError,
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.ReadTimeoutError,
+)
+
+
+def _build_resume_request(request, offset, etag):
+    # type: (HttpRequest, int, Optional[str]) -> HttpRequest
+    """Copy a download request so that it asks for the body from the given offset onward.
+
+    An existing range header (standard or "x-ms-range") is narrowed rather than replaced,
+    and the request is made conditional on the ETag of the interrupted response.
+
+    :param request: The original request.
+    :param int offset: Number of body bytes already received.
+    :param str etag: The ETag of the original response, if any.
+    :rtype: ~azure.core.pipeline.transport.HttpRequest
+    """
+    resumed = HttpRequest(request.method, request.url, headers=request.headers,
+                          files=request.files, data=request.data)
+    for header in _RANGE_HEADERS:
+        current = resumed.headers.get(header)
+        if current:
+            start, _, end = current.partition('=')[2].partition('-')
+            if start:
+                resumed.headers[header] = 'bytes={}-{}'.format(int(start) + offset, end)
+            else:
+                # Suffix range: "bytes=-N" asks for the last N bytes
+                resumed.headers[header] = 'bytes=-{}'.format(int(end) - offset)
+            break
+    else:
+        resumed.headers['range'] = 'bytes={}-'.format(offset)
+    if etag:
+        resumed.headers['If-Match'] = etag
+    return resumed
+
+
+def _check_resume_response(response, etag):
+    # type: (HttpResponse, Optional[str]) -> bool
+    """Check the response to a resume request.
+
+    :return: False if there is nothing left to download, True if the body can be read.
+    :raises: ~azure.core.exceptions.ResourceModifiedError if the resource changed since the
+     download started, ~azure.core.exceptions.HttpResponseError if the range was not honoured.
+    """
+    if response.status_code == 416:
+        return False
+    if response.status_code == 412 or (etag and response.headers.get('ETag', etag) != etag):
+        raise ResourceModifiedError(
+            message="The resource was modified while it was being downloaded.", response=response)
+    if response.status_code != 206:
+        raise HttpResponseError(
+            message="Unable to resume download, the service did not return the requested range.",
+            response=response)
+    return True
+
+
 class StreamDownloadGenerator(object):
     """Generator for streaming response data.
 
+    If the connection drops mid-body, the download is resumed by sending a range request
+    for the remaining bytes, conditional on the ETag of the original response. This is
+    only possible if the body is not content-encoded.
+
     :param pipeline: The pipeline object
     :param request: The request object
     :param response: The response object.
     :param int block_size: Number of bytes to read into memory.
     :param generator iter_content_func: Iterator for response data.
     :param int content_length: size of body in bytes.
+    :param int downloaded: Number of body bytes returned so far.
     """
     def __init__(self, pipeline, request, response, block_size):
         self.pipeline = pipeline
@@ -96,6 +170,11 @@ class StreamDownloadGenerator(object):
         self.iter_content_func = self.response.iter_content(self.block_size)
         self.content_length = int(response.headers.get('Content-Length', 0))
         self.downloaded = 0
+        self.retry_total = 3
+        self.retry_backoff = 1
+        self._etag = response.headers.get('ETag')
+        self._resumable = not response.headers.get('Content-Encoding')
+        self._pending = None  # type: Optional[memoryview]
 
     def __len__(self):
         return self.content_length
@@ -104,36 +183,24 @@ class StreamDownloadGenerator(object):
         return self
 
     def __next__(self):
-        retry_active = True
-        retry_total = 3
-        retry_interval = 1000
-        while retry_active:
+        retry_count = 0
+        while True:
             try:
-                chunk = next(self.iter_content_func)
+                if self._pending:
+                    chunk = self._pending.tobytes()
+                    self._pending = None
+                else:
+                    chunk = next(self.iter_content_func)
                 if not chunk:
                     raise StopIteration()
-                self.downloaded += self.block_size
+                self.downloaded += len(chunk)
                 return chunk
             except StopIteration:
                 self.response.close()
                 raise StopIteration()
-            except (requests.exceptions.ChunkedEncodingError,
-                    requests.exceptions.ConnectionError):
-                retry_total -= 1
-                if retry_total <= 0:
-                    retry_active = False
-                else:
-                    time.sleep(retry_interval)
-                    headers = {'range': 'bytes=' + self.downloaded + '-'}
-                    resp = self.pipeline.run(self.request, stream=True, headers=headers)
-                    if resp.status_code == 416:
-                        raise
-                    chunk = next(self.iter_content_func)
-                    if not chunk:
-                        raise StopIteration()
-                    self.downloaded += chunk
-                    return chunk
-                continue
+            except _STREAM_ERRORS as err:
+                retry_count += 1
+                self._resume(err, retry_count)
             except requests.exceptions.StreamConsumedError:
                 raise
             except Exception as err:
@@ -142,6 +209,70 @@ class StreamDownloadGenerator(object):
                 raise
     next = __next__  # Python 2 compatibility.
 
+    def readinto(self, buffer):
+        # type: (Any) -> int
+        """Read the next bytes of the body into a pre-allocated, writable buffer.
+
+        When the body is not content-encoded, data is read directly from the connection
+        into the buffer instead of being returned as one new bytes object per chunk.
+
+        :param buffer: A writable bytes-like object, e.g. a bytearray or a memoryview on one.
+        :return: The number of bytes read, 0 once the body is exhausted.
+        :rtype: int
+        """
+        view = memoryview(buffer)
+        if not view.nbytes:
+            return 0
+        retry_count = 0
+        while True:
+            try:
+                if self._pending or not self._resumable:
+                    read = self._readinto_from_chunks(view)
+                else:
+                    read = self.response.raw.readinto(view)
+                if not read:
+                    self.response.close()
+                self.downloaded += read
+                return read
+            except _STREAM_ERRORS as err:
+                retry_count += 1
+                self._resume(err, retry_count)
+            except Exception as err:
+                _LOGGER.warning("Unable to stream download: %s", err)
+                self.response.close()
+                raise
+
+    def _readinto_from_chunks(self, view):
+        # type: (memoryview) -> int
+        if not self._pending:
+            chunk = next(self.iter_content_func, None)
+            if not chunk:
+                return 0
+            self._pending = memoryview(chunk)
+        count = min(view.nbytes, self._pending.nbytes)
+        view[:count] = self._pending[:count]
+        self._pending = self._pending[count:] if count < self._pending.nbytes else None
+        return count
+
+    def _resume(self, error, retry_count):
+        # type: (Exception, int) -> None
+        """Re-issue the request for the bytes not yet received, or re-raise the error."""
+        self.response.close()
+        if not self._resumable or self.pipeline is None or retry_count > self.retry_total:
+            raise error
+        offset = self.downloaded + (self._pending.nbytes if self._pending else 0)
+        _LOGGER.warning("Stream download interrupted after %d bytes, resuming: %s", offset, error)
+        time.sleep(self.retry_backoff * 2 ** (retry_count - 1))
+        resume_request = _build_resume_request(self.request, offset, self._etag)
+        response = self.pipeline.run(resume_request, stream=True).http_response
+        if _check_resume_response(response, self._etag):
+            self.response = response.internal_response
+            self.iter_content_func = self.response.iter_content(self.block_size)
+        else:
+            response.internal_response.close()
+            self._resumable = False
+            self.iter_content_func = iter(())
+
 
 class RequestsTransportResponse(HttpResponse, _RequestsTransportResponseBase):
     """Streaming of data from the response.
@@ -152,6 +283,44 @@ class RequestsTransportResponse(HttpResponse, _RequestsTransportResponseBase):
         return StreamDownloadGenerator(pipeline, self.request, self.internal_response, self.block_size)
 
 
+class _SharedSessionRegistry(object):
+    """Process-wide registry of requests sessions, keyed by scheme, host and session settings.
+
+    Sessions handed out by the registry are not owned by any transport: they stay
+    open, with their keep-alive connections, until :meth:`close_all` is called. Only
+    transports with the same session settings (environment settings and pool sizing)
+    share a session, so that a transport never gets the settings of another one.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}  # type: Dict[Tuple[Any, ...], requests.Session]
+
+    def get(self, url, settings, init_session):
+        # type: (str, Tuple[Any, ...], Callable[[requests.Session], None]) -> requests.Session
+        parsed = urlparse(url)
+        key = (parsed.scheme.lower(), parsed.netloc.lower()) + settings
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = requests.Session()
+                    init_session(session)
+                    self._sessions[key] = session
+        return session
+
+    def close_all(self):
+        # type: () -> None
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+        for session in sessions:
+            session.close()
+
+
+_SHARED_SESSIONS = _SharedSessionRegistry()
+
+
 class RequestsTransport(HttpTransport):
     """Implements a basic requests HTTP sender.
 
@@ -168,6 +337,13 @@ class RequestsTransport(HttpTransport):
     *session (requests.Session)* - Request session to use instead of the default one.
     *session_owner (bool)* - Decide if the session provided by user is owned by this transport. Default to True.
     *use_env_settings (bool)* - Uses proxy settings from environment. Defaults to True.
+    *pool_connections (int)* - Number of host connection pools to cache. Defaults to 10.
+    *pool_maxsize (int)* - Maximum number of connections kept alive per host pool. Should be at least
+    the number of threads sending requests through this transport. Defaults to 10.
+    *shared_session (bool)* - Use a process-wide session per host instead of a session owned by this
+    transport, so that all clients talking to the same host share warm keep-alive connections.
+    Only transports with the same use_env_settings and pool sizing share a session.
+    Shared sessions are never closed by the transport, see :meth:`close_shared_sessions`. Defaults to False.
 
     Example:
         .. literalinclude:: ../examples/test_example_sync.py
@@ -186,6 +362,9 @@ class RequestsTransport(HttpTransport):
         self._session_owner = kwargs.get('session_owner', True)
         self.connection_config = ConnectionConfiguration(**kwargs)
         self._use_env_settings = kwargs.pop('use_env_settings', True)
+        self._pool_connections = kwargs.pop('pool_connections', requests.adapters.DEFAULT_POOLSIZE)
+        self._pool_maxsize = kwargs.pop('pool_maxsize', requests.adapters.DEFAULT_POOLSIZE)
+        self._shared_session = kwargs.pop('shared_session', False) and self.session is None
 
     def __enter__(self):
         # type: () -> RequestsTransport
@@ -203,17 +382,44 @@ class RequestsTransport(HttpTransport):
         """
         session.trust_env = self._use_env_settings
         disable_retries = Retry(total=False, redirect=False, raise_on_status=False)
-        adapter = requests.adapters.HTTPAdapter(max_retries=disable_retries)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            max_retries=disable_retries
+        )
         for p in self._protocols:
             session.mount(p, adapter)
 
+    def _get_session(self, request):
+        # type: (HttpRequest) -> requests.Session
+        """Return the session to send this request with.
+
+        This is the session of this transport, or the process-wide session of the request host
+        if this transport was created with "shared_session".
+        """
+        if self._shared_session:
+            settings = (self._use_env_settings, self._pool_connections, self._pool_maxsize)
+            return _SHARED_SESSIONS.get(request.url, settings, self._init_session)
+        return self.session
+
+    @staticmethod
+    def close_shared_sessions():
+        # type: () -> None
+        """Close all the process-wide sessions used by transports created with "shared_session".
+
+        Transports still in use will transparently create new sessions.
+        """
+        _SHARED_SESSIONS.close_all()
+
     def open(self):
+        if self._shared_session:
+            return
         if not self.session and self._session_owner:
             self.session = requests.Session()
             self._init_session(self.session)
 
     def close(self):
-        if self._session_owner:
+        if self._session_owner and not self._shared_session:
             self.session.close()
             self._session_owner = False
             self.session = None
@@ -238,7 +444,7 @@ class RequestsTransport(HttpTransport):
         error = None # type: Optional[Union[ServiceRequestError, ServiceResponseError]]
 
         try:
-            response = self.session.request(  # type: ignore
+            response = self._get_session(request).request(  # type: ignore
                 request.method,
                 request.url,
                 headers=request.headers,
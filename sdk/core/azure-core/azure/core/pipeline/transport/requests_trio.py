@@ -43,7 +43,12 @@ from .base_async import (
     AsyncHttpResponse,
     _ResponseStopIteration,
     _iterate_response_content)
-from .requests_basic import RequestsTransport, RequestsTransportResponse
+from .requests_basic import (
+    RequestsTransport,
+    RequestsTransportResponse,
+    _build_resume_request,
+    _check_resume_response
+)
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -52,6 +57,9 @@ _LOGGER = logging.getLogger(__name__)
 class TrioStreamDownloadGenerator(AsyncIterator):
     """Generator for streaming response data.
 
+    If the connection drops mid-body, the download is resumed by sending a range request
+    for the remaining bytes, conditional on the ETag of the original response.
+
     :param pipeline: The pipeline object
     :param request: The request object
     :param response: The response object.
@@ -67,14 +75,17 @@ class TrioStreamDownloadGenerator(AsyncIterator):
         self.iter_content_func = self.response.iter_content(self.block_size)
         self.content_length = int(response.headers.get('Content-Length', 0))
         self.downloaded = 0
+        self.retry_total = 3
+        self.retry_backoff = 1
+        self._etag = response.headers.get('ETag')
+        self._resumable = not response.headers.get('Content-Encoding')
 
     def __len__(self):
         return self.content_length
 
     async def __anext__(self):
-        retry_active = True
-        retry_total = 3
-        while retry_active:
+        retry_count = 0
+        while True:
             try:
                 chunk = await trio.run_sync_in_worker_thread(
                     _iterate_response_content,
@@ -82,31 +93,15 @@ class TrioStreamDownloadGenerator(AsyncIterator):
                 )
                 if not chunk:
                     raise _ResponseStopIteration()
-                self.downloaded += self.block_size
+                self.downloaded += len(chunk)
                 return chunk
             except _ResponseStopIteration:
                 self.response.close()
                 raise StopAsyncIteration()
             except (requests.exceptions.ChunkedEncodingError,
-                    requests.exceptions.ConnectionError):
-                retry_total -= 1
-                if retry_total <= 0:
-                    retry_active = False
-                else:
-                    await trio.sleep(1000)
-                    headers = {'range': 'bytes=' + self.downloaded + '-'}
-                    resp = self.pipeline.run(self.request, stream=True, headers=headers)
-                    if resp.status_code == 416:
-                        raise
-                    chunk = await trio.run_sync_in_worker_thread(
-                        _iterate_response_content,
-                        self.iter_content_func,
-                    )
-                    if not chunk:
-                        raise StopIteration()
-                    self.downloaded += chunk
-                    return chunk
-                continue
+                    requests.exceptions.ConnectionError) as err:
+                retry_count += 1
+                await self._resume(err, retry_count)
             except requests.exceptions.StreamConsumedError:
                 raise
             except Exception as err:
@@ -114,6 +109,21 @@ class TrioStreamDownloadGenerator(AsyncIterator):
                 self.response.close()
                 raise
 
+    async def _resume(self, error, retry_count):
+        self.response.close()
+        if not self._resumable or self.pipeline is None or retry_count > self.retry_total:
+            raise error
+        _LOGGER.warning("Stream download interrupted after %d bytes, resuming: %s", self.downloaded, error)
+        await trio.sleep(self.retry_backoff * 2 ** (retry_count - 1))
+        resume_request = _build_resume_request(self.request, self.downloaded, self._etag)
+        response = (await self.pipeline.run(resume_request, stream=True)).http_response
+        if _check_resume_response(response, self._etag):
+            self.response = response.internal_response
+            self.iter_content_func = self.response.iter_content(self.block_size)
+        else:
+            response.internal_response.close()
+            self.iter_content_func = iter(())
+
 class TrioRequestsTransportResponse(AsyncHttpResponse, RequestsTransportResponse):  # type: ignore
     """Asynchronous streaming of data from the response.
     """
@@ -167,7 +177,7 @@ class TrioRequestsTransport(RequestsTransport, AsyncHttpTransport):  # type: ign
         try:
             response = await trio.run_sync_in_worker_thread(
                 functools.partial(
-                    self.session.request, # type: ignore
+                    self._get_session(request).request, # type: ignore
                     request.method,
                     request.url,
                     headers=request.headers,
@@ -23,7 +23,13 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
-from .poller import NoPolling as _NoPolling
+import asyncio
+import itertools
+import math
+import weakref
+from typing import Any, Dict, List, Optional, Set, Tuple  # pylint: disable=unused-import
+
+from .poller import NoPolling as _NoPolling, get_retry_after
 
 class AsyncPollingMethod(object):
     """ABC class for polling method.
@@ -78,3 +84,180 @@ async def async_poller(client, initial_response, deserialization_callback, polli
 
     await polling_method.run()
     return polling_method.resource()
+
+
+class AsyncLROPollerManager(object):
+    """Drives many long running operations on one event loop.
+
+    Instead of one :func:`async_poller` coroutine sleeping on its own for each operation,
+    timers due within `timer_resolution` seconds of each other are coalesced in one event loop
+    callback, and at most `max_concurrent_polls` status requests are in flight at once.
+
+    Polling methods exposing an ``async update_status()`` method are polled step by step: the manager
+    awaits ``update_status()`` then calls ``finished()``. ``update_status()`` may return the response of
+    the status request, whose Retry-After header then sets the delay before the next poll.
+    Other polling methods are run to completion with ``await run()``.
+
+    :param float polling_interval: The delay, in seconds, between two polls of an operation when
+     the service doesn't return a Retry-After header. Default value is 30.
+    :param float timer_resolution: Timers due within this many seconds are fired together.
+     Default value is 0.5.
+    :param int max_concurrent_polls: The maximum number of status requests in flight. Default value is 16.
+    """
+
+    def __init__(self, polling_interval=30, timer_resolution=0.5, max_concurrent_polls=16):
+        self.polling_interval = polling_interval
+        self.timer_resolution = timer_resolution
+        self.max_concurrent_polls = max_concurrent_polls
+        self._loop = None  # type: Optional[asyncio.AbstractEventLoop]
+        self._semaphore = None  # type: Optional[asyncio.Semaphore]
+        # Weak references, so that the operations completed and dropped by the caller are released
+        self._futures = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary
+        self._counter = itertools.count()
+        self._slots = {}  # type: Dict[float, Tuple[asyncio.Handle, List[Tuple[asyncio.Future, Any]]]]
+        self._tasks = set()  # type: Set[asyncio.Task]
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_details):
+        await self.close()
+
+    def next_polling_delay(self, response: Any) -> float:
+        """Returns the delay before the next poll of an operation.
+
+        :param response: The response of the last status request, if any.
+        :rtype: float
+        """
+        retry_after = get_retry_after(response)
+        return self.polling_interval if retry_after is None else retry_after
+
+    def add(self, client, initial_response, deserialization_callback, polling_method) -> asyncio.Future:
+        """Starts polling a long running operation.
+
+        Takes the same parameters as :func:`async_poller`.
+
+        :return: A future resolved with the deserialized resource of the long running operation.
+        :rtype: ~asyncio.Future
+        """
+        if self._closed:
+            raise ValueError("The poller manager is closed.")
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_polls)
+
+        # This implicit test avoids bringing in an explicit dependency on Model directly
+        try:
+            deserialization_callback = deserialization_callback.deserialize
+        except AttributeError:
+            pass
+
+        # Might raise a CloudError
+        polling_method.initialize(client, initial_response, deserialization_callback)
+
+        future = self._loop.create_future()
+        self._futures[next(self._counter)] = future
+        if polling_method.finished():
+            self._set_result(future, polling_method)
+        elif hasattr(polling_method, 'update_status'):
+            self._schedule(future, polling_method, self.next_polling_delay(initial_response))
+        else:
+            self._spawn(self._run(future, polling_method))
+        return future
+
+    async def wait_all(self, futures=None, timeout=None):
+        """Waits for all the operations to complete.
+
+        :param list futures: The futures to wait for. Default is all the operations of this manager
+         that are pending, or still referenced.
+        :param float timeout: The maximum time to wait, in seconds.
+        :return: The sets of completed and pending futures.
+        :rtype: tuple(set, set)
+        """
+        return await self._wait(futures, timeout, asyncio.ALL_COMPLETED)
+
+    async def wait_any(self, futures=None, timeout=None):
+        """Waits for at least one of the operations to complete.
+
+        :param list futures: The futures to wait for. Default is all the operations of this manager
+         that are pending, or still referenced.
+        :param float timeout: The maximum time to wait, in seconds.
+        :return: The sets of completed and pending futures.
+        :rtype: tuple(set, set)
+        """
+        return await self._wait(futures, timeout, asyncio.FIRST_COMPLETED)
+
+    async def close(self):
+        """Stops polling. Operations not completed yet are cancelled."""
+        self._closed = True
+        for handle, _ in self._slots.values():
+            handle.cancel()
+        self._slots.clear()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for future in list(self._futures.values()):
+            future.cancel()
+
+    async def _wait(self, futures, timeout, return_when):
+        if futures is None:
+            futures = [future for _, future in sorted(self._futures.items())]
+        futures = list(futures)
+        if not futures:
+            return set(), set()
+        return await asyncio.wait(futures, timeout=timeout, return_when=return_when)
+
+    def _spawn(self, coro):
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _schedule(self, future, polling_method, delay):
+        due = self._loop.time() + delay
+        if self.timer_resolution > 0:
+            due = math.ceil(due / self.timer_resolution) * self.timer_resolution
+        if due not in self._slots:
+            self._slots[due] = (self._loop.call_at(due, self._fire, due), [])
+        self._slots[due][1].append((future, polling_method))
+
+    def _fire(self, due):
+        _, batch = self._slots.pop(due)
+        for future, polling_method in batch:
+            self._spawn(self._poll(future, polling_method))
+
+    async def _poll(self, future, polling_method):
+        if future.done():
+            return
+        try:
+            async with self._semaphore:
+                response = await polling_method.update_status()
+            if not polling_method.finished():
+                if not self._closed:
+                    self._schedule(future, polling_method, self.next_polling_delay(response))
+                return
+        except Exception as err:  # pylint: disable=broad-except
+            if not future.done():
+                future.set_exception(err)
+            return
+        self._set_result(future, polling_method)
+
+    async def _run(self, future, polling_method):
+        try:
+            await polling_method.run()
+        except Exception as err:  # pylint: disable=broad-except
+            if not future.done():
+                future.set_exception(err)
+            return
+        self._set_result(future, polling_method)
+
+    @staticmethod
+    def _set_result(future, polling_method):
+        if future.done():
+            return
+        try:
+            future.set_result(polling_method.resource())
+        except Exception as err:  # pylint: disable=broad-except
+            future.set_exception(err)
@@ -23,14 +23,23 @@
 # IN THE SOFTWARE.
 #
 # --------------------------------------------------------------------------
+import email.utils
+import heapq
+import itertools
 import threading
+import time
 import uuid
+import weakref
 try:
     from urlparse import urlparse # type: ignore # pylint: disable=unused-import
 except ImportError:
     from urllib.parse import urlparse
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # type: ignore
 
-from typing import Any, Callable, Union, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Union, List, Optional, Tuple, TYPE_CHECKING
 from azure.core.pipeline.transport.base import HttpResponse  # type: ignore
 
 if TYPE_CHECKING:
@@ -236,3 +245,331 @@ class LROPoller(object):
         if self._done is None or self._done.is_set():
             raise ValueError("Process is complete.")
         self._callbacks = [c for c in self._callbacks if c != func]
+
+
+def get_retry_after(response):
+    # type: (Any) -> Optional[float]
+    """Returns the value of the Retry-After header of a response, in seconds.
+
+    :param response: A HttpResponse or a PipelineResponse. Anything else is ignored.
+    :return: The delay in seconds, or None if the response has no valid Retry-After header.
+    :rtype: float or None
+    """
+    headers = getattr(getattr(response, 'http_response', response), 'headers', None)
+    if not headers:
+        return None
+    retry_after = headers.get('Retry-After')
+    if retry_after is None:
+        return None
+    try:
+        seconds = float(retry_after)
+    except ValueError:
+        retry_date_tuple = email.utils.parsedate_tz(retry_after)
+        if retry_date_tuple is None:
+            return None
+        seconds = email.utils.mktime_tz(retry_date_tuple) - time.time()
+    return max(seconds, 0)
+
+
+class ManagedLROPoller(object):
+    """Poller for a long running operation driven by a :class:`LROPollerManager`.
+
+    It exposes the same methods as :class:`LROPoller`, but no thread is dedicated to it.
+    Instances are created with :meth:`LROPollerManager.add`.
+    """
+
+    def __init__(self, manager, client, initial_response, deserialization_callback, polling_method):
+        # type: (LROPollerManager, Any, Any, DeserializationCallbackType, PollingMethod) -> None
+        self._manager = manager
+        self._response = initial_response
+        self._callbacks = []  # type: List[Callable]
+        self._polling_method = polling_method
+        self._exception = None  # type: Optional[Exception]
+        self._done = threading.Event()
+
+        # This implicit test avoids bringing in an explicit dependency on Model directly
+        try:
+            deserialization_callback = deserialization_callback.deserialize # type: ignore
+        except AttributeError:
+            pass
+
+        # Might raise a CloudError
+        self._polling_method.initialize(client, initial_response, deserialization_callback)
+
+    def _step(self):
+        # type: () -> Optional[float]
+        """Polls the operation once.
+
+        :return: The delay before the next poll, or None if the operation is complete.
+        """
+        try:
+            response = self._polling_method.update_status()  # type: ignore
+            if not self._polling_method.finished():
+                return self._manager.next_polling_delay(response)
+        except Exception as err: #pylint: disable=broad-except
+            self._exception = err
+        self._complete()
+        return None
+
+    def _run(self):
+        # type: () -> None
+        """Runs the polling method to completion, for polling methods that can't be polled step by step."""
+        try:
+            self._polling_method.run()
+        except Exception as err: #pylint: disable=broad-except
+            self._exception = err
+        self._complete()
+
+    def _complete(self):
+        self._done.set()
+        self._manager._notify_completed()  # pylint: disable=protected-access
+        callbacks, self._callbacks = self._callbacks, []
+        while callbacks:
+            for call in callbacks:
+                call(self._polling_method)
+            callbacks, self._callbacks = self._callbacks, []
+
+    def status(self):
+        # type: () -> str
+        """Returns the current status string.
+
+        :returns: The current status string
+        :rtype: str
+        """
+        return self._polling_method.status()
+
+    def result(self, timeout=None):
+        # type: (Optional[int]) -> Model
+        """Return the result of the long running operation, or
+        the result available after the specified timeout.
+
+        :returns: The deserialized resource of the long running operation,
+         if one is available.
+        :raises CloudError: Server problem with the query.
+        """
+        self.wait(timeout)
+        return self._polling_method.resource()
+
+    def wait(self, timeout=None):
+        # type: (Optional[int]) -> None
+        """Wait on the long running operation for a specified length
+        of time. You can check if this call as ended with timeout with the
+        "done()" method.
+
+        :param int timeout: Period of time to wait for the long running
+         operation to complete (in seconds).
+        :raises CloudError: Server problem with the query.
+        """
+        self._done.wait(timeout)
+        if self._exception is not None:
+            raise self._exception
+
+    def done(self):
+        # type: () -> bool
+        """Check status of the long running operation.
+
+        :returns: 'True' if the process has completed, else 'False'.
+        """
+        return self._done.is_set()
+
+    def add_done_callback(self, func):
+        # type: (Callable) -> None
+        """Add callback function to be run once the long running operation
+        has completed - regardless of the status of the operation.
+
+        :param callable func: Callback function that takes at least one
+         argument, a completed LongRunningOperation.
+        """
+        if self._done.is_set():
+            func(self._polling_method)
+        self._callbacks.append(func)
+
+    def remove_done_callback(self, func):
+        # type: (Callable) -> None
+        """Remove a callback from the long running operation.
+
+        :param callable func: The function to be removed from the callbacks.
+        :raises: ValueError if the long running operation has already
+         completed.
+        """
+        if self._done.is_set():
+            raise ValueError("Process is complete.")
+        self._callbacks = [c for c in self._callbacks if c != func]
+
+
+class LROPollerManager(object):
+    """Drives many long running operations with a small pool of threads.
+
+    :class:`LROPoller` dedicates a thread to each operation. This manager instead keeps one
+    timer per operation in a single scheduler thread and runs the status requests on a
+    fixed number of worker threads. Timers due within `timer_resolution` seconds of each other
+    fire together, so that hundreds of operations started at once are polled in batches.
+
+    Polling methods exposing an ``update_status()`` method are polled step by step: the manager
+    calls ``update_status()`` then ``finished()``. ``update_status()`` may return the response of
+    the status request, whose Retry-After header then sets the delay before the next poll.
+    Other polling methods block in ``run()`` until the operation completes: each of them is run
+    on a thread of its own, as :class:`LROPoller` does, so that they don't hold the workers.
+
+    :param int max_workers: The number of threads running status requests. Default value is 4.
+    :param float polling_interval: The delay, in seconds, between two polls of an operation when
+     the service doesn't return a Retry-After header. Default value is 30.
+    :param float timer_resolution: Timers due within this many seconds are fired together.
+     Default value is 0.5.
+    """
+
+    def __init__(self, max_workers=4, polling_interval=30, timer_resolution=0.5):
+        # type: (int, float, float) -> None
+        self.max_workers = max_workers
+        self.polling_interval = polling_interval
+        self.timer_resolution = timer_resolution
+        # Weak references, so that the operations completed and dropped by the caller are released
+        self._pollers = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary
+        self._timers = []  # type: List[Tuple[float, int, ManagedLROPoller]]
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._work = queue.Queue()  # type: queue.Queue
+        self._threads = []  # type: List[threading.Thread]
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_details):
+        self.close()
+
+    def next_polling_delay(self, response):
+        # type: (Any) -> float
+        """Returns the delay before the next poll of an operation.
+
+        :param response: The response of the last status request, if any.
+        :rtype: float
+        """
+        retry_after = get_retry_after(response)
+        return self.polling_interval if retry_after is None else retry_after
+
+    def add(self, client, initial_response, deserialization_callback, polling_method):
+        # type: (Any, Any, DeserializationCallbackType, PollingMethod) -> ManagedLROPoller
+        """Starts polling a long running operation.
+
+        Takes the same parameters as :class:`LROPoller`.
+
+        :rtype: ~azure.core.polling.ManagedLROPoller
+        """
+        if self._closed:
+            raise ValueError("The poller manager is closed.")
+        poller = ManagedLROPoller(self, client, initial_response, deserialization_callback, polling_method)
+        with self._condition:
+            self._pollers[next(self._counter)] = poller
+        if polling_method.finished():
+            poller._complete()  # pylint: disable=protected-access
+        elif hasattr(polling_method, 'update_status'):
+            self._start_threads()
+            self._schedule(poller, self.next_polling_delay(initial_response))
+        else:
+            run = poller._run  # pylint: disable=protected-access
+            thread = threading.Thread(target=run, name="LROPollerManager-run")
+            thread.daemon = True
+            thread.start()
+        return poller
+
+    def wait_all(self, pollers=None, timeout=None):
+        # type: (Optional[List[ManagedLROPoller]], Optional[float]) -> Tuple[List[ManagedLROPoller], List[ManagedLROPoller]]
+        """Waits for all the operations to complete.
+
+        :param list pollers: The pollers to wait for. Default is all the pollers of this manager
+         that are pending, or still referenced.
+        :param float timeout: The maximum time to wait, in seconds.
+        :return: The completed and the pending pollers.
+        :rtype: tuple(list, list)
+        """
+        return self._wait(pollers, timeout, all)
+
+    def wait_any(self, pollers=None, timeout=None):
+        # type: (Optional[List[ManagedLROPoller]], Optional[float]) -> Tuple[List[ManagedLROPoller], List[ManagedLROPoller]]
+        """Waits for at least one of the operations to complete.
+
+        :param list pollers: The pollers to wait for. Default is all the pollers of this manager
+         that are pending, or still referenced.
+        :param float timeout: The maximum time to wait, in seconds.
+        :return: The completed and the pending pollers.
+        :rtype: tuple(list, list)
+        """
+        return self._wait(pollers, timeout, any)
+
+    def close(self):
+        # type: () -> None
+        """Stops the threads of the manager. Operations not completed yet are not polled anymore,
+        except the ones run with ``run()``, which can't be interrupted.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        for _ in range(self.max_workers):
+            self._work.put(None)
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def _wait(self, pollers, timeout, predicate):
+        if pollers is None:
+            with self._condition:
+                pollers = [poller for _, poller in sorted(self._pollers.items())]
+        pollers = list(pollers)
+        end_time = None if timeout is None else time.time() + timeout
+        with self._condition:
+            while not predicate(p.done() for p in pollers):
+                remaining = None if end_time is None else end_time - time.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+        done = [p for p in pollers if p.done()]
+        return done, [p for p in pollers if not p.done()]
+
+    def _notify_completed(self):
+        with self._condition:
+            self._condition.notify_all()
+
+    def _start_threads(self):
+        with self._condition:
+            if self._threads:
+                return
+            self._threads.append(threading.Thread(target=self._run_timers, name="LROPollerManager-timers"))
+            for index in range(self.max_workers):
+                self._threads.append(threading.Thread(
+                    target=self._run_worker, name="LROPollerManager-worker-{}".format(index)))
+            for thread in self._threads:
+                thread.daemon = True
+                thread.start()
+
+    def _schedule(self, poller, delay):
+        with self._condition:
+            heapq.heappush(self._timers, (time.time() + delay, next(self._counter), poller))
+            self._condition.notify_all()
+
+    def _run_timers(self):
+        with self._condition:
+            while not self._closed:
+                if not self._timers:
+                    self._condition.wait()
+                    continue
+                now = time.time()
+                if self._timers[0][0] > now:
+                    self._condition.wait(self._timers[0][0] - now)
+                    continue
+                limit = now + self.timer_resolution
+                while self._timers and self._timers[0][0] <= limit:
+                    self._work.put(heapq.heappop(self._timers)[2])
+
+    def _run_worker(self):
+        while True:
+            poller = self._work.get()
+            if poller is None:
+                return
+            delay = poller._step()  # pylint: disable=protected-access
+            if delay is not None and not self._closed:
+                self._schedule(poller, delay)
+            # Don't keep the last operation alive while waiting for the next one
+            poller = None
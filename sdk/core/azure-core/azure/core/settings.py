@@ -40,7 +40,7 @@ except ImportError:
     TYPE_CHECKING = False
 
 if TYPE_CHECKING:
-    from typing import Any, Union
+    from typing import Any, Optional, Union
 
 
 from azure.core.tracing import AbstractSpan
@@ -171,6 +171,24 @@ def convert_tracing_impl(value):
     return wrapper_class
 
 
+def convert_sampling_rate(value):
+    # type: (Union[str, float]) -> float
+    """Convert a string to a sampling rate
+
+    The rate is the fraction of operations traced, between 0 and 1.
+
+    :param value: the value to convert
+    :type value: string
+    :returns: float
+    :raises ValueError: If conversion to a rate between 0 and 1 fails
+
+    """
+    rate = float(value)
+    if not 0 <= rate <= 1:
+        raise ValueError("Cannot convert {} to sampling rate, it should be between 0 and 1".format(value))
+    return rate
+
+
 class PrioritizedSetting(object):
     """Return a value for a global setting according to configuration precedence.
 
@@ -265,11 +283,18 @@ class PrioritizedSetting(object):
 
         """
         self._user_value = value
+        Settings.invalidate_snapshot()
 
     def unset_value(self):
         # () -> None
         """Unset the previous user value such that the priority is reset."""
         self._user_value = _Unset
+        Settings.invalidate_snapshot()
+
+    def is_implicit(self):
+        # () -> bool
+        """Whether the value comes from the system setting or the implicit default."""
+        return self._user_value is _Unset and not (self._env_var and self._env_var in os.environ)
 
     @property
     def env_var(self):
@@ -280,6 +305,34 @@ class PrioritizedSetting(object):
         return self._default
 
 
+class TracingSnapshot(object):
+    """An immutable view of the tracing settings, as returned by :meth:`Settings.tracing_snapshot`.
+
+    :ivar should_only_propagate: the value of ``settings.tracing_should_only_propagate``
+    :ivar sampling_rate: the value of ``settings.tracing_sampling_rate``
+    """
+
+    __slots__ = ("_implementation", "_implicit", "should_only_propagate", "sampling_rate")
+
+    def __init__(self, current_settings):
+        # type: (Settings) -> None
+        self._implicit = current_settings.tracing_implementation.is_implicit()
+        self._implementation = None if self._implicit else current_settings.tracing_implementation()
+        self.should_only_propagate = current_settings.tracing_should_only_propagate()
+        self.sampling_rate = current_settings.tracing_sampling_rate()
+
+    @property
+    def implementation(self):
+        # type: () -> Optional[AbstractSpan]
+        """The value of ``settings.tracing_implementation``.
+
+        When no implementation is configured, opencensus is still used as soon as it is imported.
+        """
+        if self._implicit:
+            return get_opencensus_span_if_opencensus_is_imported()
+        return self._implementation
+
+
 class Settings(object):
     """Settings for globally used Azure configuration values.
 
@@ -340,6 +393,8 @@ class Settings(object):
     :type log_level: PrioritizedSetting
     :cvar tracing_enabled: Whether tracing shoudl be enabled across Azure SDKs (AZURE_TRACING_ENABLED)
     :type tracing_enabled: PrioritizedSetting
+    :cvar tracing_sampling_rate: The fraction of operations traced when a tracer is set (AZURE_TRACING_SAMPLING_RATE)
+    :type tracing_sampling_rate: PrioritizedSetting
 
     :Example:
 
@@ -354,9 +409,32 @@ class Settings(object):
 
     """
 
+    _tracing_snapshot = None  # type: Optional[TracingSnapshot]
+
     def __init__(self):
         self._defaults_only = False
 
+    def tracing_snapshot(self):
+        # type: () -> TracingSnapshot
+        """ Return the tracing settings, computed once and cached until a setting value is changed.
+
+        Environment variables are read when the snapshot is computed. Call :meth:`invalidate_snapshot`
+        if they are changed at runtime.
+
+        """
+        snapshot = Settings._tracing_snapshot
+        if snapshot is None:
+            snapshot = Settings._tracing_snapshot = TracingSnapshot(self)
+        return snapshot
+
+    @staticmethod
+    def invalidate_snapshot():
+        # type: () -> None
+        """ Discard the cached tracing snapshot, so that the next one reads the settings again.
+
+        """
+        Settings._tracing_snapshot = None
+
     @property
     def defaults_only(self):
         return self._defaults_only
@@ -414,5 +492,9 @@ class Settings(object):
         "tracing_should_only_propagate", env_var="AZURE_TRACING_ONLY_PROPAGATE", convert=convert_bool, default=False
     )
 
+    tracing_sampling_rate = PrioritizedSetting(
+        "tracing_sampling_rate", env_var="AZURE_TRACING_SAMPLING_RATE", convert=convert_sampling_rate, default=1.0
+    )
+
 
 settings = Settings()
@@ -25,6 +25,8 @@
 # --------------------------------------------------------------------------
 """Common functions shared by both the sync and the async decorators."""
 
+import random
+
 from azure.core.tracing.context import tracing_context
 from azure.core.tracing.abstract_span import AbstractSpan
 from azure.core.settings import settings
@@ -50,7 +52,7 @@ def set_span_contexts(wrapped_span, span_instance=None):
     :param span_instance: The span to set as the current span for the implementation context
     """
     tracing_context.current_span.set(wrapped_span)
-    impl_wrapper = settings.tracing_implementation()
+    impl_wrapper = settings.tracing_snapshot().implementation
     if wrapped_span is not None:
         span_instance = wrapped_span.span_instance
     if impl_wrapper is not None:
@@ -67,7 +69,7 @@ def get_parent_span(parent_span):
     :returns: the parent_span of the function to be traced
     :rtype: `azure.core.tracing.abstract_span.AbstractSpan`
     """
-    wrapper_class = settings.tracing_implementation()
+    wrapper_class = settings.tracing_snapshot().implementation
     if wrapper_class is None:
         return None
 
@@ -88,5 +90,11 @@ def get_parent_span(parent_span):
 def should_use_trace(parent_span):
     # type: (AbstractSpan) -> bool
     """Given Parent Span Returns whether the function should be traced"""
-    only_propagate = settings.tracing_should_only_propagate()
+    only_propagate = settings.tracing_snapshot().should_only_propagate
     return bool(parent_span and not only_propagate)
+
+
+def should_sample(sampling_rate):
+    # type: (float) -> bool
+    """Returns whether a new trace should be started, given the fraction of operations to trace"""
+    return sampling_rate >= 1 or random.random() < sampling_rate
@@ -122,6 +122,8 @@ class TracingContext:
     def __init__(self):
         # type: () -> None
         self.current_span = TracingContext._get_context_class("current_span", None)
+        # Set while running an operation whose trace was not sampled
+        self.sampled_out = TracingContext._get_context_class("sampled_out", False)
 
     def with_current_context(self, func):
         # type: (Callable[[Any], Any]) -> Any
@@ -131,7 +133,7 @@ class TracingContext:
         :return: The target the pass in instead of the function
         """
         wrapped_span = tracing_context.current_span.get()
-        wrapper_class = settings.tracing_implementation()
+        wrapper_class = settings.tracing_snapshot().implementation
         if wrapper_class is not None:
             current_impl_span = wrapper_class.get_current_span()
             current_impl_tracer = wrapper_class.get_current_tracer()
@@ -38,11 +38,19 @@ def distributed_trace(func):
     def wrapper_use_tracer(self, *args, **kwargs):
         # type: (Any) -> Any
         passed_in_parent = kwargs.pop("parent_span", None)
+        tracing = settings.tracing_snapshot()
+        wrapper_class = tracing.implementation
+        if wrapper_class is None or tracing_context.sampled_out.get():
+            return func(self, *args, **kwargs)
         orig_wrapped_span = tracing_context.current_span.get()
-        wrapper_class = settings.tracing_implementation()
-        original_span_instance = None
-        if wrapper_class is not None:
-            original_span_instance = wrapper_class.get_current_span()
+        original_span_instance = wrapper_class.get_current_span()
+        if orig_wrapped_span is None and passed_in_parent is None and original_span_instance is None \
+                and not common.should_sample(tracing.sampling_rate):
+            tracing_context.sampled_out.set(True)
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                tracing_context.sampled_out.set(False)
         parent_span = common.get_parent_span(passed_in_parent)
         ans = None
         if common.should_use_trace(parent_span):
@@ -89,6 +89,23 @@ async def test_example_aiohttp():
     assert response.http_response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_example_h2_asyncio():
+
+    request = HttpRequest("GET", "https://bing.com")
+    policies = [
+        UserAgentPolicy("myuseragent"),
+        AsyncRedirectPolicy()
+    ]
+    # [START h2_asyncio]
+    from azure.core.pipeline.transport import AsyncioH2Transport
+
+    async with AsyncPipeline(AsyncioH2Transport(), policies=policies) as pipeline:
+        response = await pipeline.run(request)
+    # [END h2_asyncio]
+    assert response.http_response.status_code == 200
+
+
 @pytest.mark.asyncio
 async def test_example_async_pipeline():
     # [START build_async_pipeline]
@@ -0,0 +1,223 @@
+#--------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#--------------------------------------------------------------------------
+import asyncio
+import ssl
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import pytest
+
+from azure.core.exceptions import ServiceRequestError
+from azure.core.pipeline import AsyncPipeline
+from azure.core.pipeline.policies import UserAgentPolicy
+from azure.core.pipeline.transport import AsyncioH2Transport, HttpRequest
+from azure.core.pipeline.transport import h2_asyncio
+
+
+class H2TestServer(object):
+    """Local cleartext HTTP/2 server ("prior knowledge"), so the transport can be tested offline.
+
+    - GET /hello returns a small body
+    - GET /slow waits a little before answering, to observe multiplexing
+    - GET /large?size=N returns N bytes, larger than the flow control window
+    - POST /echo returns the request body
+    """
+    def __init__(self):
+        self.port = None
+        self.connections = 0
+        self.active_streams = 0
+        self.max_active_streams = 0
+        self._server = None
+        self._handlers = []
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle_connection, '127.0.0.1', 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *args):
+        self._server.close()
+        if self._handlers:
+            await asyncio.wait(self._handlers, timeout=1)
+        await self._server.wait_closed()
+
+    def url(self, path):
+        return 'http://127.0.0.1:{}{}'.format(self.port, path)
+
+    async def _handle_connection(self, reader, writer):
+        self.connections += 1
+        self._handlers.append(asyncio.ensure_future(self._serve(reader, writer)))
+
+    async def _serve(self, reader, writer):
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        requests = {}
+        tasks = []
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        requests[event.stream_id] = (dict(event.headers), bytearray())
+                    elif isinstance(event, h2.events.DataReceived):
+                        requests[event.stream_id][1].extend(event.data)
+                        conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        headers, body = requests.pop(event.stream_id)
+                        tasks.append(asyncio.ensure_future(
+                            self._respond(conn, writer, event.stream_id, headers, bytes(body))))
+                writer.write(conn.data_to_send())
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _respond(self, conn, writer, stream_id, headers, body):
+        path = headers[b':path'].decode()
+        self.active_streams += 1
+        self.max_active_streams = max(self.max_active_streams, self.active_streams)
+        try:
+            if path.startswith('/slow'):
+                await asyncio.sleep(0.2)
+                body = b'slow'
+            elif path.startswith('/large'):
+                body = b'a' * int(path.split('size=')[1])
+            elif path.startswith('/hello'):
+                body = b'Hello, world!'
+            conn.send_headers(stream_id, [
+                (':status', '200'),
+                ('content-length', str(len(body))),
+                ('content-type', 'text/plain'),
+            ])
+            view = memoryview(body)
+            while view:
+                window = conn.local_flow_control_window(stream_id)
+                if window <= 0:
+                    writer.write(conn.data_to_send())
+                    await asyncio.sleep(0.005)
+                    continue
+                size = min(window, len(view), conn.max_outbound_frame_size)
+                conn.send_data(stream_id, view[:size].tobytes())
+                view = view[size:]
+            conn.end_stream(stream_id)
+            writer.write(conn.data_to_send())
+        except h2.exceptions.StreamClosedError:
+            pass
+        finally:
+            self.active_streams -= 1
+
+
+@pytest.mark.asyncio
+async def test_h2_basic():
+    async with H2TestServer() as server:
+        request = HttpRequest("GET", server.url("/hello"))
+        async with AsyncPipeline(AsyncioH2Transport(), policies=[UserAgentPolicy("myuseragent")]) as pipeline:
+            response = await pipeline.run(request)
+
+    assert response.http_response.status_code == 200
+    assert response.http_response.reason == 'OK'
+    assert response.http_response.headers['Content-Type'] == 'text/plain'
+    assert response.http_response.body() == b'Hello, world!'
+    assert response.http_response.text() == 'Hello, world!'
+
+
+@pytest.mark.asyncio
+async def test_h2_multiplexing():
+    async with H2TestServer() as server:
+        async with AsyncioH2Transport(max_connections_per_host=1) as transport:
+            start = time.time()
+            responses = await asyncio.gather(*[
+                transport.send(HttpRequest("GET", server.url("/slow"))) for _ in range(50)
+            ])
+            elapsed = time.time() - start
+
+    assert all(r.status_code == 200 and r.body() == b'slow' for r in responses)
+    assert server.connections == 1
+    assert server.max_active_streams > 1
+    assert elapsed < 50 * 0.2 / 2
+
+
+@pytest.mark.asyncio
+async def test_h2_upload_larger_than_window():
+    data = b'0123456789' * 100000
+    async with H2TestServer() as server:
+        async with AsyncioH2Transport() as transport:
+            response = await transport.send(HttpRequest("POST", server.url("/echo"), data=data))
+
+    assert response.status_code == 200
+    assert response.body() == data
+
+
+@pytest.mark.asyncio
+async def test_h2_stream_download():
+    size = 1024 * 1024
+    async with H2TestServer() as server:
+        async with AsyncPipeline(AsyncioH2Transport()) as pipeline:
+            response = await pipeline.run(HttpRequest("GET", server.url("/large?size={}".format(size))), stream=True)
+            stream = response.http_response.stream_download(pipeline)
+            received = 0
+            async for chunk in stream:
+                received += len(chunk)
+
+    assert len(stream) == size
+    assert received == size
+    assert stream.downloaded == size
+
+
+@pytest.mark.asyncio
+async def test_h2_connection_error():
+    async with H2TestServer() as server:
+        url = server.url("/hello")
+    async with AsyncioH2Transport() as transport:
+        with pytest.raises(ServiceRequestError):
+            await transport.send(HttpRequest("GET", url))
+
+
+@pytest.mark.asyncio
+async def test_h2_connection_settings_per_request(monkeypatch):
+    connects = []
+
+    async def connect(host, port, ssl_context, timeout):
+        connects.append((ssl_context, timeout))
+        raise ServiceRequestError("Connection refused")
+
+    monkeypatch.setattr(h2_asyncio._H2Connection, 'connect', connect)
+    async with AsyncioH2Transport(connection_timeout=100) as transport:
+        for settings in [{}, {'connection_timeout': 5}, {'connection_verify': False}]:
+            with pytest.raises(ServiceRequestError):
+                await transport.send(HttpRequest("GET", "https://localhost/"), **settings)
+        # Connections with other TLS settings are kept apart
+        assert len(transport._connect_locks) == 2
+
+    assert [timeout for _, timeout in connects] == [100, 5, 100]
+    assert connects[0][0].verify_mode == ssl.CERT_REQUIRED
+    assert connects[2][0].verify_mode == ssl.CERT_NONE
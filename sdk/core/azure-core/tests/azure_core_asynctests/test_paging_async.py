@@ -0,0 +1,170 @@
+#--------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved. 
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#--------------------------------------------------------------------------
+import asyncio
+import json
+
+import pytest
+
+from azure.core.paging import Paged
+
+from msrest.serialization import Deserializer
+
+
+class FakePaged(Paged):
+    _attribute_map = {
+        'next_link': {'key': 'nextLink', 'type': 'str'},
+        'current_page': {'key': 'value', 'type': '[str]'}
+    }
+
+
+_test_deserializer = Deserializer({})
+
+_PAGES = {
+    '': {'nextLink': 'page2', 'value': ['value1.0', 'value1.1']},
+    'page2': {'nextLink': 'page3', 'value': ['value2.0', 'value2.1']},
+    'page3': {'nextLink': None, 'value': ['value3.0']},
+}
+
+
+def _sync_paging(next_link=None, raw=False):
+    raise AssertionError("Sync paging should not be used")
+
+
+@pytest.mark.asyncio
+async def test_async_paging():
+    async def internal_paging(next_link=None, raw=False):
+        return _PAGES[next_link]
+
+    deserialized = FakePaged(_sync_paging, _test_deserializer, async_command=internal_paging)
+    result_iterated = [item async for item in deserialized]
+    assert result_iterated == ['value1.0', 'value1.1', 'value2.0', 'value2.1', 'value3.0']
+
+
+@pytest.mark.asyncio
+async def test_async_prefetch_paging():
+    page2_fetched = asyncio.Event()
+
+    async def internal_paging(next_link=None, raw=False):
+        if next_link == 'page2':
+            page2_fetched.set()
+        return _PAGES[next_link]
+
+    deserialized = FakePaged(_sync_paging, _test_deserializer, async_command=internal_paging, prefetch=1)
+    assert await deserialized.__anext__() == 'value1.0'
+    # Page 2 is requested while page 1 is still being consumed
+    await asyncio.wait_for(page2_fetched.wait(), 5)
+    assert deserialized.current_page == ['value1.0', 'value1.1']
+
+    result_iterated = [item async for item in deserialized]
+    assert result_iterated == ['value1.1', 'value2.0', 'value2.1', 'value3.0']
+
+
+@pytest.mark.asyncio
+async def test_async_prefetch_paging_error_retried():
+    fetched = []
+
+    async def internal_paging(next_link=None, raw=False):
+        fetched.append(next_link)
+        if next_link == 'page2' and fetched.count('page2') == 1:
+            raise ValueError("Broken")
+        return _PAGES[next_link]
+
+    deserialized = FakePaged(_sync_paging, _test_deserializer, async_command=internal_paging, prefetch=2)
+    assert await deserialized.__anext__() == 'value1.0'
+    assert await deserialized.__anext__() == 'value1.1'
+    with pytest.raises(ValueError):
+        await deserialized.__anext__()
+    # The failed page is requested again
+    result_iterated = [item async for item in deserialized]
+    assert result_iterated == ['value2.0', 'value2.1', 'value3.0']
+    assert fetched == ['', 'page2', 'page2', 'page3']
+
+
+@pytest.mark.asyncio
+async def test_async_prefetch_paging_close():
+    async def internal_paging(next_link=None, raw=False):
+        return {'nextLink': next_link + 'x', 'value': ['value']}
+
+    deserialized = FakePaged(_sync_paging, _test_deserializer, async_command=internal_paging, prefetch=2)
+    assert await deserialized.__anext__() == 'value'
+    task = deserialized._async_prefetcher._task
+    deserialized.close()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_async_streamed_paging():
+    class StreamedResponse(object):
+        def __init__(self, body):
+            self._body = json.dumps(body).encode('utf-8')
+
+        async def _chunks(self):
+            for i in range(0, len(self._body), 5):
+                yield self._body[i:i + 5]
+
+        def stream_download(self, pipeline):
+            return self._chunks()
+
+    async def internal_paging(next_link=None, raw=False):
+        return StreamedResponse(_PAGES[next_link])
+
+    deserialized = FakePaged(_sync_paging, _test_deserializer, async_command=internal_paging).streamed()
+    result_iterated = [item async for item in deserialized]
+    assert result_iterated == ['value1.0', 'value1.1', 'value2.0', 'value2.1', 'value3.0']
+
+
+@pytest.mark.asyncio
+async def test_async_streamed_xml_paging():
+    class XmlPaged(FakePaged):
+        _attribute_map = {
+            'next_link': {'key': 'NextMarker', 'type': 'str'},
+            'current_page': {'key': 'Items', 'type': '[str]', 'xml': {'name': 'Items', 'wrapped': True, 'itemsName': 'Item'}}
+        }
+
+    class StreamedResponse(object):
+        content_type = 'application/xml; charset=utf-8'
+
+        def __init__(self, body):
+            self._body = body
+
+        async def _chunks(self):
+            for i in range(0, len(self._body), 5):
+                yield self._body[i:i + 5]
+
+        def stream_download(self, pipeline):
+            return self._chunks()
+
+    pages = {
+        '': b'<List><Items><Item>a</Item><Item>b</Item></Items><NextMarker>m</NextMarker></List>',
+        'm': b'<List><Items><Item>c</Item></Items><NextMarker /></List>',
+    }
+
+    async def internal_paging(next_link=None, raw=False):
+        return StreamedResponse(pages[next_link])
+
+    deserialized = XmlPaged(_sync_paging, _test_deserializer, async_command=internal_paging).streamed().raw()
+    assert [item.text async for item in deserialized] == ['a', 'b', 'c']
@@ -144,4 +144,84 @@ def test_conf_async_trio_requests():
             return await pipeline.run(request)
 
     response = trio.run(do)
-    assert response.http_response.status_code == 200
\ No newline at end of file
+    assert response.http_response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_async_streamed_items():
+    from azure.core.pipeline.policies import ContentDecodePolicy
+    from azure.core.pipeline.transport import AsyncHttpResponse
+
+    class MockResponse(AsyncHttpResponse):
+        def __init__(self, request, body):
+            super(MockResponse, self).__init__(request, None)
+            self._body = body
+            self.status_code = 200
+            self.content_type = "application/json"
+
+        async def _chunks(self):
+            for i in range(0, len(self._body), 3):
+                yield self._body[i:i + 3]
+
+        def stream_download(self, pipeline):
+            return self._chunks()
+
+    class MockTransport(AsyncHttpTransport):
+        async def __aexit__(self, *args):
+            pass
+
+        async def open(self):
+            pass
+
+        async def close(self):
+            pass
+
+        async def send(self, request, **kwargs):
+            assert kwargs["stream"] is True
+            return MockResponse(request, b'{"value": [{"a": 1}, 2, "x"], "nextLink": "page2"}')
+
+    pipeline = AsyncPipeline(MockTransport(), [ContentDecodePolicy()])
+    response = await pipeline.run(HttpRequest("GET", "/"), stream_items="value")
+    items = response.context["deserialized_data"]
+    assert [item async for item in items] == [{"a": 1}, 2, "x"]
+    assert items.document == {"nextLink": "page2"}
+
+
+@pytest.mark.asyncio
+async def test_async_retry_probe_exhausts_retries():
+    from azure.core.pipeline.policies import AsyncRetryPolicy, RetryBudget, CircuitState
+    from azure.core.pipeline.transport import AsyncHttpResponse
+
+    class MockResponse(AsyncHttpResponse):
+        def __init__(self, request):
+            super(MockResponse, self).__init__(request, None)
+            self.status_code = 503
+            self.headers = {}
+
+    class MockTransport(AsyncHttpTransport):
+        requests = 0
+
+        async def __aexit__(self, *args):
+            pass
+
+        async def open(self):
+            pass
+
+        async def close(self):
+            pass
+
+        async def sleep(self, duration):
+            pass
+
+        async def send(self, request, **kwargs):
+            self.requests += 1
+            return MockResponse(request)
+
+    budget = RetryBudget(circuit_failure_threshold=1, circuit_recovery_time=0)
+    budget.record_failure("localhost")
+    transport = MockTransport()
+    policy = AsyncRetryPolicy(retry_total=1, retry_backoff_factor=0, retry_budget=budget)
+    response = await AsyncPipeline(transport, [policy]).run(HttpRequest("GET", "http://localhost/"))
+    assert response.http_response.status_code == 503
+    assert transport.requests == 2
+    # The failed probe reopened the circuit instead of leaving it half-open
+    assert budget.acquire("localhost")
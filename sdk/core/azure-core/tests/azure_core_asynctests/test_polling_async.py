@@ -0,0 +1,150 @@
+#--------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved. 
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+#--------------------------------------------------------------------------
+import asyncio
+import gc
+
+import pytest
+
+from azure.core.polling import AsyncLROPollerManager, AsyncNoPolling, AsyncPollingMethod
+
+
+class StatusResponse(object):
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class AsyncStepPolling(AsyncPollingMethod):
+    def __init__(self, steps, retry_after=None, error=None):
+        self._steps = steps
+        self._retry_after = retry_after
+        self._error = error
+        self.polls = 0
+
+    def initialize(self, _, initial_response, deserialization_callback):
+        self._initial_response = initial_response
+        self._deserialization_callback = deserialization_callback
+
+    async def update_status(self):
+        self.polls += 1
+        if self._error and self.polls == self._steps:
+            raise self._error
+        return StatusResponse({'Retry-After': self._retry_after} if self._retry_after else {})
+
+    def status(self):
+        return "succeeded" if self.finished() else "running"
+
+    def finished(self):
+        return self.polls >= self._steps
+
+    def resource(self):
+        return self._deserialization_callback(self._initial_response)
+
+
+class AsyncRunPolling(AsyncPollingMethod):
+    def initialize(self, _, initial_response, deserialization_callback):
+        self._initial_response = initial_response
+        self._finished = False
+
+    async def run(self):
+        await asyncio.sleep(0.01)
+        self._finished = True
+
+    def finished(self):
+        return self._finished
+
+    def resource(self):
+        return self._initial_response
+
+
+@pytest.mark.asyncio
+async def test_async_poller_manager():
+    def deserialization_callback(response):
+        return "Treated: "+response
+
+    async with AsyncLROPollerManager(polling_interval=0.01, timer_resolution=0.01, max_concurrent_polls=4) as manager:
+        methods = [AsyncStepPolling(steps=i % 5 + 1) for i in range(100)]
+        futures = [manager.add(None, "response {}".format(i), deserialization_callback, method)
+                   for i, method in enumerate(methods)]
+        done, pending = await manager.wait_all(timeout=10)
+        assert len(done) == 100
+        assert not pending
+        for i, future in enumerate(futures):
+            assert future.result() == "Treated: response {}".format(i)
+            assert methods[i].polls == i % 5 + 1
+
+
+@pytest.mark.asyncio
+async def test_async_poller_manager_wait_any_and_errors():
+    def deserialization_callback(response):
+        return response
+
+    manager = AsyncLROPollerManager(polling_interval=0.01, timer_resolution=0)
+    slow_method = AsyncStepPolling(steps=2, retry_after='60')
+    slow = manager.add(None, "slow", deserialization_callback, slow_method)
+    broken = manager.add(None, "broken", deserialization_callback,
+                         AsyncStepPolling(steps=2, error=ValueError("Something bad happened")))
+    legacy = manager.add(None, "legacy", deserialization_callback, AsyncRunPolling())
+    finished = manager.add(None, "finished", deserialization_callback, AsyncNoPolling())
+    assert finished.result() == "finished"
+
+    done, pending = await manager.wait_any([slow, broken], timeout=10)
+    assert done == {broken}
+    assert pending == {slow}
+    with pytest.raises(ValueError) as excinfo:
+        broken.result()
+    assert "Something bad happened" in str(excinfo.value)
+
+    assert await legacy == "legacy"
+
+    # Retry-After of 60 seconds is honoured
+    done, pending = await manager.wait_all([slow], timeout=0.2)
+    assert pending == {slow}
+    assert slow_method.polls == 1
+
+    await manager.close()
+    assert slow.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_async_poller_manager_releases_completed_futures():
+    def deserialization_callback(response):
+        return response
+
+    async with AsyncLROPollerManager(polling_interval=0.01, timer_resolution=0) as manager:
+        kept = manager.add(None, "kept", deserialization_callback, AsyncStepPolling(steps=2))
+        for i in range(10):
+            manager.add(None, "dropped {}".format(i), deserialization_callback, AsyncStepPolling(steps=2))
+
+        # The dropped operations are still polled to completion
+        done, pending = await manager.wait_all(timeout=10)
+        assert not pending
+        assert len(done) == 11
+
+        del done
+        gc.collect()
+        done, pending = await manager.wait_all(timeout=10)
+        assert done == {kept}
+        assert len(manager._futures) == 1
@@ -24,11 +24,13 @@
 #
 #--------------------------------------------------------------------------
 
+import json
+import threading
 import unittest
 
 from azure.core.paging import Paged
 
-from msrest.serialization import Deserializer
+from msrest.serialization import Deserializer, Model
 
 class FakePaged(Paged):
     _attribute_map = {
@@ -102,3 +104,221 @@ class TestPaging(unittest.TestCase):
         deserialized = FakePaged(internal_paging, _test_deserializer)
         result_iterated = list(deserialized)
         self.assertEqual(len(result_iterated), 0)
+
+    def test_prefetch_paging(self):
+        pages = {
+            '': {'nextLink': 'page2', 'value': ['value1.0', 'value1.1']},
+            'page2': {'nextLink': 'page3', 'value': ['value2.0', 'value2.1']},
+            'page3': {'nextLink': None, 'value': ['value3.0']},
+        }
+        fetched = []
+        page2_fetched = threading.Event()
+
+        def internal_paging(next_link=None, raw=False):
+            fetched.append(next_link)
+            if next_link == 'page2':
+                page2_fetched.set()
+            return pages[next_link]
+
+        deserialized = FakePaged(internal_paging, _test_deserializer, prefetch=1)
+        assert next(deserialized) == 'value1.0'
+        # Page 2 is requested while page 1 is still being consumed
+        assert page2_fetched.wait(5)
+        assert deserialized.current_page == ['value1.0', 'value1.1']
+        assert deserialized.next_link == 'page2'
+
+        result_iterated = list(deserialized)
+        self.assertListEqual(['value1.1', 'value2.0', 'value2.1', 'value3.0'], result_iterated)
+        self.assertListEqual(['', 'page2', 'page3'], fetched)
+
+    def test_prefetch_paging_error(self):
+        def internal_paging(next_link=None, raw=False):
+            if next_link:
+                raise ValueError("Broken")
+            return {'nextLink': 'page2', 'value': ['value1.0']}
+
+        deserialized = FakePaged(internal_paging, _test_deserializer, prefetch=2)
+        assert next(deserialized) == 'value1.0'
+        with self.assertRaises(ValueError):
+            next(deserialized)
+
+    def test_prefetch_paging_error_retried(self):
+        fetched = []
+
+        def internal_paging(next_link=None, raw=False):
+            fetched.append(next_link)
+            if next_link == 'page2' and fetched.count('page2') == 1:
+                raise ValueError("Broken")
+            return {'nextLink': 'page2' if not next_link else None, 'value': ['value' + (next_link or '1')]}
+
+        deserialized = FakePaged(internal_paging, _test_deserializer, prefetch=2)
+        assert next(deserialized) == 'value1'
+        with self.assertRaises(ValueError):
+            next(deserialized)
+        # The failed page is requested again
+        assert next(deserialized) == 'valuepage2'
+        with self.assertRaises(StopIteration):
+            next(deserialized)
+        self.assertListEqual(['', 'page2', 'page2'], fetched)
+
+    def test_prefetch_paging_close(self):
+        fetched = []
+
+        def internal_paging(next_link=None, raw=False):
+            fetched.append(next_link)
+            return {'nextLink': 'page{}'.format(len(fetched) + 1), 'value': ['value']}
+
+        deserialized = FakePaged(internal_paging, _test_deserializer, prefetch=2)
+        assert next(deserialized) == 'value'
+        prefetcher = deserialized._prefetcher
+        deserialized.close()
+        prefetcher._worker.join(5)
+        assert not prefetcher._worker.is_alive()
+        # Bounded: the current page, the pages buffered and at most one page being fetched
+        assert len(fetched) <= 1 + 2 + 1
+
+    def test_by_page(self):
+        def internal_paging(next_link=None, raw=False):
+            if not next_link:
+                return {'nextLink': 'page2', 'value': ['value1.0', 'value1.1', 'value1.2']}
+            return {'nextLink': None, 'value': ['value2.0']}
+
+        deserialized = FakePaged(internal_paging, _test_deserializer)
+        self.assertListEqual(
+            [['value1.0', 'value1.1', 'value1.2'], ['value2.0']],
+            list(deserialized.by_page())
+        )
+
+        deserialized = FakePaged(internal_paging, _test_deserializer)
+        assert next(deserialized) == 'value1.0'
+        self.assertListEqual([['value1.1', 'value1.2'], ['value2.0']], list(deserialized.by_page()))
+
+    def test_raw_paging(self):
+        class Resource(Model):
+            _attribute_map = {
+                'name': {'key': 'name', 'type': 'str'},
+                'state': {'key': 'properties.provisioningState', 'type': 'str'},
+            }
+
+        class ResourcePaged(Paged):
+            _attribute_map = {
+                'next_link': {'key': 'nextLink', 'type': 'str'},
+                'current_page': {'key': 'value', 'type': '[Resource]'}
+            }
+
+        def internal_paging(next_link=None, raw=False):
+            if not next_link:
+                return {'nextLink': 'page2', 'value': [
+                    {'name': 'a', 'properties': {'provisioningState': 'Succeeded', 'size': 1}},
+                ]}
+            return {'nextLink': None, 'value': [
+                {'name': 'b', 'properties': {'provisioningState': 'Failed', 'size': 2}},
+            ]}
+
+        deserializer = Deserializer({'Resource': Resource})
+        models = list(ResourcePaged(internal_paging, deserializer))
+        assert [m.state for m in models] == ['Succeeded', 'Failed']
+
+        raw_items = list(ResourcePaged(internal_paging, deserializer).raw())
+        assert raw_items[1] == {'name': 'b', 'properties': {'provisioningState': 'Failed', 'size': 2}}
+
+        pages = list(ResourcePaged(internal_paging, deserializer).raw(
+            fields=['name', 'properties.provisioningState']).by_page())
+        self.assertListEqual([
+            [{'name': 'a', 'properties.provisioningState': 'Succeeded'}],
+            [{'name': 'b', 'properties.provisioningState': 'Failed'}],
+        ], pages)
+
+        paged = ResourcePaged(internal_paging, deserializer, prefetch=1).raw(fields=['name'])
+        assert list(paged) == [{'name': 'a'}, {'name': 'b'}]
+
+        paged = ResourcePaged(internal_paging, deserializer)
+        next(paged)
+        with self.assertRaises(ValueError):
+            paged.raw()
+
+    def test_streamed_paging(self):
+        class Resource(Model):
+            _attribute_map = {
+                'name': {'key': 'name', 'type': 'str'},
+                'state': {'key': 'properties.provisioningState', 'type': 'str'},
+            }
+
+        class ResourcePaged(Paged):
+            _attribute_map = {
+                'next_link': {'key': 'nextLink', 'type': 'str'},
+                'current_page': {'key': 'value', 'type': '[Resource]'}
+            }
+
+        class StreamedResponse(object):
+            content_type = 'application/json'
+
+            def __init__(self, body):
+                self._body = json.dumps(body).encode('utf-8')
+
+            def stream_download(self, pipeline):
+                return (self._body[i:i + 7] for i in range(0, len(self._body), 7))
+
+        def internal_paging(next_link=None, raw=False):
+            if not next_link:
+                return StreamedResponse({'value': [
+                    {'name': 'a', 'properties': {'provisioningState': 'Succeeded'}},
+                    {'name': 'b', 'properties': {'provisioningState': 'Failed'}},
+                ], 'nextLink': 'page2'})
+            return StreamedResponse({'nextLink': None, 'value': [{'name': 'c', 'properties': {}}]})
+
+        deserializer = Deserializer({'Resource': Resource})
+        models = list(ResourcePaged(internal_paging, deserializer).streamed())
+        assert [(m.name, m.state) for m in models] == [('a', 'Succeeded'), ('b', 'Failed'), ('c', None)]
+
+        pages = list(ResourcePaged(internal_paging, deserializer).streamed().raw(fields=['name']).by_page())
+        self.assertListEqual([[{'name': 'a'}, {'name': 'b'}], [{'name': 'c'}]], pages)
+
+        paged = ResourcePaged(internal_paging, deserializer).streamed().raw(fields=['name'])
+        assert next(paged) == {'name': 'a'}
+        self.assertListEqual([[{'name': 'b'}], [{'name': 'c'}]], list(paged.by_page()))
+
+        with self.assertRaises(ValueError):
+            ResourcePaged(internal_paging, deserializer, prefetch=1).streamed()
+        paged = ResourcePaged(internal_paging, deserializer).streamed()
+        next(paged)
+        with self.assertRaises(ValueError):
+            paged.streamed()
+
+    def test_streamed_xml_paging(self):
+        class Item(Model):
+            _attribute_map = {
+                'name': {'key': 'Name', 'type': 'str', 'xml': {'name': 'Name'}},
+            }
+            _xml_map = {'name': 'Item'}
+
+        class XmlPaged(Paged):
+            _attribute_map = {
+                'next_link': {'key': 'NextMarker', 'type': 'str'},
+                'current_page': {'key': 'Items', 'type': '[Item]', 'xml': {'name': 'Items', 'wrapped': True, 'itemsName': 'Item'}}
+            }
+
+        class StreamedResponse(object):
+            content_type = 'application/xml'
+
+            def __init__(self, body):
+                self._body = body
+
+            def stream_download(self, pipeline):
+                return (self._body[i:i + 7] for i in range(0, len(self._body), 7))
+
+        pages = {
+            '': b'<List><Items><Item><Name>a</Name></Item><Item><Name>b</Name></Item></Items>'
+                  b'<NextMarker>m</NextMarker></List>',
+            'm': b'<List><Items><Item><Name>c</Name></Item></Items><NextMarker /></List>',
+        }
+
+        def internal_paging(next_link=None, raw=False):
+            return StreamedResponse(pages[next_link])
+
+        deserializer = Deserializer({'Item': Item})
+        models = list(XmlPaged(internal_paging, deserializer).streamed())
+        assert [m.name for m in models] == ['a', 'b', 'c']
+
+        pages_raw = list(XmlPaged(internal_paging, deserializer).streamed().raw(fields=['Name']).by_page())
+        self.assertListEqual([[{'Name': 'a'}, {'Name': 'b'}], [{'Name': 'c'}]], pages_raw)
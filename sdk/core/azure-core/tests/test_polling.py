@@ -23,6 +23,8 @@
 # THE SOFTWARE.
 #
 #--------------------------------------------------------------------------
+import gc
+import threading
 import time
 try:
     from unittest import mock
@@ -32,6 +34,7 @@ except ImportError:
 import pytest
 
 from azure.core.polling import *
+from azure.core.polling.poller import get_retry_after
 from msrest.service_client import ServiceClient
 from msrest.serialization import Model
 from msrest.configuration import Configuration
@@ -172,3 +175,146 @@ def test_broken_poller(client):
     with pytest.raises(ValueError) as excinfo:
         poller.result()
     assert "Something bad happened" in str(excinfo.value)
+
+
+class StatusResponse(object):
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class StepPolling(PollingMethod):
+    """A polling method completing after a number of status requests.
+    """
+    def __init__(self, steps, retry_after=None, error=None):
+        self._steps = steps
+        self._retry_after = retry_after
+        self._error = error
+        self.polls = 0
+
+    def initialize(self, _, initial_response, deserialization_callback):
+        self._initial_response = initial_response
+        self._deserialization_callback = deserialization_callback
+
+    def update_status(self):
+        self.polls += 1
+        if self._error and self.polls == self._steps:
+            raise self._error
+        return StatusResponse({'Retry-After': self._retry_after} if self._retry_after else {})
+
+    def status(self):
+        return "succeeded" if self.finished() else "running"
+
+    def finished(self):
+        return self.polls >= self._steps
+
+    def resource(self):
+        return self._deserialization_callback(self._initial_response)
+
+
+def test_get_retry_after():
+    assert get_retry_after(StatusResponse({'Retry-After': '3'})) == 3
+    assert get_retry_after(StatusResponse({'Retry-After': 'Fri, 31 Dec 1999 23:59:59 GMT'})) == 0
+    assert get_retry_after(StatusResponse({'Retry-After': 'garbage'})) is None
+    assert get_retry_after(StatusResponse({})) is None
+    assert get_retry_after("Initial response") is None
+
+
+def test_poller_manager(client):
+    def deserialization_callback(response):
+        return "Treated: "+response
+
+    threads_before = threading.active_count()
+    with LROPollerManager(max_workers=2, polling_interval=0.01, timer_resolution=0.01) as manager:
+        methods = [StepPolling(steps=i % 5 + 1) for i in range(100)]
+        pollers = [manager.add(client, "response {}".format(i), deserialization_callback, method)
+                   for i, method in enumerate(methods)]
+        # One timer thread and two workers, whatever the number of operations
+        assert threading.active_count() - threads_before == 3
+
+        done, pending = manager.wait_all(timeout=10)
+        assert len(done) == 100
+        assert not pending
+        for i, poller in enumerate(pollers):
+            assert poller.done()
+            assert poller.status() == "succeeded"
+            assert poller.result() == "Treated: response {}".format(i)
+            assert methods[i].polls == i % 5 + 1
+
+
+def test_poller_manager_wait_any_and_errors(client):
+    def deserialization_callback(response):
+        return response
+
+    with LROPollerManager(max_workers=1, polling_interval=0.01, timer_resolution=0) as manager:
+        slow = manager.add(client, "slow", deserialization_callback, StepPolling(steps=2, retry_after='60'))
+        broken = manager.add(client, "broken", deserialization_callback,
+                             StepPolling(steps=2, error=ValueError("Something bad happened")))
+        legacy = manager.add(client, "legacy", deserialization_callback, PollingTwoSteps())
+        finished = manager.add(client, "finished", deserialization_callback, NoPolling())
+        assert finished.done()
+
+        done, pending = manager.wait_any([slow, broken], timeout=10)
+        assert done == [broken]
+        assert pending == [slow]
+        with pytest.raises(ValueError) as excinfo:
+            broken.result()
+        assert "Something bad happened" in str(excinfo.value)
+
+        assert legacy.result(timeout=10) == "legacy"
+
+        # Retry-After of 60 seconds is honoured
+        done, pending = manager.wait_all([slow], timeout=0.2)
+        assert pending == [slow]
+        assert slow._polling_method.polls == 1
+
+        done_cb = mock.MagicMock()
+        slow.add_done_callback(done_cb)
+    assert not slow.done()
+    done_cb.assert_not_called()
+
+
+def test_poller_manager_run_only_methods_dont_hold_workers(client):
+    release = threading.Event()
+
+    class BlockingPolling(PollingTwoSteps):
+        def run(self):
+            release.wait(10)
+            self._finished = True
+
+    def deserialization_callback(response):
+        return response
+
+    with LROPollerManager(max_workers=1, polling_interval=0.01, timer_resolution=0) as manager:
+        blocked = [manager.add(client, "blocked {}".format(i), deserialization_callback, BlockingPolling())
+                   for i in range(3)]
+        stepped = manager.add(client, "stepped", deserialization_callback, StepPolling(steps=2))
+
+        # The only worker is free to poll the other operations
+        assert stepped.result(timeout=10) == "stepped"
+        assert not any(poller.done() for poller in blocked)
+
+        release.set()
+        done, pending = manager.wait_all(blocked, timeout=10)
+        assert not pending
+        assert [poller.result() for poller in done] == ["blocked 0", "blocked 1", "blocked 2"]
+
+
+def test_poller_manager_releases_completed_pollers(client):
+    def deserialization_callback(response):
+        return response
+
+    with LROPollerManager(max_workers=1, polling_interval=0.01, timer_resolution=0) as manager:
+        kept = manager.add(client, "kept", deserialization_callback, StepPolling(steps=2))
+        for i in range(10):
+            manager.add(client, "dropped {}".format(i), deserialization_callback, StepPolling(steps=2))
+
+        # The dropped operations are still polled to completion
+        done, pending = manager.wait_all(timeout=10)
+        assert not pending
+        assert len(done) == 11
+
+        del done
+        gc.collect()
+        done, pending = manager.wait_all(timeout=10)
+        assert done == [kept]
+        assert len(manager._pollers) == 1
@@ -24,12 +24,23 @@
 #
 # --------------------------------------------------------------------------
 import concurrent.futures
+import io
 import pytest
+import requests
 from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from azure.core.exceptions import ResourceModifiedError
+from azure.core.pipeline import PipelineResponse
 
 from azure.core.pipeline.transport import HttpRequest
 from azure.core.configuration import Configuration
 from azure.core.pipeline.transport import RequestsTransport
+from azure.core.pipeline.transport.requests_basic import StreamDownloadGenerator, RequestsTransportResponse
 
 
 def test_threading_basic_requests():
@@ -46,3 +57,137 @@ def test_threading_basic_requests():
     with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
         future = executor.submit(thread_body, sender)
         assert future.result()
+
+
+def test_requests_pool_size():
+    transport = RequestsTransport(pool_connections=4, pool_maxsize=64)
+    with transport:
+        adapter = transport.session.get_adapter("https://account.blob.core.windows.net")
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 64
+        assert adapter.max_retries.total is False
+
+
+def test_requests_shared_session():
+    try:
+        first = RequestsTransport(shared_session=True, pool_maxsize=32)
+        second = RequestsTransport(shared_session=True, pool_maxsize=32)
+        blob_request = HttpRequest("GET", "https://account.blob.core.windows.net/container")
+        queue_request = HttpRequest("GET", "https://account.queue.core.windows.net/queue")
+
+        with first, second:
+            session = first._get_session(blob_request)
+            assert first.session is None
+            assert second._get_session(blob_request) is session
+            assert first._get_session(queue_request) is not session
+            assert session.get_adapter("https://")._pool_maxsize == 32
+
+        # Closing a transport does not close the shared session
+        assert RequestsTransport(shared_session=True, pool_maxsize=32)._get_session(blob_request) is session
+    finally:
+        RequestsTransport.close_shared_sessions()
+
+    assert RequestsTransport(shared_session=True, pool_maxsize=32)._get_session(blob_request) is not session
+
+
+def test_requests_shared_session_keeps_transport_settings():
+    try:
+        request = HttpRequest("GET", "https://account.blob.core.windows.net/container")
+        default = RequestsTransport(shared_session=True)._get_session(request)
+        large_pool = RequestsTransport(shared_session=True, pool_maxsize=64)._get_session(request)
+        no_env = RequestsTransport(shared_session=True, use_env_settings=False)._get_session(request)
+
+        assert len(set([id(default), id(large_pool), id(no_env)])) == 3
+        assert default.get_adapter("https://")._pool_maxsize == requests.adapters.DEFAULT_POOLSIZE
+        assert large_pool.get_adapter("https://")._pool_maxsize == 64
+        assert default.trust_env and not no_env.trust_env
+    finally:
+        RequestsTransport.close_shared_sessions()
+
+
+def test_requests_shared_session_ignored_with_custom_session():
+    session = requests.Session()
+    transport = RequestsTransport(session=session, session_owner=False, shared_session=True)
+    request = HttpRequest("GET", "https://account.blob.core.windows.net/container")
+    assert transport._get_session(request) is session
+
+
+def _build_requests_response(body, status_code=200, headers=None, fail_after=None):
+    headers = dict(headers or {}, **{'Content-Length': str(len(body)), 'ETag': '"etag"'})
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    response.raw = HTTPResponse(body=io.BytesIO(body), headers=headers, preload_content=False)
+    if fail_after is not None:
+        def iter_content(chunk_size=1, decode_unicode=False):
+            yield body[:fail_after]
+            raise requests.exceptions.ChunkedEncodingError("Connection broken")
+        response.iter_content = iter_content
+    return response
+
+
+def _build_resume_pipeline(response):
+    request = HttpRequest("GET", "https://account.blob.core.windows.net/container/blob")
+    pipeline = mock.Mock()
+    pipeline.run.return_value = PipelineResponse(
+        request, RequestsTransportResponse(request, response), context=None)
+    return pipeline
+
+
+def test_stream_download_resume():
+    body = b"0123456789" * 10
+    request = HttpRequest("GET", "https://account.blob.core.windows.net/container/blob",
+                          headers={'x-ms-range': 'bytes=100-199'})
+    pipeline = _build_resume_pipeline(_build_requests_response(body[30:], status_code=206))
+    stream = StreamDownloadGenerator(pipeline, request, _build_requests_response(body, fail_after=30), 16)
+    stream.retry_backoff = 0
+
+    assert b"".join(stream) == body
+    assert stream.downloaded == len(body)
+    resume_request = pipeline.run.call_args[0][0]
+    assert resume_request.headers['x-ms-range'] == 'bytes=130-199'
+    assert resume_request.headers['If-Match'] == '"etag"'
+    assert request.headers['x-ms-range'] == 'bytes=100-199'
+
+
+def test_stream_download_resume_etag_changed():
+    body = b"0123456789" * 10
+    request = HttpRequest("GET", "https://account.blob.core.windows.net/container/blob")
+    resumed = _build_requests_response(body[30:], status_code=206)
+    resumed.headers['ETag'] = '"other"'
+    pipeline = _build_resume_pipeline(resumed)
+    stream = StreamDownloadGenerator(pipeline, request, _build_requests_response(body, fail_after=30), 16)
+    stream.retry_backoff = 0
+
+    assert next(stream) == body[:30]
+    with pytest.raises(ResourceModifiedError):
+        next(stream)
+    assert pipeline.run.call_args[0][0].headers['range'] == 'bytes=30-'
+
+
+def test_stream_download_not_resumed_without_pipeline():
+    body = b"0123456789" * 10
+    request = HttpRequest("GET", "https://account.blob.core.windows.net/container/blob")
+    stream = StreamDownloadGenerator(None, request, _build_requests_response(body, fail_after=30), 16)
+
+    assert next(stream) == body[:30]
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        next(stream)
+
+
+def test_stream_download_readinto():
+    body = b"0123456789" * 10
+    request = HttpRequest("GET", "https://account.blob.core.windows.net/container/blob")
+    stream = StreamDownloadGenerator(None, request, _build_requests_response(body), 16)
+
+    buffer = bytearray(len(body))
+    view = memoryview(buffer)
+    position = 0
+    while True:
+        read = stream.readinto(view[position:position + 32])
+        if not read:
+            break
+        position += read
+    assert position == len(body)
+    assert bytes(buffer) == body
+    assert stream.downloaded == len(body)
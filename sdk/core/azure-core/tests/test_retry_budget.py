@@ -0,0 +1,212 @@
+﻿# --------------------------------------------------------------------------
+#
+# Copyright (c) Microsoft Corporation. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the ""Software""), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED *AS IS*, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# --------------------------------------------------------------------------
+import pytest
+
+from azure.core.exceptions import ClientAuthenticationError, ServiceRequestError
+from azure.core.pipeline import Pipeline
+from azure.core.pipeline.policies import RetryPolicy, RetryBudget, CircuitState
+from azure.core.pipeline.policies.retry_budget import decorrelated_jitter
+from azure.core.pipeline.transport import HttpRequest, HttpResponse, HttpTransport
+
+
+class MockResponse(HttpResponse):
+    def __init__(self, request, status_code):
+        super(MockResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.headers = {}
+
+
+class MockTransport(HttpTransport):
+    def __init__(self, status_codes):
+        self.status_codes = list(status_codes)
+        self.requests = []
+
+    def send(self, request, **config):
+        self.requests.append(request)
+        status = self.status_codes.pop(0)
+        if status is None:
+            raise ServiceRequestError("Unreachable")
+        if isinstance(status, Exception):
+            raise status
+        return MockResponse(request, status)
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def sleep(self, duration):
+        pass
+
+
+def test_retry_budget_tokens():
+    budget = RetryBudget(capacity=10, retry_cost=5, timeout_retry_cost=10, success_refill=1,
+                         circuit_failure_threshold=100)
+    assert budget.acquire("host")
+    assert budget.acquire("host")
+    assert not budget.acquire("host")
+    budget.record_success("host")
+    assert budget.tokens == 1
+    for _ in range(20):
+        budget.record_success("host")
+    assert budget.tokens == 10
+    assert budget.acquire("host", timeout=True)
+    assert budget.tokens == 0
+
+
+def test_retry_budget_circuit_breaker():
+    budget = RetryBudget(circuit_failure_threshold=2, circuit_recovery_time=3600)
+    budget.record_failure("a")
+    assert budget.circuit_state("a") == CircuitState.CLOSED
+    budget.record_failure("a")
+    assert budget.circuit_state("a") == CircuitState.OPEN
+    assert not budget.acquire("a")
+    # Other hosts are not affected
+    assert budget.acquire("b")
+
+    budget.circuit_recovery_time = 0
+    assert budget.circuit_state("a") == CircuitState.HALF_OPEN
+    # A single probe is allowed, and the grant tells it is the probe
+    assert budget.acquire("a") == CircuitState.HALF_OPEN
+    assert not budget.acquire("a")
+    budget.record_failure("a")
+    assert budget.circuit_state("a") == CircuitState.HALF_OPEN  # recovery time is 0
+    assert budget.acquire("a") == CircuitState.HALF_OPEN
+    budget.record_success("a")
+    assert budget.circuit_state("a") == CircuitState.CLOSED
+    assert budget.acquire("a") == CircuitState.CLOSED
+
+
+def test_decorrelated_jitter():
+    previous = 1
+    for _ in range(100):
+        backoff = decorrelated_jitter(1, previous, 20)
+        assert 1 <= backoff <= min(20, previous * 3)
+        previous = backoff
+
+
+def test_retry_policy_decorrelated_mode():
+    policy = RetryPolicy(retry_mode='decorrelated', retry_backoff_factor=2, retry_backoff_max=30)
+    settings = policy.configure_retries({})
+    settings['history'] = [None]
+    assert policy.get_backoff_time(settings) == 0
+    for _ in range(10):
+        settings['history'].append(None)
+        previous = settings['last_backoff'] or 2
+        backoff = policy.get_backoff_time(settings)
+        assert 2 <= backoff <= min(30, previous * 3)
+
+
+def test_retry_policy_without_budget_retries():
+    transport = MockTransport([503, 503, 200])
+    pipeline = Pipeline(transport, [RetryPolicy(retry_backoff_factor=0)])
+    response = pipeline.run(HttpRequest("GET", "http://localhost/"))
+    assert response.http_response.status_code == 200
+    assert len(transport.requests) == 3
+
+
+def test_retry_policy_budget_shared():
+    budget = RetryBudget(capacity=10, retry_cost=5, circuit_failure_threshold=100)
+
+    transport = MockTransport([503, 503, 503, 503])
+    pipeline = Pipeline(transport, [RetryPolicy(retry_backoff_factor=0, retry_budget=budget)])
+    response = pipeline.run(HttpRequest("GET", "http://localhost/"))
+    # Two retries drained the budget
+    assert response.http_response.status_code == 503
+    assert len(transport.requests) == 3
+
+    # A second client sharing the budget does not retry at all
+    transport = MockTransport([503, 200])
+    pipeline = Pipeline(transport, [RetryPolicy(retry_backoff_factor=0, retry_budget=budget)])
+    response = pipeline.run(HttpRequest("GET", "http://localhost/"))
+    assert response.http_response.status_code == 503
+    assert len(transport.requests) == 1
+
+    # Successes refill it
+    transport = MockTransport([200] * 5 + [503, 200])
+    pipeline = Pipeline(transport, [RetryPolicy(retry_backoff_factor=0, retry_budget=budget)])
+    for _ in range(6):
+        response = pipeline.run(HttpRequest("GET", "http://localhost/"))
+    assert response.http_response.status_code == 200
+    assert len(transport.requests) == 7
+
+
+def test_retry_policy_circuit_open():
+    budget = RetryBudget(circuit_failure_threshold=1, circuit_recovery_time=3600)
+    transport = MockTransport([None, None])
+    pipeline = Pipeline(transport, [RetryPolicy(retry_backoff_factor=0, retry_budget=budget)])
+    with pytest.raises(ServiceRequestError):
+        pipeline.run(HttpRequest("GET", "http://localhost/"))
+    assert len(transport.requests) == 1
+    assert budget.circuit_state("localhost") == CircuitState.OPEN
+
+
+def _half_open_budget(host="localhost"):
+    budget = RetryBudget(circuit_failure_threshold=1, circuit_recovery_time=0)
+    budget.record_failure(host)
+    assert budget.circuit_state(host) == CircuitState.HALF_OPEN
+    return budget
+
+
+def test_retry_policy_probe_exhausts_retries():
+    budget = _half_open_budget()
+    transport = MockTransport([503, 503])
+    pipeline = Pipeline(transport, [RetryPolicy(retry_total=1, retry_backoff_factor=0, retry_budget=budget)])
+    response = pipeline.run(HttpRequest("GET", "http://localhost/"))
+    assert response.http_response.status_code == 503
+    assert len(transport.requests) == 2
+
+    # The failed probe reopened the circuit, so once recovered the host can be probed again
+    budget.circuit_recovery_time = 3600
+    assert budget.circuit_state("localhost") == CircuitState.OPEN
+    budget.circuit_recovery_time = 0
+    assert budget.acquire("localhost")
+
+
+def test_retry_policy_probe_succeeds():
+    budget = _half_open_budget()
+    transport = MockTransport([503, 200])
+    pipeline = Pipeline(transport, [RetryPolicy(retry_backoff_factor=0, retry_budget=budget)])
+    response = pipeline.run(HttpRequest("GET", "http://localhost/"))
+    assert response.http_response.status_code == 200
+    assert budget.circuit_state("localhost") == CircuitState.CLOSED
+
+
+def test_retry_policy_probe_without_verdict_is_released():
+    budget = _half_open_budget()
+    transport = MockTransport([503, ClientAuthenticationError("No token")])
+    pipeline = Pipeline(transport, [RetryPolicy(retry_backoff_factor=0, retry_budget=budget)])
+    with pytest.raises(ClientAuthenticationError):
+        pipeline.run(HttpRequest("GET", "http://localhost/"))
+    assert len(transport.requests) == 2
+
+    # The next retry to the host probes it
+    assert budget.acquire("localhost")
+    assert not budget.acquire("localhost")
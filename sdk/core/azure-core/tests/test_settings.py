@@ -27,6 +27,10 @@ import logging
 import os
 import sys
 import pytest
+try:
+    from unittest import mock
+except ImportError:
+    import mock
 
 # module under test
 import azure.core.settings as m
@@ -239,3 +243,48 @@ class TestStandardSettings(object):
         assert isinstance(val, tuple)
         assert val.log_level == 10
         del os.environ["AZURE_LOG_LEVEL"]
+
+
+class TestTracingSnapshot(object):
+    def test_snapshot_cached(self):
+        snapshot = m.settings.tracing_snapshot()
+        assert m.settings.tracing_snapshot() is snapshot
+        assert snapshot.should_only_propagate == False
+        assert snapshot.sampling_rate == 1.0
+
+        m.settings.tracing_sampling_rate = 0.5
+        try:
+            new_snapshot = m.settings.tracing_snapshot()
+            assert new_snapshot is not snapshot
+            assert new_snapshot.sampling_rate == 0.5
+        finally:
+            m.settings.tracing_sampling_rate.unset_value()
+        assert m.settings.tracing_snapshot().sampling_rate == 1.0
+
+    def test_snapshot_implementation(self):
+        m.settings.tracing_implementation = "opencensus"
+        try:
+            assert m.settings.tracing_snapshot().implementation is m.get_opencensus_span()
+        finally:
+            m.settings.tracing_implementation.unset_value()
+        with mock.patch.dict(sys.modules, {"opencensus": None}):
+            del sys.modules["opencensus"]
+            assert m.settings.tracing_snapshot().implementation is None
+
+    def test_snapshot_env_var(self):
+        os.environ["AZURE_TRACING_ONLY_PROPAGATE"] = "yes"
+        try:
+            m.settings.invalidate_snapshot()
+            assert m.settings.tracing_snapshot().should_only_propagate == True
+        finally:
+            del os.environ["AZURE_TRACING_ONLY_PROPAGATE"]
+            m.settings.invalidate_snapshot()
+        assert m.settings.tracing_snapshot().should_only_propagate == False
+
+    def test_convert_sampling_rate(self):
+        assert m.convert_sampling_rate("0.25") == 0.25
+        assert m.convert_sampling_rate(1) == 1
+        with pytest.raises(ValueError):
+            m.convert_sampling_rate("2")
+        with pytest.raises(ValueError):
+            m.convert_sampling_rate("often")
@@ -24,12 +24,14 @@ class ContextHelper(object):
         self.orig_sdk_context_span = tracing_context.current_span.get()
         settings.tracing_implementation.set_value(self.tracer_to_use)
         self.os_env.start()
+        settings.invalidate_snapshot()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         tracing_context.current_span.set(self.orig_sdk_context_span)
         settings.tracing_implementation.unset_value()
         self.os_env.stop()
+        settings.invalidate_snapshot()
 
 
 class TestContext(unittest.TestCase):
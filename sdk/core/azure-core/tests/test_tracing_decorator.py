@@ -199,3 +199,25 @@ class TestDecorator(object):
             assert len(parent.children) == 1
             assert parent.children[0].span_data.name == "child"
             assert not parent.children[0].children
+
+    def test_sampled_out(self):
+        with ContextHelper(tracer_to_use="opencensus"):
+            settings.tracing_sampling_rate.set_value(0)
+            try:
+                with mock.patch.object(OpenCensusSpan, "span") as create_span:
+                    client = MockClient(assert_current_span=False)
+                    client.make_request(2)
+                    assert not create_span.called
+                assert tracing_context.current_span.get() is None
+                assert not tracing_context.sampled_out.get()
+
+                # An operation with a parent is always traced
+                exporter = MockExporter()
+                trace = tracer_module.Tracer(sampler=AlwaysOnSampler(), exporter=exporter)
+                with trace.start_span(name="OverAll"):
+                    client.get_foo()
+                trace.finish()
+                exporter.build_tree()
+                assert exporter.root.children[0].span_data.name == "MockClient.get_foo"
+            finally:
+                settings.tracing_sampling_rate.unset_value()
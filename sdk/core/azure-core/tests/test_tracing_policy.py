@@ -12,6 +12,7 @@ from azure.core.pipeline.transport import HttpRequest, HttpResponse
 from opencensus.trace import tracer as tracer_module
 from opencensus.trace.samplers import AlwaysOnSampler
 from azure.core.tracing.ext.opencensus_span import OpenCensusSpan
+from azure.core.settings import settings
 from tracing_common import ContextHelper, MockExporter
 import time
 import pytest
@@ -130,3 +131,33 @@ def test_distributed_tracing_policy_with_user_agent():
         assert network_span.span_data.attributes.get("x-ms-client-request-id") == "some client request id"
         assert network_span.span_data.attributes.get("x-ms-request-id") is None
         assert network_span.span_data.attributes.get("http.status_code") == 504
+
+
+def test_distributed_tracing_policy_sampled_out():
+    """Test that requests without parent span are traced according to the sampling rate."""
+    with ContextHelper(tracer_to_use="opencensus"):
+        settings.tracing_sampling_rate.set_value(0)
+        try:
+            policy = DistributedTracingPolicy()
+            request = HttpRequest("GET", "http://127.0.0.1/temp?query=query")
+            pipeline_request = PipelineRequest(request, PipelineContext(None))
+            policy.on_request(pipeline_request)
+            assert "traceparent" not in request.headers
+            assert tracing_context.current_span.get() is None
+            response = HttpResponse(request, None)
+            response.headers = {}
+            response.status_code = 200
+            policy.on_response(pipeline_request, PipelineResponse(request, response, PipelineContext(None)))
+
+            # With a parent span, the request is always traced
+            exporter = MockExporter()
+            trace = tracer_module.Tracer(sampler=AlwaysOnSampler(), exporter=exporter)
+            with trace.span("parent"):
+                policy.on_request(pipeline_request)
+                assert "traceparent" in request.headers
+                policy.on_response(pipeline_request, PipelineResponse(request, response, PipelineContext(None)))
+            trace.finish()
+            exporter.build_tree()
+            assert exporter.root.children[0].span_data.name == "/temp"
+        finally:
+            settings.tracing_sampling_rate.unset_value()
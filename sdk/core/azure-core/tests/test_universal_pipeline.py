@@ -29,6 +29,8 @@ try:
 except ImportError:
     import mock
 
+import json
+
 import requests
 
 import pytest
@@ -179,3 +181,51 @@ def test_raw_deserializer():
     raw_deserializer.on_response(None, response)
     result = response.context["deserialized_data"]
     assert result["success"] is True
+
+
+def test_streamed_items_deserializer():
+    class MockResponse(HttpResponse):
+        def __init__(self, body, content_type, chunk_size=3):
+            super(MockResponse, self).__init__(None, None)
+            self._body = body
+            self.content_type = content_type
+            self.chunk_size = chunk_size
+
+        def stream_download(self, pipeline):
+            return (self._body[i:i + self.chunk_size] for i in range(0, len(self._body), self.chunk_size))
+
+    body = json.dumps({
+        "value": [{"name": u"é\"[{", "tags": {"a": [1, 2]}}, None, 1.5, "x"],
+        "nextLink": "page2"
+    }, ensure_ascii=False).encode('utf-8')
+    items = ContentDecodePolicy.deserialize_items_from_stream(MockResponse(body, "application/json"), "value")
+    assert next(items) == {"name": u"é\"[{", "tags": {"a": [1, 2]}}
+    assert list(items) == [None, 1.5, "x"]
+    assert items.document == {"nextLink": "page2"}
+
+    items = ContentDecodePolicy.deserialize_items_from_stream(MockResponse(b'[1, [2], {"3": 3}]', None), None)
+    assert list(items) == [1, [2], {"3": 3}]
+
+    with pytest.raises(ValueError):
+        list(ContentDecodePolicy.deserialize_items_from_stream(
+            MockResponse(b'{"value": [1, 2', "application/json"), "value"))
+
+    body = (b'<?xml version="1.0" encoding="utf-8"?><EnumerationResults><Blobs>'
+            b'<Blob><Name>a</Name></Blob><Blob><Name>b</Name></Blob></Blobs>'
+            b'<NextMarker>marker</NextMarker></EnumerationResults>')
+    items = ContentDecodePolicy.deserialize_items_from_stream(
+        MockResponse(body, "application/xml; charset=utf-8"), "Blobs/Blob")
+    assert [item.find("Name").text for item in items] == ["a", "b"]
+    assert items.document.find("NextMarker").text == "marker"
+    # Items were detached from the tree
+    assert len(items.document.find("Blobs")) == 0
+
+    # Through the policy
+    policy = ContentDecodePolicy()
+    request = PipelineRequest(None, PipelineContext(None, stream_items="value"))
+    policy.on_request(request)
+    assert "stream_items" not in request.context.options
+    assert request.context.options["stream"] is True
+    response = PipelineResponse(None, MockResponse(b'{"value": [1, 2]}', "application/json"), request.context)
+    policy.on_response(request, response)
+    assert list(response.context["deserialized_data"]) == [1, 2]
@@ -44,6 +44,7 @@ class ContextHelper(object):
         if self.should_only_propagate is not None:
             settings.tracing_should_only_propagate.set_value(self.should_only_propagate)
         self.os_env.start()
+        settings.invalidate_snapshot()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -53,6 +54,7 @@ class ContextHelper(object):
         settings.tracing_implementation.unset_value()
         settings.tracing_should_only_propagate.unset_value()
         self.os_env.stop()
+        settings.invalidate_snapshot()
 
 
 class Node:
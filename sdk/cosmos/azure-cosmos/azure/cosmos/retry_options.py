@@ -31,11 +31,16 @@ class RetryOptions(object):
         Fixed retry interval in milliseconds to wait between each retry ignoring the retryAfter returned as part of the response.
     :ivar int MaxWaitTimeInSeconds:
         Max wait time in seconds to wait for a request while the retries are happening. Default value 30 seconds.
+    :ivar RetryBudget:
+        Optional retry budget (such as azure.core.pipeline.policies.RetryBudget) shared by the clients
+        using it. Retries refused by the budget or by the circuit breaker of the endpoint are not sent.
+        Default value None.
     """
-    def __init__(self, max_retry_attempt_count = 9, fixed_retry_interval_in_milliseconds = None, max_wait_time_in_seconds = 30):
+    def __init__(self, max_retry_attempt_count = 9, fixed_retry_interval_in_milliseconds = None, max_wait_time_in_seconds = 30, retry_budget = None):
         self._max_retry_attempt_count = max_retry_attempt_count
         self._fixed_retry_interval_in_milliseconds = fixed_retry_interval_in_milliseconds
         self._max_wait_time_in_seconds = max_wait_time_in_seconds
+        self._retry_budget = retry_budget
 
     @property
     def MaxRetryAttemptCount(self):
@@ -47,4 +52,8 @@ class RetryOptions(object):
 
     @property
     def MaxWaitTimeInSeconds(self):
-        return self._max_wait_time_in_seconds
\ No newline at end of file
+        return self._max_wait_time_in_seconds
+
+    @property
+    def RetryBudget(self):
+        return self._retry_budget
@@ -24,6 +24,13 @@
 
 import time
 
+import requests
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
 from . import errors
 from . import endpoint_discovery_retry_policy
 from . import resource_throttle_retry_policy
@@ -31,6 +38,9 @@ from . import default_retry_policy
 from . import session_retry_policy
 from .http_constants import HttpHeaders, StatusCodes, SubStatusCodes
 
+# the state of a circuit whose probe is granted by azure.core.pipeline.policies.RetryBudget.acquire
+_HALF_OPEN = 'half-open'
+
 def _Execute(client, global_endpoint_manager, function, *args, **kwargs):
     """Exectutes the function with passed parameters applying all retry policies
 
@@ -53,46 +63,93 @@ def _Execute(client, global_endpoint_manager, function, *args, **kwargs):
     defaultRetry_policy = default_retry_policy._DefaultRetryPolicy(*args)
 
     sessionRetry_policy = session_retry_policy._SessionRetryPolicy(client.connection_policy.EnableEndpointDiscovery, global_endpoint_manager, *args)
-    while True:
-        try:
-            if args:
-                result = _ExecuteFunction(function, global_endpoint_manager, *args, **kwargs)
-            else:
-                result = _ExecuteFunction(function, *args, **kwargs)
-            if not client.last_response_headers:
-                client.last_response_headers = {}
-            
-            # setting the throttle related response headers before returning the result
-            client.last_response_headers[HttpHeaders.ThrottleRetryCount] = resourceThrottle_retry_policy.current_retry_attempt_count
-            client.last_response_headers[HttpHeaders.ThrottleRetryWaitTimeInMs] = resourceThrottle_retry_policy.cummulative_wait_time_in_milliseconds
-
-            return result
-        except errors.HTTPFailure as e:
-            retry_policy = None
-            if (e.status_code == StatusCodes.FORBIDDEN
-                    and e.sub_status == SubStatusCodes.WRITE_FORBIDDEN):
-                retry_policy = endpointDiscovery_retry_policy
-            elif e.status_code == StatusCodes.TOO_MANY_REQUESTS:
-                retry_policy = resourceThrottle_retry_policy
-            elif e.status_code == StatusCodes.NOT_FOUND and e.sub_status and e.sub_status == SubStatusCodes.READ_SESSION_NOTAVAILABLE:
-                retry_policy = sessionRetry_policy
-            else:
-                retry_policy = defaultRetry_policy
-
-            # If none of the retry policies applies or there is no retry needed, set the throttle related response hedaers and 
-            # re-throw the exception back
-            # arg[0] is the request. It needs to be modified for write forbidden exception
-            if not (retry_policy.ShouldRetry(e)):
+
+    retry_budget = client.connection_policy.RetryOptions.RetryBudget
+    # the host whose half-open circuit the current retry probes, until its outcome is recorded
+    budget_probe = None
+    try:
+        while True:
+            try:
+                if args:
+                    result = _ExecuteFunction(function, global_endpoint_manager, *args, **kwargs)
+                else:
+                    result = _ExecuteFunction(function, *args, **kwargs)
                 if not client.last_response_headers:
                     client.last_response_headers = {}
+
+                # setting the throttle related response headers before returning the result
                 client.last_response_headers[HttpHeaders.ThrottleRetryCount] = resourceThrottle_retry_policy.current_retry_attempt_count
                 client.last_response_headers[HttpHeaders.ThrottleRetryWaitTimeInMs] = resourceThrottle_retry_policy.cummulative_wait_time_in_milliseconds
-                if len(args) > 0 and args[0].should_clear_session_token_on_session_read_failure:
-                    client.session.clear_session_token(client.last_response_headers)
+
+                if retry_budget is not None:
+                    retry_budget.record_success(_GetRetryBudgetHost(client, global_endpoint_manager, *args))
+                    budget_probe = None
+                return result
+            except errors.HTTPFailure as e:
+                # the endpoint must be resolved before the retry policies re-route the request
+                budget_host = _GetRetryBudgetHost(client, global_endpoint_manager, *args) if retry_budget is not None else None
+                retry_policy = None
+                if (e.status_code == StatusCodes.FORBIDDEN
+                        and e.sub_status == SubStatusCodes.WRITE_FORBIDDEN):
+                    retry_policy = endpointDiscovery_retry_policy
+                elif e.status_code == StatusCodes.TOO_MANY_REQUESTS:
+                    retry_policy = resourceThrottle_retry_policy
+                elif e.status_code == StatusCodes.NOT_FOUND and e.sub_status and e.sub_status == SubStatusCodes.READ_SESSION_NOTAVAILABLE:
+                    retry_policy = sessionRetry_policy
+                else:
+                    retry_policy = defaultRetry_policy
+
+                # If none of the retry policies applies or there is no retry needed, set the throttle related response hedaers and 
+                # re-throw the exception back
+                # arg[0] is the request. It needs to be modified for write forbidden exception
+                should_retry = retry_policy.ShouldRetry(e)
+                if retry_budget is not None:
+                    # every response settles the probe of a half-open circuit: a failure of the
+                    # endpoint opens it again, any other error shows the endpoint is serving
+                    if should_retry or _IsEndpointFailure(e):
+                        retry_budget.record_failure(budget_host)
+                    else:
+                        retry_budget.record_success(budget_host)
+                    budget_probe = None
+                if should_retry and retry_budget is not None:
+                    grant = retry_budget.acquire(budget_host)
+                    should_retry = bool(grant)
+                    if grant == _HALF_OPEN:
+                        budget_probe = budget_host
+                if not should_retry:
+                    if not client.last_response_headers:
+                        client.last_response_headers = {}
+                    client.last_response_headers[HttpHeaders.ThrottleRetryCount] = resourceThrottle_retry_policy.current_retry_attempt_count
+                    client.last_response_headers[HttpHeaders.ThrottleRetryWaitTimeInMs] = resourceThrottle_retry_policy.cummulative_wait_time_in_milliseconds
+                    if len(args) > 0 and args[0].should_clear_session_token_on_session_read_failure:
+                        client.session.clear_session_token(client.last_response_headers)
+                    raise
+                else:
+                    # Wait for retry_after_in_milliseconds time before the next retry
+                    time.sleep(retry_policy.retry_after_in_milliseconds / 1000.0)
+            except requests.exceptions.RequestException:
+                # connection and read errors are not retried, but count as failures of the endpoint
+                if retry_budget is not None:
+                    retry_budget.record_failure(_GetRetryBudgetHost(client, global_endpoint_manager, *args))
+                    budget_probe = None
                 raise
-            else:
-                # Wait for retry_after_in_milliseconds time before the next retry
-                time.sleep(retry_policy.retry_after_in_milliseconds / 1000.0)
+    finally:
+        # a probing retry that got no verdict from the endpoint gives the probe back
+        if budget_probe is not None:
+            retry_budget.release_probe(budget_probe)
+
+def _IsEndpointFailure(error):
+    """Returns whether an error response shows the endpoint is failing, rather than the request.
+    """
+    return error.status_code in (StatusCodes.REQUEST_TIMEOUT, StatusCodes.TOO_MANY_REQUESTS) or error.status_code >= 500
+
+def _GetRetryBudgetHost(client, global_endpoint_manager, *args):
+    """Returns the host of the endpoint a request is sent to, used to key the circuits of the retry budget.
+    """
+    endpoint = client.url_connection
+    if args and hasattr(args[0], 'location_endpoint_to_route'):
+        endpoint = global_endpoint_manager.resolve_service_endpoint(args[0])
+    return urlparse(endpoint).netloc
 
 def _ExecuteFunction(function, *args, **kwargs):
     """ Stub method so that it can be used for mocking purposes as well.
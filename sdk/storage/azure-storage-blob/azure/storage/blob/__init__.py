@@ -21,6 +21,9 @@ from ._shared.models import(
     StorageErrorCode
 )
 from ._blob_utils import StorageStreamDownloader
+from ._blob_batch import PartialBatchErrorException
+from ._blob_listing import ParallelBlobListing
+from ._directory_sync import DirectorySyncReport
 from .models import (
     BlobType,
     BlockState,
@@ -89,6 +92,9 @@ __all__ = [
     'AccountPermissions',
     'CopyStatusPoller',
     'StorageStreamDownloader',
+    'PartialBatchErrorException',
+    'ParallelBlobListing',
+    'DirectorySyncReport',
 ]
 
 
@@ -172,5 +178,4 @@ def download_blob_from_url(
         else:
             if not overwrite and os.path.isfile(output):
                 raise ValueError("The file '{}' already exists.".format(output))
-            with open(output, 'wb') as file_handle:
-                _download_to_stream(client, file_handle, max_connections, **kwargs)
+            client.download_blob(**kwargs).download_to_path(output, max_connections=max_connections)
@@ -0,0 +1,217 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import uuid
+from typing import Any, List, Optional, Union, TYPE_CHECKING # pylint: disable=unused-import
+
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib2 import quote  # type: ignore
+
+import six
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline import PipelineRequest, PipelineContext
+from azure.core.pipeline.transport import HttpRequest, HttpResponse
+
+from ._shared.authentication import SharedKeyCredentialPolicy
+from ._shared.utils import normalize_headers, process_storage_error
+from ._generated.models import StorageErrorException
+
+if TYPE_CHECKING:
+    from .models import BlobProperties  # pylint: disable=unused-import
+
+
+# The Blob Batch operation was introduced with this service version
+BATCH_VERSION = '2018-11-09'
+MAX_BATCH_SIZE = 256
+
+_CRLF = b'\r\n'
+
+
+class PartialBatchErrorException(HttpResponseError):
+    """Some of the sub-requests of a batch operation failed.
+
+    :param str message: The message of the exception.
+    :param response: The response of the last batch request.
+    :param list parts: The result of every sub-request, in the order of the blobs:
+        the response headers of the sub-requests that succeeded, and the errors of
+        the ones that failed.
+    """
+
+    def __init__(self, message, response, parts):
+        self.parts = parts
+        super(PartialBatchErrorException, self).__init__(message=message, response=response)
+
+
+class _BatchSubResponse(HttpResponse):
+    """The response of a sub-request, read from a part of the batch response."""
+
+    def __init__(self, request, status_code, reason, headers, body):
+        super(_BatchSubResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        content_type = headers.get('content-type')
+        if content_type:
+            self.content_type = content_type.split(";")
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+def get_batch_subrequest(method, container_name, blob, query=None, headers=None, sas_token=None):
+    # type: (str, str, Union[str, BlobProperties], Optional[dict], Optional[dict], Optional[str]) -> HttpRequest
+    """Build a sub-request on a blob, or on the snapshot of a BlobProperties."""
+    blob_name = getattr(blob, 'name', blob)
+    if isinstance(container_name, six.text_type):
+        container_name = container_name.encode('UTF-8')
+    if isinstance(blob_name, six.text_type):
+        blob_name = blob_name.encode('UTF-8')
+    url = '/{}/{}'.format(quote(container_name), quote(blob_name, safe='/~'))
+
+    query_parts = ['{}={}'.format(name, value) for name, value in (query or {}).items()]
+    snapshot = getattr(blob, 'snapshot', None)
+    if snapshot:
+        query_parts.append('snapshot={}'.format(quote(snapshot)))
+    if sas_token:
+        query_parts.append(sas_token.lstrip('?'))
+    if query_parts:
+        url += '?' + '&'.join(query_parts)
+
+    request = HttpRequest(method, url, headers=headers or {})
+    request.headers['Content-Length'] = '0'
+    return request
+
+
+def sign_batch_subrequests(requests, headers_policy, credential, token=None):
+    """Add the date and request ID headers to each sub-request, and authorize it.
+
+    A shared key credential signs every sub-request; with a token credential, the
+    access token fetched for the batch is used.
+    """
+    for request in requests:
+        pipeline_request = PipelineRequest(request, PipelineContext(None))
+        headers_policy.on_request(pipeline_request)
+        if isinstance(credential, SharedKeyCredentialPolicy):
+            credential.on_request(pipeline_request)
+        elif token:
+            request.headers['Authorization'] = 'Bearer {}'.format(token)
+
+
+def _serialize_subrequest(request):
+    lines = ['{} {} HTTP/1.1'.format(request.method, request.url)]
+    lines.extend('{}: {}'.format(name, value) for name, value in request.headers.items())
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8')
+
+
+def get_batch_request(url, requests):
+    # type: (str, List[HttpRequest]) -> HttpRequest
+    """Build the multipart/mixed batch request holding the sub-requests."""
+    boundary = 'batch_{}'.format(uuid.uuid4())
+    delimiter = b'--' + boundary.encode('utf-8')
+    body = []
+    for content_id, request in enumerate(requests):
+        body.extend([
+            delimiter,
+            b'Content-Type: application/http',
+            b'Content-Transfer-Encoding: binary',
+            'Content-ID: {}'.format(content_id).encode('utf-8'),
+            b'',
+            _serialize_subrequest(request)])
+    body.extend([delimiter + b'--', b''])
+
+    batch = HttpRequest('POST', url, headers={
+        'x-ms-version': BATCH_VERSION,
+        'Content-Type': 'multipart/mixed; boundary={}'.format(boundary),
+    })
+    batch.set_bytes_body(_CRLF.join(body))
+    return batch
+
+
+def _parse_headers(block):
+    headers = {}
+    for line in block.split(_CRLF):
+        if line:
+            name, _, value = line.decode('utf-8').partition(':')
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _parse_subresponse(request, data):
+    status_line, _, data = data.partition(_CRLF)
+    if data.startswith(_CRLF):
+        header_block, body = b'', data[len(_CRLF):]
+    else:
+        header_block, _, body = data.partition(_CRLF + _CRLF)
+    _, status_code, reason = status_line.decode('utf-8').split(' ', 2)
+    headers = _parse_headers(header_block)
+    if 'content-length' in headers:
+        body = body[:int(headers['content-length'])]
+    return _BatchSubResponse(request, int(status_code), reason, headers, body)
+
+
+def parse_batch_response(response, body, requests):
+    # type: (HttpResponse, bytes, List[HttpRequest]) -> List[HttpResponse]
+    """Split the multipart/mixed batch response into the responses of the sub-requests.
+
+    The responses are returned in the order of the sub-requests, matched by their Content-ID.
+    """
+    content_type = response.headers.get('Content-Type') or ''
+    boundary = None
+    for param in content_type.split(';')[1:]:
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'boundary':
+            boundary = value.strip('"')
+    if not boundary:
+        raise HttpResponseError(message="The batch response is not a multipart response.", response=response)
+
+    subresponses = [None] * len(requests)  # type: List[Any]
+    parts = body.split(b'--' + boundary.encode('utf-8'))[1:]
+    for index, part in enumerate(parts):
+        if part.startswith(b'--'):
+            # The close delimiter
+            break
+        if part.startswith(_CRLF):
+            part = part[len(_CRLF):]
+        if part.endswith(_CRLF):
+            part = part[:-len(_CRLF)]
+        part_headers, _, data = part.partition(_CRLF + _CRLF)
+        content_id = _parse_headers(part_headers).get('content-id')
+        if content_id is not None:
+            index = int(content_id)
+        if index < len(requests):
+            subresponses[index] = _parse_subresponse(requests[index], data)
+
+    if any(s is None for s in subresponses):
+        raise HttpResponseError(
+            message="The batch response is missing the responses of some sub-requests.", response=response)
+    return subresponses
+
+
+def process_batch_results(subresponses, deserialize):
+    # type: (List[HttpResponse], Any) -> List[Any]
+    """The response headers of each sub-request that succeeded, or the error of each one that failed."""
+    results = []
+    for subresponse in subresponses:
+        if 200 <= subresponse.status_code < 300:
+            results.append(normalize_headers(subresponse.headers))
+            continue
+        try:
+            process_storage_error(StorageErrorException(subresponse, deserialize))
+        except HttpResponseError as error:
+            results.append(error)
+    return results
+
+
+def raise_on_any_failure(results, response):
+    failures = sum(1 for r in results if isinstance(r, HttpResponseError))
+    if failures:
+        raise PartialBatchErrorException(
+            message="{} of {} batch sub-requests failed.".format(failures, len(results)),
+            response=response,
+            parts=results)
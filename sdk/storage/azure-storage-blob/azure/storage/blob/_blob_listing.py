@@ -0,0 +1,275 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import heapq
+import threading
+from itertools import count
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple # pylint: disable=unused-import
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # type: ignore
+
+from ._generated.models import BlobItem, BlobPrefix as GeneratedBlobPrefix
+from .models import BlobProperties
+
+_POLL_INTERVAL = 0.1
+
+
+def get_listing_checkpoint(prefixes=None, name_starts_with=None, delimiter=None):
+    # type: (Optional[List[str]], Optional[str], Optional[str]) -> List[List[Any]]
+    """Build the shards of a parallel listing, as [prefix, delimiter, marker] entries.
+
+    With caller-supplied prefixes, each prefix is a shard. Otherwise the listing starts with
+    a single shard listing name_starts_with with the delimiter: it returns the blobs directly
+    under name_starts_with, and the virtual directories it finds become shards of their own.
+    """
+    if prefixes is not None:
+        prefixes = sorted(set(prefixes))
+        for prefix, following in zip(prefixes, prefixes[1:]):
+            if following.startswith(prefix):
+                raise ValueError(
+                    "Listing prefixes must not overlap: '{}' starts with '{}'.".format(following, prefix))
+        return [[prefix, None, ''] for prefix in prefixes]
+    return [[name_starts_with or '', delimiter, '']]
+
+
+def get_page_blobs(paged):
+    # type: (Any) -> List[BlobProperties]
+    """The blobs of the current page of a BlobPropertiesPaged or BlobPrefix listing.
+
+    The virtual directories of a hierarchical listing are skipped.
+    """
+    blobs = []
+    for item in paged.current_page:
+        if isinstance(item, BlobItem):
+            item = BlobProperties._from_generated(item)  # pylint: disable=protected-access
+            item.container = paged.container
+        if isinstance(item, BlobProperties):
+            blobs.append(item)
+    return blobs
+
+
+def get_page_prefixes(paged):
+    # type: (Any) -> List[str]
+    """The names of the virtual directories of the current page of a BlobPrefix listing."""
+    return [item.name for item in paged.current_page if isinstance(item, GeneratedBlobPrefix)]
+
+
+def get_blob_pages(paged):
+    """Yield the (blobs, prefixes, next_marker) pages of a BlobPropertiesPaged or BlobPrefix listing."""
+    while paged.next_marker is not None:
+        paged._advance_page()  # pylint: disable=protected-access
+        yield get_page_blobs(paged), get_page_prefixes(paged), paged.next_marker
+
+
+def get_page_items(blobs, shards):
+    # type: (List[BlobProperties], List[Tuple[str, Any]]) -> List[Tuple[str, Optional[BlobProperties], Any]]
+    """The blobs and the (prefix, shard) shards of a page of a hierarchical listing, in name order.
+
+    The names under a prefix sort right after it, and before any name that does not start
+    with it, so the blobs of a shard are returned in name order at the place of its prefix.
+    """
+    items = [(blob.name, blob, None) for blob in blobs]
+    items.extend((prefix, None, index) for prefix, index in shards)
+    items.sort(key=lambda item: item[0])
+    return items
+
+
+class ParallelBlobListing(object):
+    """An iterable of the blobs of a container, listed by shards of its keyspace in parallel.
+
+    Each shard lists the blobs whose names start with a prefix, following its continuation
+    markers one page at a time. A shard with a delimiter returns the blobs directly under its
+    prefix, and each virtual directory it finds becomes a shard without delimiter, started as
+    soon as its page comes in. Unordered, the blobs are returned as the pages of the shards come
+    in, and up to max_connections shards are listed at once. Ordered, they are returned in
+    name order: the shards do not overlap, so this only holds the pages of the shards ahead
+    of the one being consumed, at most two pages per shard. The shards with a delimiter are
+    merged with the others, so each of them is listed by a worker of its own, and so are,
+    one after the other, the shards without delimiter of a resumed listing next to them: up to
+    max_connections + 1 shards are listed at once, plus one per shard with a delimiter.
+
+    :ivar list checkpoint:
+        The progress of the listing, as a list of [prefix, delimiter, marker] shards. The marker
+        is '' for a shard that was not started yet, and None for a shard that was listed to the end.
+        It can be saved, for example as JSON, and passed to list_blobs_parallel to resume an
+        interrupted listing. A page is only checkpointed once all of its blobs were consumed, so a
+        resumed listing may return again the blobs of the page being consumed when it stopped.
+
+    :param callable list_pages: Function of (prefix, delimiter, marker), returning the
+        (blobs, prefixes, next_marker) pages of a shard.
+    :param list checkpoint: The shards to list.
+    :param bool ordered: Whether to return the blobs in name order.
+    :param int max_connections: The maximum number of shards listed at once, not counting
+        the workers of the shards with a delimiter of an ordered listing.
+    """
+
+    def __init__(self, list_pages, checkpoint, ordered=False, max_connections=4):
+        # type: (Callable[..., Iterator[Tuple[List[BlobProperties], List[str], Optional[str]]]], List[List[Any]], bool, int) -> None
+        self.checkpoint = checkpoint
+        self.ordered = ordered
+        self.max_connections = max(1, max_connections)
+        self._list_pages = list_pages
+        self._stopped = threading.Event()
+        self._executor = None
+        self._iterator = None  # type: Optional[Iterator[BlobProperties]]
+        self._shards = dict((shard[0], i) for i, shard in enumerate(checkpoint) if not shard[1])
+        self._queues = {}  # type: Dict[int, queue.Queue]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # type: () -> BlobProperties
+        if self._iterator is None:
+            self._iterator = self._ordered_blobs() if self.ordered else self._unordered_blobs()
+        return next(self._iterator)
+
+    next = __next__
+
+    def close(self):
+        # type: () -> None
+        """Stop listing. Requests already in flight complete, but their pages are discarded."""
+        self._stopped.set()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    def _put(self, pages, page):
+        while not self._stopped.is_set():
+            try:
+                pages.put(page, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                pass
+
+    def _list_shard(self, index, pages):
+        if self._stopped.is_set():
+            return
+        prefix, delimiter, marker = self.checkpoint[index]
+        try:
+            for blobs, prefixes, next_marker in self._list_pages(prefix, delimiter, marker):
+                if self._stopped.is_set():
+                    return
+                self._put(pages, (index, blobs, prefixes, next_marker, None))
+        except Exception as error:  # pylint: disable=broad-except
+            self._put(pages, (index, None, None, None, error))
+
+    def _list_shards(self, indexes):
+        for index in indexes:
+            self._list_shard(index, self._queues[index])
+
+    def _add_shards(self, prefixes, pages=None):
+        # type: (List[str], Optional[queue.Queue]) -> List[Tuple[str, int]]
+        """Start listing the virtual directories found by a shard, unless they are shards already.
+
+        A resumed listing finds again the directories of the page it stopped at.
+        """
+        shards = []
+        for prefix in prefixes:
+            if prefix in self._shards:
+                continue
+            index = len(self.checkpoint)
+            self.checkpoint.append([prefix, None, ''])
+            self._shards[prefix] = index
+            self._queues[index] = pages or queue.Queue(maxsize=2)
+            self._executor.submit(self._list_shard, index, self._queues[index])
+            shards.append((prefix, index))
+        return shards
+
+    def _start(self, workers):
+        import concurrent.futures
+        self._executor = concurrent.futures.ThreadPoolExecutor(workers)
+
+    def _shard_blobs(self, pages):
+        """Yield the blobs of the pages of a queue, checkpointing each page once consumed."""
+        while True:
+            index, blobs, _, next_marker, error = pages.get()
+            if error is not None:
+                raise error
+            for blob in blobs:
+                yield blob
+            self.checkpoint[index][2] = next_marker
+            if next_marker is None:
+                return
+
+    def _nested_blobs(self, pages):
+        """Yield the blobs of a shard with a delimiter, and of the shards it finds, in name order."""
+        while True:
+            index, blobs, prefixes, next_marker, error = pages.get()
+            if error is not None:
+                raise error
+            for _, blob, shard in get_page_items(blobs, self._add_shards(prefixes)):
+                if blob is None:
+                    for blob in self._shard_blobs(self._queues[shard]):
+                        yield blob
+                else:
+                    yield blob
+            self.checkpoint[index][2] = next_marker
+            if next_marker is None:
+                return
+
+    def _unordered_blobs(self):
+        pending = [i for i, shard in enumerate(self.checkpoint) if shard[2] is not None]
+        pages = queue.Queue(maxsize=self.max_connections)  # type: queue.Queue
+        self._start(self.max_connections)
+        try:
+            for index in pending:
+                self._executor.submit(self._list_shard, index, pages)
+            remaining = len(pending)
+            while remaining:
+                # The pages of a shard come in order, and a shard ends with its last page.
+                index, blobs, prefixes, next_marker, error = pages.get()
+                if error is not None:
+                    raise error
+                remaining += len(self._add_shards(prefixes, pages))
+                for blob in blobs:
+                    yield blob
+                self.checkpoint[index][2] = next_marker
+                if next_marker is None:
+                    remaining -= 1
+        finally:
+            self.close()
+
+    def _ordered_blobs(self):
+        pending = sorted(
+            (i for i, shard in enumerate(self.checkpoint) if shard[2] is not None),
+            key=lambda i: self.checkpoint[i][0])
+        # The shards without a delimiter are disjoint ranges of names, and are returned one after
+        # the other. A shard with a delimiter interleaves with them, so it is merged in and gets a
+        # worker of its own, to be listed alongside the shard being consumed. The shards it finds
+        # are returned in its stream, and listed by the other workers in the order they are found.
+        flat = [i for i in pending if not self.checkpoint[i][1]]
+        nested = [i for i in pending if self.checkpoint[i][1]]
+        self._queues.update((i, queue.Queue(maxsize=2)) for i in pending)
+        self._start(self.max_connections + len(nested) + (1 if nested and flat else 0))
+        try:
+            for index in nested:
+                self._executor.submit(self._list_shard, index, self._queues[index])
+            if nested and flat:
+                # The shards of a resumed listing come first in name order. They are listed one
+                # after the other, so that they leave the workers to the shards found later on.
+                self._executor.submit(self._list_shards, flat)
+            else:
+                for index in flat:
+                    self._executor.submit(self._list_shard, index, self._queues[index])
+
+            def _flat_blobs():
+                for index in flat:
+                    for blob in self._shard_blobs(self._queues[index]):
+                        yield blob
+
+            streams = [_flat_blobs()] + [self._nested_blobs(self._queues[i]) for i in nested]
+            # Key on the name, then on the stream and the position in it: a stream can hold the
+            # same name more than once, the snapshots of a blob.
+            keyed = [
+                ((blob.name, stream_index, position, blob) for position, blob in zip(count(), stream))
+                for stream_index, stream in enumerate(streams)]
+            for _, _, _, blob in heapq.merge(*keyed):
+                yield blob
+        finally:
+            self.close()
@@ -5,14 +5,22 @@
 # --------------------------------------------------------------------------
 # pylint: disable=no-self-use
 
+import hashlib
+import os
 import sys
 from io import BytesIO, SEEK_SET, UnsupportedOperation
-from typing import Optional, Union, Any, TypeVar, TYPE_CHECKING # pylint: disable=unused-import
+from typing import Optional, Union, Any, List, Tuple, TypeVar, TYPE_CHECKING # pylint: disable=unused-import
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse # type: ignore
 
 import six
-from azure.core.exceptions import ResourceExistsError, ResourceModifiedError
+from azure.core.exceptions import HttpResponseError, ResourceExistsError, ResourceModifiedError
 
 from ._shared.utils import (
+    encode_base64,
+    parse_query,
     process_storage_error,
     validate_and_format_range_headers,
     parse_length_from_content_range,
@@ -22,15 +30,29 @@ from ._shared.upload_chunking import (
     upload_blob_chunks,
     upload_blob_substream_blocks,
     BlockBlobChunkUploader,
+    GCMBlockBlobChunkUploader,
     PageBlobChunkUploader,
     AppendBlobChunkUploader)
 from ._shared.download_chunking import (
     process_content,
+    process_encrypted_regions,
     process_range_and_offset,
+    download_chunks,
+    download_chunks_in_order,
+    write_at,
     ParallelBlobChunkDownloader,
+    PositionalBlobChunkDownloader,
     SequentialBlobChunkDownloader
 )
-from ._shared.encryption import _generate_blob_encryption_data, _encrypt_blob
+from ._shared.encryption import (
+    _ENCRYPTION_PROTOCOL_V1,
+    _ENCRYPTION_PROTOCOL_V2,
+    _generate_blob_encryption_data,
+    _encrypt_blob,
+    _get_encrypted_blob_length,
+    _get_blob_encrypted_regions,
+    _EncryptedRegions)
+from ._shared.autotune import TransferTuner, _MIN_CHUNK_SIZE
 from ._generated.models import (
     StorageErrorException,
     BlockLookupList,
@@ -47,6 +69,26 @@ if TYPE_CHECKING:
 _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE = 4 * 1024 * 1024
 _ERROR_VALUE_SHOULD_BE_SEEKABLE_STREAM = '{0} should be a seekable file-like/io.IOBase type stream object.'
 
+# A block blob commits at most 50,000 blocks, and Put Block From URL reads at most 100MiB
+_MAX_BLOCKS = 50000
+_MAX_COPY_BLOCK_SIZE = 100 * 1024 * 1024
+
+# The service returns a transactional MD5 for ranges of at most 4MiB
+_MAX_MD5_RANGE_SIZE = 4 * 1024 * 1024
+
+
+def get_upload_tuner(length, block_size, max_connections):
+    # type: (Optional[int], int, int) -> TransferTuner
+    """The tuner of an autotuned block upload.
+
+    When the length is known, the blocks never shrink below the size that fits the
+    blob in the blocks a block blob can commit.
+    """
+    min_block_size = None
+    if length is not None:
+        min_block_size = max(_MIN_CHUNK_SIZE, -(-length // _MAX_BLOCKS))
+    return TransferTuner(block_size, max_connections, min_chunk_size=min_block_size)
+
 
 def _convert_mod_error(error):
     message = error.message.replace(
@@ -118,6 +160,8 @@ def upload_block_blob(  # pylint: disable=too-many-locals
         blob_settings,
         require_encryption,
         key_encryption_key,
+        encryption_version=_ENCRYPTION_PROTOCOL_V1,
+        autotune=False,
         **kwargs):
     try:
         overwrite_mod_conditions = None
@@ -125,10 +169,17 @@ def upload_block_blob(  # pylint: disable=too-many-locals
             overwrite_mod_conditions = get_modification_conditions(if_none_match='*')
         adjusted_count = length
         if (key_encryption_key is not None) and (adjusted_count is not None):
-            adjusted_count += (16 - (length % 16))
-
-        # Do single put if the size is smaller than config.max_single_put_size
-        if adjusted_count is not None and (adjusted_count < blob_settings.max_single_put_size):
+            adjusted_count = _get_encrypted_blob_length(length, encryption_version)
+
+        # Do single put if the size is smaller than config.max_single_put_size.
+        # An autotuned upload stages anything larger than a block, so it can tune the blocks.
+        tuner = None
+        if autotune:
+            tuner = get_upload_tuner(adjusted_count, blob_settings.max_block_size, max_connections)
+        max_single_put_size = blob_settings.max_single_put_size
+        if tuner:
+            max_single_put_size = min(max_single_put_size, blob_settings.max_block_size + 1)
+        if adjusted_count is not None and (adjusted_count < max_single_put_size):
             try:
                 data = data.read(length)
                 if not isinstance(data, six.binary_type):
@@ -136,7 +187,7 @@ def upload_block_blob(  # pylint: disable=too-many-locals
             except AttributeError:
                 pass
             if key_encryption_key:
-                encryption_data, data = _encrypt_blob(data, key_encryption_key)
+                encryption_data, data = _encrypt_blob(data, key_encryption_key, encryption_version)
                 headers['x-ms-meta-encryptiondata'] = encryption_data
             return client.upload(
                 data,
@@ -153,16 +204,26 @@ def upload_block_blob(  # pylint: disable=too-many-locals
                 **kwargs)
 
         cek, iv, encryption_data = None, None, None
-        use_original_upload_path = blob_settings.use_byte_buffer or \
-            validate_content or require_encryption or \
-            blob_settings.max_block_size < blob_settings.min_large_block_upload_threshold or \
-            hasattr(stream, 'seekable') and not stream.seekable() or \
-            not hasattr(stream, 'seek') or not hasattr(stream, 'tell')
+        # A memoryview (e.g. of a memory-mapped file) is always staged as zero-copy slices
+        use_original_upload_path = not isinstance(stream, memoryview) and (
+            blob_settings.use_byte_buffer or
+            validate_content or require_encryption or key_encryption_key is not None or
+            blob_settings.max_block_size < blob_settings.min_large_block_upload_threshold or
+            hasattr(stream, 'seekable') and not stream.seekable() or
+            not hasattr(stream, 'seek') or not hasattr(stream, 'tell'))
 
         if use_original_upload_path:
+            uploader_class = BlockBlobChunkUploader
+            uploader_options = {}
             if key_encryption_key:
-                cek, iv, encryption_data = _generate_blob_encryption_data(key_encryption_key)
+                cek, iv, encryption_data = _generate_blob_encryption_data(key_encryption_key, encryption_version)
                 headers['x-ms-meta-encryptiondata'] = encryption_data
+                if encryption_version == _ENCRYPTION_PROTOCOL_V2:
+                    # The blocks hold whole regions, which are encrypted as they are staged
+                    uploader_class = GCMBlockBlobChunkUploader
+                    uploader_options['encrypted_regions'] = _EncryptedRegions(cek)
+                    cek = None
+            uploader_options.update(kwargs)
             block_ids = upload_blob_chunks(
                 blob_service=client,
                 blob_size=length,
@@ -171,11 +232,12 @@ def upload_block_blob(  # pylint: disable=too-many-locals
                 max_connections=max_connections,
                 validate_content=validate_content,
                 access_conditions=access_conditions,
-                uploader_class=BlockBlobChunkUploader,
+                uploader_class=uploader_class,
                 timeout=timeout,
                 content_encryption_key=cek,
                 initialization_vector=iv,
-                **kwargs
+                tuner=tuner,
+                **uploader_options
             )
         else:
             block_ids = upload_blob_substream_blocks(
@@ -188,12 +250,13 @@ def upload_block_blob(  # pylint: disable=too-many-locals
                 access_conditions=access_conditions,
                 uploader_class=BlockBlobChunkUploader,
                 timeout=timeout,
+                tuner=tuner,
                 **kwargs
             )
 
         block_lookup = BlockLookupList(committed=[], uncommitted=[], latest=[])
         block_lookup.latest = block_ids
-        return client.commit_block_list(
+        response = client.commit_block_list(
             block_lookup,
             blob_http_headers=blob_headers,
             lease_access_conditions=access_conditions,
@@ -203,6 +266,9 @@ def upload_block_blob(  # pylint: disable=too-many-locals
             validate_content=validate_content,
             headers=headers,
             **kwargs)
+        if tuner:
+            response['autotune_settings'] = tuner.settings()
+        return response
     except StorageErrorException as error:
         try:
             process_storage_error(error)
@@ -385,6 +451,70 @@ def upload_append_blob(
         process_storage_error(error)
 
 
+def get_copy_blocks(source_url, source_length, source_etag, block_size):
+    # type: (str, int, Optional[str], int) -> List[Tuple[str, int, int]]
+    """The (block ID, offset, length) of the blocks a source is copied in.
+
+    The IDs derive from the source, its ETag and the block size, so a copy started again
+    after a failure finds the blocks it already staged, unless the source changed.
+    """
+    if block_size > _MAX_COPY_BLOCK_SIZE:
+        raise ValueError("The block size of a copy must not exceed {} bytes.".format(_MAX_COPY_BLOCK_SIZE))
+    block_size = max(block_size, -(-source_length // _MAX_BLOCKS))
+    if block_size > _MAX_COPY_BLOCK_SIZE:
+        raise ValueError("The source is too large to be copied in blocks.")
+    parsed_url = urlparse(source_url)
+    snapshot, _ = parse_query(parsed_url.query)
+    source = u'|'.join([
+        parsed_url.netloc, parsed_url.path, snapshot or u'', source_etag or u'', str(source_length), str(block_size)])
+    prefix = hashlib.md5(source.encode('utf-8')).hexdigest()[:16]
+    return [
+        ('{}-{:05d}'.format(prefix, index), offset, min(block_size, source_length - offset))
+        for index, offset in enumerate(range(0, source_length, block_size))]
+
+
+def stage_blocks_from_url(client, source_url, blocks, max_connections, access_conditions, timeout, **kwargs):
+    # type: (Any, str, List[Tuple[str, int, int]], int, Any, Optional[int], Any) -> int
+    """Stages the blocks of a copy that are not staged already, up to max_connections at once.
+
+    Returns the number of blocks staged.
+    """
+    try:
+        block_list = client.get_block_list(
+            list_type='uncommitted',
+            lease_access_conditions=access_conditions,
+            timeout=timeout)
+        staged = set((b.name, b.size) for b in block_list.uncommitted_blocks or [])
+    except StorageErrorException as error:
+        if error.response.status_code != 404:
+            raise
+        staged = set()
+    pending = [b for b in blocks if (encode_base64(b[0]), b[2]) not in staged]
+
+    def _stage_block(block):
+        block_id, offset, length = block
+        client.stage_block_from_url(
+            encode_base64(block_id),
+            content_length=0,
+            source_url=source_url,
+            source_range='bytes={0}-{1}'.format(offset, offset + length - 1),
+            timeout=timeout,
+            lease_access_conditions=access_conditions,
+            **kwargs)
+
+    if max_connections > 1 and len(pending) > 1:
+        import concurrent.futures
+        executor = concurrent.futures.ThreadPoolExecutor(max_connections)
+        try:
+            list(executor.map(_stage_block, pending))
+        finally:
+            executor.shutdown(wait=False)
+    else:
+        for block in pending:
+            _stage_block(block)
+    return len(pending)
+
+
 def deserialize_metadata(response, _, headers):  # pylint: disable=unused-argument
     raw_metadata = {k: v for k, v in response.headers.items() if k.startswith("x-ms-meta-")}
     return {k[10:]: v for k, v in raw_metadata.items()}
@@ -419,17 +549,49 @@ def deserialize_container_properties(response, obj, headers):
     return container_properties
 
 
+def get_initial_regions(encrypted_regions, encrypted_size, content_range, start, end, first_get_size):
+    """Plan the initial content of a download of a blob encrypted in regions.
+
+    The initial response is used for the whole regions it holds. It has to be downloaded
+    again if it does not start on the first region of the range, or is too short to hold
+    a whole region.
+
+    :returns: The encrypted range to download again, or None, the length of the whole
+        regions of the response, the offset and length of the initial content in the
+        decrypted regions, and the last byte of the initial content.
+    """
+    region_start, _, start_offset = encrypted_regions.get_range(start, start)
+    received_start, received_end = 0, encrypted_size - 1
+    if content_range is not None:
+        received_start, received_end = [int(i) for i in content_range.split(' ', 1)[1].split('/', 1)[0].split('-')]
+    if received_end >= encrypted_size - 1:
+        regions_end = encrypted_size
+    else:
+        regions_end = (received_end + 1) // encrypted_regions.region_length * encrypted_regions.region_length
+
+    download_range = None
+    if received_start != region_start or regions_end <= region_start:
+        initial_end = min(end, start + first_get_size - 1)
+        region_start, region_end, start_offset = encrypted_regions.get_range(start, initial_end)
+        download_range = (region_start, region_end)
+        regions_end = min(region_end + 1, encrypted_size)
+
+    initial_end = min(end, encrypted_regions.get_data_length(regions_end) - 1)
+    return download_range, regions_end - region_start, (start_offset, initial_end - start + 1), initial_end
+
+
 class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attributes
     """A streaming object to download a blob.
 
     The stream downloader can iterated, or download to open file or stream
-    over multiple threads.
+    over multiple threads. When the download is autotuned, the chunk size and
+    number of connections it settled on are reported in `autotune_settings`.
     """
 
     def __init__(
             self, name, container, service, config, offset, length, validate_content,
             access_conditions, mod_conditions, timeout,
-            require_encryption, key_encryption_key, key_resolver_function, **kwargs
+            require_encryption, key_encryption_key, key_resolver_function, autotune=False, **kwargs
     ):
         self.service = service
         self.config = config
@@ -445,12 +607,17 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         self.request_options = kwargs
         self.location_mode = None
         self._download_complete = False
+        self._encrypted_regions = None
+        self._initial_encrypted_length = None
+        self.autotune = autotune
+        self.autotune_settings = None
 
         # The service only provides transactional MD5s for chunks under 4MB.
         # If validate_content is on, get only self.MAX_CHUNK_GET_SIZE for the first
-        # chunk so a transactional MD5 can be retrieved.
-        self.first_get_size = self.config.max_single_get_size if not self.validate_content \
-            else self.config.max_chunk_get_size
+        # chunk so a transactional MD5 can be retrieved. An autotuned download also starts
+        # small, and grows the chunks from there.
+        self.first_get_size = self.config.max_single_get_size \
+            if not (self.validate_content or self.autotune) else self.config.max_chunk_get_size
         initial_request_start = self.offset if self.offset is not None else 0
         if self.length is not None and self.length - self.offset < self.first_get_size:
             initial_request_end = self.length
@@ -486,35 +653,86 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         return self.download_size
 
     def __iter__(self):
-        if self.download_size == 0:
-            content = b""
-        else:
-            content = process_content(
-                self.blob,
-                self.initial_offset[0],
-                self.initial_offset[1],
-                self.require_encryption,
-                self.key_encryption_key,
-                self.key_resolver_function)
+        return self.chunks()
+
+    def chunks(self, max_connections=1):
+        """Iterate over the contents of this blob, in order, as chunks of bytes.
 
+        With more than one connection, up to max_connections ranges are downloaded
+        ahead of the consumer. Chunks are still yielded in order, and at most
+        max_connections downloaded chunks are held in memory at once.
+
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :rtype: Iterator[bytes]
+        """
+        content = self._initial_content()
         if content is not None:
             yield content
         if self._download_complete:
             return
 
+        downloader = self._get_downloader(SequentialBlobChunkDownloader, None)
+        tuner = self._get_tuner(max_connections)
+        if max_connections > 1 or tuner:
+            for chunk in download_chunks_in_order(downloader, max_connections, tuner=tuner):
+                yield chunk
+        else:
+            for chunk in downloader.get_chunk_offsets():
+                yield downloader.yield_chunk(chunk)
+        self._set_autotune_settings(tuner)
+
+    def _get_tuner(self, max_connections):
+        if not self.autotune:
+            return None
+        # Chunks must stay small enough to get their MD5 from the service
+        max_chunk_size = _MAX_MD5_RANGE_SIZE if self.validate_content else None
+        return TransferTuner(self.config.max_chunk_get_size, max_connections, max_chunk_size=max_chunk_size)
+
+    def _set_autotune_settings(self, tuner):
+        if tuner:
+            self.autotune_settings = tuner.settings()
+
+    def _initial_content(self):
+        if self.download_size == 0:
+            return b""
+        if self._encrypted_regions is not None:
+            return process_encrypted_regions(
+                self.blob,
+                self._encrypted_regions,
+                self.initial_offset[0],
+                self.initial_offset[1],
+                encrypted_length=self._initial_encrypted_length)
+        return process_content(
+            self.blob,
+            self.initial_offset[0],
+            self.initial_offset[1],
+            self.require_encryption,
+            self.key_encryption_key,
+            self.key_resolver_function)
+
+    def _get_downloader(self, downloader_class, stream, **kwargs):
         end_blob = self.blob_size
         if self.length is not None:
             # Use the length unless it is over the end of the blob
             end_blob = min(self.blob_size, self.length + 1)
 
-        downloader = SequentialBlobChunkDownloader(
+        chunk_size = self.config.max_chunk_get_size
+        if self._encrypted_regions is not None:
+            # The chunks hold whole regions, so no region is downloaded twice
+            data_length = self._encrypted_regions.data_length
+            chunk_size = max(1, chunk_size // data_length) * data_length
+            kwargs['encrypted_regions'] = self._encrypted_regions
+
+        kwargs.update(self.request_options)
+        return downloader_class(
             blob_service=self.service,
             download_size=self.download_size,
-            chunk_size=self.config.max_chunk_get_size,
+            chunk_size=chunk_size,
             progress=self.first_get_size,
             start_range=self.initial_range[1] + 1,  # start where the first download ended
             end_range=end_blob,
-            stream=None,
+            stream=stream,
             validate_content=self.validate_content,
             access_conditions=self.access_conditions,
             mod_conditions=self.mod_conditions,
@@ -524,10 +742,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             key_resolver_function=self.key_resolver_function,
             use_location=self.location_mode,
             cls=deserialize_blob_stream,
-            **self.request_options)
-
-        for chunk in downloader.get_chunk_offsets():
-            yield downloader.yield_chunk(chunk)
+            **kwargs)
 
     def _initial_request(self):
         range_header, range_validation = validate_and_format_range_headers(
@@ -589,17 +804,67 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             else:
                 process_storage_error(error)
 
-        # If the blob is small, the download is complete at this point.
-        # If blob size is large, download the rest of the blob in chunks.
-        if blob.properties.size != self.download_size:
+        if self.blob_size and (self.key_encryption_key is not None or self.key_resolver_function is not None):
+            blob = self._initial_encrypted_regions(blob)
+        else:
+            # If the blob is small, the download is complete at this point.
+            # If blob size is large, download the rest of the blob in chunks.
+            self._download_complete = blob.properties.size == self.download_size
+
+        if not self._download_complete:
             # Lock on the etag. This can be overriden by the user by specifying '*'
             if not self.mod_conditions:
                 self.mod_conditions = ModifiedAccessConditions()
             if not self.mod_conditions.if_match:
                 self.mod_conditions.if_match = blob.properties.etag
-        else:
+
+        return blob
+
+    def _initial_encrypted_regions(self, blob):
+        # A blob encrypted with version 2.0 is downloaded in whole regions, and the
+        # sizes are those of the plain text.
+        try:
+            self._encrypted_regions = _get_blob_encrypted_regions(
+                self.require_encryption,
+                self.key_encryption_key,
+                self.key_resolver_function,
+                blob.response.headers)
+        except Exception as error:
+            raise HttpResponseError(message="Decryption failed.", response=blob.response, error=error)
+        if self._encrypted_regions is None:
+            self._download_complete = blob.properties.size == self.download_size
+            return blob
+
+        encrypted_size = self.blob_size
+        self.blob_size = self._encrypted_regions.get_data_length(encrypted_size)
+        start = self.offset or 0
+        end = self.blob_size - 1 if self.length is None else min(self.length, self.blob_size - 1)
+        self.download_size = max(0, end - start + 1)
+        if not self.download_size:
             self._download_complete = True
+            return blob
 
+        download_range, self._initial_encrypted_length, self.initial_offset, initial_end = get_initial_regions(
+            self._encrypted_regions, encrypted_size, blob.properties.content_range, start, end, self.first_get_size)
+        self.initial_range = (start, initial_end)
+        self._download_complete = initial_end == end
+        if download_range is not None:
+            if not self.mod_conditions:
+                self.mod_conditions = ModifiedAccessConditions()
+            if not self.mod_conditions.if_match:
+                self.mod_conditions.if_match = blob.properties.etag
+            try:
+                _, blob = self.service.download(
+                    timeout=self.timeout,
+                    range=validate_and_format_range_headers(*download_range)[0],
+                    lease_access_conditions=self.access_conditions,
+                    modified_access_conditions=self.mod_conditions,
+                    cls=deserialize_blob_stream,
+                    data_stream_total=None,
+                    download_stream_current=0,
+                    **self.request_options)
+            except StorageErrorException as error:
+                process_storage_error(error)
         return blob
 
 
@@ -649,16 +914,7 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             except (NotImplementedError, AttributeError):
                 raise ValueError(error_message)
 
-        if self.download_size == 0:
-            content = b""
-        else:
-            content = process_content(
-                self.blob,
-                self.initial_offset[0],
-                self.initial_offset[1],
-                self.require_encryption,
-                self.key_encryption_key,
-                self.key_resolver_function)
+        content = self._initial_content()
         # Write the content to the user stream
         # Clear blob content since output has been written to user stream
         if content is not None:
@@ -666,37 +922,53 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         if self._download_complete:
             return self.properties
 
-        end_blob = self.blob_size
-        if self.length is not None:
-            # Use the length unless it is over the end of the blob
-            end_blob = min(self.blob_size, self.length + 1)
-
         downloader_class = ParallelBlobChunkDownloader if max_connections > 1 else SequentialBlobChunkDownloader
-        downloader = downloader_class(
-            blob_service=self.service,
-            download_size=self.download_size,
-            chunk_size=self.config.max_chunk_get_size,
-            progress=self.first_get_size,
-            start_range=self.initial_range[1] + 1,  # start where the first download ended
-            end_range=end_blob,
-            stream=stream,
-            validate_content=self.validate_content,
-            access_conditions=self.access_conditions,
-            mod_conditions=self.mod_conditions,
-            timeout=self.timeout,
-            require_encryption=self.require_encryption,
-            key_encryption_key=self.key_encryption_key,
-            key_resolver_function=self.key_resolver_function,
-            use_location=self.location_mode,
-            cls=deserialize_blob_stream,
-            **self.request_options)
+        downloader = self._get_downloader(downloader_class, stream)
+        tuner = self._get_tuner(max_connections)
+        download_chunks(downloader, max_connections, tuner=tuner)
+        self._set_autotune_settings(tuner)
+        return self.properties
 
-        if max_connections > 1:
-            import concurrent.futures
-            executor = concurrent.futures.ThreadPoolExecutor(max_connections)
-            list(executor.map(downloader.process_chunk, downloader.get_chunk_offsets()))
-        else:
-            for chunk in downloader.get_chunk_offsets():
-                downloader.process_chunk(chunk)
+    def download_to_path(self, file_path, max_connections=1):
+        """Download the contents of this blob to a local file.
+
+        The file is created, or truncated, and preallocated to the size of the download.
+        Each chunk is then written at its own offset with os.pwrite, so parallel
+        connections do not contend on a shared file position. On platforms without
+        os.pwrite this falls back to :func:`download_to_stream`.
+
+        :param str file_path:
+            The path of the file to download to.
+        :param int max_connections:
+            The number of parallel connections with which to download.
+        :returns: The properties of the downloaded blob.
+        :rtype: ~azure.storage.blob.models.BlobProperties
+        """
+        if not hasattr(os, 'pwrite'):
+            with open(file_path, 'wb') as stream:
+                return self.download_to_stream(stream, max_connections=max_connections)
+
+        with open(file_path, 'wb') as stream:
+            fileno = stream.fileno()
+            content = self._initial_content() or b""
+            if self.download_size:
+                _preallocate(fileno, self.download_size)
+            write_at(fileno, content, 0)
+            if self._download_complete:
+                return self.properties
+
+            downloader = self._get_downloader(PositionalBlobChunkDownloader, fileno, file_offset=len(content))
+            tuner = self._get_tuner(max_connections)
+            download_chunks(downloader, max_connections, tuner=tuner)
+            self._set_autotune_settings(tuner)
 
         return self.properties
+
+
+def _preallocate(fileno, size):
+    try:
+        os.posix_fallocate(fileno, 0, size)
+    except (AttributeError, OSError):
+        # Not every platform or file system can reserve the blocks up front,
+        # extending the file still avoids growing it chunk by chunk.
+        os.ftruncate(fileno, size)
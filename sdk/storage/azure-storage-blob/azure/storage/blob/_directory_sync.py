@@ -0,0 +1,287 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import calendar
+import hashlib
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING # pylint: disable=unused-import
+
+from ._shared.models import DictMixin
+from .models import ContentSettings
+
+if TYPE_CHECKING:
+    from .container_client import ContainerClient  # pylint: disable=unused-import
+    from .models import BlobProperties  # pylint: disable=unused-import
+
+
+# The number of small files transferred one after the other by a task of the worker pool
+SMALL_FILE_BATCH_SIZE = 16
+_MD5_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class DirectorySyncReport(DictMixin):
+    """The differences found between a local directory and the blobs under a prefix,
+    and the transfers made to remove them.
+
+    :ivar str direction:
+        The direction of the sync, 'upload' or 'download'.
+    :ivar bool dry_run:
+        Whether the differences were only reported, without transferring any file.
+    :ivar list changes:
+        The (relative path, reason) of each file to transfer, the reason being one of
+        'new', 'size', 'modified' or 'content'.
+    :ivar list skipped:
+        The relative paths of the files found unchanged.
+    :ivar int total_bytes:
+        The size of the files to transfer.
+    :ivar int transferred_bytes:
+        The size of the files transferred.
+    """
+
+    def __init__(self, direction, dry_run):
+        self.direction = direction
+        self.dry_run = dry_run
+        self.changes = []  # type: List[Tuple[str, str]]
+        self.skipped = []  # type: List[str]
+        self.total_bytes = 0
+        self.transferred_bytes = 0
+
+
+class _LocalFile(object):
+
+    def __init__(self, path, size, mtime):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+
+
+def _timestamp(value):
+    return calendar.timegm(value.utctimetuple())
+
+
+def get_file_md5(path):
+    # type: (str) -> bytes
+    md5 = hashlib.md5()
+    with open(path, 'rb') as stream:
+        for block in iter(lambda: stream.read(_MD5_BLOCK_SIZE), b''):
+            md5.update(block)
+    return md5.digest()
+
+
+def makedirs(path):
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+
+
+class DirectorySync(object):  # pylint: disable=too-many-instance-attributes
+    """Compares a local directory with the blobs under a prefix of a container, and
+    transfers the files that differ.
+
+    A file differs when it is missing from the destination, when the sizes differ, or,
+    when the source was modified after the destination. With compare_content, the
+    Content-MD5 of the blob is compared with the MD5 of the local file instead of the
+    modification times; uploaded blobs get their Content-MD5 set for later syncs.
+
+    The transfers share a pool of max_connections workers: small files are handed to the
+    workers in batches of consecutive files, and large files are then transferred one at a
+    time, each in chunks with max_connections parallel connections.
+
+    :param container: The client of the container to sync with.
+    :param str local_path: The local directory.
+    :param str name_starts_with: The prefix of the blobs that mirror the directory.
+    :param int small_file_size: The size up to which a file is transferred with a single request.
+    :param bool compare_content: Whether to compare the contents of files of the same size.
+    :param int max_connections: The size of the worker pool.
+    :param callable progress_callback: Called with the (current, total) bytes transferred after each file.
+    """
+
+    def __init__(
+            self, container,  # type: ContainerClient
+            local_path,  # type: str
+            name_starts_with=None,  # type: Optional[str]
+            small_file_size=None,  # type: Optional[int]
+            compare_content=False,  # type: bool
+            max_connections=4,  # type: int
+            progress_callback=None,  # type: Optional[Callable[[int, int], None]]
+            **kwargs  # type: Any
+        ):
+        # type: (...) -> None
+        self.container = container
+        self.local_path = os.path.abspath(local_path)
+        self.prefix = name_starts_with or ''
+        if self.prefix and not self.prefix.endswith('/'):
+            self.prefix += '/'
+        self.small_file_size = small_file_size or 0
+        self.compare_content = compare_content
+        self.max_connections = max(1, max_connections)
+        self.progress_callback = progress_callback
+        self.request_options = kwargs
+        self._progress_lock = threading.Lock()
+
+    def get_local_files(self):
+        # type: () -> Dict[str, _LocalFile]
+        files = {}
+        for directory, _, names in os.walk(self.local_path):
+            for name in names:
+                path = os.path.join(directory, name)
+                stat = os.stat(path)
+                relative_path = os.path.relpath(path, self.local_path).replace(os.sep, '/')
+                files[relative_path] = _LocalFile(path, stat.st_size, stat.st_mtime)
+        return files
+
+    def get_relative_path(self, blob_name):
+        # type: (str) -> Optional[str]
+        """The path of a blob relative to the directory, or None for a blob that cannot be a file in it."""
+        relative_path = blob_name[len(self.prefix):]
+        if not relative_path or relative_path.endswith('/'):
+            return None
+        parts = relative_path.split('/')
+        if any(part in ('', '.', '..') for part in parts):
+            return None
+        return relative_path
+
+    def get_local_path(self, relative_path):
+        # type: (str) -> str
+        return os.path.join(self.local_path, *relative_path.split('/'))
+
+    def _compare(self, local_file, blob, upload):
+        # type: (_LocalFile, BlobProperties, bool) -> Optional[str]
+        if local_file.size != blob.size:
+            return 'size'
+        if self.compare_content:
+            blob_md5 = blob.content_settings.content_md5
+            if not blob_md5 or bytes(blob_md5) != get_file_md5(local_file.path):
+                return 'content'
+            return None
+        # Last-Modified has a one second resolution
+        blob_mtime, local_mtime = _timestamp(blob.last_modified), int(local_file.mtime)
+        if (upload and local_mtime > blob_mtime) or (not upload and blob_mtime > local_mtime):
+            return 'modified'
+        return None
+
+    def diff(self, upload, local_files, blobs, dry_run):
+        # type: (bool, Dict[str, _LocalFile], Dict[str, BlobProperties], bool) -> Tuple[DirectorySyncReport, List[Tuple[str, int, Any]]]
+        """Compare the local files with the blobs, both keyed by relative path.
+
+        Returns the report and the transfers to make, as (relative path, size, source) tuples.
+        """
+        report = DirectorySyncReport('upload' if upload else 'download', dry_run)
+        sources, destinations = (local_files, blobs) if upload else (blobs, local_files)
+        transfers = []
+        for relative_path in sorted(sources):
+            source = sources[relative_path]
+            destination = destinations.get(relative_path)
+            if destination is None:
+                reason = 'new'
+            elif upload:
+                reason = self._compare(source, destination, upload)
+            else:
+                reason = self._compare(destination, source, upload)
+            if reason is None:
+                report.skipped.append(relative_path)
+                continue
+            report.changes.append((relative_path, reason))
+            report.total_bytes += source.size
+            transfers.append((relative_path, source.size, source))
+        return report, transfers
+
+    def split_transfers(self, transfers):
+        # type: (List[Tuple[str, int, Any]]) -> Tuple[List[List[Tuple[str, int, Any]]], List[Tuple[str, int, Any]]]
+        """Split the transfers into batches of small files, and large files."""
+        small = [t for t in transfers if t[1] <= self.small_file_size]
+        large = [t for t in transfers if t[1] > self.small_file_size]
+        batches = [small[i:i + SMALL_FILE_BATCH_SIZE] for i in range(0, len(small), SMALL_FILE_BATCH_SIZE)]
+        return batches, large
+
+    def update_progress(self, report, length):
+        with self._progress_lock:
+            report.transferred_bytes += length
+            if self.progress_callback:
+                self.progress_callback(report.transferred_bytes, report.total_bytes)
+
+    def get_upload_settings(self, local_file):
+        if self.compare_content:
+            return ContentSettings(content_md5=bytearray(get_file_md5(local_file.path)))
+        return None
+
+    def set_local_mtime(self, path, properties):
+        # The blob is now newer than, or as old as, the file, so it is not downloaded again.
+        mtime = _timestamp(properties.last_modified)
+        os.utime(path, (mtime, mtime))
+
+    def _list_blobs(self):
+        blobs = {}
+        listing = self.container.list_blobs_parallel(
+            name_starts_with=self.prefix or None, max_connections=self.max_connections)
+        for blob in listing:
+            relative_path = self.get_relative_path(blob.name)
+            if relative_path is not None:
+                blobs[relative_path] = blob
+        return blobs
+
+    def _run(self, transfer, transfers):
+        batches, large = self.split_transfers(transfers)
+
+        def _transfer_batch(batch):
+            for item in batch:
+                transfer(item, 1)
+
+        if self.max_connections > 1 and len(batches) > 1:
+            import concurrent.futures
+            executor = concurrent.futures.ThreadPoolExecutor(self.max_connections)
+            try:
+                list(executor.map(_transfer_batch, batches))
+            finally:
+                executor.shutdown(wait=False)
+        else:
+            for batch in batches:
+                _transfer_batch(batch)
+        for item in large:
+            transfer(item, self.max_connections)
+
+    def upload(self, dry_run=False):
+        # type: (bool) -> DirectorySyncReport
+        report, transfers = self.diff(True, self.get_local_files(), self._list_blobs(), dry_run)
+        if dry_run:
+            return report
+
+        def _upload(item, max_connections):
+            relative_path, size, local_file = item
+            with open(local_file.path, 'rb') as data:
+                self.container.upload_blob(
+                    self.prefix + relative_path,
+                    data,
+                    length=size,
+                    overwrite=True,
+                    content_settings=self.get_upload_settings(local_file),
+                    max_connections=max_connections,
+                    **self.request_options)
+            self.update_progress(report, size)
+
+        self._run(_upload, transfers)
+        return report
+
+    def download(self, dry_run=False):
+        # type: (bool) -> DirectorySyncReport
+        report, transfers = self.diff(False, self.get_local_files(), self._list_blobs(), dry_run)
+        if dry_run:
+            return report
+
+        def _download(item, max_connections):
+            relative_path, size, blob = item
+            path = self.get_local_path(relative_path)
+            makedirs(os.path.dirname(path))
+            downloader = self.container.get_blob_client(blob.name).download_blob(**self.request_options)
+            properties = downloader.download_to_path(path, max_connections=max_connections)
+            self.set_local_mtime(path, properties)
+            self.update_progress(report, size)
+
+        self._run(_download, transfers)
+        return report
@@ -0,0 +1,53 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+import time
+
+
+async def tuned_map(tuner, func, items, length_of):
+    """Await func with each item, with as many calls in flight as the tuner allows.
+
+    The items are consumed lazily, so the chunk size the tuner has chosen is used for
+    each new item. Returns the results in the order of the items.
+    """
+    async def _run(item):
+        # The length is taken first, as func may release the chunk
+        length = length_of(item)
+        started = time.time()
+        result = await func(item)
+        tuner.record(length, started)
+        return result
+
+    if tuner.max_connections <= 1:
+        results = []
+        for item in items:
+            results.append(await _run(item))
+        return results
+
+    tasks = []
+    running = set()
+    items = iter(items)
+    try:
+        while True:
+            # Wait for a free slot before taking the next item, so that it uses the latest chunk size.
+            while len(running) >= tuner.connections:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                # Check for exceptions and fail fast.
+                for task in done:
+                    task.result()
+            try:
+                item = next(items)
+            except StopIteration:
+                break
+            task = asyncio.ensure_future(_run(item))
+            tasks.append(task)
+            running.add(task)
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
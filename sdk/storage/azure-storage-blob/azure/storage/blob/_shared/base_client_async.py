@@ -0,0 +1,110 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+from typing import (  # pylint: disable=unused-import
+    Union, Optional, Any, Iterable, Dict, List, Type, Tuple,
+    TYPE_CHECKING
+)
+import logging
+
+from azure.core import Configuration
+from azure.core.pipeline import AsyncPipeline
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.core.pipeline.policies import (
+    AsyncBearerTokenCredentialPolicy,
+    AsyncRedirectPolicy,
+    ContentDecodePolicy,
+    ProxyPolicy)
+
+from .constants import STORAGE_OAUTH_SCOPE, DEFAULT_SOCKET_TIMEOUT
+from .authentication import SharedKeyCredentialPolicy
+from .utils import StorageAccountHostsMixin
+from .policies import (
+    StorageDataSettings,
+    StorageHeadersPolicy,
+    StorageUserAgentPolicy,
+    StorageRequestHook,
+    StorageLoggingPolicy,
+    StorageHosts,
+    QueueMessagePolicy)
+from .policies_async import (
+    AsyncStorageContentValidation,
+    AsyncStorageResponseHook,
+    ExponentialRetry)
+
+if TYPE_CHECKING:
+    from azure.core.pipeline.transport import AsyncHttpTransport
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AsyncStorageAccountHostsMixin(StorageAccountHostsMixin):
+
+    def __enter__(self):
+        raise TypeError("Async client only supports 'async with'.")
+
+    def __exit__(self, *args):
+        pass
+
+    async def __aenter__(self):
+        await self._client.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        await self._client.__aexit__(*args)
+
+    def _create_pipeline(self, credential, **kwargs):
+        # type: (Any, **Any) -> Tuple[Configuration, AsyncPipeline]
+        return create_pipeline(credential, **kwargs)
+
+
+def create_configuration(**kwargs):
+    # type: (**Any) -> Configuration
+    config = Configuration(**kwargs)
+    config.headers_policy = StorageHeadersPolicy(**kwargs)
+    config.user_agent_policy = StorageUserAgentPolicy(**kwargs)
+    config.retry_policy = kwargs.get('retry_policy') or ExponentialRetry(**kwargs)
+    config.redirect_policy = AsyncRedirectPolicy(**kwargs)
+    config.logging_policy = StorageLoggingPolicy(**kwargs)
+    config.proxy_policy = ProxyPolicy(**kwargs)
+    config.blob_settings = StorageDataSettings(**kwargs)
+    return config
+
+
+def create_pipeline(credential, **kwargs):
+    # type: (Any, **Any) -> Tuple[Configuration, AsyncPipeline]
+    credential_policy = None
+    if hasattr(credential, 'get_token'):
+        credential_policy = AsyncBearerTokenCredentialPolicy(credential, STORAGE_OAUTH_SCOPE)
+    elif isinstance(credential, SharedKeyCredentialPolicy):
+        credential_policy = credential
+    elif credential is not None:
+        raise TypeError("Unsupported credential: {}".format(credential))
+
+    config = kwargs.get('_configuration') or create_configuration(**kwargs)
+    if kwargs.get('_pipeline'):
+        return config, kwargs['_pipeline']
+    transport = kwargs.get('transport')  # type: AsyncHttpTransport
+    if 'connection_timeout' not in kwargs:
+        kwargs['connection_timeout'] = DEFAULT_SOCKET_TIMEOUT
+    if not transport:
+        transport = AioHttpTransport(**kwargs)
+    policies = [
+        QueueMessagePolicy(),
+        config.headers_policy,
+        config.user_agent_policy,
+        AsyncStorageContentValidation(),
+        StorageRequestHook(**kwargs),
+        credential_policy,
+        ContentDecodePolicy(),
+        config.redirect_policy,
+        StorageHosts(**kwargs),
+        config.retry_policy,
+        config.logging_policy,
+        AsyncStorageResponseHook(**kwargs),
+    ]
+    return config, AsyncPipeline(transport, policies=policies)
@@ -0,0 +1,255 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+
+from azure.core.exceptions import HttpResponseError
+
+from .models import ModifiedAccessConditions
+from .utils import validate_and_format_range_headers, process_storage_error
+from .encryption import _decrypt_blob_content
+from .download_chunking import process_range_and_offset
+from .policies_async import validate_downloaded_md5
+from .autotune_async import tuned_map
+
+
+async def process_content(
+        blob, start_offset, end_offset, require_encryption, key_encryption_key, key_resolver_function,
+        validate_content=False):
+    data = []
+    async for chunk in blob:
+        data.append(chunk)
+    content = b"".join(data)
+    if validate_content:
+        validate_downloaded_md5(blob.response, content)
+    if key_encryption_key is not None or key_resolver_function is not None:
+        try:
+            return _decrypt_blob_content(
+                require_encryption,
+                key_encryption_key,
+                key_resolver_function,
+                content,
+                blob.response.headers,
+                start_offset,
+                end_offset)
+        except Exception as error:
+            raise HttpResponseError(
+                message="Decryption failed.",
+                response=blob.response,
+                error=error)
+    return content
+
+
+async def process_encrypted_regions(blob, encrypted_regions, start_offset, length, encrypted_length=None):
+    data = []
+    async for chunk in blob:
+        data.append(chunk)
+    content = b"".join(data)
+    try:
+        content = encrypted_regions.decrypt(content[:encrypted_length])
+    except Exception as error:
+        raise HttpResponseError(
+            message="Decryption failed.",
+            response=blob.response,
+            error=error)
+    return content[start_offset:start_offset + length]
+
+
+class _AsyncBlobChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+            self, blob_service, download_size, chunk_size, progress, start_range, end_range, stream,
+            validate_content, access_conditions, mod_conditions, timeout,
+            require_encryption, key_encryption_key, key_resolver_function, **kwargs):
+        # identifiers for the blob
+        self.blob_service = blob_service
+
+        # information on the download range/chunk size
+        self.chunk_size = chunk_size
+        self.download_size = download_size
+        self.start_index = start_range
+        self.blob_end = end_range
+
+        # the destination that we will write to
+        self.stream = stream
+
+        # download progress so far
+        self.progress_total = progress
+
+        # encryption
+        self.require_encryption = require_encryption
+        self.key_encryption_key = key_encryption_key
+        self.key_resolver_function = key_resolver_function
+
+        # parameters for each get blob operation
+        self.timeout = timeout
+        self.validate_content = validate_content
+        self.access_conditions = access_conditions
+        self.mod_conditions = mod_conditions
+        self.encrypted_regions = kwargs.pop('encrypted_regions', None)
+        self.request_options = kwargs
+        self.tuner = None
+
+    def _calculate_range(self, chunk_start):
+        if chunk_start + self.chunk_size > self.blob_end:
+            chunk_end = self.blob_end
+        else:
+            chunk_end = chunk_start + self.chunk_size
+        return chunk_start, chunk_end
+
+    def get_chunk_offsets(self):
+        index = self.start_index
+        while index < self.blob_end:
+            yield index
+            index += self.chunk_size
+
+    def get_chunk_ranges(self):
+        # An autotuned download picks up the chunk size the tuner has chosen for every new chunk
+        index = self.start_index
+        while index < self.blob_end:
+            chunk_size = self.tuner.chunk_size if self.tuner else self.chunk_size
+            chunk_end = min(index + chunk_size, self.blob_end)
+            yield index, chunk_end
+            index = chunk_end
+
+    async def process_chunk(self, chunk_start, chunk_end=None):
+        if chunk_end is None:
+            chunk_start, chunk_end = self._calculate_range(chunk_start)
+        chunk_data = await self._download_chunk(chunk_start, chunk_end)
+        length = chunk_end - chunk_start
+        if length > 0:
+            self._write_to_stream(chunk_data, chunk_start)
+            self._update_progress(length)
+
+    async def yield_chunk(self, chunk_start, chunk_end=None):
+        if chunk_end is None:
+            chunk_start, chunk_end = self._calculate_range(chunk_start)
+        return await self._download_chunk(chunk_start, chunk_end)
+
+    # should be provided by the subclass
+    def _update_progress(self, length):
+        pass
+
+    # should be provided by the subclass
+    def _write_to_stream(self, chunk_data, chunk_start):
+        pass
+
+    async def _download_chunk(self, chunk_start, chunk_end):
+        if self.encrypted_regions is not None:
+            # Only the regions holding the chunk are downloaded. Every region is
+            # authenticated as it is decrypted, instead of with a transactional MD5.
+            region_start, region_end, start_offset = self.encrypted_regions.get_range(chunk_start, chunk_end - 1)
+            range_header, range_validation = validate_and_format_range_headers(region_start, region_end)
+        else:
+            download_range, offset = process_range_and_offset(
+                chunk_start,
+                chunk_end,
+                chunk_end,
+                self.key_encryption_key,
+                self.key_resolver_function,
+            )
+            range_header, range_validation = validate_and_format_range_headers(
+                download_range[0],
+                download_range[1] - 1,
+                check_content_md5=self.validate_content)
+
+        try:
+            _, response = await self.blob_service.download(
+                timeout=self.timeout,
+                range=range_header,
+                range_get_content_md5=range_validation,
+                lease_access_conditions=self.access_conditions,
+                modified_access_conditions=self.mod_conditions,
+                validate_content=self.validate_content,
+                data_stream_total=self.download_size,
+                download_stream_current=self.progress_total,
+                **self.request_options)
+        except HttpResponseError as error:
+            process_storage_error(error)
+
+        if self.encrypted_regions is not None:
+            chunk_data = await process_encrypted_regions(
+                response, self.encrypted_regions, start_offset, chunk_end - chunk_start)
+        else:
+            chunk_data = await process_content(
+                response,
+                offset[0],
+                offset[1],
+                self.require_encryption,
+                self.key_encryption_key,
+                self.key_resolver_function,
+                validate_content=self.validate_content)
+
+        # This makes sure that if_match is set so that we can validate
+        # that subsequent downloads are to an unmodified blob
+        if not self.mod_conditions:
+            self.mod_conditions = ModifiedAccessConditions()
+        self.mod_conditions.if_match = response.properties.etag
+        return chunk_data
+
+
+class ParallelBlobChunkDownloader(_AsyncBlobChunkDownloader):
+    def __init__(
+            self, blob_service, download_size, chunk_size, progress, start_range, end_range,
+            stream, validate_content, access_conditions, mod_conditions, timeout,
+            require_encryption, key_encryption_key, key_resolver_function, **kwargs):
+
+        super(ParallelBlobChunkDownloader, self).__init__(
+            blob_service, download_size, chunk_size, progress, start_range, end_range,
+            stream, validate_content, access_conditions, mod_conditions, timeout,
+            require_encryption, key_encryption_key, key_resolver_function, **kwargs)
+
+        # for a parallel download, the stream is always seekable, so we note down the current position
+        # in order to seek to the right place when out-of-order chunks come in
+        self.stream_start = stream.tell()
+
+    def _update_progress(self, length):
+        # Chunks complete on the event loop thread, so no lock is needed
+        self.progress_total += length
+
+    def _write_to_stream(self, chunk_data, chunk_start):
+        self.stream.seek(self.stream_start + (chunk_start - self.start_index))
+        self.stream.write(chunk_data)
+
+
+class SequentialBlobChunkDownloader(_AsyncBlobChunkDownloader):
+
+    def _update_progress(self, length):
+        self.progress_total += length
+
+    def _write_to_stream(self, chunk_data, chunk_start):
+        # chunk_start is ignored in the case of sequential download since we cannot seek the destination stream
+        self.stream.write(chunk_data)
+
+
+async def download_chunks(downloader, max_connections, tuner=None):
+    """Downloads the chunks of the downloader, with at most max_connections requests in flight.
+
+    With a tuner, the tuner picks the chunk size and the number of requests in flight.
+    """
+    if tuner:
+        downloader.tuner = tuner
+        await tuned_map(
+            tuner, lambda r: downloader.process_chunk(*r), downloader.get_chunk_ranges(), lambda r: r[1] - r[0])
+        return
+
+    if max_connections <= 1:
+        for chunk in downloader.get_chunk_offsets():
+            await downloader.process_chunk(chunk)
+        return
+
+    throttler = asyncio.Semaphore(max_connections)
+
+    async def _process(chunk):
+        async with throttler:
+            await downloader.process_chunk(chunk)
+
+    tasks = [asyncio.ensure_future(_process(chunk)) for chunk in downloader.get_chunk_offsets()]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -37,6 +37,7 @@ from azure.core.pipeline.policies import (
     NetworkTraceLoggingPolicy,
     HTTPPolicy)
 from azure.core.pipeline.policies.base import RequestHistory
+from azure.core.pipeline.policies.retry_budget import CircuitState, retry_host
 from azure.core.exceptions import AzureError, ServiceRequestError, ServiceResponseError
 
 from ..version import VERSION
@@ -53,6 +54,9 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
+# The storage service of the package this copy of _shared is vendored in, e.g. 'blob'
+_SERVICE = __name__.split('.')[-3]
+
 
 def encode_base64(data):
     if isinstance(data, _unicode_type):
@@ -104,7 +108,7 @@ class QueueMessagePolicy(SansIOHTTPPolicy):
                 message_id)
 
 
-class StorageBlobSettings(object):
+class StorageDataSettings(object):
 
     def __init__(self, **kwargs):
         self.max_single_put_size = kwargs.get('max_single_put_size', 64 * 1024 * 1024)
@@ -122,6 +126,9 @@ class StorageBlobSettings(object):
         self.max_single_get_size = kwargs.get('max_single_get_size', 32 * 1024 * 1024)
         self.max_chunk_get_size = kwargs.get('max_chunk_get_size', 4 * 1024 * 1024)
 
+        # File uploads
+        self.max_range_size = kwargs.get('max_range_size', 4 * 1024 * 1024)
+
 
 class StorageHeadersPolicy(HeadersPolicy):
 
@@ -253,7 +260,8 @@ class StorageUserAgentPolicy(SansIOHTTPPolicy):
 
     def __init__(self, **kwargs):
         self._application = kwargs.pop('user_agent', None)
-        self._user_agent = "azsdk-python-storage-blob/{} Python/{} ({})".format(
+        self._user_agent = "azsdk-python-storage-{}/{} Python/{} ({})".format(
+            _SERVICE,
             VERSION,
             platform.python_version(),
             platform.platform())
@@ -337,7 +345,7 @@ class StorageContentValidation(SansIOHTTPPolicy):
     @staticmethod
     def get_content_md5(data):
         md5 = hashlib.md5()
-        if isinstance(data, bytes):
+        if isinstance(data, (bytes, memoryview)):
             md5.update(data)
         elif hasattr(data, 'read'):
             pos = 0
@@ -380,6 +388,9 @@ class StorageContentValidation(SansIOHTTPPolicy):
 class StorageRetryPolicy(HTTPPolicy):
     """
     The base class for Exponential and Linear retries containing shared code.
+
+    A ~azure.core.pipeline.policies.RetryBudget can be given with the `retry_budget`
+    keyword argument to share a retry budget and per-host circuit breakers between clients.
     """
 
     def __init__(self, **kwargs):
@@ -388,6 +399,7 @@ class StorageRetryPolicy(HTTPPolicy):
         self.read_retries = kwargs.pop('retry_read', 3)
         self.status_retries = kwargs.pop('retry_status', 3)
         self.retry_to_secondary = kwargs.pop('retry_to_secondary', False)
+        self.retry_budget = kwargs.pop('retry_budget', None)
         super(StorageRetryPolicy, self).__init__()
 
     def _set_next_host_location(self, settings, request):  # pylint: disable=no-self-use
@@ -454,6 +466,28 @@ class StorageRetryPolicy(HTTPPolicy):
 
         return min(retry_counts) < 0
 
+    def _acquire_retry_budget(self, settings, request, error=None):
+        """Asks the retry budget whether a retry can be sent.
+
+        If the retry probes a half-open circuit, its host is kept in the settings until the
+        outcome of the retry is recorded.
+        """
+        if self.retry_budget is None:
+            return True
+        host = retry_host(request)
+        grant = self.retry_budget.acquire(host, timeout=error is not None)
+        if not grant:
+            return False
+        if grant == CircuitState.HALF_OPEN:
+            settings['budget_probe'] = host
+        return True
+
+    def _release_retry_budget_probe(self, settings):
+        """Gives back the probe of a half-open circuit if the outcome of the probing retry was not recorded."""
+        if settings.get('budget_probe'):
+            self.retry_budget.release_probe(settings['budget_probe'])
+            settings['budget_probe'] = None
+
     def increment(self, settings, request, response=None, error=None):
         """Increment the retry counters.
 
@@ -484,10 +518,10 @@ class StorageRetryPolicy(HTTPPolicy):
                 settings['status'] -= 1
                 settings['history'].append(RequestHistory(request, http_response=response))
 
+        if self.retry_budget is not None:
+            self.retry_budget.record_failure(retry_host(request))
+            settings['budget_probe'] = None
         if not self.is_exhausted(settings):
-            if request.method not in ['PUT'] and settings['retry_secondary']:
-                self._set_next_host_location(settings, request)
-
             # rewind the request body if it is a stream
             if request.body and hasattr(request.body, 'read'):
                 # no position was saved, then retry would not work
@@ -499,6 +533,11 @@ class StorageRetryPolicy(HTTPPolicy):
                 except UnsupportedOperation:
                     # if body is not seekable, then retry would not work
                     return False
+            if not self._acquire_retry_budget(settings, request, error):
+                return False
+            if request.method not in ['PUT'] and settings['retry_secondary']:
+                self._set_next_host_location(settings, request)
+
             if settings['hook']:
                 settings['hook'](
                     request=request,
@@ -514,26 +553,32 @@ class StorageRetryPolicy(HTTPPolicy):
         retries_remaining = True
         response = None
         retry_settings = self.configure_retries(request)
-        while retries_remaining:
-            try:
-                response = self.next.send(request)
-                if is_retry(response, retry_settings['mode']):
+        try:
+            while retries_remaining:
+                try:
+                    response = self.next.send(request)
+                    if is_retry(response, retry_settings['mode']):
+                        retries_remaining = self.increment(
+                            retry_settings,
+                            request=request.http_request,
+                            response=response.http_response)
+                        if retries_remaining:
+                            self.sleep(retry_settings, request.context.transport)
+
+                            continue
+                    break
+                except AzureError as err:
                     retries_remaining = self.increment(
-                        retry_settings,
-                        request=request.http_request,
-                        response=response.http_response)
+                        retry_settings, request=request.http_request, error=err)
                     if retries_remaining:
                         self.sleep(retry_settings, request.context.transport)
-
                         continue
-                break
-            except AzureError as err:
-                retries_remaining = self.increment(
-                    retry_settings, request=request.http_request, error=err)
-                if retries_remaining:
-                    self.sleep(retry_settings, request.context.transport)
-                    continue
-                raise err
+                    raise err
+            if self.retry_budget is not None and not is_retry(response, retry_settings['mode']):
+                self.retry_budget.record_success(retry_host(request.http_request))
+                retry_settings['budget_probe'] = None
+        finally:
+            self._release_retry_budget_probe(retry_settings)
         if retry_settings['history']:
             response.context['history'] = retry_settings['history']
         response.http_response.location_mode = retry_settings['mode']
@@ -575,6 +620,9 @@ class ExponentialRetry(StorageRetryPolicy):
         :param int random_jitter_range:
             A number in seconds which indicates a range to jitter/randomize for the back-off interval.
             For example, a random_jitter_range of 3 results in the back-off interval x to vary between x+3 and x-3.
+        :param ~azure.core.pipeline.policies.RetryBudget retry_budget:
+            A retry budget shared by the clients using it. Retries refused by the budget
+            or by the circuit breaker of the host are not sent.
         '''
         self.initial_backoff = initial_backoff
         self.increment_base = increment_base
@@ -616,6 +664,9 @@ class LinearRetry(StorageRetryPolicy):
         :param int random_jitter_range:
             A number in seconds which indicates a range to jitter/randomize for the back-off interval.
             For example, a random_jitter_range of 3 results in the back-off interval x to vary between x+3 and x-3.
+        :param ~azure.core.pipeline.policies.RetryBudget retry_budget:
+            A retry budget shared by the clients using it. Retries refused by the budget
+            or by the circuit breaker of the host are not sent.
         """
         self.backoff = backoff
         self.random_jitter_range = random_jitter_range
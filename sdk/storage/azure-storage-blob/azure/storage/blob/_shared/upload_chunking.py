@@ -5,11 +5,11 @@
 # --------------------------------------------------------------------------
 # pylint: disable=no-self-use
 
+import mmap
+from contextlib import contextmanager
 from io import (BytesIO, IOBase, SEEK_CUR, SEEK_END, SEEK_SET, UnsupportedOperation)
 from threading import Lock
 
-from math import ceil
-
 import six
 
 from .models import ModifiedAccessConditions
@@ -19,6 +19,7 @@ from .utils import (
     get_length,
     return_response_headers)
 from .encryption import _get_blob_encryptor_and_padder
+from .autotune import tuned_map
 
 
 _LARGE_BLOB_UPLOAD_MAX_READ_BUFFER_SIZE = 4 * 1024 * 1024
@@ -27,7 +28,7 @@ _ERROR_VALUE_SHOULD_BE_SEEKABLE_STREAM = '{0} should be a seekable file-like/io.
 
 def upload_blob_chunks(blob_service, blob_size, block_size, stream, max_connections, validate_content,  # pylint: disable=too-many-locals
                        access_conditions, uploader_class, append_conditions=None, modified_access_conditions=None,
-                       timeout=None, content_encryption_key=None, initialization_vector=None, **kwargs):
+                       timeout=None, content_encryption_key=None, initialization_vector=None, tuner=None, **kwargs):
 
     encryptor, padder = _get_blob_encryptor_and_padder(
         content_encryption_key,
@@ -55,7 +56,10 @@ def upload_blob_chunks(blob_service, blob_size, block_size, stream, max_connecti
     else:
         uploader.modified_access_conditions = modified_access_conditions
 
-    if max_connections > 1:
+    if tuner:
+        uploader.tuner = tuner
+        range_ids = tuned_map(tuner, uploader.process_chunk, uploader.get_chunk_streams(), lambda c: len(c[1]))
+    elif max_connections > 1:
         import concurrent.futures
         from threading import BoundedSemaphore
 
@@ -98,7 +102,8 @@ def upload_blob_chunks(blob_service, blob_size, block_size, stream, max_connecti
 
 def upload_blob_substream_blocks(blob_service, blob_size, block_size, stream, max_connections,
                                  validate_content, access_conditions, uploader_class,
-                                 append_conditions=None, modified_access_conditions=None, timeout=None, **kwargs):
+                                 append_conditions=None, modified_access_conditions=None, timeout=None, tuner=None,
+                                 **kwargs):
 
     uploader = uploader_class(
         blob_service,
@@ -121,7 +126,11 @@ def upload_blob_substream_blocks(blob_service, blob_size, block_size, stream, ma
     else:
         uploader.modified_access_conditions = modified_access_conditions
 
-    if max_connections > 1:
+    if tuner:
+        uploader.tuner = tuner
+        range_ids = tuned_map(
+            tuner, uploader.process_substream_block, uploader.get_substream_blocks(), lambda b: len(b[1]))
+    elif max_connections > 1:
         import concurrent.futures
         executor = concurrent.futures.ThreadPoolExecutor(max_connections)
         range_ids = list(executor.map(uploader.process_substream_block, uploader.get_substream_blocks()))
@@ -131,6 +140,32 @@ def upload_blob_substream_blocks(blob_service, blob_size, block_size, stream, ma
     return range_ids
 
 
+def upload_file_chunks(file_service, file_size, block_size, stream, max_connections,
+                       validate_content, timeout, sparse=False, **kwargs):
+    uploader = FileChunkUploader(
+        file_service,
+        file_size,
+        block_size,
+        stream,
+        max_connections > 1,
+        validate_content,
+        timeout,
+        sparse=sparse,
+        **kwargs
+    )
+    if max_connections > 1:
+        import concurrent.futures
+        executor = concurrent.futures.ThreadPoolExecutor(max_connections)
+        range_ids = list(executor.map(uploader.process_chunk, uploader.get_chunk_offsets()))
+    else:
+        if file_size is not None:
+            range_ids = [uploader.process_chunk(start) for start in uploader.get_chunk_offsets()]
+        else:
+            range_ids = uploader.process_all_unknown_size()
+    # The ranges of zeros skipped by a sparse upload have no id
+    return [range_id for range_id in range_ids if range_id is not None]
+
+
 class _BlobChunkUploader(object):  # pylint: disable=too-many-instance-attributes
 
     def __init__(self, blob_service, blob_size, chunk_size, stream, parallel, validate_content,
@@ -140,8 +175,10 @@ class _BlobChunkUploader(object):  # pylint: disable=too-many-instance-attribute
         self.chunk_size = chunk_size
         self.stream = stream
         self.parallel = parallel
-        self.stream_start = stream.tell() if parallel else None
-        self.stream_lock = Lock() if parallel else None
+        # Blocks of a memoryview are independent slices, so they need no shared position or lock
+        shared_stream = parallel and not isinstance(stream, memoryview)
+        self.stream_start = stream.tell() if shared_stream else None
+        self.stream_lock = Lock() if shared_stream else None
         self.progress_total = 0
         self.progress_lock = Lock() if parallel else None
         self.validate_content = validate_content
@@ -155,28 +192,36 @@ class _BlobChunkUploader(object):  # pylint: disable=too-many-instance-attribute
         self.etag = None
         self.last_modified = None
         self.request_options = kwargs
+        self.tuner = None
 
     def get_chunk_streams(self):
         index = 0
         while True:
-            data = b''
-            read_size = self.chunk_size
+            buffered = []
+            buffered_size = 0
+            chunk_size = self._get_chunk_size()
+            read_size = chunk_size
 
             # Buffer until we either reach the end of the stream or get a whole chunk.
+            # The reads are joined once, rather than concatenated after every read.
             while True:
                 if self.blob_size:
-                    read_size = min(self.chunk_size - len(data), self.blob_size - (index + len(data)))
+                    read_size = min(chunk_size - buffered_size, self.blob_size - (index + buffered_size))
                 temp = self.stream.read(read_size)
                 if not isinstance(temp, six.binary_type):
                     raise TypeError('Blob data should be of type bytes.')
-                data += temp or b""
+                if temp:
+                    buffered.append(temp)
+                    buffered_size += len(temp)
 
                 # We have read an empty string and so are at the end
                 # of the buffer or we have read a full chunk.
-                if temp == b'' or len(data) == self.chunk_size:
+                if temp == b'' or buffered_size == chunk_size:
                     break
 
-            if len(data) == self.chunk_size:
+            data = buffered[0] if len(buffered) == 1 else b''.join(buffered)
+
+            if len(data) == chunk_size:
                 if self.padder:
                     data = self.padder.update(data)
                 if self.encryptor:
@@ -192,6 +237,10 @@ class _BlobChunkUploader(object):  # pylint: disable=too-many-instance-attribute
                 break
             index += len(data)
 
+    def _get_chunk_size(self):
+        # An autotuned upload picks up the chunk size the tuner has chosen for every new chunk
+        return self.tuner.chunk_size if self.tuner else self.chunk_size
+
     def process_chunk(self, chunk_data):
         chunk_bytes = chunk_data[1]
         chunk_offset = chunk_data[0]
@@ -222,13 +271,18 @@ class _BlobChunkUploader(object):  # pylint: disable=too-many-instance-attribute
             if blob_length is None:
                 raise ValueError("Unable to determine content length of upload data.")
 
-        blocks = int(ceil(blob_length / (self.chunk_size * 1.0)))
-        last_block_size = self.chunk_size if blob_length % self.chunk_size == 0 else blob_length % self.chunk_size
-
-        for i in range(blocks):
-            yield ('BlockId{}'.format("%05d" % i),
-                   _SubStream(self.stream, i * self.chunk_size, last_block_size if i == blocks - 1 else self.chunk_size,
-                              lock))
+        block_index = 0
+        block_start = 0
+        while block_start < blob_length:
+            block_id = 'BlockId{}'.format("%05d" % block_index)
+            block_size = min(self._get_chunk_size(), blob_length - block_start)
+            if isinstance(self.stream, memoryview):
+                # Zero-copy: the block is a slice of the caller's buffer (e.g. a memory-mapped file)
+                yield block_id, self.stream[block_start:block_start + block_size]
+            else:
+                yield block_id, _SubStream(self.stream, block_start, block_size, lock)
+            block_index += 1
+            block_start += block_size
 
     def process_substream_block(self, block_data):
         return self._upload_substream_block_with_progress(block_data[0], block_data[1])
@@ -275,10 +329,30 @@ class BlockBlobChunkUploader(_BlobChunkUploader):
                 upload_stream_current=self.progress_total,
                 **self.request_options)
         finally:
-            block_stream.close()
+            close_block_stream(block_stream)
         return block_id
 
 
+class GCMBlockBlobChunkUploader(BlockBlobChunkUploader):
+    """Stages blocks of whole regions, for blobs encrypted with version 2.0.
+
+    Every region is encrypted on its own, so the blocks are encrypted by the
+    workers that stage them, rather than in order as the stream is read.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.encrypted_regions = kwargs.pop('encrypted_regions')
+        super(GCMBlockBlobChunkUploader, self).__init__(*args, **kwargs)
+
+    def _get_chunk_size(self):
+        # Only the last region of the blob can be short
+        data_length = self.encrypted_regions.data_length
+        return max(1, super(GCMBlockBlobChunkUploader, self)._get_chunk_size() // data_length) * data_length
+
+    def process_chunk(self, chunk_data):
+        return self._upload_chunk_with_progress(chunk_data[0], self.encrypted_regions.encrypt(chunk_data[1]))
+
+
 class PageBlobChunkUploader(_BlobChunkUploader):  # pylint: disable=abstract-method
 
     def _is_chunk_empty(self, chunk_data):
@@ -353,6 +427,131 @@ class AppendBlobChunkUploader(_BlobChunkUploader):  # pylint: disable=abstract-m
             )
 
 
+class FileChunkUploader(object):  # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, file_service, file_size, chunk_size, stream, parallel,
+                 validate_content, timeout, sparse=False, **kwargs):
+        self.file_service = file_service
+        self.sparse = sparse
+        self.file_size = file_size
+        self.chunk_size = chunk_size
+        self.stream = stream
+        self.parallel = parallel
+        self.stream_start = stream.tell() if parallel else None
+        self.stream_lock = Lock() if parallel else None
+        self.progress_total = 0
+        self.progress_lock = Lock() if parallel else None
+        self.validate_content = validate_content
+        self.timeout = timeout
+        self.request_options = kwargs
+
+    def get_chunk_offsets(self):
+        index = 0
+        if self.file_size is None:
+            # we don't know the size of the stream, so we have no
+            # choice but to seek
+            while True:
+                data = self._read_from_stream(index, 1)
+                if not data:
+                    break
+                yield index
+                index += self.chunk_size
+        else:
+            while index < self.file_size:
+                yield index
+                index += self.chunk_size
+
+    def process_chunk(self, chunk_offset):
+        size = self.chunk_size
+        if self.file_size is not None:
+            size = min(size, self.file_size - chunk_offset)
+        chunk_data = self._read_from_stream(chunk_offset, size)
+        return self._upload_chunk_with_progress(chunk_offset, chunk_data)
+
+    def process_all_unknown_size(self):
+        assert self.stream_lock is None
+        range_ids = []
+        index = 0
+        while True:
+            data = self._read_from_stream(None, self.chunk_size)
+            if data:
+                index += len(data)
+                range_id = self._upload_chunk_with_progress(index, data)
+                range_ids.append(range_id)
+            else:
+                break
+
+        return range_ids
+
+    def _read_from_stream(self, offset, count):
+        if self.stream_lock is not None:
+            with self.stream_lock:
+                self.stream.seek(self.stream_start + offset)
+                data = self.stream.read(count)
+        else:
+            data = self.stream.read(count)
+        return data
+
+    def _update_progress(self, length):
+        if self.progress_lock is not None:
+            with self.progress_lock:
+                self.progress_total += length
+        else:
+            self.progress_total += length
+
+    def _is_chunk_empty(self, chunk_data):
+        return chunk_data.count(b'\x00') == len(chunk_data)
+
+    def _upload_chunk_with_progress(self, chunk_start, chunk_data):
+        if self.sparse and self._is_chunk_empty(chunk_data):
+            # The new file already reads as zeros where no range was written
+            self._update_progress(len(chunk_data))
+            return None
+        chunk_end = chunk_start + len(chunk_data) - 1
+        self.file_service.upload_range(
+            chunk_data,
+            chunk_start,
+            chunk_end,
+            validate_content=self.validate_content,
+            timeout=self.timeout,
+            data_stream_total=self.file_size,
+            upload_stream_current=self.progress_total,
+            **self.request_options
+        )
+        range_id = 'bytes={0}-{1}'.format(chunk_start, chunk_end)
+        self._update_progress(len(chunk_data))
+        return range_id
+
+
+def close_block_stream(block_stream):
+    # A memoryview block must be released so that the memory map it slices can be closed
+    if isinstance(block_stream, memoryview):
+        block_stream.release()
+    else:
+        block_stream.close()
+
+
+@contextmanager
+def memory_mapped_file(stream):
+    """Map an open file read-only, and yield a memoryview over the whole file.
+
+    Slices of the view can be staged as blocks from many threads without
+    copying the file or seeking a shared file handle.
+    """
+    mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        yield view
+    finally:
+        view.release()
+        try:
+            mapped.close()
+        except BufferError:
+            # A block is still referenced (e.g. by a traceback), the map
+            # will be closed when it is garbage collected.
+            pass
+
+
 class _SubStream(IOBase):
     def __init__(self, wrapped_stream, stream_begin_index, length, lockObj):
         # Python 2.7: file-like objects created with open() typically support seek(), but are not
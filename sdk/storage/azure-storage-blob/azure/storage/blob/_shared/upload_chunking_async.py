@@ -0,0 +1,263 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+# pylint: disable=no-self-use
+
+import asyncio
+
+from .models import ModifiedAccessConditions
+from .utils import (
+    encode_base64,
+    url_quote,
+    return_response_headers)
+from .encryption import _get_blob_encryptor_and_padder
+from .upload_chunking import _BlobChunkUploader, close_block_stream
+from .autotune_async import tuned_map
+
+
+async def _parallel_uploads(upload, pending, max_connections):
+    # Only 'max_connections' uploads are in flight, and the next chunk is read
+    # while waiting for one of them to complete, the same bound the thread pool
+    # gives the sync upload. Results are kept in submission order.
+    throttler = asyncio.Semaphore(max_connections)
+    tasks = []
+
+    async def _run(item):
+        try:
+            return await upload(item)
+        finally:
+            throttler.release()
+
+    try:
+        for item in pending:
+            await throttler.acquire()
+            # Check for exceptions and fail fast.
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception():
+                    raise task.exception()
+            tasks.append(asyncio.ensure_future(_run(item)))
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def upload_blob_chunks(blob_service, blob_size, block_size, stream, max_connections, validate_content,  # pylint: disable=too-many-locals
+                             access_conditions, uploader_class, append_conditions=None, modified_access_conditions=None,
+                             timeout=None, content_encryption_key=None, initialization_vector=None, tuner=None,
+                             **kwargs):
+
+    encryptor, padder = _get_blob_encryptor_and_padder(
+        content_encryption_key,
+        initialization_vector,
+        uploader_class is not PageBlobChunkUploader)
+
+    uploader = uploader_class(
+        blob_service,
+        blob_size,
+        block_size,
+        stream,
+        max_connections > 1,
+        validate_content,
+        access_conditions,
+        append_conditions,
+        timeout,
+        encryptor,
+        padder,
+        **kwargs
+    )
+
+    # Access conditions do not work with parallelism
+    if max_connections > 1:
+        uploader.modified_access_conditions = None
+    else:
+        uploader.modified_access_conditions = modified_access_conditions
+
+    if tuner:
+        uploader.tuner = tuner
+        range_ids = await tuned_map(
+            tuner, uploader.process_chunk, uploader.get_chunk_streams(), lambda c: len(c[1]))
+    elif max_connections > 1:
+        range_ids = await _parallel_uploads(uploader.process_chunk, uploader.get_chunk_streams(), max_connections)
+    else:
+        range_ids = []
+        for chunk in uploader.get_chunk_streams():
+            range_ids.append(await uploader.process_chunk(chunk))
+
+    if any(range_ids):
+        return range_ids
+    return uploader.response_headers
+
+
+async def upload_blob_substream_blocks(blob_service, blob_size, block_size, stream, max_connections,
+                                       validate_content, access_conditions, uploader_class,
+                                       append_conditions=None, modified_access_conditions=None, timeout=None,
+                                       tuner=None, **kwargs):
+
+    uploader = uploader_class(
+        blob_service,
+        blob_size,
+        block_size,
+        stream,
+        max_connections > 1,
+        validate_content,
+        access_conditions,
+        append_conditions,
+        timeout,
+        None,
+        None,
+        **kwargs
+    )
+    # ETag matching does not work with parallelism as a ranged upload may start
+    # before the previous finishes and provides an etag
+    if max_connections > 1:
+        uploader.modified_access_conditions = None
+    else:
+        uploader.modified_access_conditions = modified_access_conditions
+
+    if tuner:
+        uploader.tuner = tuner
+        range_ids = await tuned_map(
+            tuner, uploader.process_substream_block, uploader.get_substream_blocks(), lambda b: len(b[1]))
+    elif max_connections > 1:
+        range_ids = await _parallel_uploads(
+            uploader.process_substream_block, uploader.get_substream_blocks(), max_connections)
+    else:
+        range_ids = []
+        for block in uploader.get_substream_blocks():
+            range_ids.append(await uploader.process_substream_block(block))
+    return range_ids
+
+
+class _AsyncBlobChunkUploader(_BlobChunkUploader):  # pylint: disable=abstract-method
+
+    async def process_chunk(self, chunk_data):  # pylint: disable=invalid-overridden-method
+        chunk_bytes = chunk_data[1]
+        chunk_offset = chunk_data[0]
+        return await self._upload_chunk_with_progress(chunk_offset, chunk_bytes)
+
+    async def _upload_chunk_with_progress(self, chunk_offset, chunk_data):  # pylint: disable=invalid-overridden-method
+        range_id = await self._upload_chunk(chunk_offset, chunk_data)
+        self._update_progress(len(chunk_data))
+        return range_id
+
+    async def process_substream_block(self, block_data):  # pylint: disable=invalid-overridden-method
+        return await self._upload_substream_block_with_progress(block_data[0], block_data[1])
+
+    async def _upload_substream_block_with_progress(self, block_id, block_stream):  # pylint: disable=invalid-overridden-method
+        range_id = await self._upload_substream_block(block_id, block_stream)
+        return range_id
+
+
+class BlockBlobChunkUploader(_AsyncBlobChunkUploader):
+
+    async def _upload_chunk(self, chunk_offset, chunk_data):  # pylint: disable=invalid-overridden-method
+        # TODO: This is incorrect, but works with recording.
+        block_id = encode_base64(url_quote(encode_base64('{0:032d}'.format(chunk_offset))))
+        await self.blob_service.stage_block(
+            block_id,
+            len(chunk_data),
+            chunk_data,
+            timeout=self.timeout,
+            lease_access_conditions=self.lease_access_conditions,
+            validate_content=self.validate_content,
+            data_stream_total=self.blob_size,
+            upload_stream_current=self.progress_total,
+            **self.request_options)
+        return block_id
+
+    async def _upload_substream_block(self, block_id, block_stream):  # pylint: disable=invalid-overridden-method
+        try:
+            await self.blob_service.stage_block(
+                block_id,
+                len(block_stream),
+                block_stream,
+                validate_content=self.validate_content,
+                lease_access_conditions=self.lease_access_conditions,
+                timeout=self.timeout,
+                data_stream_total=self.blob_size,
+                upload_stream_current=self.progress_total,
+                **self.request_options)
+        finally:
+            close_block_stream(block_stream)
+        return block_id
+
+
+class GCMBlockBlobChunkUploader(BlockBlobChunkUploader):
+    """Stages blocks of whole regions, for blobs encrypted with version 2.0."""
+
+    def __init__(self, *args, **kwargs):
+        self.encrypted_regions = kwargs.pop('encrypted_regions')
+        super(GCMBlockBlobChunkUploader, self).__init__(*args, **kwargs)
+
+    def _get_chunk_size(self):
+        # Only the last region of the blob can be short
+        data_length = self.encrypted_regions.data_length
+        return max(1, super(GCMBlockBlobChunkUploader, self)._get_chunk_size() // data_length) * data_length
+
+    async def process_chunk(self, chunk_data):  # pylint: disable=invalid-overridden-method
+        return await self._upload_chunk_with_progress(chunk_data[0], self.encrypted_regions.encrypt(chunk_data[1]))
+
+
+class PageBlobChunkUploader(_AsyncBlobChunkUploader):  # pylint: disable=abstract-method
+
+    def _is_chunk_empty(self, chunk_data):
+        # read until non-zero byte is encountered
+        # if reached the end without returning, then chunk_data is all 0's
+        for each_byte in chunk_data:
+            if each_byte not in [0, b'\x00']:
+                return False
+        return True
+
+    async def _upload_chunk(self, chunk_offset, chunk_data):  # pylint: disable=invalid-overridden-method
+        # avoid uploading the empty pages
+        if not self._is_chunk_empty(chunk_data):
+            chunk_end = chunk_offset + len(chunk_data) - 1
+            content_range = 'bytes={0}-{1}'.format(chunk_offset, chunk_end)
+            computed_md5 = None
+            self.response_headers = await self.blob_service.upload_pages(
+                chunk_data,
+                content_length=len(chunk_data),
+                transactional_content_md5=computed_md5,
+                timeout=self.timeout,
+                range=content_range,
+                lease_access_conditions=self.lease_access_conditions,
+                modified_access_conditions=self.modified_access_conditions,
+                validate_content=self.validate_content,
+                cls=return_response_headers,
+                data_stream_total=self.blob_size,
+                upload_stream_current=self.progress_total,
+                **self.request_options)
+
+            if not self.parallel:
+                self.modified_access_conditions = ModifiedAccessConditions(
+                    if_match=self.response_headers['etag'])
+
+
+class AppendBlobChunkUploader(_AsyncBlobChunkUploader):  # pylint: disable=abstract-method
+
+    def __init__(self, *args, **kwargs):
+        super(AppendBlobChunkUploader, self).__init__(*args, **kwargs)
+        self.current_length = None
+
+    async def _upload_chunk(self, chunk_offset, chunk_data):  # pylint: disable=invalid-overridden-method
+        if self.current_length is not None:
+            self.append_conditions.append_position = self.current_length + chunk_offset
+        self.response_headers = await self.blob_service.append_block(
+            chunk_data,
+            content_length=len(chunk_data),
+            timeout=self.timeout,
+            lease_access_conditions=self.lease_access_conditions,
+            modified_access_conditions=self.modified_access_conditions,
+            validate_content=self.validate_content,
+            append_position_access_conditions=self.append_conditions,
+            cls=return_response_headers,
+            data_stream_total=self.blob_size,
+            upload_stream_current=self.progress_total,
+            **self.request_options
+        )
+        if self.current_length is None:
+            self.current_length = int(self.response_headers['blob_append_offset'])
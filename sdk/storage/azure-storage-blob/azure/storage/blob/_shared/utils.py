@@ -45,7 +45,7 @@ from .constants import STORAGE_OAUTH_SCOPE, SERVICE_HOST_BASE, DEFAULT_SOCKET_TI
 from .models import LocationMode, StorageErrorCode
 from .authentication import SharedKeyCredentialPolicy
 from .policies import (
-    StorageBlobSettings,
+    StorageDataSettings,
     StorageHeadersPolicy,
     StorageUserAgentPolicy,
     StorageContentValidation,
@@ -153,8 +153,9 @@ class StorageAccountHostsMixin(object):
         self.require_encryption = kwargs.get('require_encryption', False)
         self.key_encryption_key = kwargs.get('key_encryption_key')
         self.key_resolver_function = kwargs.get('key_resolver_function')
+        self.encryption_version = kwargs.get('encryption_version', '1.0')
 
-        self._config, self._pipeline = create_pipeline(self.credential, hosts=self._hosts, **kwargs)
+        self._config, self._pipeline = self._create_pipeline(self.credential, hosts=self._hosts, **kwargs)
 
     def __enter__(self):
         self._client.__enter__()
@@ -197,6 +198,10 @@ class StorageAccountHostsMixin(object):
         else:
             raise ValueError("No host URL for location mode: {}".format(value))
 
+    def _create_pipeline(self, credential, **kwargs):  # pylint: disable=no-self-use
+        # type: (Any, **Any) -> Tuple[Configuration, Pipeline]
+        return create_pipeline(credential, **kwargs)
+
     def _format_query_string(self, sas_token, credential, snapshot=None):
         query_str = "?"
         if snapshot:
@@ -478,7 +483,7 @@ def create_configuration(**kwargs):
     config.redirect_policy = RedirectPolicy(**kwargs)
     config.logging_policy = StorageLoggingPolicy(**kwargs)
     config.proxy_policy = ProxyPolicy(**kwargs)
-    config.blob_settings = StorageBlobSettings(**kwargs)
+    config.blob_settings = StorageDataSettings(**kwargs)
     return config
 
 
@@ -499,6 +504,10 @@ def create_pipeline(credential, **kwargs):
     if 'connection_timeout' not in kwargs:
         kwargs['connection_timeout'] = DEFAULT_SOCKET_TIMEOUT
     if not transport:
+        # Clients of all the storage services share the process-wide session of their host,
+        # and its keep-alive connections, with the clients that have the same session settings
+        # (use_env_settings and pool sizing), unless they opt out with shared_session=False.
+        kwargs.setdefault('shared_session', True)
         transport = RequestsTransport(**kwargs)
     policies = [
         QueueMessagePolicy(),
@@ -0,0 +1,124 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+
+from typing import Union, Iterable, AnyStr, IO, Any # pylint: disable=unused-import
+from .._shared.policies_async import ExponentialRetry, LinearRetry, NoRetry
+from ..models import BlobType
+from .blob_client_async import BlobClient
+from .container_client_async import ContainerClient
+from .blob_service_client_async import BlobServiceClient
+from .lease_async import LeaseClient
+from .polling_async import CopyStatusPoller
+from ._blob_utils_async import StorageStreamDownloader
+from ._blob_listing_async import ParallelBlobListing
+from .models import (
+    ContainerPropertiesPaged,
+    BlobPropertiesPaged,
+    BlobPrefix
+)
+
+
+__all__ = [
+    'BlobServiceClient',
+    'ContainerClient',
+    'BlobClient',
+    'LeaseClient',
+    'ExponentialRetry',
+    'LinearRetry',
+    'NoRetry',
+    'ContainerPropertiesPaged',
+    'BlobPropertiesPaged',
+    'BlobPrefix',
+    'CopyStatusPoller',
+    'StorageStreamDownloader',
+    'ParallelBlobListing',
+]
+
+
+async def upload_blob_to_url(
+        blob_url,  # type: str
+        data,  # type: Union[Iterable[AnyStr], IO[AnyStr]]
+        overwrite=False,  # type: bool
+        max_connections=1,  # type: int
+        encoding='UTF-8', # type: str
+        credential=None,  # type: Any
+        **kwargs):
+    # type: (...) -> dict[str, Any]
+    """Upload data to a given URL
+
+    The data will be uploaded as a block blob.
+
+    :param str blob_url:
+        The full URI to the blob. This can also include a SAS token.
+    :param data:
+        The data to upload. This can be bytes, text, an iterable or a file-like object.
+    :type data: bytes or str or Iterable
+    :param bool overwrite:
+        Whether the blob to be uploaded should overwrite the current data.
+        If True, upload_blob_to_url will overwrite any existing data. If set to False, the
+        operation will fail with a ResourceExistsError.
+    :param credential:
+        The credentials with which to authenticate. This is optional if the
+        blob URL already has a SAS token. The value can be a SAS token string, an account
+        shared access key, or an instance of an async TokenCredentials class from azure.identity.
+        If the URL already has a SAS token, specifying an explicit credential will take priority.
+    :returns: Blob-updated property dict (Etag and last modified)
+    :rtype: dict(str, Any)
+    """
+    async with BlobClient(blob_url, credential=credential) as client:
+        return await client.upload_blob(
+            data=data,
+            blob_type=BlobType.BlockBlob,
+            overwrite=overwrite,
+            max_connections=max_connections,
+            encoding=encoding,
+            **kwargs)
+
+
+async def _download_to_stream(client, handle, max_connections, **kwargs):
+    """Download data to specified open file-handle."""
+    stream = await client.download_blob(**kwargs)
+    await stream.download_to_stream(handle, max_connections=max_connections)
+
+
+async def download_blob_from_url(
+        blob_url,  # type: str
+        output,  # type: str
+        overwrite=False,  # type: bool
+        max_connections=1,  # type: int
+        credential=None,  # type: Any
+        **kwargs):
+    # type: (...) -> None
+    """Download the contents of a blob to a local file or stream.
+
+    :param str blob_url:
+        The full URI to the blob. This can also include a SAS token.
+    :param output:
+        Where the data should be downloaded to. This could be either a file path to write to,
+        or an open IO handle to write to.
+    :type output: str or writable stream.
+    :param bool overwrite:
+        Whether the local file should be overwritten if it already exists. The default value is
+        `False` - in which case a ValueError will be raised if the file already exists. If set to
+        `True`, an attempt will be made to write to the existing file. If a stream handle is passed
+        in, this value is ignored.
+    :param credential:
+        The credentials with which to authenticate. This is optional if the
+        blob URL already has a SAS token or the blob is public. The value can be a SAS token string,
+        an account shared access key, or an instance of an async TokenCredentials class from azure.identity.
+        If the URL already has a SAS token, specifying an explicit credential will take priority.
+    :rtype: None
+    """
+    async with BlobClient(blob_url, credential=credential) as client:
+        if hasattr(output, 'write'):
+            await _download_to_stream(client, output, max_connections, **kwargs)
+        else:
+            if not overwrite and os.path.isfile(output):
+                raise ValueError("The file '{}' already exists.".format(output))
+            with open(output, 'wb') as file_handle:
+                await _download_to_stream(client, file_handle, max_connections, **kwargs)
@@ -0,0 +1,253 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional # pylint: disable=unused-import
+
+from .._blob_listing import get_page_blobs, get_page_items, get_page_prefixes
+from ..models import BlobProperties
+
+
+class _BlobStream(object):
+    """The blobs of the pages of one or more shard queues, consumed one queue after the other.
+
+    A page is checkpointed when the blob following its last one is requested.
+    """
+
+    def __init__(self, checkpoint, sources, add_shards=None):
+        self._checkpoint = checkpoint
+        # [queue, number of shards left to read from it]
+        self._sources = deque(sources)
+        self._add_shards = add_shards
+        self._blobs = deque()  # type: deque
+        self._page = None
+
+    async def fill(self):
+        while not self._blobs:
+            if self._page is not None:
+                index, next_marker = self._page
+                self._page = None
+                self._checkpoint[index][2] = next_marker
+                if next_marker is None:
+                    self._sources[0][1] -= 1
+                    if not self._sources[0][1]:
+                        self._sources.popleft()
+            if not self._sources:
+                return
+            index, blobs, prefixes, next_marker, error = await self._sources[0][0].get()
+            if error is not None:
+                raise error
+            if self._add_shards:
+                self._sources[0][1] += len(self._add_shards(prefixes, self._sources[0][0]))
+            self._blobs.extend(blobs)
+            self._page = (index, next_marker)
+
+    def peek(self):
+        return self._blobs[0] if self._blobs else None
+
+    def pop(self):
+        return self._blobs.popleft()
+
+
+class _NestedBlobStream(object):
+    """The blobs of a shard with a delimiter, and of the shards it finds, in name order.
+
+    The blobs of a shard found on a page are returned at the place of its prefix in the page.
+    A page is checkpointed when the blob following its last one is requested.
+    """
+
+    def __init__(self, checkpoint, pages, add_shards):
+        self._checkpoint = checkpoint
+        self._pages = pages
+        self._add_shards = add_shards
+        self._items = deque()  # type: deque
+        self._shard = None
+        self._blobs = deque()  # type: deque
+        self._page = None
+        self._nested_page = None
+
+    async def fill(self):
+        while not self._blobs:
+            if self._page is not None:
+                index, next_marker = self._page
+                self._page = None
+                self._checkpoint[index][2] = next_marker
+                if next_marker is None:
+                    self._shard = None
+            if self._shard is not None:
+                index, blobs, _, next_marker, error = await self._shard.get()
+                if error is not None:
+                    raise error
+                self._blobs.extend(blobs)
+                self._page = (index, next_marker)
+                continue
+            if self._items:
+                _, blob, shard = self._items.popleft()
+                if blob is None:
+                    self._shard = shard
+                else:
+                    self._blobs.append(blob)
+                continue
+            if self._nested_page is not None:
+                index, next_marker = self._nested_page
+                self._checkpoint[index][2] = next_marker
+                if next_marker is None:
+                    return
+            index, blobs, prefixes, next_marker, error = await self._pages.get()
+            if error is not None:
+                raise error
+            self._items.extend(get_page_items(blobs, self._add_shards(prefixes)))
+            self._nested_page = (index, next_marker)
+
+    def peek(self):
+        return self._blobs[0] if self._blobs else None
+
+    def pop(self):
+        return self._blobs.popleft()
+
+
+class ParallelBlobListing(object):
+    """An async iterable of the blobs of a container, listed by shards of its keyspace in parallel.
+
+    Each shard lists the blobs whose names start with a prefix, following its continuation
+    markers one page at a time. A shard with a delimiter returns the blobs directly under its
+    prefix, and each virtual directory it finds becomes a shard without delimiter, started as
+    soon as its page comes in. Unordered, the blobs are returned as the pages of the shards come
+    in, and up to max_connections shards are listed at once. Ordered, they are returned in
+    name order: the shards do not overlap, so this only holds the pages of the shards ahead
+    of the one being consumed, at most two pages per shard. The shards with a delimiter are
+    merged with the others, so each of them is listed by a worker of its own, and so are,
+    one after the other, the shards without delimiter of a resumed listing next to them: up to
+    max_connections + 1 shards are listed at once, plus one per shard with a delimiter.
+
+    :ivar list checkpoint:
+        The progress of the listing, as a list of [prefix, delimiter, marker] shards. The marker
+        is '' for a shard that was not started yet, and None for a shard that was listed to the end.
+        It can be saved, for example as JSON, and passed to list_blobs_parallel to resume an
+        interrupted listing. A page is only checkpointed once all of its blobs were consumed, so a
+        resumed listing may return again the blobs of the page being consumed when it stopped.
+
+    :param callable get_paged: Function of (prefix, delimiter, marker), returning the async
+        BlobPropertiesPaged or BlobPrefix listing of a shard.
+    :param list checkpoint: The shards to list.
+    :param bool ordered: Whether to return the blobs in name order.
+    :param int max_connections: The maximum number of shards listed at once, not counting
+        the workers of the shards with a delimiter of an ordered listing.
+    """
+
+    def __init__(self, get_paged, checkpoint, ordered=False, max_connections=4):
+        # type: (Callable[..., Any], List[List[Any]], bool, int) -> None
+        self.checkpoint = checkpoint
+        self.ordered = ordered
+        self.max_connections = max(1, max_connections)
+        self._get_paged = get_paged
+        self._streams = None  # type: Optional[List[Any]]
+        self._workers = []  # type: List[asyncio.Future]
+        self._shards = dict((shard[0], i) for i, shard in enumerate(checkpoint) if not shard[1])
+        self._pending = deque()  # type: deque
+        self._pool_size = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # type: () -> BlobProperties
+        if self._streams is None:
+            self._start()
+        try:
+            for stream in self._streams:
+                await stream.fill()
+        except BaseException:
+            self.close()
+            raise
+        heads = [s for s in self._streams if s.peek() is not None]
+        if not heads:
+            self.close()
+            raise StopAsyncIteration("End of listing")
+        return min(heads, key=lambda s: s.peek().name).pop()
+
+    def close(self):
+        # type: () -> None
+        """Stop listing. Requests in flight are cancelled."""
+        for worker in self._workers:
+            worker.cancel()
+
+    async def _list_shard(self, index, pages):
+        prefix, delimiter, marker = self.checkpoint[index]
+        paged = self._get_paged(prefix, delimiter, marker)
+        try:
+            while paged.next_marker is not None:
+                await paged._async_advance_page()  # pylint: disable=protected-access
+                await pages.put((index, get_page_blobs(paged), get_page_prefixes(paged), paged.next_marker, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:  # pylint: disable=broad-except
+            await pages.put((index, None, None, None, error))
+
+    async def _worker(self, shards):
+        while shards:
+            index, pages = shards.popleft()
+            await self._list_shard(index, pages)
+
+    async def _pool_worker(self):
+        try:
+            await self._worker(self._pending)
+        finally:
+            self._pool_size -= 1
+
+    def _start_workers(self, shards, count):
+        shards = deque(shards)
+        self._workers.extend(asyncio.ensure_future(self._worker(shards)) for _ in range(count))
+
+    def _submit(self, index, pages):
+        self._pending.append((index, pages))
+        if self._pool_size < self.max_connections:
+            self._pool_size += 1
+            self._workers.append(asyncio.ensure_future(self._pool_worker()))
+
+    def _add_shards(self, prefixes, pages=None):
+        # type: (List[str], Optional[asyncio.Queue]) -> List[Any]
+        """Start listing the virtual directories found by a shard, unless they are shards already.
+
+        A resumed listing finds again the directories of the page it stopped at.
+        """
+        shards = []
+        for prefix in prefixes:
+            if prefix in self._shards:
+                continue
+            index = len(self.checkpoint)
+            self.checkpoint.append([prefix, None, ''])
+            self._shards[prefix] = index
+            shard = pages or asyncio.Queue(maxsize=2)
+            self._submit(index, shard)
+            shards.append((prefix, shard))
+        return shards
+
+    def _start(self):
+        pending = [i for i, shard in enumerate(self.checkpoint) if shard[2] is not None]
+        if not self.ordered:
+            pages = asyncio.Queue(maxsize=self.max_connections)
+            self._streams = [_BlobStream(
+                self.checkpoint, [[pages, len(pending)]] if pending else [], add_shards=self._add_shards)]
+            for index in pending:
+                self._submit(index, pages)
+            return
+
+        pending.sort(key=lambda i: self.checkpoint[i][0])
+        # The shards without a delimiter are disjoint ranges of names, and are returned one after
+        # the other. A shard with a delimiter interleaves with them, so it is merged in and gets a
+        # worker of its own, to be listed alongside the shard being consumed. The shards it finds
+        # are returned in its stream, and listed by the other workers in the order they are found.
+        flat = [(i, asyncio.Queue(maxsize=2)) for i in pending if not self.checkpoint[i][1]]
+        nested = [(i, asyncio.Queue(maxsize=2)) for i in pending if self.checkpoint[i][1]]
+        self._streams = [_BlobStream(self.checkpoint, [[pages, 1] for _, pages in flat])]
+        self._streams.extend(_NestedBlobStream(self.checkpoint, pages, self._add_shards) for _, pages in nested)
+        for shard in nested:
+            self._start_workers([shard], 1)
+        # The shards of a resumed listing come first in name order. They are listed one after
+        # the other, so that they leave the workers to the shards found later on.
+        self._start_workers(flat, 1 if nested else self.max_connections)
@@ -0,0 +1,770 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+# pylint: disable=no-self-use
+
+import sys
+import time
+from io import BytesIO, SEEK_SET, UnsupportedOperation
+from typing import Optional, Union, Any, TypeVar, TYPE_CHECKING # pylint: disable=unused-import
+
+import six
+from azure.core.exceptions import HttpResponseError, ResourceModifiedError
+
+from .._shared.utils import (
+    encode_base64,
+    process_storage_error,
+    validate_and_format_range_headers,
+    parse_length_from_content_range,
+    return_response_headers)
+from .._shared.models import ModifiedAccessConditions
+from .._shared.upload_chunking_async import (
+    _parallel_uploads,
+    upload_blob_chunks,
+    upload_blob_substream_blocks,
+    BlockBlobChunkUploader,
+    GCMBlockBlobChunkUploader,
+    PageBlobChunkUploader,
+    AppendBlobChunkUploader)
+from .._shared.download_chunking import process_range_and_offset
+from .._shared.download_chunking_async import (
+    process_content,
+    process_encrypted_regions,
+    download_chunks,
+    ParallelBlobChunkDownloader,
+    SequentialBlobChunkDownloader
+)
+from .._shared.encryption import (
+    _ENCRYPTION_PROTOCOL_V1,
+    _ENCRYPTION_PROTOCOL_V2,
+    _generate_blob_encryption_data,
+    _encrypt_blob,
+    _get_encrypted_blob_length,
+    _get_blob_encrypted_regions,
+    _EncryptedRegions)
+from .._shared.autotune import TransferTuner
+from .._generated.models import (
+    StorageErrorException,
+    BlockLookupList,
+    AppendPositionAccessConditions
+)
+from .._blob_utils import (
+    _convert_mod_error,
+    _MAX_MD5_RANGE_SIZE,
+    get_upload_tuner,
+    get_modification_conditions,
+    get_initial_regions,
+    deserialize_blob_stream)
+
+
+async def upload_block_blob(  # pylint: disable=too-many-locals
+        client,
+        data,
+        stream,
+        length,
+        overwrite,
+        headers,
+        blob_headers,
+        access_conditions,
+        mod_conditions,
+        validate_content,
+        timeout,
+        max_connections,
+        blob_settings,
+        require_encryption,
+        key_encryption_key,
+        encryption_version=_ENCRYPTION_PROTOCOL_V1,
+        autotune=False,
+        **kwargs):
+    try:
+        overwrite_mod_conditions = None
+        if not overwrite:
+            overwrite_mod_conditions = get_modification_conditions(if_none_match='*')
+        adjusted_count = length
+        if (key_encryption_key is not None) and (adjusted_count is not None):
+            adjusted_count = _get_encrypted_blob_length(length, encryption_version)
+
+        # Do single put if the size is smaller than config.max_single_put_size.
+        # An autotuned upload stages anything larger than a block, so it can tune the blocks.
+        tuner = None
+        if autotune:
+            tuner = get_upload_tuner(adjusted_count, blob_settings.max_block_size, max_connections)
+        max_single_put_size = blob_settings.max_single_put_size
+        if tuner:
+            max_single_put_size = min(max_single_put_size, blob_settings.max_block_size + 1)
+        if adjusted_count is not None and (adjusted_count < max_single_put_size):
+            try:
+                data = data.read(length)
+                if not isinstance(data, six.binary_type):
+                    raise TypeError('Blob data should be of type bytes.')
+            except AttributeError:
+                pass
+            if key_encryption_key:
+                encryption_data, data = _encrypt_blob(data, key_encryption_key, encryption_version)
+                headers['x-ms-meta-encryptiondata'] = encryption_data
+            return await client.upload(
+                data,
+                content_length=adjusted_count,
+                timeout=timeout,
+                blob_http_headers=blob_headers,
+                lease_access_conditions=access_conditions,
+                modified_access_conditions=mod_conditions or overwrite_mod_conditions,
+                headers=headers,
+                cls=return_response_headers,
+                validate_content=validate_content,
+                data_stream_total=adjusted_count,
+                upload_stream_current=0,
+                **kwargs)
+
+        cek, iv, encryption_data = None, None, None
+        # A memoryview (e.g. of a memory-mapped file) is always staged as zero-copy slices
+        use_original_upload_path = not isinstance(stream, memoryview) and (
+            blob_settings.use_byte_buffer or
+            validate_content or require_encryption or key_encryption_key is not None or
+            blob_settings.max_block_size < blob_settings.min_large_block_upload_threshold or
+            hasattr(stream, 'seekable') and not stream.seekable() or
+            not hasattr(stream, 'seek') or not hasattr(stream, 'tell'))
+
+        if use_original_upload_path:
+            uploader_class = BlockBlobChunkUploader
+            uploader_options = {}
+            if key_encryption_key:
+                cek, iv, encryption_data = _generate_blob_encryption_data(key_encryption_key, encryption_version)
+                headers['x-ms-meta-encryptiondata'] = encryption_data
+                if encryption_version == _ENCRYPTION_PROTOCOL_V2:
+                    # The blocks hold whole regions, which are encrypted as they are staged
+                    uploader_class = GCMBlockBlobChunkUploader
+                    uploader_options['encrypted_regions'] = _EncryptedRegions(cek)
+                    cek = None
+            uploader_options.update(kwargs)
+            block_ids = await upload_blob_chunks(
+                blob_service=client,
+                blob_size=length,
+                block_size=blob_settings.max_block_size,
+                stream=stream,
+                max_connections=max_connections,
+                validate_content=validate_content,
+                access_conditions=access_conditions,
+                uploader_class=uploader_class,
+                timeout=timeout,
+                content_encryption_key=cek,
+                initialization_vector=iv,
+                tuner=tuner,
+                **uploader_options
+            )
+        else:
+            block_ids = await upload_blob_substream_blocks(
+                blob_service=client,
+                blob_size=length,
+                block_size=blob_settings.max_block_size,
+                stream=stream,
+                max_connections=max_connections,
+                validate_content=validate_content,
+                access_conditions=access_conditions,
+                uploader_class=BlockBlobChunkUploader,
+                timeout=timeout,
+                tuner=tuner,
+                **kwargs
+            )
+
+        block_lookup = BlockLookupList(committed=[], uncommitted=[], latest=[])
+        block_lookup.latest = block_ids
+        response = await client.commit_block_list(
+            block_lookup,
+            blob_http_headers=blob_headers,
+            lease_access_conditions=access_conditions,
+            timeout=timeout,
+            modified_access_conditions=mod_conditions or overwrite_mod_conditions,
+            cls=return_response_headers,
+            validate_content=validate_content,
+            headers=headers,
+            **kwargs)
+        if tuner:
+            response['autotune_settings'] = tuner.settings()
+        return response
+    except StorageErrorException as error:
+        try:
+            process_storage_error(error)
+        except ResourceModifiedError as mod_error:
+            if overwrite_mod_conditions:
+                _convert_mod_error(mod_error)
+            raise
+
+
+async def upload_page_blob(
+        client,
+        stream,
+        length,
+        overwrite,
+        headers,
+        blob_headers,
+        access_conditions,
+        mod_conditions,
+        validate_content,
+        premium_page_blob_tier,
+        timeout,
+        max_connections,
+        blob_settings,
+        cek,
+        iv,
+        encryption_data,
+        **kwargs):
+    try:
+        overwrite_mod_conditions = None
+        if not overwrite:
+            overwrite_mod_conditions = get_modification_conditions(if_none_match='*')
+        if length is None or length < 0:
+            raise ValueError("A content length must be specified for a Page Blob.")
+        if length % 512 != 0:
+            raise ValueError("Invalid page blob size: {0}. "
+                             "The size must be aligned to a 512-byte boundary.".format(length))
+        if premium_page_blob_tier:
+            try:
+                headers['x-ms-access-tier'] = premium_page_blob_tier.value
+            except AttributeError:
+                headers['x-ms-access-tier'] = premium_page_blob_tier
+        if encryption_data is not None:
+            headers['x-ms-meta-encryptiondata'] = encryption_data
+        response = await client.create(
+            content_length=0,
+            blob_content_length=length,
+            blob_sequence_number=None,
+            blob_http_headers=blob_headers,
+            timeout=timeout,
+            lease_access_conditions=access_conditions,
+            modified_access_conditions=mod_conditions or overwrite_mod_conditions,
+            cls=return_response_headers,
+            headers=headers,
+            **kwargs)
+        if length == 0:
+            return response
+
+        mod_conditions = get_modification_conditions(if_match=response['etag'])
+        return await upload_blob_chunks(
+            blob_service=client,
+            blob_size=length,
+            block_size=blob_settings.max_page_size,
+            stream=stream,
+            max_connections=max_connections,
+            validate_content=validate_content,
+            access_conditions=access_conditions,
+            uploader_class=PageBlobChunkUploader,
+            modified_access_conditions=mod_conditions,
+            timeout=timeout,
+            content_encryption_key=cek,
+            initialization_vector=iv,
+            **kwargs)
+    except StorageErrorException as error:
+        try:
+            process_storage_error(error)
+        except ResourceModifiedError as mod_error:
+            if overwrite_mod_conditions:
+                _convert_mod_error(mod_error)
+            raise
+
+
+async def _create_append_blob(
+        client,
+        blob_headers,
+        timeout,
+        access_conditions,
+        mod_conditions,
+        headers,
+        **kwargs):
+    await client.create(
+        content_length=0,
+        blob_http_headers=blob_headers,
+        timeout=timeout,
+        lease_access_conditions=access_conditions,
+        modified_access_conditions=mod_conditions,
+        cls=return_response_headers,
+        headers=headers,
+        **kwargs)
+
+
+async def upload_append_blob(
+        client,
+        stream,
+        length,
+        overwrite,
+        headers,
+        blob_headers,
+        access_conditions,
+        mod_conditions,
+        maxsize_condition,
+        validate_content,
+        timeout,
+        max_connections,
+        blob_settings,
+        **kwargs
+    ):
+    try:
+        if length == 0:
+            return {}
+        append_conditions = AppendPositionAccessConditions(
+            max_size=maxsize_condition,
+            append_position=None)
+        try:
+            if overwrite:
+                await _create_append_blob(
+                    client,
+                    blob_headers,
+                    timeout,
+                    access_conditions,
+                    mod_conditions,
+                    headers,
+                    **kwargs)
+            return await upload_blob_chunks(
+                blob_service=client,
+                blob_size=length,
+                block_size=blob_settings.max_block_size,
+                stream=stream,
+                append_conditions=append_conditions,
+                max_connections=max_connections,
+                validate_content=validate_content,
+                access_conditions=access_conditions,
+                uploader_class=AppendBlobChunkUploader,
+                modified_access_conditions=mod_conditions,
+                timeout=timeout,
+                **kwargs)
+        except StorageErrorException as error:
+            if error.response.status_code != 404:
+                raise
+            # rewind the request body if it is a stream
+            if hasattr(stream, 'read'):
+                try:
+                    # attempt to rewind the body to the initial position
+                    stream.seek(0, SEEK_SET)
+                except UnsupportedOperation:
+                    # if body is not seekable, then retry would not work
+                    raise error
+            await _create_append_blob(
+                client,
+                blob_headers,
+                timeout,
+                access_conditions,
+                mod_conditions,
+                headers,
+                **kwargs)
+            return await upload_blob_chunks(
+                blob_service=client,
+                blob_size=length,
+                block_size=blob_settings.max_block_size,
+                stream=stream,
+                append_conditions=append_conditions,
+                max_connections=max_connections,
+                validate_content=validate_content,
+                access_conditions=access_conditions,
+                uploader_class=AppendBlobChunkUploader,
+                modified_access_conditions=mod_conditions,
+                timeout=timeout,
+                **kwargs)
+    except StorageErrorException as error:
+        process_storage_error(error)
+
+
+async def stage_blocks_from_url(client, source_url, blocks, max_connections, access_conditions, timeout, **kwargs):
+    """Stages the blocks of a copy that are not staged already, up to max_connections at once.
+
+    Returns the number of blocks staged.
+    """
+    try:
+        block_list = await client.get_block_list(
+            list_type='uncommitted',
+            lease_access_conditions=access_conditions,
+            timeout=timeout)
+        staged = set((b.name, b.size) for b in block_list.uncommitted_blocks or [])
+    except StorageErrorException as error:
+        if error.response.status_code != 404:
+            raise
+        staged = set()
+    pending = [b for b in blocks if (encode_base64(b[0]), b[2]) not in staged]
+
+    async def _stage_block(block):
+        block_id, offset, length = block
+        await client.stage_block_from_url(
+            encode_base64(block_id),
+            content_length=0,
+            source_url=source_url,
+            source_range='bytes={0}-{1}'.format(offset, offset + length - 1),
+            timeout=timeout,
+            lease_access_conditions=access_conditions,
+            **kwargs)
+
+    if max_connections > 1 and len(pending) > 1:
+        await _parallel_uploads(_stage_block, pending, max_connections)
+    else:
+        for block in pending:
+            await _stage_block(block)
+    return len(pending)
+
+
+class _AsyncChunkIterator(object):
+    """Async iterator over the chunks of a blob download."""
+
+    def __init__(self, download):
+        self._download = download
+        self._downloader = None
+        self._ranges = None
+        self._tuner = None
+        self._started = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # pylint: disable=protected-access
+        if not self._started:
+            self._started = True
+            return await self._download._get_initial_content()
+        if self._download._download_complete:
+            raise StopAsyncIteration("Download complete")
+        if self._ranges is None:
+            self._downloader = self._download._get_downloader(SequentialBlobChunkDownloader, None)
+            # The chunks are requested one at a time, so only the chunk size is tuned
+            self._tuner = self._download._get_tuner(1)
+            self._downloader.tuner = self._tuner
+            self._ranges = self._downloader.get_chunk_ranges()
+        try:
+            chunk_range = next(self._ranges)
+        except StopIteration:
+            self._download._set_autotune_settings(self._tuner)
+            raise StopAsyncIteration("Download complete")
+        started = time.time()
+        chunk = await self._downloader.yield_chunk(*chunk_range)
+        if self._tuner:
+            self._tuner.record(chunk_range[1] - chunk_range[0], started)
+        return chunk
+
+
+class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attributes
+    """A streaming object to download a blob.
+
+    The stream downloader can be iterated asynchronously, or download to open file
+    or stream over multiple concurrent connections. The initial request is sent by
+    awaiting :func:`~azure.storage.blob.aio.BlobClient.download_blob`. When the download
+    is autotuned, the chunk size and number of connections it settled on are reported
+    in `autotune_settings`.
+    """
+
+    def __init__(
+            self, name, container, service, config, offset, length, validate_content,
+            access_conditions, mod_conditions, timeout,
+            require_encryption, key_encryption_key, key_resolver_function, autotune=False, **kwargs
+    ):
+        self.name = name
+        self.container = container
+        self.service = service
+        self.config = config
+        self.offset = offset
+        self.length = length
+        self.timeout = timeout
+        self.validate_content = validate_content
+        self.access_conditions = access_conditions
+        self.mod_conditions = mod_conditions
+        self.require_encryption = require_encryption
+        self.key_encryption_key = key_encryption_key
+        self.key_resolver_function = key_resolver_function
+        self.request_options = kwargs
+        self.location_mode = None
+        self._download_complete = False
+        self._initial_content = None
+        self._encrypted_regions = None
+        self._initial_encrypted_length = None
+        self.autotune = autotune
+        self.autotune_settings = None
+
+        # The service only provides transactional MD5s for chunks under 4MB.
+        # If validate_content is on, get only self.MAX_CHUNK_GET_SIZE for the first
+        # chunk so a transactional MD5 can be retrieved. An autotuned download also starts
+        # small, and grows the chunks from there.
+        self.first_get_size = self.config.max_single_get_size \
+            if not (self.validate_content or self.autotune) else self.config.max_chunk_get_size
+        initial_request_start = self.offset if self.offset is not None else 0
+        if self.length is not None and self.length - self.offset < self.first_get_size:
+            initial_request_end = self.length
+        else:
+            initial_request_end = initial_request_start + self.first_get_size - 1
+
+        self.initial_range, self.initial_offset = process_range_and_offset(
+            initial_request_start,
+            initial_request_end,
+            self.length,
+            self.key_encryption_key,
+            self.key_resolver_function)
+
+        self.download_size = None
+        self.blob_size = None
+        self.blob = None
+        self.properties = None
+
+    def __len__(self):
+        return self.download_size
+
+    async def _setup(self):
+        self.blob = await self._initial_request()
+        self.properties = self.blob.properties
+        self.properties.name = self.name
+        self.properties.container = self.container
+        # Set the content length to the download size instead of the size of
+        # the last range
+        self.properties.size = self.download_size
+
+        # Overwrite the content range to the user requested range
+        self.properties.content_range = 'bytes {0}-{1}/{2}'.format(self.offset, self.length, self.blob_size)
+
+        # Overwrite the content MD5 as it is the MD5 for the last range instead
+        # of the stored MD5
+        # TODO: Set to the stored MD5 when the service returns this
+        self.properties.content_md5 = None
+
+    async def _initial_request(self):
+        range_header, range_validation = validate_and_format_range_headers(
+            self.initial_range[0],
+            self.initial_range[1],
+            start_range_required=False,
+            end_range_required=False,
+            check_content_md5=self.validate_content)
+
+        try:
+            location_mode, blob = await self.service.download(
+                timeout=self.timeout,
+                range=range_header,
+                range_get_content_md5=range_validation,
+                lease_access_conditions=self.access_conditions,
+                modified_access_conditions=self.mod_conditions,
+                validate_content=self.validate_content,
+                cls=deserialize_blob_stream,
+                data_stream_total=None,
+                download_stream_current=0,
+                **self.request_options)
+
+            # Check the location we read from to ensure we use the same one
+            # for subsequent requests.
+            self.location_mode = location_mode
+
+            # Parse the total blob size and adjust the download size if ranges
+            # were specified
+            self.blob_size = parse_length_from_content_range(blob.properties.content_range)
+            if self.length is not None:
+                # Use the length unless it is over the end of the blob
+                self.download_size = min(self.blob_size, self.length - self.offset + 1)
+            elif self.offset is not None:
+                self.download_size = self.blob_size - self.offset
+            else:
+                self.download_size = self.blob_size
+
+        except StorageErrorException as error:
+            if self.offset is None and error.response.status_code == 416:
+                # Get range will fail on an empty blob. If the user did not
+                # request a range, do a regular get request in order to get
+                # any properties.
+                try:
+                    _, blob = await self.service.download(
+                        timeout=self.timeout,
+                        lease_access_conditions=self.access_conditions,
+                        modified_access_conditions=self.mod_conditions,
+                        validate_content=self.validate_content,
+                        cls=deserialize_blob_stream,
+                        data_stream_total=0,
+                        download_stream_current=0,
+                        **self.request_options)
+                except StorageErrorException as error:
+                    process_storage_error(error)
+
+                # Set the download size to empty
+                self.download_size = 0
+                self.blob_size = 0
+            else:
+                process_storage_error(error)
+
+        if self.blob_size and (self.key_encryption_key is not None or self.key_resolver_function is not None):
+            blob = await self._initial_encrypted_regions(blob)
+        else:
+            # If the blob is small, the download is complete at this point.
+            # If blob size is large, download the rest of the blob in chunks.
+            self._download_complete = blob.properties.size == self.download_size
+
+        if not self._download_complete:
+            # Lock on the etag. This can be overriden by the user by specifying '*'
+            if not self.mod_conditions:
+                self.mod_conditions = ModifiedAccessConditions()
+            if not self.mod_conditions.if_match:
+                self.mod_conditions.if_match = blob.properties.etag
+
+        return blob
+
+    async def _initial_encrypted_regions(self, blob):
+        # A blob encrypted with version 2.0 is downloaded in whole regions, and the
+        # sizes are those of the plain text.
+        try:
+            self._encrypted_regions = _get_blob_encrypted_regions(
+                self.require_encryption,
+                self.key_encryption_key,
+                self.key_resolver_function,
+                blob.response.headers)
+        except Exception as error:
+            raise HttpResponseError(message="Decryption failed.", response=blob.response, error=error)
+        if self._encrypted_regions is None:
+            self._download_complete = blob.properties.size == self.download_size
+            return blob
+
+        encrypted_size = self.blob_size
+        self.blob_size = self._encrypted_regions.get_data_length(encrypted_size)
+        start = self.offset or 0
+        end = self.blob_size - 1 if self.length is None else min(self.length, self.blob_size - 1)
+        self.download_size = max(0, end - start + 1)
+        if not self.download_size:
+            self._download_complete = True
+            return blob
+
+        download_range, self._initial_encrypted_length, self.initial_offset, initial_end = get_initial_regions(
+            self._encrypted_regions, encrypted_size, blob.properties.content_range, start, end, self.first_get_size)
+        self.initial_range = (start, initial_end)
+        self._download_complete = initial_end == end
+        if download_range is not None:
+            if not self.mod_conditions:
+                self.mod_conditions = ModifiedAccessConditions()
+            if not self.mod_conditions.if_match:
+                self.mod_conditions.if_match = blob.properties.etag
+            try:
+                _, blob = await self.service.download(
+                    timeout=self.timeout,
+                    range=validate_and_format_range_headers(*download_range)[0],
+                    lease_access_conditions=self.access_conditions,
+                    modified_access_conditions=self.mod_conditions,
+                    cls=deserialize_blob_stream,
+                    data_stream_total=None,
+                    download_stream_current=0,
+                    **self.request_options)
+            except StorageErrorException as error:
+                process_storage_error(error)
+        return blob
+
+    async def _get_initial_content(self):
+        # The body of the initial response can only be read once
+        if self._initial_content is None:
+            if self.download_size == 0:
+                self._initial_content = b""
+            elif self._encrypted_regions is not None:
+                self._initial_content = await process_encrypted_regions(
+                    self.blob,
+                    self._encrypted_regions,
+                    self.initial_offset[0],
+                    self.initial_offset[1],
+                    encrypted_length=self._initial_encrypted_length)
+            else:
+                self._initial_content = await process_content(
+                    self.blob,
+                    self.initial_offset[0],
+                    self.initial_offset[1],
+                    self.require_encryption,
+                    self.key_encryption_key,
+                    self.key_resolver_function,
+                    validate_content=self.validate_content)
+        return self._initial_content
+
+    def _get_downloader(self, downloader_class, stream):
+        end_blob = self.blob_size
+        if self.length is not None:
+            # Use the length unless it is over the end of the blob
+            end_blob = min(self.blob_size, self.length + 1)
+
+        chunk_size = self.config.max_chunk_get_size
+        options = dict(self.request_options)
+        if self._encrypted_regions is not None:
+            # The chunks hold whole regions, so no region is downloaded twice
+            data_length = self._encrypted_regions.data_length
+            chunk_size = max(1, chunk_size // data_length) * data_length
+            options['encrypted_regions'] = self._encrypted_regions
+
+        return downloader_class(
+            blob_service=self.service,
+            download_size=self.download_size,
+            chunk_size=chunk_size,
+            progress=self.first_get_size,
+            start_range=self.initial_range[1] + 1,  # start where the first download ended
+            end_range=end_blob,
+            stream=stream,
+            validate_content=self.validate_content,
+            access_conditions=self.access_conditions,
+            mod_conditions=self.mod_conditions,
+            timeout=self.timeout,
+            require_encryption=self.require_encryption,
+            key_encryption_key=self.key_encryption_key,
+            key_resolver_function=self.key_resolver_function,
+            use_location=self.location_mode,
+            cls=deserialize_blob_stream,
+            **options)
+
+    def _get_tuner(self, max_connections):
+        if not self.autotune:
+            return None
+        # Chunks must stay small enough to get their MD5 from the service
+        max_chunk_size = _MAX_MD5_RANGE_SIZE if self.validate_content else None
+        return TransferTuner(self.config.max_chunk_get_size, max_connections, max_chunk_size=max_chunk_size)
+
+    def _set_autotune_settings(self, tuner):
+        if tuner:
+            self.autotune_settings = tuner.settings()
+
+    def __aiter__(self):
+        return _AsyncChunkIterator(self)
+
+    async def content_as_bytes(self, max_connections=1):
+        """Download the contents of this blob.
+
+        :param int max_connections:
+            The number of concurrent connections with which to download.
+        :rtype: bytes
+        """
+        stream = BytesIO()
+        await self.download_to_stream(stream, max_connections=max_connections)
+        return stream.getvalue()
+
+    async def content_as_text(self, max_connections=1, encoding='UTF-8'):
+        """Download the contents of this blob, and decode as text.
+
+        :param int max_connections:
+            The number of concurrent connections with which to download.
+        :rtype: str
+        """
+        content = await self.content_as_bytes(max_connections=max_connections)
+        return content.decode(encoding)
+
+    async def download_to_stream(self, stream, max_connections=1):
+        """Download the contents of this blob to a stream.
+
+        :param stream:
+            The stream to download to. This can be an open file-handle,
+            or any writable stream. The stream must be seekable if the download
+            uses more than one concurrent connection.
+        :returns: The properties of the downloaded blob.
+        :rtype: ~azure.storage.blob.models.BlobProperties
+        """
+        # the stream must be seekable if parallel download is required
+        if max_connections > 1:
+            error_message = "Target stream handle must be seekable."
+            if sys.version_info >= (3,) and not stream.seekable():
+                raise ValueError(error_message)
+
+            try:
+                stream.seek(stream.tell())
+            except (NotImplementedError, AttributeError):
+                raise ValueError(error_message)
+
+        content = await self._get_initial_content()
+        # Write the content to the user stream
+        if content is not None:
+            stream.write(content)
+        if self._download_complete:
+            return self.properties
+
+        downloader_class = ParallelBlobChunkDownloader if max_connections > 1 else SequentialBlobChunkDownloader
+        downloader = self._get_downloader(downloader_class, stream)
+        tuner = self._get_tuner(max_connections)
+        await download_chunks(downloader, max_connections, tuner=tuner)
+        self._set_autotune_settings(tuner)
+        return self.properties
@@ -0,0 +1,86 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+import os
+
+from .._directory_sync import DirectorySync, makedirs
+
+
+class AsyncDirectorySync(DirectorySync):
+    """Compares a local directory with the blobs under a prefix of a container, and
+    transfers the files that differ, with an async container client.
+
+    The worker pool is a set of max_connections tasks.
+    """
+
+    async def _list_blobs(self):
+        blobs = {}
+        listing = self.container.list_blobs_parallel(
+            name_starts_with=self.prefix or None, max_connections=self.max_connections)
+        async for blob in listing:
+            relative_path = self.get_relative_path(blob.name)
+            if relative_path is not None:
+                blobs[relative_path] = blob
+        return blobs
+
+    async def _run(self, transfer, transfers):
+        batches, large = self.split_transfers(transfers)
+        batches.reverse()
+
+        async def _worker():
+            while batches:
+                for item in batches.pop():
+                    await transfer(item, 1)
+
+        workers = [asyncio.ensure_future(_worker()) for _ in range(min(self.max_connections, len(batches)))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            raise
+        for item in large:
+            await transfer(item, self.max_connections)
+
+    async def upload(self, dry_run=False):
+        report, transfers = self.diff(True, self.get_local_files(), await self._list_blobs(), dry_run)
+        if dry_run:
+            return report
+
+        async def _upload(item, max_connections):
+            relative_path, size, local_file = item
+            with open(local_file.path, 'rb') as data:
+                await self.container.upload_blob(
+                    self.prefix + relative_path,
+                    data,
+                    length=size,
+                    overwrite=True,
+                    content_settings=self.get_upload_settings(local_file),
+                    max_connections=max_connections,
+                    **self.request_options)
+            self.update_progress(report, size)
+
+        await self._run(_upload, transfers)
+        return report
+
+    async def download(self, dry_run=False):
+        report, transfers = self.diff(False, self.get_local_files(), await self._list_blobs(), dry_run)
+        if dry_run:
+            return report
+
+        async def _download(item, max_connections):
+            relative_path, size, blob = item
+            path = self.get_local_path(relative_path)
+            makedirs(os.path.dirname(path))
+            downloader = await self.container.get_blob_client(blob.name).download_blob(**self.request_options)
+            with open(path, 'wb') as stream:
+                properties = await downloader.download_to_stream(stream, max_connections=max_connections)
+            self.set_local_mtime(path, properties)
+            self.update_progress(report, size)
+
+        await self._run(_download, transfers)
+        return report
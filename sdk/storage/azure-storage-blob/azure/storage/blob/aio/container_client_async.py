@@ -0,0 +1,1043 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+# pylint: disable=invalid-overridden-method
+
+import functools
+from typing import (  # pylint: disable=unused-import
+    Union, Optional, Any, Iterable, AnyStr, Dict, List, Tuple, IO, Callable,
+    TYPE_CHECKING
+)
+
+from .._shared.base_client_async import AsyncStorageAccountHostsMixin
+from .._shared.constants import STORAGE_OAUTH_SCOPE
+from .._shared.utils import (
+    process_storage_error,
+    return_response_headers,
+    add_metadata_headers,
+    serialize_iso,
+    return_headers_and_deserialized)
+from .._generated.aio import AzureBlobStorage
+from .._generated.models import (
+    StorageErrorException,
+    SignedIdentifier)
+from .._blob_utils import (
+    get_access_conditions,
+    get_modification_conditions,
+    deserialize_container_properties)
+from .._blob_listing import get_listing_checkpoint
+from .._directory_sync import DirectorySyncReport
+from .._blob_batch import (
+    MAX_BATCH_SIZE,
+    get_batch_request,
+    sign_batch_subrequests,
+    parse_batch_response,
+    process_batch_results,
+    raise_on_any_failure)
+from ..models import ( # pylint: disable=unused-import
+    ContainerProperties,
+    BlobProperties,
+    BlobType)
+from ..container_client import ContainerClient as ContainerClientBase
+from .models import BlobPropertiesPaged, BlobPrefix
+from ._blob_listing_async import ParallelBlobListing
+from ._directory_sync_async import AsyncDirectorySync
+from .lease_async import LeaseClient
+from .blob_client_async import BlobClient
+
+if TYPE_CHECKING:
+    from azure.core.pipeline.transport import AsyncHttpTransport
+    from azure.core.pipeline.policies import HTTPPolicy
+    from ..models import ContainerPermissions, PublicAccess
+    from datetime import datetime
+    from ..models import ( # pylint: disable=unused-import
+        AccessPolicy,
+        ContentSettings,
+        PremiumPageBlobTier,
+        StandardBlobTier)
+
+
+class ContainerClient(AsyncStorageAccountHostsMixin, ContainerClientBase):
+    """A client to interact with a specific container, although that container
+    may not yet exist.
+
+    All operations that call the service are coroutines. For operations relating
+    to a specific blob within this container, an async blob client can be
+    retrieved using the :func:`~get_blob_client` function.
+
+    :ivar str url:
+        The full endpoint URL to the Container, including SAS token if used. This could be
+        either the primary endpoint, or the secondard endpoint depending on the current `location_mode`.
+    :ivar str primary_endpoint:
+        The full primary endpoint URL.
+    :ivar str primary_hostname:
+        The hostname of the primary endpoint.
+    :ivar str secondary_endpoint:
+        The full secondard endpoint URL if configured. If not available
+        a ValueError will be raised. To explicitly specify a secondary hostname, use the optional
+        `secondary_hostname` keyword argument on instantiation.
+    :ivar str secondary_hostname:
+        The hostname of the secondary endpoint. If not available this
+        will be None. To explicitly specify a secondary hostname, use the optional
+        `secondary_hostname` keyword argument on instantiation.
+    :ivar str location_mode:
+        The location mode that the client is currently using. By default
+        this will be "primary". Options include "primary" and "secondary".
+    :param str container_url:
+        The full URI to the container. This can also be a URL to the storage
+        account, in which case the blob container must also be specified.
+    :param container:
+        The container for the blob.
+    :type container: str or ~azure.storage.blob.models.ContainerProperties
+    :param credential:
+        The credentials with which to authenticate. This is optional if the
+        account URL already has a SAS token. The value can be a SAS token string, and account
+        shared access key, or an instance of an async TokenCredentials class from azure.identity.
+        If the URL already has a SAS token, specifying an explicit credential will take priority.
+    """
+    def __init__(
+            self, container_url,  # type: str
+            container=None,  # type: Optional[Union[ContainerProperties, str]]
+            credential=None,  # type: Optional[Any]
+            **kwargs  # type: Any
+        ):
+        # type: (...) -> None
+        super(ContainerClient, self).__init__(
+            container_url,
+            container=container,
+            credential=credential,
+            **kwargs)
+        self._client = AzureBlobStorage(self.url, pipeline=self._pipeline)
+
+    async def create_container(self, metadata=None, public_access=None, timeout=None, **kwargs):
+        # type: (Optional[Dict[str, str]], Optional[Union[PublicAccess, str]], Optional[int], **Any) -> None
+        """
+        Creates a new container under the specified account. If the container
+        with the same name already exists, the operation fails.
+
+        :param metadata:
+            A dict with name_value pairs to associate with the
+            container as metadata. Example:{'Category':'test'}
+        :type metadata: dict[str, str]
+        :param ~azure.storage.blob.models.PublicAccess public_access:
+            Possible values include: container, blob.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :rtype: None
+        """
+        headers = kwargs.pop('headers', {})
+        headers.update(add_metadata_headers(metadata)) # type: ignore
+        try:
+            return await self._client.container.create( # type: ignore
+                timeout=timeout,
+                access=public_access,
+                cls=return_response_headers,
+                headers=headers,
+                **kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+
+    async def delete_container(
+            self, lease=None,  # type: Optional[Union[LeaseClient, str]]
+            if_modified_since=None,  # type: Optional[datetime]
+            if_unmodified_since=None,  # type: Optional[datetime]
+            if_match=None,  # type: Optional[str]
+            if_none_match=None,  # type: Optional[str]
+            timeout=None,  # type: Optional[int]
+            **kwargs
+        ):
+        # type: (...) -> None
+        """
+        Marks the specified container for deletion. The container and any blobs
+        contained within it are later deleted during garbage collection.
+
+        :param ~azure.storage.blob.aio.LeaseClient lease:
+            If specified, delete_container only succeeds if the
+            container's lease is active and matches this ID.
+            Required if the container has an active lease.
+        :param datetime if_modified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only
+            if the resource has been modified since the specified time.
+        :param datetime if_unmodified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only if
+            the resource has not been modified since the specified date/time.
+        :param str if_match:
+            An ETag value, or the wildcard character (*). Specify this header to perform
+            the operation only if the resource's ETag matches the value specified.
+        :param str if_none_match:
+            An ETag value, or the wildcard character (*). Specify this header
+            to perform the operation only if the resource's ETag does not match
+            the value specified. Specify the wildcard character (*) to perform
+            the operation only if the resource does not exist, and fail the
+            operation if it does exist.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :rtype: None
+        """
+        access_conditions = get_access_conditions(lease)
+        mod_conditions = get_modification_conditions(
+            if_modified_since, if_unmodified_since, if_match, if_none_match)
+        try:
+            await self._client.container.delete(
+                timeout=timeout,
+                lease_access_conditions=access_conditions,
+                modified_access_conditions=mod_conditions,
+                **kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+
+    async def acquire_lease(
+            self, lease_duration=-1,  # type: int
+            lease_id=None,  # type: Optional[str]
+            if_modified_since=None,  # type: Optional[datetime]
+            if_unmodified_since=None,  # type: Optional[datetime]
+            if_match=None,  # type: Optional[str]
+            if_none_match=None,  # type: Optional[str]
+            timeout=None,  # type: Optional[int]
+            **kwargs):
+        # type: (...) -> LeaseClient
+        """
+        Requests a new lease. If the container does not have an active lease,
+        the Blob service creates a lease on the container and returns a new
+        lease ID.
+
+        :param int lease_duration:
+            Specifies the duration of the lease, in seconds, or negative one
+            (-1) for a lease that never expires. A non-infinite lease can be
+            between 15 and 60 seconds. A lease duration cannot be changed
+            using renew or change. Default is -1 (infinite lease).
+        :param str lease_id:
+            Proposed lease ID, in a GUID string format. The Blob service returns
+            400 (Invalid request) if the proposed lease ID is not in the correct format.
+        :param datetime if_modified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only
+            if the resource has been modified since the specified time.
+        :param datetime if_unmodified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only if
+            the resource has not been modified since the specified date/time.
+        :param str if_match:
+            An ETag value, or the wildcard character (*). Specify this header to perform
+            the operation only if the resource's ETag matches the value specified.
+        :param str if_none_match:
+            An ETag value, or the wildcard character (*). Specify this header
+            to perform the operation only if the resource's ETag does not match
+            the value specified. Specify the wildcard character (*) to perform
+            the operation only if the resource does not exist, and fail the
+            operation if it does exist.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: A LeaseClient object, that can be run in a context manager.
+        :rtype: ~azure.storage.blob.aio.LeaseClient
+        """
+        lease = LeaseClient(self, lease_id=lease_id) # type: ignore
+        await lease.acquire(
+            lease_duration=lease_duration,
+            if_modified_since=if_modified_since,
+            if_unmodified_since=if_unmodified_since,
+            if_match=if_match,
+            if_none_match=if_none_match,
+            timeout=timeout,
+            **kwargs)
+        return lease
+
+    async def get_account_information(self, **kwargs): # type: ignore
+        # type: (**Any) -> Dict[str, str]
+        """Gets information related to the storage account.
+
+        The information can also be retrieved if the user has a SAS to a container or blob.
+        The keys in the returned dictionary include 'sku_name' and 'account_kind'.
+
+        :returns: A dict of account information (SKU and account type).
+        :rtype: dict(str, str)
+        """
+        try:
+            return await self._client.container.get_account_info(cls=return_response_headers, **kwargs) # type: ignore
+        except StorageErrorException as error:
+            process_storage_error(error)
+
+    async def get_container_properties(self, lease=None, timeout=None, **kwargs):
+        # type: (Optional[Union[LeaseClient, str]], Optional[int], **Any) -> ContainerProperties
+        """Returns all user-defined metadata and system properties for the specified
+        container. The data returned does not include the container's list of blobs.
+
+        :param ~azure.storage.blob.aio.LeaseClient lease:
+            If specified, get_container_properties only succeeds if the
+            container's lease is active and matches this ID.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :return: Properties for the specified container within a container object.
+        :rtype: ~azure.storage.blob.models.ContainerProperties
+        """
+        access_conditions = get_access_conditions(lease)
+        try:
+            response = await self._client.container.get_properties(
+                timeout=timeout,
+                lease_access_conditions=access_conditions,
+                cls=deserialize_container_properties,
+                **kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+        response.name = self.container_name
+        return response # type: ignore
+
+    async def set_container_metadata( # type: ignore
+            self, metadata=None,  # type: Optional[Dict[str, str]]
+            lease=None,  # type: Optional[Union[str, LeaseClient]]
+            if_modified_since=None,  # type: Optional[datetime]
+            timeout=None,  # type: Optional[int]
+            **kwargs
+        ):
+        # type: (...) -> Dict[str, Union[str, datetime]]
+        """Sets one or more user-defined name-value pairs for the specified
+        container. Each call to this operation replaces all existing metadata
+        attached to the container. To remove all metadata from the container,
+        call this operation with no metadata dict.
+
+        :param metadata:
+            A dict containing name-value pairs to associate with the container as
+            metadata. Example: {'category':'test'}
+        :type metadata: dict[str, str]
+        :param str lease:
+            If specified, set_container_metadata only succeeds if the
+            container's lease is active and matches this ID.
+        :param datetime if_modified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only
+            if the resource has been modified since the specified time.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: Container-updated property dict (Etag and last modified).
+        """
+        headers = kwargs.pop('headers', {})
+        headers.update(add_metadata_headers(metadata))
+        access_conditions = get_access_conditions(lease)
+        mod_conditions = get_modification_conditions(if_modified_since=if_modified_since)
+        try:
+            return await self._client.container.set_metadata( # type: ignore
+                timeout=timeout,
+                lease_access_conditions=access_conditions,
+                modified_access_conditions=mod_conditions,
+                cls=return_response_headers,
+                headers=headers,
+                **kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+
+    async def get_container_access_policy(self, lease=None, timeout=None, **kwargs):
+        # type: (Optional[Union[LeaseClient, str]], Optional[int], **Any) -> Dict[str, Any]
+        """Gets the permissions for the specified container.
+        The permissions indicate whether container data may be accessed publicly.
+
+        :param str lease:
+            If specified, get_container_access_policy only succeeds if the
+            container's lease is active and matches this ID.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: Access policy information in a dict.
+        :rtype: dict[str, str]
+        """
+        access_conditions = get_access_conditions(lease)
+        try:
+            response, identifiers = await self._client.container.get_access_policy(
+                timeout=timeout,
+                lease_access_conditions=access_conditions,
+                cls=return_headers_and_deserialized,
+                **kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+        return {
+            'public_access': response.get('blob_public_access'),
+            'signed_identifiers': identifiers or []
+        }
+
+    async def set_container_access_policy(
+            self, signed_identifiers=None,  # type: Optional[Dict[str, Optional[AccessPolicy]]]
+            public_access=None,  # type: Optional[Union[str, PublicAccess]]
+            lease=None,  # type: Optional[Union[str, LeaseClient]]
+            if_modified_since=None,  # type: Optional[datetime]
+            if_unmodified_since=None,  # type: Optional[datetime]
+            timeout=None,  # type: Optional[int]
+            **kwargs
+        ):
+        """Sets the permissions for the specified container or stored access
+        policies that may be used with Shared Access Signatures. The permissions
+        indicate whether blobs in a container may be accessed publicly.
+
+        :param signed_identifiers:
+            A dictionary of access policies to associate with the container. The
+            dictionary may contain up to 5 elements. An empty dictionary
+            will clear the access policies set on the service.
+        :type signed_identifiers: dict(str, :class:`~azure.storage.blob.models.AccessPolicy`)
+        :param ~azure.storage.blob.models.PublicAccess public_access:
+            Possible values include: container, blob.
+        :param lease:
+            Required if the container has an active lease. Value can be a LeaseClient object
+            or the lease ID as a string.
+        :type lease: ~azure.storage.blob.aio.LeaseClient or str
+        :param datetime if_modified_since:
+            A datetime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only
+            if the resource has been modified since the specified date/time.
+        :param datetime if_unmodified_since:
+            A datetime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only if
+            the resource has not been modified since the specified date/time.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: Container-updated property dict (Etag and last modified).
+        """
+        if signed_identifiers:
+            if len(signed_identifiers) > 5:
+                raise ValueError(
+                    'Too many access policies provided. The server does not support setting '
+                    'more than 5 access policies on a single resource.')
+            identifiers = []
+            for key, value in signed_identifiers.items():
+                if value:
+                    value.start = serialize_iso(value.start)
+                    value.expiry = serialize_iso(value.expiry)
+                identifiers.append(SignedIdentifier(id=key, access_policy=value)) # type: ignore
+            signed_identifiers = identifiers # type: ignore
+
+        mod_conditions = get_modification_conditions(
+            if_modified_since, if_unmodified_since)
+        access_conditions = get_access_conditions(lease)
+        try:
+            return await self._client.container.set_access_policy(
+                container_acl=signed_identifiers or None,
+                timeout=timeout,
+                access=public_access,
+                lease_access_conditions=access_conditions,
+                modified_access_conditions=mod_conditions,
+                cls=return_response_headers,
+                **kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+
+    def list_blobs(self, name_starts_with=None, include=None, marker=None, timeout=None, **kwargs):
+        # type: (Optional[str], Optional[Any], Optional[str], Optional[int], **Any) -> Iterable[BlobProperties]
+        """Returns a generator to list the blobs under the specified container.
+        The generator will lazily follow the continuation tokens returned by
+        the service.
+
+        :param str name_starts_with:
+            Filters the results to return only blobs whose names
+            begin with the specified prefix.
+        :param list[str] include:
+            Specifies one or more additional datasets to include in the response.
+            Options include: 'snapshots', 'metadata', 'uncommittedblobs', 'copy', 'deleted'.
+        :param str marker:
+            An opaque continuation token. This value can be retrieved from the
+            next_marker field of a previous generator object. If specified,
+            this generator will begin returning results from this point.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: An iterable (auto-paging) response of BlobProperties.
+        :rtype: ~azure.storage.blob.aio.models.BlobPropertiesPaged
+        """
+        if include and not isinstance(include, list):
+            include = [include]
+
+        results_per_page = kwargs.pop('results_per_page', None)
+        command = functools.partial(
+            self._client.container.list_blob_flat_segment,
+            include=include,
+            timeout=timeout,
+            **kwargs)
+        return BlobPropertiesPaged(command, prefix=name_starts_with, results_per_page=results_per_page, marker=marker)
+
+    def walk_blobs(
+            self, name_starts_with=None, # type: Optional[str]
+            include=None, # type: Optional[Any]
+            delimiter="/", # type: str
+            marker=None, # type: Optional[str]
+            timeout=None, # type: Optional[int]
+            **kwargs # type: Optional[Any]
+        ):
+        # type: (...) -> Iterable[BlobProperties]
+        """Returns a generator to list the blobs under the specified container.
+        The generator will lazily follow the continuation tokens returned by
+        the service. This operation will list blobs in accordance with a hierarchy,
+        as delimited by the specified delimiter character.
+
+        :param str name_starts_with:
+            Filters the results to return only blobs whose names
+            begin with the specified prefix.
+        :param list[str] include:
+            Specifies one or more additional datasets to include in the response.
+            Options include: 'snapshots', 'metadata', 'uncommittedblobs', 'copy', 'deleted'.
+        :param str delimiter:
+            When the request includes this parameter, the operation returns a BlobPrefix
+            element in the response body that acts as a placeholder for all blobs whose
+            names begin with the same substring up to the appearance of the delimiter
+            character. The delimiter may be a single character or a string.
+        :param str marker:
+            An opaque continuation token. This value can be retrieved from the
+            next_marker field of a previous generator object. If specified,
+            this generator will begin returning results from this point.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: An iterable (auto-paging) response of BlobProperties.
+        :rtype: ~azure.storage.blob.aio.models.BlobPrefix
+        """
+        if include and not isinstance(include, list):
+            include = [include]
+
+        results_per_page = kwargs.pop('results_per_page', None)
+        marker = kwargs.pop('marker', "")
+        command = functools.partial(
+            self._client.container.list_blob_hierarchy_segment,
+            delimiter=delimiter,
+            include=include,
+            timeout=timeout,
+            **kwargs)
+        return BlobPrefix(
+            command,
+            prefix=name_starts_with,
+            results_per_page=results_per_page,
+            marker=marker,
+            delimiter=delimiter)
+
+    def _get_blob_paged(
+            self, prefix,  # type: str
+            delimiter,  # type: Optional[str]
+            marker,  # type: str
+            include=None,  # type: Optional[List[str]]
+            timeout=None,  # type: Optional[int]
+            **kwargs  # type: Any
+        ):
+        # type: (...) -> BlobPropertiesPaged
+        results_per_page = kwargs.pop('results_per_page', None)
+        if delimiter:
+            command = functools.partial(
+                self._client.container.list_blob_hierarchy_segment,
+                delimiter=delimiter,
+                include=include,
+                timeout=timeout,
+                **kwargs)
+            return BlobPrefix(
+                command, prefix=prefix, results_per_page=results_per_page, marker=marker, delimiter=delimiter)
+        command = functools.partial(
+            self._client.container.list_blob_flat_segment,
+            include=include,
+            timeout=timeout,
+            **kwargs)
+        return BlobPropertiesPaged(command, prefix=prefix, results_per_page=results_per_page, marker=marker)
+
+    def list_blobs_parallel(
+            self, name_starts_with=None,  # type: Optional[str]
+            include=None,  # type: Optional[Any]
+            prefixes=None,  # type: Optional[List[str]]
+            delimiter="/",  # type: str
+            ordered=False,  # type: bool
+            max_connections=4,  # type: int
+            checkpoint=None,  # type: Optional[List[List[Any]]]
+            timeout=None,  # type: Optional[int]
+            **kwargs
+        ):
+        # type: (...) -> ParallelBlobListing
+        """Returns an async generator to list the blobs under the specified container,
+        listing shards of the container keyspace in parallel.
+
+        The keyspace is split by prefix: either the given prefixes, or the virtual
+        directories found under name_starts_with with the delimiter. Without prefixes,
+        the listing starts with the blobs directly under name_starts_with, and each
+        virtual directory is listed as soon as it is found. Each shard lazily follows
+        its own continuation tokens, and up to max_connections shards are listed at once.
+        An ordered listing without prefixes uses up to two more connections: one for the
+        blobs directly under name_starts_with, and once resumed, one for the shards found
+        before it was interrupted.
+        A container without virtual directories is listed as a single shard, so its
+        listing is only parallel with prefixes.
+
+        :param str name_starts_with:
+            Filters the results to return only blobs whose names
+            begin with the specified prefix. Ignored if prefixes are given.
+        :param list[str] include:
+            Specifies one or more additional datasets to include in the response.
+            Options include: 'snapshots', 'metadata', 'uncommittedblobs', 'copy', 'deleted'.
+            Snapshots cannot be listed with a delimiter, so they require prefixes, or
+            delimiter=None.
+        :param list[str] prefixes:
+            The split points of the listing: only the blobs whose names begin with one of
+            these prefixes are listed. A prefix must not begin with another one.
+        :param str delimiter:
+            The delimiter of the virtual directories used as shards, when no prefixes are given.
+        :param bool ordered:
+            Whether to return the blobs in name order, as list_blobs does. Unordered, blobs
+            are returned as soon as they are listed. The default value is False.
+        :param int max_connections:
+            The maximum number of shards listed at once, not counting the connections
+            an ordered listing adds. The default value is 4.
+        :param list checkpoint:
+            The checkpoint attribute of an interrupted listing, to resume it. The shards
+            and the continuation tokens are taken from it, and the other parameters that
+            define the shards are ignored.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: An async iterable of BlobProperties, whose checkpoint attribute holds the
+            progress of the listing.
+        :rtype: ~azure.storage.blob.aio.ParallelBlobListing
+        """
+        if include and not isinstance(include, list):
+            include = [include]
+
+        if checkpoint is not None:
+            checkpoint = [list(shard) for shard in checkpoint]
+        elif prefixes is not None:
+            checkpoint = get_listing_checkpoint(prefixes=prefixes)
+        else:
+            checkpoint = get_listing_checkpoint(name_starts_with=name_starts_with, delimiter=delimiter)
+        if include and 'snapshots' in include and any(shard[1] for shard in checkpoint if shard[2] is not None):
+            raise ValueError("Snapshots cannot be listed with a delimiter, they require prefixes or delimiter=None.")
+
+        get_paged = functools.partial(self._get_blob_paged, include=include, timeout=timeout, **kwargs)
+        return ParallelBlobListing(get_paged, checkpoint, ordered=ordered, max_connections=max_connections)
+
+    async def upload_blob(
+            self, name,  # type: Union[str, BlobProperties]
+            data,  # type: Union[Iterable[AnyStr], IO[AnyStr]]
+            blob_type=BlobType.BlockBlob,  # type: Union[str, BlobType]
+            overwrite=False,  # type: bool
+            length=None,  # type: Optional[int]
+            metadata=None,  # type: Optional[Dict[str, str]]
+            content_settings=None,  # type: Optional[ContentSettings]
+            validate_content=False,  # type: Optional[bool]
+            lease=None,  # type: Optional[Union[LeaseClient, str]]
+            if_modified_since=None,  # type: Optional[datetime]
+            if_unmodified_since=None,  # type: Optional[datetime]
+            if_match=None,  # type: Optional[str]
+            if_none_match=None,  # type: Optional[str]
+            timeout=None,  # type: Optional[int]
+            premium_page_blob_tier=None,  # type: Optional[Union[str, PremiumPageBlobTier]]
+            maxsize_condition=None,  # type: Optional[int]
+            max_connections=1,  # type: int
+            encoding='UTF-8', # type: str
+            **kwargs
+        ):
+        # type: (...) -> BlobClient
+        """Creates a new blob from a data source with automatic chunking.
+
+        :param name: The blob with which to interact. If specified, this value will override
+            a blob value specified in the blob URL.
+        :type name: str or ~azure.storage.blob.models.BlobProperties
+        :param ~azure.storage.blob.models.BlobType blob_type: The type of the blob. This can be
+            either BlockBlob, PageBlob or AppendBlob. The default value is BlockBlob.
+        :param bool overwrite: Whether the blob to be uploaded should overwrite the current data.
+            If True, upload_blob will silently overwrite the existing data. If set to False, the
+            operation will fail with ResourceExistsError. The exception to the above is with Append
+            blob types. In this case, if data already exists, an error will not be raised and
+            the data will be appended to the existing blob. If you set overwrite=True, then the existing
+            blob will be deleted, and a new one created.
+        :param int length:
+            Number of bytes to read from the stream. This is optional, but
+            should be supplied for optimal performance.
+        :param metadata:
+            Name-value pairs associated with the blob as metadata.
+        :type metadata: dict(str, str)
+        :param ~azure.storage.blob.models.ContentSettings content_settings:
+            ContentSettings object used to set blob properties.
+        :param bool validate_content:
+            If true, calculates an MD5 hash for each chunk of the blob. The storage
+            service checks the hash of the content that has arrived with the hash
+            that was sent. This is primarily valuable for detecting bitflips on
+            the wire if using http instead of https as https (the default) will
+            already validate. Note that this MD5 hash is not stored with the
+            blob. Also note that if enabled, the memory-efficient upload algorithm
+            will not be used, because computing the MD5 hash requires buffering
+            entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
+        :param lease:
+            Required if the container has an active lease. Value can be a LeaseClient object
+            or the lease ID as a string.
+        :type lease: ~azure.storage.blob.aio.LeaseClient or str
+        :param datetime if_modified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only
+            if the resource has been modified since the specified time.
+        :param datetime if_unmodified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only if
+            the resource has not been modified since the specified date/time.
+        :param str if_match:
+            An ETag value, or the wildcard character (*). Specify this header to perform
+            the operation only if the resource's ETag matches the value specified.
+        :param str if_none_match:
+            An ETag value, or the wildcard character (*). Specify this header
+            to perform the operation only if the resource's ETag does not match
+            the value specified. Specify the wildcard character (*) to perform
+            the operation only if the resource does not exist, and fail the
+            operation if it does exist.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :param ~azure.storage.blob.models.PremiumPageBlobTier premium_page_blob_tier:
+            A page blob tier value to set the blob to. The tier correlates to the size of the
+            blob and number of allowed IOPS. This is only applicable to page blobs on
+            premium storage accounts.
+        :param int maxsize_condition:
+            Optional conditional header. The max length in bytes permitted for
+            the append blob. If the Append Block operation would cause the blob
+            to exceed that limit or if the blob size is already greater than the
+            value specified in this header, the request will fail with
+            MaxBlobSizeConditionNotMet error (HTTP status code 412 - Precondition Failed).
+        :param int max_connections:
+            Maximum number of parallel connections to use when the blob size exceeds
+            64MB.
+        :param str encoding:
+            Defaults to UTF-8.
+        :returns: A BlobClient to interact with the newly uploaded blob.
+        :rtype: ~azure.storage.blob.aio.BlobClient
+        """
+        blob = self.get_blob_client(name)
+        await blob.upload_blob(
+            data,
+            blob_type=blob_type,
+            overwrite=overwrite,
+            length=length,
+            metadata=metadata,
+            content_settings=content_settings,
+            validate_content=validate_content,
+            lease=lease,
+            if_modified_since=if_modified_since,
+            if_unmodified_since=if_unmodified_since,
+            if_match=if_match,
+            if_none_match=if_none_match,
+            timeout=timeout,
+            premium_page_blob_tier=premium_page_blob_tier,
+            maxsize_condition=maxsize_condition,
+            max_connections=max_connections,
+            encoding=encoding,
+            **kwargs
+        )
+        return blob
+
+    async def upload_directory(
+            self, source,  # type: str
+            name_starts_with=None,  # type: Optional[str]
+            compare_content=False,  # type: bool
+            dry_run=False,  # type: bool
+            max_connections=4,  # type: int
+            progress_callback=None,  # type: Optional[Callable[[int, int], None]]
+            **kwargs
+        ):
+        # type: (...) -> DirectorySyncReport
+        """Uploads the files of a local directory tree that differ from the blobs under a prefix.
+
+        A file is uploaded when it has no blob, when the sizes differ, or when it was
+        modified after its blob. Blobs without a local file are left untouched.
+        The uploads share a pool of max_connections workers: small files are uploaded
+        in batches, and large files one at a time in parallel blocks.
+
+        :param str source:
+            The local directory to upload.
+        :param str name_starts_with:
+            The prefix of the blobs that mirror the directory, a virtual directory
+            of the container. By default, the directory mirrors the whole container.
+        :param bool compare_content:
+            Whether to compare the MD5 of the files with the Content-MD5 of the blobs
+            rather than their modification times. The uploaded blobs get their
+            Content-MD5 set. The default value is False.
+        :param bool dry_run:
+            Whether to only report the differences, without uploading any file.
+        :param int max_connections:
+            The size of the worker pool. The default value is 4.
+        :param callable progress_callback:
+            Called with the current and total number of bytes to upload, after each file.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: The differences found and the bytes uploaded.
+        :rtype: ~azure.storage.blob.DirectorySyncReport
+        """
+        sync = AsyncDirectorySync(
+            self, source,
+            name_starts_with=name_starts_with,
+            small_file_size=self._config.blob_settings.max_single_put_size,
+            compare_content=compare_content,
+            max_connections=max_connections,
+            progress_callback=progress_callback,
+            **kwargs)
+        return await sync.upload(dry_run=dry_run)
+
+    async def download_directory(
+            self, destination,  # type: str
+            name_starts_with=None,  # type: Optional[str]
+            compare_content=False,  # type: bool
+            dry_run=False,  # type: bool
+            max_connections=4,  # type: int
+            progress_callback=None,  # type: Optional[Callable[[int, int], None]]
+            **kwargs
+        ):
+        # type: (...) -> DirectorySyncReport
+        """Downloads the blobs under a prefix that differ from the files of a local directory tree.
+
+        A blob is downloaded when it has no local file, when the sizes differ, or when it
+        was modified after its file. The modification time of a downloaded file is set to
+        the last modified time of its blob. Files without a blob are left untouched.
+        The downloads share a pool of max_connections workers: small blobs are downloaded
+        in batches, and large blobs one at a time in parallel ranges.
+
+        :param str destination:
+            The local directory to download to. It is created if needed.
+        :param str name_starts_with:
+            The prefix of the blobs that mirror the directory, a virtual directory
+            of the container. By default, the directory mirrors the whole container.
+        :param bool compare_content:
+            Whether to compare the MD5 of the files with the Content-MD5 of the blobs
+            rather than their modification times. The default value is False.
+        :param bool dry_run:
+            Whether to only report the differences, without downloading any blob.
+        :param int max_connections:
+            The size of the worker pool. The default value is 4.
+        :param callable progress_callback:
+            Called with the current and total number of bytes to download, after each blob.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: The differences found and the bytes downloaded.
+        :rtype: ~azure.storage.blob.DirectorySyncReport
+        """
+        sync = AsyncDirectorySync(
+            self, destination,
+            name_starts_with=name_starts_with,
+            small_file_size=self._config.blob_settings.max_single_get_size,
+            compare_content=compare_content,
+            max_connections=max_connections,
+            progress_callback=progress_callback,
+            **kwargs)
+        return await sync.download(dry_run=dry_run)
+
+    async def delete_blob(
+            self, blob,  # type: Union[str, BlobProperties]
+            delete_snapshots=None,  # type: Optional[str]
+            lease=None,  # type: Optional[Union[str, LeaseClient]]
+            if_modified_since=None,  # type: Optional[datetime]
+            if_unmodified_since=None,  # type: Optional[datetime]
+            if_match=None,  # type: Optional[str]
+            if_none_match=None,  # type: Optional[str]
+            timeout=None,  # type: Optional[int]
+            **kwargs
+        ):
+        # type: (...) -> None
+        """Marks the specified blob or snapshot for deletion.
+
+        The blob is later deleted during garbage collection.
+        Note that in order to delete a blob, you must delete all of its
+        snapshots. You can delete both at the same time with the Delete
+        Blob operation.
+
+        If a delete retention policy is enabled for the service, then this operation soft deletes the blob or snapshot
+        and retains the blob or snapshot for specified number of days.
+        After specified number of days, blob's data is removed from the service during garbage collection.
+        Soft deleted blob or snapshot is accessible through List Blobs API specifying `include="deleted"` option.
+        Soft-deleted blob or snapshot can be restored using Undelete API.
+
+        :param blob: The blob with which to interact. If specified, this value will override
+         a blob value specified in the blob URL.
+        :type blob: str or ~azure.storage.blob.models.BlobProperties
+        :param str delete_snapshots:
+            Required if the blob has associated snapshots. Values include:
+             - "only": Deletes only the blobs snapshots.
+             - "include": Deletes the blob along with all snapshots.
+        :param lease:
+            Required if the blob has an active lease. Value can be a Lease object
+            or the lease ID as a string.
+        :type lease: ~azure.storage.blob.aio.LeaseClient or str
+        :param str delete_snapshots:
+            Required if the blob has associated snapshots. Values include:
+             - "only": Deletes only the blobs snapshots.
+             - "include": Deletes the blob along with all snapshots.
+        :param datetime if_modified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only
+            if the resource has been modified since the specified time.
+        :param datetime if_unmodified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only if
+            the resource has not been modified since the specified date/time.
+        :param str if_match:
+            An ETag value, or the wildcard character (*). Specify this header to perform
+            the operation only if the resource's ETag matches the value specified.
+        :param str if_none_match:
+            An ETag value, or the wildcard character (*). Specify this header
+            to perform the operation only if the resource's ETag does not match
+            the value specified. Specify the wildcard character (*) to perform
+            the operation only if the resource does not exist, and fail the
+            operation if it does exist.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :rtype: None
+        """
+        blob = self.get_blob_client(blob) # type: ignore
+        await blob.delete_blob( # type: ignore
+            delete_snapshots=delete_snapshots,
+            lease=lease,
+            if_modified_since=if_modified_since,
+            if_unmodified_since=if_unmodified_since,
+            if_match=if_match,
+            if_none_match=if_none_match,
+            timeout=timeout,
+            **kwargs)
+
+    async def _batch_send(self, requests, timeout=None, **kwargs):
+        # type: (List[Any], Optional[int], Any) -> List[Any]
+        raise_on_failure = kwargs.pop('raise_on_any_failure', True)
+        token = None
+        if hasattr(self.credential, 'get_token'):
+            token = (await self.credential.get_token(STORAGE_OAUTH_SCOPE)).token
+
+        results = []  # type: List[Any]
+        response = None
+        for index in range(0, len(requests), MAX_BATCH_SIZE):
+            batch = requests[index:index + MAX_BATCH_SIZE]
+            sign_batch_subrequests(batch, self._config.headers_policy, self.credential, token=token)
+            request = get_batch_request(self._batch_url(timeout), batch)
+            try:
+                response = (await self._pipeline.run(request, stream=True, **kwargs)).http_response
+                if response.status_code != 202:
+                    raise StorageErrorException(response, self._client._deserialize)  # pylint: disable=protected-access
+            except StorageErrorException as error:
+                process_storage_error(error)
+            await response.load_body()
+            subresponses = parse_batch_response(response, response.body(), batch)
+            results.extend(process_batch_results(subresponses, self._client._deserialize))  # pylint: disable=protected-access
+        if raise_on_failure:
+            raise_on_any_failure(results, response)
+        return results
+
+    async def delete_blobs(self, *blobs, **kwargs):
+        # type: (*Union[str, BlobProperties], Any) -> List[Any]
+        """Marks the specified blobs or snapshots for deletion, with batch requests.
+
+        The blobs are deleted with as few Blob Batch operations as possible, each of which
+        holds up to 256 sub-requests. The batch operations are sent to the storage account,
+        so a SAS credential must be an account SAS.
+
+        :param blobs: The blobs with which to interact. A BlobProperties with a snapshot
+            deletes that snapshot.
+        :type blobs: str or ~azure.storage.blob.models.BlobProperties
+        :param str delete_snapshots:
+            Required if the blobs have associated snapshots. Values include:
+             - "only": Deletes only the blobs snapshots.
+             - "include": Deletes the blob along with all snapshots.
+        :param datetime if_modified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only
+            if the resource has been modified since the specified time.
+        :param datetime if_unmodified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only if
+            the resource has not been modified since the specified date/time.
+        :param bool raise_on_any_failure:
+            Whether to raise a PartialBatchErrorException when any of the blobs could not
+            be deleted. The default value is True.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: For each blob, in order, the response headers of its deletion, or the
+            error it failed with.
+        :rtype: list
+        :raises: ~azure.storage.blob.PartialBatchErrorException
+        """
+        timeout = kwargs.pop('timeout', None)
+        requests = self._delete_blobs_subrequests(
+            blobs,
+            delete_snapshots=kwargs.pop('delete_snapshots', None),
+            if_modified_since=kwargs.pop('if_modified_since', None),
+            if_unmodified_since=kwargs.pop('if_unmodified_since', None))
+        return await self._batch_send(requests, timeout=timeout, **kwargs)
+
+    async def set_standard_blob_tier_blobs(
+            self, standard_blob_tier,  # type: Union[str, StandardBlobTier]
+            *blobs,  # type: Union[str, BlobProperties]
+            **kwargs
+        ):
+        # type: (...) -> List[Any]
+        """Sets the tier of the specified block blobs, with batch requests.
+
+        The tiers are set with as few Blob Batch operations as possible, each of which
+        holds up to 256 sub-requests. The batch operations are sent to the storage account,
+        so a SAS credential must be an account SAS.
+
+        :param standard_blob_tier:
+            Indicates the tier to be set on the blobs. Options include 'Hot', 'Cool',
+            'Archive'. The hot tier is optimized for storing data that is accessed
+            frequently. The cool storage tier is optimized for storing data that
+            is infrequently accessed and stored for at least a month. The archive
+            tier is optimized for storing data that is rarely accessed and stored
+            for at least six months with flexible latency requirements.
+        :type standard_blob_tier: str or ~azure.storage.blob.models.StandardBlobTier
+        :param blobs: The blobs with which to interact.
+        :type blobs: str or ~azure.storage.blob.models.BlobProperties
+        :param bool raise_on_any_failure:
+            Whether to raise a PartialBatchErrorException when the tier of any of the blobs
+            could not be set. The default value is True.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: For each blob, in order, the response headers of its operation, or the
+            error it failed with.
+        :rtype: list
+        :raises: ~azure.storage.blob.PartialBatchErrorException
+        """
+        timeout = kwargs.pop('timeout', None)
+        requests = self._set_tier_subrequests(standard_blob_tier, blobs)
+        return await self._batch_send(requests, timeout=timeout, **kwargs)
+
+    def get_blob_client(
+            self, blob,  # type: Union[str, BlobProperties]
+            snapshot=None  # type: str
+        ):
+        # type: (...) -> BlobClient
+        """Get a client to interact with the specified blob.
+
+        The blob need not already exist.
+
+        :param blob:
+            The blob with which to interact. If specified, this value will override
+            a blob value specified in the blob URL.
+        :type blob: str or ~azure.storage.blob.models.BlobProperties
+        :param str snapshot:
+            The optional blob snapshot on which to operate.
+        :returns: A BlobClient.
+        :rtype: ~azure.storage.blob.aio.BlobClient
+        """
+        return BlobClient(
+            self.url, container=self.container_name, blob=blob, snapshot=snapshot,
+            credential=self.credential, _configuration=self._config,
+            _pipeline=self._pipeline, _location_mode=self._location_mode, _hosts=self._hosts,
+            require_encryption=self.require_encryption, key_encryption_key=self.key_encryption_key,
+            key_resolver_function=self.key_resolver_function, encryption_version=self.encryption_version)
@@ -0,0 +1,209 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+import logging
+from typing import Callable, Any # pylint: disable=unused-import
+from azure.core.polling import AsyncPollingMethod
+
+from .._shared.utils import process_storage_error
+from .._generated.models import StorageErrorException
+from .._blob_utils import deserialize_blob_properties
+
+
+logger = logging.getLogger(__name__)
+
+
+class CopyStatusPoller(object):
+    """Poller for a long-running copy operation, returned by the async BlobClient.
+
+    The polling method can also be given to :class:`~azure.core.polling.AsyncLROPollerManager`,
+    which polls many copy operations on coalesced timers.
+    """
+
+    def __init__(self, client, copy_id, polling=True, configuration=None, **kwargs):
+        if configuration:
+            polling_interval = configuration.blob_settings.copy_polling_interval
+        else:
+            polling_interval = 2
+        polling_method = AsyncCopyBlobPolling if polling else AsyncCopyBlob
+        self._polling_method = polling_method(polling_interval, **kwargs)
+        self._polling_method.initialize(client, copy_id, None)
+
+    def polling_method(self):
+        # type: () -> AsyncCopyBlob
+        """Return the polling method associated to this poller.
+        """
+        return self._polling_method
+
+    def copy_id(self):
+        # type: () -> str
+        """Get the ID of the copy operation.
+
+        :rtype: str
+        """
+        return self._polling_method.id
+
+    async def abort(self):
+        # type: () -> None
+        """Abort the copy operation.
+
+        This will leave a destination blob with zero length and full metadata.
+        This will raise an error if the copy operation has already ended.
+
+        :rtype: None
+        """
+        return await self._polling_method.abort()
+
+    def status(self):
+        # type: () -> str
+        """Returns the status of the copy operation, as of the last status request.
+
+        :rtype: str
+        """
+        return self._polling_method.status()
+
+    def done(self):
+        # type: () -> bool
+        """Check status of the copy operation, as of the last status request.
+
+        :returns: 'True' if the process has completed, else 'False'.
+        """
+        return self._polling_method.finished()
+
+    async def result(self, timeout=None):
+        # type: (Optional[int]) -> Model
+        """Return the BlobProperties after the completion of the copy operation,
+        or the properties available after the specified timeout.
+
+        :param int timeout: The maximum time to wait, in seconds.
+        :returns: The destination blob properties.
+        :rtype: ~azure.storage.blob.models.BlobProperties
+        """
+        try:
+            await asyncio.wait_for(self._polling_method.run(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        if self._polling_method.blob is None:
+            await self._polling_method.update_status()
+        return self._polling_method.resource()
+
+
+class AsyncCopyBlob(AsyncPollingMethod):
+    """An empty poller that returns the deserialized initial response.
+    """
+    def __init__(self, interval, **kwargs):
+        self._client = None
+        self._status = None
+        self._exception = None
+        self.id = None
+        self.etag = None
+        self.last_modified = None
+        self.polling_interval = interval
+        self.kwargs = kwargs
+        self.blob = None
+        self._response = None
+
+    def _deserialize_properties(self, response, obj, headers):
+        self._response = response
+        return deserialize_blob_properties(response, obj, headers)
+
+    async def update_status(self):
+        """Request the properties of the destination blob, and update the copy status.
+
+        :returns: The response of the status request.
+        """
+        try:
+            self.blob = await self._client._client.blob.get_properties(  # pylint: disable=protected-access
+                cls=self._deserialize_properties, **self.kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+        self._status = self.blob.copy.status
+        self.etag = self.blob.etag
+        self.last_modified = self.blob.last_modified
+        return self._response
+
+    def initialize(self, client, initial_status, _):  # pylint: disable=arguments-differ
+        # type: (Any, Any, Callable) -> None
+        self._client = client
+        if isinstance(initial_status, str):
+            # The status is unknown until the first update_status
+            self.id = initial_status
+        else:
+            self._status = initial_status['copy_status']
+            self.id = initial_status['copy_id']
+            self.etag = initial_status['etag']
+            self.last_modified = initial_status['last_modified']
+
+    async def run(self):
+        # type: () -> None
+        """Empty run, no polling."""
+        if self._status is None:
+            await self.update_status()
+
+    async def abort(self):
+        # type: () -> None
+        try:
+            return await self._client._client.blob.abort_copy_from_url(  # pylint: disable=protected-access
+                self.id, **self.kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+
+    def status(self):
+        # type: () -> str
+        """Return the current status as a string.
+
+        :rtype: str
+        """
+        try:
+            return self._status.value # type: ignore
+        except AttributeError:
+            return self._status # type: ignore
+
+    def finished(self):
+        # type: () -> bool
+        """Is this polling finished?
+        :rtype: bool
+        """
+        return str(self.status()).lower() in ['success', 'aborted', 'failed']
+
+    def resource(self):
+        # type: () -> Any
+        return self.blob
+
+
+class AsyncCopyBlobPolling(AsyncCopyBlob):
+
+    def _check_status(self):
+        if str(self.status()).lower() == 'aborted':
+            raise ValueError("Copy operation aborted.")
+        if str(self.status()).lower() == 'failed':
+            raise ValueError("Copy operation failed: {}".format(self.blob.copy.status_description))
+
+    async def run(self):
+        # type: () -> None
+        try:
+            if self._status is None:
+                await super(AsyncCopyBlobPolling, self).update_status()
+            while not self.finished():
+                await asyncio.sleep(self.polling_interval)
+                await super(AsyncCopyBlobPolling, self).update_status()
+            self._check_status()
+        except Exception as e:
+            logger.warning(str(e))
+            raise
+
+    async def update_status(self):
+        """Poll the status of the copy operation once.
+
+        This lets a :class:`~azure.core.polling.AsyncLROPollerManager` poll the operation step by step.
+
+        :returns: The response of the status request.
+        :raises: ValueError if the copy operation was aborted or failed.
+        """
+        response = await super(AsyncCopyBlobPolling, self).update_status()
+        self._check_status()
+        return response
@@ -17,10 +17,11 @@ except ImportError:
     from urllib2 import quote, unquote # type: ignore
 
 import six
+from azure.core.exceptions import ResourceModifiedError
 
 from ._shared.shared_access_signature import BlobSharedAccessSignature
 from ._shared.encryption import _generate_blob_encryption_data
-from ._shared.upload_chunking import IterStreamer
+from ._shared.upload_chunking import IterStreamer, memory_mapped_file
 from ._shared.utils import (
     StorageAccountHostsMixin,
     return_response_headers,
@@ -44,6 +45,8 @@ from ._blob_utils import (
     get_access_conditions,
     get_modification_conditions,
     get_sequence_conditions,
+    get_copy_blocks,
+    stage_blocks_from_url,
     StorageStreamDownloader,
     upload_block_blob,
     upload_page_blob,
@@ -330,6 +333,106 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         except StorageErrorException as error:
             process_storage_error(error)
 
+    def _upload_blob_options(  # pylint: disable=too-many-locals
+            self, data,  # type: Union[Iterable[AnyStr], IO[AnyStr]]
+            blob_type=BlobType.BlockBlob,  # type: Union[str, BlobType]
+            overwrite=False,  # type: bool
+            length=None,  # type: Optional[int]
+            metadata=None,  # type: Optional[Dict[str, str]]
+            content_settings=None,  # type: Optional[ContentSettings]
+            validate_content=False,  # type: Optional[bool]
+            lease=None,  # type: Optional[Union[LeaseClient, str]]
+            if_modified_since=None,  # type: Optional[datetime]
+            if_unmodified_since=None,  # type: Optional[datetime]
+            if_match=None,  # type: Optional[str]
+            if_none_match=None,  # type: Optional[str]
+            timeout=None,  # type: Optional[int]
+            premium_page_blob_tier=None,  # type: Optional[Union[str, PremiumPageBlobTier]]
+            maxsize_condition=None,  # type: Optional[int]
+            max_connections=1,  # type: int
+            encoding='UTF-8', # type: str
+            autotune=False,  # type: bool
+            **kwargs
+        ):
+        # type: (...) -> Dict[str, Any]
+        if self.require_encryption and not self.key_encryption_key:
+            raise ValueError("Encryption required but no key was provided.")
+
+        if isinstance(data, six.text_type):
+            data = data.encode(encoding) # type: ignore
+        if isinstance(data, memoryview):
+            data = data.cast('B')
+            if blob_type != BlobType.BlockBlob or self.key_encryption_key is not None:
+                # Only block blobs are staged from slices of the view
+                data = data.tobytes()
+        if length is None:
+            length = get_length(data)
+        if isinstance(data, (bytes, memoryview)):
+            data = data[:length]
+
+        if isinstance(data, bytes):
+            stream = BytesIO(data)
+        elif isinstance(data, memoryview):
+            stream = data
+        elif hasattr(data, 'read'):
+            stream = data
+        elif hasattr(data, '__iter__'):
+            stream = IterStreamer(data, encoding=encoding)
+        else:
+            raise TypeError("Unsupported data type: {}".format(type(data)))
+
+        headers = kwargs.pop('headers', {})
+        headers.update(add_metadata_headers(metadata))
+        blob_headers = None
+        if content_settings:
+            blob_headers = BlobHTTPHeaders(
+                blob_cache_control=content_settings.cache_control,
+                blob_content_type=content_settings.content_type,
+                blob_content_md5=bytearray(content_settings.content_md5) if content_settings.content_md5 else None,
+                blob_content_encoding=content_settings.content_encoding,
+                blob_content_language=content_settings.content_language,
+                blob_content_disposition=content_settings.content_disposition
+            )
+        options = {
+            'stream': stream,
+            'length': length,
+            'overwrite': overwrite,
+            'headers': headers,
+            'blob_headers': blob_headers,
+            'access_conditions': get_access_conditions(lease),
+            'mod_conditions': get_modification_conditions(
+                if_modified_since, if_unmodified_since, if_match, if_none_match),
+            'validate_content': validate_content,
+            'timeout': timeout,
+            'max_connections': max_connections,
+            'blob_settings': self._config.blob_settings,
+        }
+        options.update(kwargs)
+        if blob_type == BlobType.BlockBlob:
+            options['client'] = self._client.block_blob
+            options['data'] = data
+            options['require_encryption'] = self.require_encryption
+            options['key_encryption_key'] = self.key_encryption_key
+            options['encryption_version'] = self.encryption_version
+            options['autotune'] = autotune
+        elif blob_type == BlobType.PageBlob:
+            cek, iv, encryption_data = None, None, None
+            if self.key_encryption_key is not None:
+                cek, iv, encryption_data = _generate_blob_encryption_data(self.key_encryption_key)
+            options['client'] = self._client.page_blob
+            options['premium_page_blob_tier'] = premium_page_blob_tier
+            options['cek'] = cek
+            options['iv'] = iv
+            options['encryption_data'] = encryption_data
+        elif blob_type == BlobType.AppendBlob:
+            if self.require_encryption or (self.key_encryption_key is not None):
+                raise ValueError(_ERROR_UNSUPPORTED_METHOD_FOR_ENCRYPTION)
+            options['client'] = self._client.append_blob
+            options['maxsize_condition'] = maxsize_condition
+        else:
+            raise ValueError("Unsupported BlobType: {}".format(blob_type))
+        return options
+
     def upload_blob(  # pylint: disable=too-many-locals
             self, data,  # type: Union[Iterable[AnyStr], IO[AnyStr]]
             blob_type=BlobType.BlockBlob,  # type: Union[str, BlobType]
@@ -353,7 +456,8 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
         # type: (...) -> Any
         """Creates a new blob from a data source with automatic chunking.
 
-        :param data: The blob data to upload.
+        :param data: The blob data to upload. The blocks of a block blob uploaded from
+            a memoryview are staged from slices of the view, without copying.
         :param ~azure.storage.blob.models.BlobType blob_type: The type of the blob. This can be
             either BlockBlob, PageBlob or AppendBlob. The default value is BlockBlob.
         :param bool overwrite: Whether the blob to be uploaded should overwrite the current data.
@@ -423,6 +527,10 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             64MB.
         :param str encoding:
             Defaults to UTF-8.
+        :param bool autotune:
+            Tune the block size and the number of parallel connections to the link as the
+            upload runs, with max_connections as the upper bound. This only applies to
+            block blobs. The chosen values are returned under 'autotune_settings'.
         :returns: Blob-updated property dict (Etag and last modified)
         :rtype: dict[str, Any]
 
@@ -434,100 +542,98 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
                 :dedent: 12
                 :caption: Upload a blob to the container.
         """
-        if self.require_encryption and not self.key_encryption_key:
-            raise ValueError("Encryption required but no key was provided.")
+        options = self._upload_blob_options(
+            data,
+            blob_type=blob_type,
+            overwrite=overwrite,
+            length=length,
+            metadata=metadata,
+            content_settings=content_settings,
+            validate_content=validate_content,
+            lease=lease,
+            if_modified_since=if_modified_since,
+            if_unmodified_since=if_unmodified_since,
+            if_match=if_match,
+            if_none_match=if_none_match,
+            timeout=timeout,
+            premium_page_blob_tier=premium_page_blob_tier,
+            maxsize_condition=maxsize_condition,
+            max_connections=max_connections,
+            encoding=encoding,
+            **kwargs)
+        if blob_type == BlobType.BlockBlob:
+            return upload_block_blob(**options)
+        if blob_type == BlobType.PageBlob:
+            return upload_page_blob(**options)
+        return upload_append_blob(**options)
 
-        cek, iv, encryption_data = None, None, None
-        if self.key_encryption_key is not None:
-            cek, iv, encryption_data = _generate_blob_encryption_data(self.key_encryption_key)
+    def upload_blob_from_path(
+            self, file_path,  # type: str
+            blob_type=BlobType.BlockBlob,  # type: Union[str, BlobType]
+            **kwargs
+        ):
+        # type: (...) -> Any
+        """Creates a new blob from a local file.
 
-        if isinstance(data, six.text_type):
-            data = data.encode(encoding) # type: ignore
-        if length is None:
-            length = get_length(data)
-        if isinstance(data, bytes):
-            data = data[:length]
+        A block blob is uploaded from a read-only memory map of the file. Each
+        block is staged from a slice of the map, so the file is not read into
+        memory and parallel connections do not share a file handle. Page and
+        append blobs, empty files and client-side encryption read the file
+        as a stream.
 
-        if isinstance(data, bytes):
-            stream = BytesIO(data)
-        elif hasattr(data, 'read'):
-            stream = data
-        elif hasattr(data, '__iter__'):
-            stream = IterStreamer(data, encoding=encoding)
-        else:
-            raise TypeError("Unsupported data type: {}".format(type(data)))
+        :param str file_path: The path of the file to upload.
+        :param ~azure.storage.blob.models.BlobType blob_type: The type of the blob. This can be
+            either BlockBlob, PageBlob or AppendBlob. The default value is BlockBlob.
+        :param kwargs: Any of the keyword arguments of :func:`upload_blob`.
+        :returns: Blob-updated property dict (Etag and last modified)
+        :rtype: dict[str, Any]
+        """
+        with open(file_path, 'rb') as stream:
+            if blob_type != BlobType.BlockBlob or self.key_encryption_key is not None \
+                    or not get_length(stream):
+                return self.upload_blob(stream, blob_type=blob_type, **kwargs)
+            with memory_mapped_file(stream) as view:
+                return self.upload_blob(view, blob_type=blob_type, **kwargs)
+
+    def _download_blob_options(
+            self, offset=None,  # type: Optional[int]
+            length=None,  # type: Optional[int]
+            validate_content=False,  # type: bool
+            lease=None,  # type: Union[LeaseClient, str]
+            if_modified_since=None,  # type: Optional[datetime]
+            if_unmodified_since=None,  # type: Optional[datetime]
+            if_match=None,  # type: Optional[str]
+            if_none_match=None,  # type: Optional[str]
+            timeout=None,  # type: Optional[int]
+            **kwargs
+        ):
+        # type: (...) -> Dict[str, Any]
+        if self.require_encryption and not self.key_encryption_key:
+            raise ValueError("Encryption required but no key was provided.")
+        if length is not None and offset is None:
+            raise ValueError("Offset value must not be None is length is set.")
 
-        headers = kwargs.pop('headers', {})
-        headers.update(add_metadata_headers(metadata))
-        blob_headers = None
         access_conditions = get_access_conditions(lease)
         mod_conditions = get_modification_conditions(
             if_modified_since, if_unmodified_since, if_match, if_none_match)
-        if content_settings:
-            blob_headers = BlobHTTPHeaders(
-                blob_cache_control=content_settings.cache_control,
-                blob_content_type=content_settings.content_type,
-                blob_content_md5=bytearray(content_settings.content_md5) if content_settings.content_md5 else None,
-                blob_content_encoding=content_settings.content_encoding,
-                blob_content_language=content_settings.content_language,
-                blob_content_disposition=content_settings.content_disposition
-            )
-        if blob_type == BlobType.BlockBlob:
-            return upload_block_blob(
-                self._client.block_blob,
-                data,
-                stream,
-                length,
-                overwrite,
-                headers,
-                blob_headers,
-                access_conditions,
-                mod_conditions,
-                validate_content,
-                timeout,
-                max_connections,
-                self._config.blob_settings,
-                self.require_encryption,
-                self.key_encryption_key,
-                **kwargs)
-        if blob_type == BlobType.PageBlob:
-            return upload_page_blob(
-                self._client.page_blob,
-                stream,
-                length,
-                overwrite,
-                headers,
-                blob_headers,
-                access_conditions,
-                mod_conditions,
-                validate_content,
-                premium_page_blob_tier,
-                timeout,
-                max_connections,
-                self._config.blob_settings,
-                cek,
-                iv,
-                encryption_data,
-                **kwargs)
-        if blob_type == BlobType.AppendBlob:
-            if self.require_encryption or (self.key_encryption_key is not None):
-                raise ValueError(_ERROR_UNSUPPORTED_METHOD_FOR_ENCRYPTION)
-            return upload_append_blob(
-                self._client.append_blob,
-                stream,
-                length,
-                overwrite,
-                headers,
-                blob_headers,
-                access_conditions,
-                mod_conditions,
-                maxsize_condition,
-                validate_content,
-                timeout,
-                max_connections,
-                self._config.blob_settings,
-                **kwargs)
-        raise ValueError("Unsupported BlobType: {}".format(blob_type))
+
+        options = {
+            'name': self.blob_name,
+            'container': self.container_name,
+            'service': self._client.blob,
+            'config': self._config.blob_settings,
+            'offset': offset,
+            'length': length,
+            'validate_content': validate_content,
+            'access_conditions': access_conditions,
+            'mod_conditions': mod_conditions,
+            'timeout': timeout,
+            'require_encryption': self.require_encryption,
+            'key_encryption_key': self.key_encryption_key,
+            'key_resolver_function': self.key_resolver_function,
+        }
+        options.update(kwargs)
+        return options
 
     def download_blob(
             self, offset=None,  # type: Optional[int]
@@ -588,6 +694,10 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             The timeout parameter is expressed in seconds. This method may make
             multiple calls to the Azure service and the timeout will apply to
             each call individually.
+        :param bool autotune:
+            Tune the chunk size and the number of parallel connections to the link as the
+            blob is downloaded, with the max_connections of the download as the upper bound.
+            The chosen values are reported in the `autotune_settings` of the downloader.
         :returns: A iterable data generator (stream)
         :rtype: ~azure.storage.blob._blob_utils.StorageStreamDownloader
 
@@ -599,30 +709,18 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
                 :dedent: 12
                 :caption: Download a blob.
         """
-        if self.require_encryption and not self.key_encryption_key:
-            raise ValueError("Encryption required but no key was provided.")
-        if length is not None and offset is None:
-            raise ValueError("Offset value must not be None is length is set.")
-
-        access_conditions = get_access_conditions(lease)
-        mod_conditions = get_modification_conditions(
-            if_modified_since, if_unmodified_since, if_match, if_none_match)
-
-        return StorageStreamDownloader(
-            name=self.blob_name,
-            container=self.container_name,
-            service=self._client.blob,
-            config=self._config.blob_settings,
+        options = self._download_blob_options(
             offset=offset,
             length=length,
             validate_content=validate_content,
-            access_conditions=access_conditions,
-            mod_conditions=mod_conditions,
+            lease=lease,
+            if_modified_since=if_modified_since,
+            if_unmodified_since=if_unmodified_since,
+            if_match=if_match,
+            if_none_match=if_none_match,
             timeout=timeout,
-            require_encryption=self.require_encryption,
-            key_encryption_key=self.key_encryption_key,
-            key_resolver_function=self.key_resolver_function,
             **kwargs)
+        return StorageStreamDownloader(**options)
 
     def delete_blob(
             self, delete_snapshots=None,  # type: Optional[str]
@@ -1395,6 +1493,122 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
             timeout=timeout)
         return poller
 
+    def copy_blob_from_url_in_blocks(  # pylint: disable=too-many-locals
+            self, source_url,  # type: str
+            source_length=None,  # type: Optional[int]
+            block_size=None,  # type: Optional[int]
+            max_connections=4,  # type: int
+            content_settings=None,  # type: Optional[ContentSettings]
+            metadata=None,  # type: Optional[Dict[str, str]]
+            lease=None,  # type: Optional[Union[LeaseClient, str]]
+            if_modified_since=None,  # type: Optional[datetime]
+            if_unmodified_since=None,  # type: Optional[datetime]
+            if_match=None,  # type: Optional[str]
+            if_none_match=None,  # type: Optional[str]
+            timeout=None,  # type: Optional[int]
+            **kwargs
+        ):
+        # type: (...) -> Dict[str, Union[str, datetime]]
+        """Copies a blob or file to this block blob, by staging ranges of the source
+        with parallel Put Block From URL requests and committing them at the end.
+
+        Unlike copy_blob_from_url, which starts a copy that the service completes
+        at its own pace, the copy is driven by the client: its throughput grows with
+        max_connections, and it is complete when this call returns. The data is
+        still read by the service from the source, and does not go through the client.
+
+        The block IDs are derived from the source, so if the copy fails, calling this
+        again with the same source and block size only stages the blocks missing,
+        as long as the source was not modified in between.
+
+        :param str source_url:
+            A URL of up to 2 KB in length that specifies an Azure file or blob.
+            The source must either be public or be authenticated via a shared
+            access signature.
+        :param int source_length:
+            The size of the source in bytes. By default, the properties of the source
+            blob are read: its content settings and metadata are then copied too, and
+            the copy fails if the source is modified before the blocks are committed.
+            This must be given for a source that is not a blob.
+        :param int block_size:
+            The size of the ranges staged, up to 100MB. Defaults to the max_block_size
+            of the client, and is increased for a source that would need more than
+            50,000 blocks.
+        :param int max_connections:
+            The maximum number of ranges staged at once. The default value is 4.
+        :param ~azure.storage.blob.models.ContentSettings content_settings:
+            ContentSettings object used to set blob properties.
+        :param metadata:
+            Name-value pairs associated with the blob as metadata.
+        :type metadata: dict[str, str]
+        :param lease:
+            Required if the blob has an active lease. Value can be a LeaseClient object
+            or the lease ID as a string.
+        :type lease: ~azure.storage.blob.lease.LeaseClient or str
+        :param datetime if_modified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to commit the blocks only
+            if the resource has been modified since the specified time.
+        :param datetime if_unmodified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to commit the blocks only if
+            the resource has not been modified since the specified date/time.
+        :param str if_match:
+            An ETag value, or the wildcard character (*). Specify this header to commit
+            the blocks only if the resource's ETag matches the value specified.
+        :param str if_none_match:
+            An ETag value, or the wildcard character (*). Specify this header
+            to commit the blocks only if the resource's ETag does not match
+            the value specified. Specify the wildcard character (*) to commit
+            the blocks only if the resource does not exist.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: Blob-updated property dict (Etag and last modified).
+        :rtype: dict(str, Any)
+        """
+        if self.require_encryption or (self.key_encryption_key is not None):
+            raise ValueError(_ERROR_UNSUPPORTED_METHOD_FOR_ENCRYPTION)
+        source, source_etag = None, None
+        if source_length is None:
+            source = BlobClient(source_url, transport=self._pipeline._transport)  # pylint: disable=protected-access
+            source_properties = source.get_blob_properties(timeout=timeout)
+            source_length, source_etag = source_properties.size, source_properties.etag
+            if content_settings is None:
+                content_settings = source_properties.content_settings
+            if metadata is None:
+                metadata = source_properties.metadata
+        blocks = get_copy_blocks(
+            source_url, source_length, source_etag, block_size or self._config.blob_settings.max_block_size)
+        try:
+            stage_blocks_from_url(
+                self._client.block_blob,
+                source_url,
+                blocks,
+                max_connections,
+                get_access_conditions(lease),
+                timeout,
+                **kwargs)
+        except StorageErrorException as error:
+            process_storage_error(error)
+        if source is not None and source.get_blob_properties(timeout=timeout).etag != source_etag:
+            raise ResourceModifiedError("The source blob was modified during the copy.")
+        return self.commit_block_list(
+            [block_id for block_id, _, _ in blocks],
+            lease=lease,
+            content_settings=content_settings,
+            metadata=metadata,
+            if_modified_since=if_modified_since,
+            if_unmodified_since=if_unmodified_since,
+            if_match=if_match,
+            if_none_match=if_none_match,
+            timeout=timeout)
+
     def acquire_lease(
             self, lease_duration=-1,  # type: int
             lease_id=None,  # type: Optional[str]
@@ -1756,6 +1970,7 @@ class BlobClient(StorageAccountHostsMixin):  # pylint: disable=too-many-public-m
                 modified_access_conditions=mod_conditions,
                 cls=return_response_headers,
                 validate_content=validate_content,
+                headers=headers,
                 **kwargs)
         except StorageErrorException as error:
             process_storage_error(error)
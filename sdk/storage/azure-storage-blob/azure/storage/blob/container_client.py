@@ -6,7 +6,7 @@
 
 import functools
 from typing import (  # pylint: disable=unused-import
-    Union, Optional, Any, Iterable, AnyStr, Dict, List, Tuple, IO,
+    Union, Optional, Any, Iterable, AnyStr, Dict, List, Tuple, IO, Callable,
     TYPE_CHECKING
 )
 
@@ -18,6 +18,8 @@ except ImportError:
 
 import six
 
+from ._shared.constants import STORAGE_OAUTH_SCOPE
+from ._shared.models import LocationMode
 from ._shared.shared_access_signature import BlobSharedAccessSignature
 from ._shared.utils import (
     StorageAccountHostsMixin,
@@ -42,6 +44,16 @@ from .models import ( # pylint: disable=unused-import
     BlobPropertiesPaged,
     BlobType,
     BlobPrefix)
+from ._blob_batch import (
+    MAX_BATCH_SIZE,
+    get_batch_subrequest,
+    get_batch_request,
+    sign_batch_subrequests,
+    parse_batch_response,
+    process_batch_results,
+    raise_on_any_failure)
+from ._blob_listing import ParallelBlobListing, get_blob_pages, get_listing_checkpoint
+from ._directory_sync import DirectorySync, DirectorySyncReport
 from .lease import LeaseClient
 from .blob_client import BlobClient
 
@@ -53,7 +65,8 @@ if TYPE_CHECKING:
     from .models import ( # pylint: disable=unused-import
         AccessPolicy,
         ContentSettings,
-        PremiumPageBlobTier)
+        PremiumPageBlobTier,
+        StandardBlobTier)
 
 
 class ContainerClient(StorageAccountHostsMixin):
@@ -750,6 +763,104 @@ class ContainerClient(StorageAccountHostsMixin):
             marker=marker,
             delimiter=delimiter)
 
+    def _list_blob_pages(
+            self, prefix,  # type: str
+            delimiter,  # type: Optional[str]
+            marker,  # type: str
+            include=None,  # type: Optional[List[str]]
+            timeout=None,  # type: Optional[int]
+            **kwargs  # type: Any
+        ):
+        # type: (...) -> Iterable[Tuple[List[BlobProperties], List[str], Optional[str]]]
+        results_per_page = kwargs.pop('results_per_page', None)
+        if delimiter:
+            command = functools.partial(
+                self._client.container.list_blob_hierarchy_segment,
+                delimiter=delimiter,
+                include=include,
+                timeout=timeout,
+                **kwargs)
+            paged = BlobPrefix(
+                command, prefix=prefix, results_per_page=results_per_page, marker=marker, delimiter=delimiter)
+        else:
+            command = functools.partial(
+                self._client.container.list_blob_flat_segment,
+                include=include,
+                timeout=timeout,
+                **kwargs)
+            paged = BlobPropertiesPaged(command, prefix=prefix, results_per_page=results_per_page, marker=marker)
+        return get_blob_pages(paged)
+
+    def list_blobs_parallel(
+            self, name_starts_with=None,  # type: Optional[str]
+            include=None,  # type: Optional[Any]
+            prefixes=None,  # type: Optional[List[str]]
+            delimiter="/",  # type: str
+            ordered=False,  # type: bool
+            max_connections=4,  # type: int
+            checkpoint=None,  # type: Optional[List[List[Any]]]
+            timeout=None,  # type: Optional[int]
+            **kwargs
+        ):
+        # type: (...) -> ParallelBlobListing
+        """Returns a generator to list the blobs under the specified container,
+        listing shards of the container keyspace in parallel.
+
+        The keyspace is split by prefix: either the given prefixes, or the virtual
+        directories found under name_starts_with with the delimiter. Without prefixes,
+        the listing starts with the blobs directly under name_starts_with, and each
+        virtual directory is listed as soon as it is found. Each shard lazily follows
+        its own continuation tokens, and up to max_connections shards are listed at once.
+        An ordered listing without prefixes uses up to two more connections: one for the
+        blobs directly under name_starts_with, and once resumed, one for the shards found
+        before it was interrupted.
+        A container without virtual directories is listed as a single shard, so its
+        listing is only parallel with prefixes.
+
+        :param str name_starts_with:
+            Filters the results to return only blobs whose names
+            begin with the specified prefix. Ignored if prefixes are given.
+        :param list[str] include:
+            Specifies one or more additional datasets to include in the response.
+            Options include: 'snapshots', 'metadata', 'uncommittedblobs', 'copy', 'deleted'.
+            Snapshots cannot be listed with a delimiter, so they require prefixes, or
+            delimiter=None.
+        :param list[str] prefixes:
+            The split points of the listing: only the blobs whose names begin with one of
+            these prefixes are listed. A prefix must not begin with another one.
+        :param str delimiter:
+            The delimiter of the virtual directories used as shards, when no prefixes are given.
+        :param bool ordered:
+            Whether to return the blobs in name order, as list_blobs does. Unordered, blobs
+            are returned as soon as they are listed. The default value is False.
+        :param int max_connections:
+            The maximum number of shards listed at once, not counting the connections
+            an ordered listing adds. The default value is 4.
+        :param list checkpoint:
+            The checkpoint attribute of an interrupted listing, to resume it. The shards
+            and the continuation tokens are taken from it, and the other parameters that
+            define the shards are ignored.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: An iterable of BlobProperties, whose checkpoint attribute holds the
+            progress of the listing.
+        :rtype: ~azure.storage.blob.ParallelBlobListing
+        """
+        if include and not isinstance(include, list):
+            include = [include]
+
+        if checkpoint is not None:
+            checkpoint = [list(shard) for shard in checkpoint]
+        elif prefixes is not None:
+            checkpoint = get_listing_checkpoint(prefixes=prefixes)
+        else:
+            checkpoint = get_listing_checkpoint(name_starts_with=name_starts_with, delimiter=delimiter)
+        if include and 'snapshots' in include and any(shard[1] for shard in checkpoint if shard[2] is not None):
+            raise ValueError("Snapshots cannot be listed with a delimiter, they require prefixes or delimiter=None.")
+
+        list_pages = functools.partial(self._list_blob_pages, include=include, timeout=timeout, **kwargs)
+        return ParallelBlobListing(list_pages, checkpoint, ordered=ordered, max_connections=max_connections)
+
     def upload_blob(
             self, name,  # type: Union[str, BlobProperties]
             data,  # type: Union[Iterable[AnyStr], IO[AnyStr]]
@@ -880,6 +991,104 @@ class ContainerClient(StorageAccountHostsMixin):
         )
         return blob
 
+    def upload_directory(
+            self, source,  # type: str
+            name_starts_with=None,  # type: Optional[str]
+            compare_content=False,  # type: bool
+            dry_run=False,  # type: bool
+            max_connections=4,  # type: int
+            progress_callback=None,  # type: Optional[Callable[[int, int], None]]
+            **kwargs
+        ):
+        # type: (...) -> DirectorySyncReport
+        """Uploads the files of a local directory tree that differ from the blobs under a prefix.
+
+        A file is uploaded when it has no blob, when the sizes differ, or when it was
+        modified after its blob. Blobs without a local file are left untouched.
+        The uploads share a pool of max_connections workers: small files are uploaded
+        in batches, and large files one at a time in parallel blocks.
+
+        :param str source:
+            The local directory to upload.
+        :param str name_starts_with:
+            The prefix of the blobs that mirror the directory, a virtual directory
+            of the container. By default, the directory mirrors the whole container.
+        :param bool compare_content:
+            Whether to compare the MD5 of the files with the Content-MD5 of the blobs
+            rather than their modification times. The uploaded blobs get their
+            Content-MD5 set. The default value is False.
+        :param bool dry_run:
+            Whether to only report the differences, without uploading any file.
+        :param int max_connections:
+            The size of the worker pool. The default value is 4.
+        :param callable progress_callback:
+            Called with the current and total number of bytes to upload, after each file.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: The differences found and the bytes uploaded.
+        :rtype: ~azure.storage.blob.DirectorySyncReport
+        """
+        sync = DirectorySync(
+            self, source,
+            name_starts_with=name_starts_with,
+            small_file_size=self._config.blob_settings.max_single_put_size,
+            compare_content=compare_content,
+            max_connections=max_connections,
+            progress_callback=progress_callback,
+            **kwargs)
+        return sync.upload(dry_run=dry_run)
+
+    def download_directory(
+            self, destination,  # type: str
+            name_starts_with=None,  # type: Optional[str]
+            compare_content=False,  # type: bool
+            dry_run=False,  # type: bool
+            max_connections=4,  # type: int
+            progress_callback=None,  # type: Optional[Callable[[int, int], None]]
+            **kwargs
+        ):
+        # type: (...) -> DirectorySyncReport
+        """Downloads the blobs under a prefix that differ from the files of a local directory tree.
+
+        A blob is downloaded when it has no local file, when the sizes differ, or when it
+        was modified after its file. The modification time of a downloaded file is set to
+        the last modified time of its blob. Files without a blob are left untouched.
+        The downloads share a pool of max_connections workers: small blobs are downloaded
+        in batches, and large blobs one at a time in parallel ranges.
+
+        :param str destination:
+            The local directory to download to. It is created if needed.
+        :param str name_starts_with:
+            The prefix of the blobs that mirror the directory, a virtual directory
+            of the container. By default, the directory mirrors the whole container.
+        :param bool compare_content:
+            Whether to compare the MD5 of the files with the Content-MD5 of the blobs
+            rather than their modification times. The default value is False.
+        :param bool dry_run:
+            Whether to only report the differences, without downloading any blob.
+        :param int max_connections:
+            The size of the worker pool. The default value is 4.
+        :param callable progress_callback:
+            Called with the current and total number of bytes to download, after each blob.
+        :param int timeout:
+            The timeout parameter is expressed in seconds. This method may make
+            multiple calls to the Azure service and the timeout will apply to
+            each call individually.
+        :returns: The differences found and the bytes downloaded.
+        :rtype: ~azure.storage.blob.DirectorySyncReport
+        """
+        sync = DirectorySync(
+            self, destination,
+            name_starts_with=name_starts_with,
+            small_file_size=self._config.blob_settings.max_single_get_size,
+            compare_content=compare_content,
+            max_connections=max_connections,
+            progress_callback=progress_callback,
+            **kwargs)
+        return sync.download(dry_run=dry_run)
+
     def delete_blob(
             self, blob,  # type: Union[str, BlobProperties]
             delete_snapshots=None,  # type: Optional[str]
@@ -956,6 +1165,154 @@ class ContainerClient(StorageAccountHostsMixin):
             timeout=timeout,
             **kwargs)
 
+    def _batch_url(self, timeout=None):
+        # type: (Optional[int]) -> str
+        # The batch operation is sent to the account, the sub-requests address the blobs.
+        query = '?comp=batch'
+        if timeout is not None:
+            query += '&timeout={}'.format(timeout)
+        if self._query_str:
+            query += '&' + self._query_str.lstrip('?')
+        return "{}://{}/{}".format(self.scheme, self._hosts[LocationMode.PRIMARY], query)
+
+    def _batch_subrequests(self, method, blobs, query=None, headers=None):
+        # type: (str, Iterable[Union[str, BlobProperties]], Optional[dict], Optional[dict]) -> List[Any]
+        return [get_batch_subrequest(
+            method, self.container_name, blob,
+            query=query,
+            headers=headers,
+            sas_token=self._query_str) for blob in blobs]
+
+    def _batch_send(self, requests, timeout=None, **kwargs):
+        # type: (List[Any], Optional[int], Any) -> List[Any]
+        raise_on_failure = kwargs.pop('raise_on_any_failure', True)
+        token = None
+        if hasattr(self.credential, 'get_token'):
+            token = self.credential.get_token(STORAGE_OAUTH_SCOPE).token
+
+        results = []  # type: List[Any]
+        response = None
+        for index in range(0, len(requests), MAX_BATCH_SIZE):
+            batch = requests[index:index + MAX_BATCH_SIZE]
+            sign_batch_subrequests(batch, self._config.headers_policy, self.credential, token=token)
+            request = get_batch_request(self._batch_url(timeout), batch)
+            try:
+                response = self._pipeline.run(request, stream=True, **kwargs).http_response
+                if response.status_code != 202:
+                    raise StorageErrorException(response, self._client._deserialize)  # pylint: disable=protected-access
+            except StorageErrorException as error:
+                process_storage_error(error)
+            subresponses = parse_batch_response(response, response.body(), batch)
+            results.extend(process_batch_results(subresponses, self._client._deserialize))  # pylint: disable=protected-access
+        if raise_on_failure:
+            raise_on_any_failure(results, response)
+        return results
+
+    def _delete_blobs_subrequests(
+            self, blobs,  # type: Iterable[Union[str, BlobProperties]]
+            delete_snapshots=None,  # type: Optional[str]
+            if_modified_since=None,  # type: Optional[datetime]
+            if_unmodified_since=None,  # type: Optional[datetime]
+        ):
+        # type: (...) -> List[Any]
+        headers = {}
+        if delete_snapshots:
+            headers['x-ms-delete-snapshots'] = delete_snapshots
+        serialize = self._client._serialize  # pylint: disable=protected-access
+        if if_modified_since is not None:
+            headers['If-Modified-Since'] = serialize.header('if_modified_since', if_modified_since, 'rfc-1123')
+        if if_unmodified_since is not None:
+            headers['If-Unmodified-Since'] = serialize.header('if_unmodified_since', if_unmodified_since, 'rfc-1123')
+        return self._batch_subrequests('DELETE', blobs, headers=headers)
+
+    def _set_tier_subrequests(self, standard_blob_tier, blobs):
+        # type: (Union[str, StandardBlobTier], Iterable[Union[str, BlobProperties]]) -> List[Any]
+        if standard_blob_tier is None:
+            raise ValueError("A StandardBlobTier must be specified")
+        tier = self._client._serialize.header('tier', standard_blob_tier, 'str')  # pylint: disable=protected-access
+        return self._batch_subrequests('PUT', blobs, query={'comp': 'tier'}, headers={'x-ms-access-tier': tier})
+
+    def delete_blobs(self, *blobs, **kwargs):
+        # type: (*Union[str, BlobProperties], Any) -> List[Any]
+        """Marks the specified blobs or snapshots for deletion, with batch requests.
+
+        The blobs are deleted with as few Blob Batch operations as possible, each of which
+        holds up to 256 sub-requests. The batch operations are sent to the storage account,
+        so a SAS credential must be an account SAS.
+
+        :param blobs: The blobs with which to interact. A BlobProperties with a snapshot
+            deletes that snapshot.
+        :type blobs: str or ~azure.storage.blob.models.BlobProperties
+        :param str delete_snapshots:
+            Required if the blobs have associated snapshots. Values include:
+             - "only": Deletes only the blobs snapshots.
+             - "include": Deletes the blob along with all snapshots.
+        :param datetime if_modified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only
+            if the resource has been modified since the specified time.
+        :param datetime if_unmodified_since:
+            A DateTime value. Azure expects the date value passed in to be UTC.
+            If timezone is included, any non-UTC datetimes will be converted to UTC.
+            If a date is passed in without timezone info, it is assumed to be UTC.
+            Specify this header to perform the operation only if
+            the resource has not been modified since the specified date/time.
+        :param bool raise_on_any_failure:
+            Whether to raise a PartialBatchErrorException when any of the blobs could not
+            be deleted. The default value is True.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: For each blob, in order, the response headers of its deletion, or the
+            error it failed with.
+        :rtype: list
+        :raises: ~azure.storage.blob.PartialBatchErrorException
+        """
+        timeout = kwargs.pop('timeout', None)
+        requests = self._delete_blobs_subrequests(
+            blobs,
+            delete_snapshots=kwargs.pop('delete_snapshots', None),
+            if_modified_since=kwargs.pop('if_modified_since', None),
+            if_unmodified_since=kwargs.pop('if_unmodified_since', None))
+        return self._batch_send(requests, timeout=timeout, **kwargs)
+
+    def set_standard_blob_tier_blobs(
+            self, standard_blob_tier,  # type: Union[str, StandardBlobTier]
+            *blobs,  # type: Union[str, BlobProperties]
+            **kwargs
+        ):
+        # type: (...) -> List[Any]
+        """Sets the tier of the specified block blobs, with batch requests.
+
+        The tiers are set with as few Blob Batch operations as possible, each of which
+        holds up to 256 sub-requests. The batch operations are sent to the storage account,
+        so a SAS credential must be an account SAS.
+
+        :param standard_blob_tier:
+            Indicates the tier to be set on the blobs. Options include 'Hot', 'Cool',
+            'Archive'. The hot tier is optimized for storing data that is accessed
+            frequently. The cool storage tier is optimized for storing data that
+            is infrequently accessed and stored for at least a month. The archive
+            tier is optimized for storing data that is rarely accessed and stored
+            for at least six months with flexible latency requirements.
+        :type standard_blob_tier: str or ~azure.storage.blob.models.StandardBlobTier
+        :param blobs: The blobs with which to interact.
+        :type blobs: str or ~azure.storage.blob.models.BlobProperties
+        :param bool raise_on_any_failure:
+            Whether to raise a PartialBatchErrorException when the tier of any of the blobs
+            could not be set. The default value is True.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: For each blob, in order, the response headers of its operation, or the
+            error it failed with.
+        :rtype: list
+        :raises: ~azure.storage.blob.PartialBatchErrorException
+        """
+        timeout = kwargs.pop('timeout', None)
+        requests = self._set_tier_subrequests(standard_blob_tier, blobs)
+        return self._batch_send(requests, timeout=timeout, **kwargs)
+
     def get_blob_client(
             self, blob,  # type: Union[str, BlobProperties]
             snapshot=None  # type: str
@@ -987,4 +1344,4 @@ class ContainerClient(StorageAccountHostsMixin):
             credential=self.credential, _configuration=self._config,
             _pipeline=self._pipeline, _location_mode=self._location_mode, _hosts=self._hosts,
             require_encryption=self.require_encryption, key_encryption_key=self.key_encryption_key,
-            key_resolver_function=self.key_resolver_function)
+            key_resolver_function=self.key_resolver_function, encryption_version=self.encryption_version)
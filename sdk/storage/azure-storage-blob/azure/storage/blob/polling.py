@@ -81,16 +81,32 @@ class CopyBlob(PollingMethod):
         self.polling_interval = interval
         self.kwargs = kwargs
         self.blob = None
+        self._response = None
+
+    def _deserialize_properties(self, response, obj, headers):
+        self._response = response
+        return deserialize_blob_properties(response, obj, headers)
 
     def _update_status(self):
         try:
             self.blob = self._client._client.blob.get_properties(  # pylint: disable=protected-access
-                cls=deserialize_blob_properties, **self.kwargs)
+                cls=self._deserialize_properties, **self.kwargs)
         except StorageErrorException as error:
             process_storage_error(error)
         self._status = self.blob.copy.status
         self.etag = self.blob.etag
         self.last_modified = self.blob.last_modified
+        return self._response
+
+    def update_status(self):
+        # type: () -> Any
+        """Poll the status of the copy operation once.
+
+        This lets a :class:`~azure.core.polling.LROPollerManager` poll the operation step by step.
+
+        :returns: The response of the status request.
+        """
+        return self._update_status()
 
     def initialize(self, client, initial_status, _):  # pylint: disable=arguments-differ
         # type: (Any, Any, Callable) -> None
@@ -136,20 +152,36 @@ class CopyBlob(PollingMethod):
 
 class CopyBlobPolling(CopyBlob):
 
+    def _check_status(self):
+        if str(self.status()).lower() == 'aborted':
+            raise ValueError("Copy operation aborted.")
+        if str(self.status()).lower() == 'failed':
+            raise ValueError("Copy operation failed: {}".format(self.blob.copy.status_description))
+
     def run(self):
         # type: () -> None
         try:
             while not self.finished():
                 self._update_status()
                 time.sleep(self.polling_interval)
-            if str(self.status()).lower() == 'aborted':
-                raise ValueError("Copy operation aborted.")
-            if str(self.status()).lower() == 'failed':
-                raise ValueError("Copy operation failed: {}".format(self.blob.copy.status_description))
+            self._check_status()
         except Exception as e:
             logger.warning(str(e))
             raise
 
+    def update_status(self):
+        # type: () -> Any
+        """Poll the status of the copy operation once.
+
+        This lets a :class:`~azure.core.polling.LROPollerManager` poll the operation step by step.
+
+        :returns: The response of the status request.
+        :raises: ValueError if the copy operation was aborted or failed.
+        """
+        response = self._update_status()
+        self._check_status()
+        return response
+
     def status(self):
         # type: () -> str
         """Return the current status as a string.
@@ -0,0 +1,135 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import base64
+import hashlib
+import hmac
+import threading
+import unittest
+
+from azure.core.pipeline import PipelineRequest, PipelineContext
+from azure.core.pipeline.transport import HttpRequest
+
+from azure.storage.blob._shared.authentication import SharedKeyCredentialPolicy, AzureSigningError
+
+# ------------------------------------------------------------------------------
+_ACCOUNT_KEY = base64.b64encode(b'account key for the signing tests').decode('utf-8')
+
+
+def _get_request(**headers):
+    request = HttpRequest(
+        'PUT',
+        'https://account.blob.core.windows.net/container/blob%20name?comp=block&blockid=MDE%3D&timeout=30')
+    request.headers.update({
+        'x-ms-version': '2018-11-09',
+        'x-ms-date': 'Fri, 31 May 2019 12:00:00 GMT',
+        'x-ms-client-request-id': '1a2b',
+        'Content-Length': '11',
+        'Content-Type': 'application/octet-stream',
+        'If-Match': '"0x1"',
+    })
+    request.headers.update(headers)
+    return PipelineRequest(request, PipelineContext(None))
+
+
+def _sign(key, string_to_sign):
+    digest = hmac.HMAC(base64.b64decode(key), string_to_sign.encode('utf-8'), hashlib.sha256).digest()
+    return base64.b64encode(digest).decode('utf-8')
+
+
+class StorageAuthenticationTest(unittest.TestCase):
+
+    # --Test cases ---------------------------------------------------------------
+    def test_shared_key_string_to_sign(self):
+        policy = SharedKeyCredentialPolicy('account', _ACCOUNT_KEY)
+        request = _get_request(**{'Content-MD5': '', 'x-ms-meta-empty': ''})
+
+        policy.on_request(request)
+
+        expected = (
+            'PUT\n'
+            '\n'  # Content-Encoding
+            '\n'  # Content-Language
+            '11\n'
+            '\n'  # Content-MD5, empty
+            'application/octet-stream\n'
+            '\n'  # Date
+            '\n'  # If-Modified-Since
+            '"0x1"\n'
+            '\n'  # If-None-Match
+            '\n'  # If-Unmodified-Since
+            '\n'  # Range
+            'x-ms-client-request-id:1a2b\n'
+            'x-ms-date:Fri, 31 May 2019 12:00:00 GMT\n'
+            'x-ms-meta-empty:\n'
+            'x-ms-version:2018-11-09\n'
+            '/account/container/blob%20name\n'
+            'blockid:MDE=\n'
+            'comp:block\n'
+            'timeout:30')
+        self.assertEqual(
+            request.http_request.headers['Authorization'],
+            'SharedKey account:' + _sign(_ACCOUNT_KEY, expected))
+
+    def test_shared_key_zero_content_length_not_signed(self):
+        policy = SharedKeyCredentialPolicy('account', _ACCOUNT_KEY)
+        request = _get_request(**{'Content-Length': '0'})
+
+        policy.on_request(request)
+
+        string_to_sign = policy._get_string_to_sign(request)
+        self.assertTrue(string_to_sign.startswith('PUT\n\n\n\n\napplication/octet-stream\n'))
+
+    def test_shared_key_signer_is_reused(self):
+        policy = SharedKeyCredentialPolicy('account', _ACCOUNT_KEY)
+        first, second = _get_request(), _get_request()
+
+        policy.on_request(first)
+        signer = policy._signer
+        policy.on_request(second)
+
+        self.assertIs(policy._signer, signer)
+        self.assertEqual(first.http_request.headers['Authorization'], second.http_request.headers['Authorization'])
+
+    def test_shared_key_signs_concurrently(self):
+        policy = SharedKeyCredentialPolicy('account', _ACCOUNT_KEY)
+        expected = _get_request()
+        policy.on_request(expected)
+        signatures = []
+
+        def _sign_requests():
+            for _ in range(200):
+                request = _get_request()
+                policy.on_request(request)
+                signatures.append(request.http_request.headers['Authorization'])
+
+        threads = [threading.Thread(target=_sign_requests) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(set(signatures), set([expected.http_request.headers['Authorization']]))
+
+    def test_shared_key_account_key_rotated(self):
+        policy = SharedKeyCredentialPolicy('account', _ACCOUNT_KEY)
+        first = _get_request()
+        policy.on_request(first)
+
+        policy.account_key = base64.b64encode(b'another key').decode('utf-8')
+        second = _get_request()
+        policy.on_request(second)
+
+        self.assertNotEqual(first.http_request.headers['Authorization'], second.http_request.headers['Authorization'])
+        self.assertEqual(
+            second.http_request.headers['Authorization'],
+            'SharedKey account:' + _sign(policy.account_key, policy._get_string_to_sign(second)))
+
+    def test_shared_key_invalid_account_key(self):
+        policy = SharedKeyCredentialPolicy('account', 'not base64!')
+        with self.assertRaises(AzureSigningError):
+            policy.on_request(_get_request())
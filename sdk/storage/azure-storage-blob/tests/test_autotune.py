@@ -0,0 +1,238 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+from azure.storage.blob._shared.autotune import TransferTuner, tuned_map
+from azure.storage.blob._shared.upload_chunking import (
+    BlockBlobChunkUploader,
+    upload_blob_chunks,
+    upload_blob_substream_blocks)
+
+from testcase import (
+    StorageTestCase,
+)
+from test_download_chunking import _RangedBlobService, _Config
+from azure.storage.blob._blob_utils import StorageStreamDownloader
+
+# ------------------------------------------------------------------------------
+
+MB = 1024 * 1024
+
+
+class _BlockService(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.staged = {}
+
+    def stage_block(self, block_id, length, body, **kwargs):
+        data = body.read() if hasattr(body, 'read') else bytes(body)
+        assert len(data) == length
+        with self.lock:
+            self.staged[block_id] = data
+
+
+class StorageAutotuneTest(StorageTestCase):
+
+    def _record_round(self, tuner, length, latency):
+        now = time.time()
+        for _ in range(tuner.connections):
+            tuner.record(length, now - latency)
+
+    def test_connections_slow_start_and_back_off(self):
+        tuner = TransferTuner(4 * MB, 8)
+        self.assertEqual(tuner.connections, 1)
+
+        # The throughput doubles with the connections, so they keep doubling
+        self._record_round(tuner, MB, 1.0)
+        self.assertEqual(tuner.connections, 2)
+        self._record_round(tuner, MB, 1.0)
+        self.assertEqual(tuner.connections, 4)
+
+        # The throughput collapses, so the connections are halved
+        self._record_round(tuner, MB, 8.0)
+        self.assertEqual(tuner.connections, 2)
+        self.assertEqual(tuner.threshold, 2)
+
+        # From the threshold, the connections only grow one at a time
+        self._record_round(tuner, 4 * MB, 1.0)
+        self.assertEqual(tuner.connections, 3)
+
+    def test_connections_bounded_by_max_connections(self):
+        tuner = TransferTuner(4 * MB, 3)
+        for i in range(5):
+            self._record_round(tuner, (i + 1) * MB, 1.0)
+        self.assertEqual(tuner.connections, 3)
+
+    def test_chunk_size_follows_latency(self):
+        tuner = TransferTuner(4 * MB, 1)
+
+        self._record_round(tuner, 4 * MB, 0.1)
+        self.assertEqual(tuner.chunk_size, 8 * MB)
+        for _ in range(10):
+            self._record_round(tuner, 4 * MB, 0.1)
+        self.assertEqual(tuner.chunk_size, 64 * MB)
+
+        for _ in range(10):
+            self._record_round(tuner, 4 * MB, 10.0)
+        self.assertEqual(tuner.chunk_size, MB)
+
+        settings = tuner.settings()
+        self.assertEqual(settings['chunk_size'], MB)
+        self.assertEqual(settings['max_connections'], 1)
+        self.assertIsNotNone(settings['throughput'])
+
+    def test_tuned_map_keeps_order_and_bound(self):
+        tuner = TransferTuner(MB, 4)
+        lock = threading.Lock()
+        state = {'in_flight': 0, 'max_in_flight': 0}
+
+        def _work(item):
+            with lock:
+                state['in_flight'] += 1
+                state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+            time.sleep(0.005)
+            with lock:
+                state['in_flight'] -= 1
+            return item * 2
+
+        results = tuned_map(tuner, _work, range(50), lambda i: MB)
+        self.assertEqual(results, [i * 2 for i in range(50)])
+        self.assertGreater(state['max_in_flight'], 1)
+        self.assertLessEqual(state['max_in_flight'], 4)
+
+    def test_tuned_map_fails_fast(self):
+        tuner = TransferTuner(MB, 4)
+
+        def _work(item):
+            if item == 3:
+                raise ValueError("failed")
+            return item
+
+        with self.assertRaises(ValueError):
+            tuned_map(tuner, _work, range(1000), lambda i: MB)
+
+    def test_autotuned_upload_chunks(self):
+        data = os.urandom(300 * 1024 + 17)
+        service = _BlockService()
+        tuner = TransferTuner(4 * 1024, 4)
+
+        block_ids = upload_blob_chunks(
+            blob_service=service,
+            blob_size=len(data),
+            block_size=4 * 1024,
+            stream=BytesIO(data),
+            max_connections=4,
+            validate_content=False,
+            access_conditions=None,
+            uploader_class=BlockBlobChunkUploader,
+            tuner=tuner)
+
+        blocks = [service.staged[i] for i in block_ids]
+        self.assertEqual(b''.join(blocks), data)
+        # The chunks complete quickly, so the chunk size grows
+        self.assertGreater(max(len(b) for b in blocks), 4 * 1024)
+
+    def test_autotuned_upload_substream_blocks(self):
+        data = os.urandom(300 * 1024 + 17)
+        service = _BlockService()
+        tuner = TransferTuner(4 * 1024, 4)
+
+        block_ids = upload_blob_substream_blocks(
+            blob_service=service,
+            blob_size=len(data),
+            block_size=4 * 1024,
+            stream=memoryview(data),
+            max_connections=4,
+            validate_content=False,
+            access_conditions=None,
+            uploader_class=BlockBlobChunkUploader,
+            tuner=tuner)
+
+        blocks = [service.staged[i] for i in block_ids]
+        self.assertEqual(b''.join(blocks), data)
+        self.assertGreater(max(len(b) for b in blocks), 4 * 1024)
+
+    def _get_downloader(self, service):
+        return StorageStreamDownloader(
+            'blob', 'container', service, _Config(), None, None, False,
+            None, None, None, False, None, None, autotune=True)
+
+    def test_autotuned_download_chunks(self):
+        data = os.urandom(200 * 1024 + 5)
+        service = _RangedBlobService(data)
+        downloader = self._get_downloader(service)
+
+        chunks = list(downloader.chunks(max_connections=4))
+
+        self.assertEqual(b''.join(chunks), data)
+        # The first get is only one chunk, and the chunks grow from there
+        self.assertEqual(len(chunks[0]), _Config.max_chunk_get_size)
+        self.assertGreater(max(len(c) for c in chunks), _Config.max_chunk_get_size)
+        self.assertIsNotNone(downloader.autotune_settings)
+
+    def test_autotuned_download_to_path(self):
+        data = os.urandom(200 * 1024 + 5)
+        downloader = self._get_downloader(_RangedBlobService(data))
+
+        with tempfile.NamedTemporaryFile(delete=False) as temp:
+            pass
+        try:
+            downloader.download_to_path(temp.name, max_connections=4)
+            with open(temp.name, 'rb') as stream:
+                actual = stream.read()
+        finally:
+            os.remove(temp.name)
+
+        self.assertEqual(actual, data)
+        settings = downloader.autotune_settings
+        self.assertLessEqual(settings['max_connections'], 4)
+        self.assertGreater(settings['chunk_size'], _Config.max_chunk_get_size)
+
+    def test_autotuned_download_with_validate_content(self):
+        class _LargeChunksConfig(object):
+            max_single_get_size = 4 * MB
+            max_chunk_get_size = 4 * MB
+
+        data = os.urandom(40 * MB)
+        service = _RangedBlobService(data)
+        downloader = StorageStreamDownloader(
+            'blob', 'container', service, _LargeChunksConfig(), None, None, True,
+            None, None, None, False, None, None, autotune=True)
+
+        stream = BytesIO()
+        downloader.download_to_stream(stream, max_connections=4)
+
+        self.assertEqual(stream.getvalue(), data)
+        # The chunks don't grow past the largest range the service returns an MD5 for
+        self.assertEqual(downloader.autotune_settings['chunk_size'], 4 * MB)
+
+    def test_autotuned_upload_block_size_floor(self):
+        from azure.storage.blob._blob_utils import get_upload_tuner
+
+        # The blocks of a 300GiB blob can't shrink below 300GiB / 50,000, nor start below it
+        tuner = get_upload_tuner(300 * 1024 * MB, 4 * MB, 4)
+        self.assertEqual(tuner.min_chunk_size, -(-300 * 1024 * MB // 50000))
+        self.assertEqual(tuner.chunk_size, tuner.min_chunk_size)
+        for _ in range(10):
+            self._record_round(tuner, tuner.chunk_size, 10)
+        self.assertEqual(tuner.chunk_size, -(-300 * 1024 * MB // 50000))
+        tuner = get_upload_tuner(400 * 1024 * MB, 4 * MB, 8)
+        self.assertGreaterEqual(tuner.chunk_size * 50000, 400 * 1024 * MB)
+        tuner = get_upload_tuner(150 * 1024 * MB, 4 * MB, 4)
+        self.assertEqual(tuner.min_chunk_size, -(-150 * 1024 * MB // 50000))
+        for _ in range(10):
+            self._record_round(tuner, tuner.chunk_size, 10)
+        self.assertEqual(tuner.chunk_size, -(-150 * 1024 * MB // 50000))
+
+        self.assertEqual(get_upload_tuner(100 * MB, 4 * MB, 4).min_chunk_size, MB)
+        self.assertEqual(get_upload_tuner(None, 4 * MB, 4).min_chunk_size, MB)
@@ -0,0 +1,232 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import unittest
+import uuid
+
+from requests.structures import CaseInsensitiveDict
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline import PipelineRequest, PipelineContext
+from azure.core.pipeline.transport import HttpTransport, HttpResponse, HttpRequest
+
+try:
+    from urllib.parse import urlparse, parse_qs, unquote
+except ImportError:
+    from urlparse import urlparse, parse_qs # type: ignore
+    from urllib2 import unquote # type: ignore
+
+from azure.storage.blob import (
+    ContainerClient,
+    BlobProperties,
+    StandardBlobTier,
+    PartialBatchErrorException,
+)
+from azure.storage.blob._shared.authentication import SharedKeyCredentialPolicy
+
+# ------------------------------------------------------------------------------
+_ACCOUNT_NAME = 'account'
+_ACCOUNT_KEY = 'a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5a2V5'
+_ERROR_BODY = (
+    b'<?xml version="1.0" encoding="utf-8"?><Error><Code>BlobNotFound</Code>'
+    b'<Message>The specified blob does not exist.</Message></Error>')
+
+
+class _FakeResponse(HttpResponse):
+
+    def __init__(self, request, status_code, headers=None, body=b''):
+        super(_FakeResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'Accepted' if status_code < 400 else 'Error'
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content_type = self.headers['Content-Type'].split(';') if 'Content-Type' in self.headers else None
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+class _FakeBatchEndpoint(object):
+    """Serves Blob Batch requests: parses the multipart body, checks the signature of every
+    sub-request, applies it to an in-memory container and returns a multipart response."""
+
+    def __init__(self, blobs, credential=None):
+        self.blobs = blobs
+        self.credential = credential
+        self.batches = []
+        self.subrequests = []
+
+    def _check_signature(self, method, url, headers):
+        authorization = headers.pop('authorization', None)
+        if self.credential is None:
+            assert authorization is None
+            return
+        request = HttpRequest(method, url, headers=headers)
+        self.credential.on_request(PipelineRequest(request, PipelineContext(None)))
+        assert request.headers['Authorization'] == authorization, "Invalid sub-request signature"
+        headers['authorization'] = authorization
+
+    def _dispatch(self, method, url, headers):
+        parsed = urlparse(url)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        container, _, blob = parsed.path.lstrip('/').partition('/')
+        key = (unquote(container), unquote(blob), query.get('snapshot'))
+        if key not in self.blobs:
+            return 404, {'x-ms-error-code': 'BlobNotFound', 'Content-Type': 'application/xml'}, _ERROR_BODY
+        if method == 'DELETE':
+            del self.blobs[key]
+            return 202, {'x-ms-delete-type-permanent': 'true'}, b''
+        if method == 'PUT' and query.get('comp') == 'tier':
+            self.blobs[key] = headers['x-ms-access-tier']
+            return 200, {}, b''
+        return 400, {}, b''
+
+    def send(self, request):
+        url = urlparse(request.url)
+        assert request.method == 'POST'
+        assert url.path == '/'
+        assert parse_qs(url.query)['comp'] == ['batch']
+        assert request.headers['x-ms-version'] == '2018-11-09'
+        content_type = request.headers['Content-Type']
+        boundary = content_type.partition('boundary=')[2].encode('utf-8')
+        self.batches.append(request)
+
+        response_boundary = 'batchresponse_{}'.format(uuid.uuid4()).encode('utf-8')
+        parts = []
+        for part in request.data.split(b'--' + boundary)[1:-1]:
+            part_headers, _, subrequest = part.strip(b'\r\n').partition(b'\r\n\r\n')
+            content_id = [l for l in part_headers.split(b'\r\n') if l.startswith(b'Content-ID:')][0]
+            lines = subrequest.strip(b'\r\n').decode('utf-8').split('\r\n')
+            method, url, _ = lines[0].split(' ')
+            headers = dict((n.lower(), v.strip()) for n, _, v in (l.partition(':') for l in lines[1:]))
+            self._check_signature(method, url, headers)
+            self.subrequests.append((method, url, headers))
+
+            status, response_headers, body = self._dispatch(method, url, headers)
+            response_headers['x-ms-request-id'] = str(uuid.uuid4())
+            response_headers['Content-Length'] = str(len(body))
+            status_line = 'HTTP/1.1 {} {}'.format(status, 'Error' if status >= 400 else 'OK')
+            parts.append(
+                b'Content-Type: application/http\r\n' + content_id + b'\r\n\r\n' +
+                '\r\n'.join([status_line] + ['{}: {}'.format(n, v) for n, v in response_headers.items()]).encode(
+                    'utf-8') + b'\r\n\r\n' + body + b'\r\n')
+
+        # Answer in reverse order, as the parts are matched by their Content-ID.
+        body = b''.join(b'--' + response_boundary + b'\r\n' + p for p in reversed(parts))
+        body += b'--' + response_boundary + b'--\r\n'
+        return _FakeResponse(request, 202, {
+            'Content-Type': 'multipart/mixed; boundary=' + response_boundary.decode('utf-8'),
+            'x-ms-request-id': str(uuid.uuid4())}, body)
+
+
+class _FakeTransport(HttpTransport):
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        return self.endpoint.send(request)
+
+
+class StorageBlobBatchTest(unittest.TestCase):
+
+    def _get_container(self, blob_names, credential=None, url='https://account.blob.core.windows.net/container'):
+        if credential is None:
+            credential = {'account_name': _ACCOUNT_NAME, 'account_key': _ACCOUNT_KEY}
+        blobs = {('container', n, None): 'Hot' for n in blob_names}
+        signer = SharedKeyCredentialPolicy(**credential) if isinstance(credential, dict) else None
+        self.endpoint = _FakeBatchEndpoint(blobs, signer)
+        return ContainerClient(url, credential=credential, transport=_FakeTransport(self.endpoint))
+
+    # --Test cases ---------------------------------------------------------------
+    def test_delete_blobs(self):
+        names = ['blob{}'.format(i) for i in range(300)] + [u'dir/blob with spaces and é']
+        container = self._get_container(names)
+
+        results = container.delete_blobs(*names, delete_snapshots='include')
+
+        self.assertEqual(len(results), len(names))
+        self.assertTrue(all(r['delete_type_permanent'] == 'true' for r in results))
+        self.assertEqual(self.endpoint.blobs, {})
+        # 301 sub-requests fit in two batches
+        self.assertEqual(len(self.endpoint.batches), 2)
+        for method, _, headers in self.endpoint.subrequests:
+            self.assertEqual(method, 'DELETE')
+            self.assertEqual(headers['x-ms-delete-snapshots'], 'include')
+            self.assertEqual(headers['content-length'], '0')
+            self.assertIn('x-ms-date', headers)
+
+    def test_delete_blobs_partial_failure(self):
+        container = self._get_container(['blob1', 'blob3'])
+
+        with self.assertRaises(PartialBatchErrorException) as context:
+            container.delete_blobs('blob1', 'blob2', 'blob3')
+
+        parts = context.exception.parts
+        self.assertEqual(len(parts), 3)
+        self.assertIsInstance(parts[1], ResourceNotFoundError)
+        self.assertEqual(parts[1].error_code, 'BlobNotFound')
+        self.assertIsInstance(parts[0], dict)
+        self.assertIsInstance(parts[2], dict)
+        self.assertEqual(self.endpoint.blobs, {})
+
+    def test_delete_blobs_no_raise_on_failure(self):
+        container = self._get_container(['blob1'])
+
+        results = container.delete_blobs('blob1', 'missing', raise_on_any_failure=False)
+
+        self.assertIsInstance(results[0], dict)
+        self.assertIsInstance(results[1], ResourceNotFoundError)
+
+    def test_delete_blob_snapshots(self):
+        container = self._get_container([])
+        snapshot = BlobProperties(name='blob', **{'x-ms-snapshot': '2019-06-01T00:00:00.0000000Z'})
+        self.endpoint.blobs[('container', 'blob', snapshot.snapshot)] = 'Hot'
+
+        container.delete_blobs(snapshot)
+
+        _, url, _ = self.endpoint.subrequests[0]
+        self.assertEqual(url, '/container/blob?snapshot=2019-06-01T00%3A00%3A00.0000000Z')
+        self.assertEqual(self.endpoint.blobs, {})
+
+    def test_set_standard_blob_tier_blobs(self):
+        names = ['blob1', 'blob2']
+        container = self._get_container(names)
+
+        results = container.set_standard_blob_tier_blobs(StandardBlobTier.Cool, *names, timeout=10)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(set(self.endpoint.blobs.values()), {'Cool'})
+        self.assertIn('timeout=10', self.endpoint.batches[0].url)
+        for method, url, _ in self.endpoint.subrequests:
+            self.assertEqual(method, 'PUT')
+            self.assertTrue(url.endswith('?comp=tier'))
+
+    def test_set_standard_blob_tier_blobs_requires_tier(self):
+        container = self._get_container(['blob1'])
+        with self.assertRaises(ValueError):
+            container.set_standard_blob_tier_blobs(None, 'blob1')
+
+    def test_delete_blobs_with_sas(self):
+        sas = 'sv=2018-03-28&ss=b&srt=sco&sp=d&se=2099-01-01T00%3A00%3A00Z&sig=c2ln'
+        container = self._get_container(
+            ['blob1'], credential=sas, url='https://account.blob.core.windows.net/container')
+
+        container.delete_blobs('blob1')
+
+        self.assertIn(sas, self.endpoint.batches[0].url)
+        _, url, headers = self.endpoint.subrequests[0]
+        self.assertEqual(url, '/container/blob1?' + sas)
+        self.assertNotIn('authorization', headers)
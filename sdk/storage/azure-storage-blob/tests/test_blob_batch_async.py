@@ -0,0 +1,85 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import sys
+import unittest
+
+import pytest
+
+if sys.version_info < (3, 5):
+    pytest.skip("Async clients require Python 3.5+", allow_module_level=True)
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline.transport import AsyncHttpTransport
+
+from azure.storage.blob import PartialBatchErrorException
+from azure.storage.blob.aio import ContainerClient
+from azure.storage.blob._shared.authentication import SharedKeyCredentialPolicy
+
+from test_blob_batch import _FakeBatchEndpoint, _FakeResponse, _ACCOUNT_NAME, _ACCOUNT_KEY
+
+# ------------------------------------------------------------------------------
+
+
+class _FakeAsyncResponse(_FakeResponse):
+
+    async def load_body(self):
+        pass
+
+
+class _FakeAsyncTransport(AsyncHttpTransport):
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        response = self.endpoint.send(request)
+        return _FakeAsyncResponse(request, response.status_code, response.headers, response.body())
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class StorageBlobBatchAsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        credential = {'account_name': _ACCOUNT_NAME, 'account_key': _ACCOUNT_KEY}
+        self.endpoint = _FakeBatchEndpoint(
+            {('container', 'blob1', None): 'Hot', ('container', 'blob2', None): 'Hot'},
+            SharedKeyCredentialPolicy(**credential))
+        self.container = ContainerClient(
+            'https://account.blob.core.windows.net/container',
+            credential=credential,
+            transport=_FakeAsyncTransport(self.endpoint))
+
+    # --Test cases ---------------------------------------------------------------
+    def test_delete_blobs(self):
+        with self.assertRaises(PartialBatchErrorException) as context:
+            _run(self.container.delete_blobs('blob1', 'missing', 'blob2'))
+
+        parts = context.exception.parts
+        self.assertIsInstance(parts[0], dict)
+        self.assertIsInstance(parts[1], ResourceNotFoundError)
+        self.assertIsInstance(parts[2], dict)
+        self.assertEqual(self.endpoint.blobs, {})
+
+    def test_set_standard_blob_tier_blobs(self):
+        results = _run(self.container.set_standard_blob_tier_blobs('Archive', 'blob1', 'blob2'))
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(set(self.endpoint.blobs.values()), {'Archive'})
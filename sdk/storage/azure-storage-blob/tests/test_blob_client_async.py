@@ -0,0 +1,438 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import base64
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+import uuid
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+import pytest
+
+if sys.version_info < (3, 5):
+    pytest.skip("Async clients require Python 3.5+", allow_module_level=True)
+
+from requests.structures import CaseInsensitiveDict
+from azure.core.pipeline.transport import AsyncHttpTransport, AsyncHttpResponse
+from azure.core.exceptions import ResourceNotFoundError
+
+try:
+    from urllib.parse import urlparse, parse_qs, unquote
+except ImportError:
+    from urlparse import urlparse, parse_qs # type: ignore
+    from urllib2 import unquote # type: ignore
+
+from azure.storage.blob.aio import (
+    BlobServiceClient,
+    ContainerClient,
+    BlobClient,
+    LeaseClient,
+    StorageStreamDownloader,
+)
+
+# ------------------------------------------------------------------------------
+_LAST_MODIFIED = 'Fri, 31 May 2019 12:00:00 GMT'
+
+
+class _FakeStream(object):
+    """Async iterator over a response body, mirroring the aiohttp download generator."""
+
+    def __init__(self, response):
+        self.response = response
+        self._content = response.body()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._content is None:
+            raise StopAsyncIteration()
+        content, self._content = self._content, None
+        return content
+
+
+class _FakeResponse(AsyncHttpResponse):
+
+    def __init__(self, request, status_code, headers=None, body=b''):
+        super(_FakeResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.headers.setdefault('x-ms-request-id', str(uuid.uuid4()))
+        self.content_type = self.headers['Content-Type'].split(';') if 'Content-Type' in self.headers else None
+        self._body = body
+
+    def body(self):
+        return self._body
+
+    async def load_body(self):
+        pass
+
+    def stream_download(self, pipeline):
+        return _FakeStream(self)
+
+
+class _FakeBlobService(AsyncHttpTransport):
+    """A minimal in-memory block blob service."""
+
+    def __init__(self):
+        self.containers = {}
+        self.blocks = {}
+        self.leases = {}
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Yield so that concurrent requests overlap
+            await asyncio.sleep(0)
+            return self._dispatch(request)
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _read_body(request):
+        data = request.data
+        if data is None:
+            return b''
+        if hasattr(data, 'read'):
+            return data.read()
+        if isinstance(data, str):
+            return data.encode('utf-8')
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytes(data)
+        return b''.join(data)
+
+    def _dispatch(self, request):
+        url = urlparse(request.url)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        container, _, blob = url.path.lstrip('/').partition('/')
+        container, blob = unquote(container), unquote(blob)
+        comp = query.get('comp')
+        if query.get('restype') == 'container':
+            if request.method == 'PUT':
+                self.containers[container] = {}
+                return _FakeResponse(request, 201, {'ETag': '"0x1"', 'Last-Modified': _LAST_MODIFIED})
+            if comp == 'list':
+                return self._list(request, container, query)
+        blobs = self.containers.setdefault(container, {})
+        if request.method == 'PUT' and comp == 'block':
+            self.blocks.setdefault((container, blob), {})[query['blockid']] = self._read_body(request)
+            return _FakeResponse(request, 201)
+        if request.method == 'PUT' and comp == 'blocklist':
+            staged = self.blocks.pop((container, blob), {})
+            ids = [e.text for e in ET.fromstring(self._read_body(request))]
+            return self._put(request, blobs, blob, b''.join(staged[i] for i in ids))
+        if request.method == 'PUT' and comp == 'lease':
+            return self._lease(request, container, blob)
+        if request.method == 'PUT' and comp is None:
+            if request.headers.get('If-None-Match') == '*' and blob in blobs:
+                return _FakeResponse(request, 409, {'x-ms-error-code': 'BlobAlreadyExists'})
+            return self._put(request, blobs, blob, self._read_body(request))
+        if blob not in blobs:
+            return _FakeResponse(request, 404, {'x-ms-error-code': 'BlobNotFound'})
+        if request.method == 'DELETE':
+            del blobs[blob]
+            return _FakeResponse(request, 202)
+        if request.method == 'HEAD':
+            return _FakeResponse(request, 200, self._blob_headers(blobs[blob], len(blobs[blob]['content'])))
+        if request.method == 'GET':
+            return self._get(request, blobs[blob])
+        return _FakeResponse(request, 400)
+
+    def _put(self, request, blobs, blob, content):
+        etag = '"0x{}"'.format(uuid.uuid4().hex[:8])
+        metadata = {k: v for k, v in request.headers.items() if k.lower().startswith('x-ms-meta-')}
+        blobs[blob] = {'content': content, 'etag': etag, 'metadata': metadata}
+        return _FakeResponse(request, 201, {'ETag': etag, 'Last-Modified': _LAST_MODIFIED})
+
+    @staticmethod
+    def _blob_headers(props, length):
+        headers = {
+            'ETag': props['etag'],
+            'Last-Modified': _LAST_MODIFIED,
+            'Content-Length': str(length),
+            'x-ms-blob-type': 'BlockBlob',
+        }
+        headers.update(props['metadata'])
+        return headers
+
+    def _get(self, request, props):
+        content = props['content']
+        range_header = request.headers.get('x-ms-range')
+        if not range_header:
+            return _FakeResponse(request, 200, self._blob_headers(props, len(content)), content)
+        if not content:
+            return _FakeResponse(request, 416, {'x-ms-error-code': 'InvalidRange'})
+        start, _, end = range_header.split('=')[1].partition('-')
+        start, end = int(start), min(int(end), len(content) - 1)
+        body = content[start:end + 1]
+        headers = self._blob_headers(props, len(body))
+        headers['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, len(content))
+        if request.headers.get('x-ms-range-get-content-md5') == 'true':
+            headers['Content-MD5'] = base64.b64encode(hashlib.md5(body).digest()).decode('utf-8')
+        return _FakeResponse(request, 206, headers, body)
+
+    def _lease(self, request, container, blob):
+        action = request.headers['x-ms-lease-action']
+        key = (container, blob)
+        if action == 'acquire':
+            if key in self.leases:
+                return _FakeResponse(request, 409, {'x-ms-error-code': 'LeaseAlreadyPresent'})
+            self.leases[key] = request.headers.get('x-ms-proposed-lease-id') or str(uuid.uuid4())
+            return _FakeResponse(
+                request, 201, {'ETag': '"0x1"', 'Last-Modified': _LAST_MODIFIED, 'x-ms-lease-id': self.leases[key]})
+        if action == 'release':
+            self.leases.pop(key, None)
+            return _FakeResponse(request, 200, {'ETag': '"0x1"', 'Last-Modified': _LAST_MODIFIED})
+        return _FakeResponse(request, 400)
+
+    def _list(self, request, container, query):
+        names = sorted(self.containers.get(container, {}))
+        prefix = query.get('prefix', '')
+        names = [n for n in names if n.startswith(prefix)]
+        marker = query.get('marker')
+        if marker:
+            names = [n for n in names if n >= marker]
+        max_results = int(query.get('maxresults', 5000))
+        page, rest = names[:max_results], names[max_results:]
+        root = ET.Element('EnumerationResults', ServiceEndpoint='https://account.blob.core.windows.net/',
+                          ContainerName=container)
+        ET.SubElement(root, 'Prefix').text = prefix
+        ET.SubElement(root, 'MaxResults').text = str(max_results)
+        items = ET.SubElement(root, 'Blobs')
+        for name in page:
+            item = ET.SubElement(items, 'Blob')
+            ET.SubElement(item, 'Name').text = name
+            props = ET.SubElement(item, 'Properties')
+            ET.SubElement(props, 'Last-Modified').text = _LAST_MODIFIED
+            ET.SubElement(props, 'Etag').text = self.containers[container][name]['etag']
+            ET.SubElement(props, 'Content-Length').text = str(len(self.containers[container][name]['content']))
+            ET.SubElement(props, 'BlobType').text = 'BlockBlob'
+        ET.SubElement(root, 'NextMarker').text = rest[0] if rest else ''
+        return _FakeResponse(request, 200, {'Content-Type': 'application/xml'}, ET.tostring(root))
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class StorageBlobClientAsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = _FakeBlobService()
+        self.service = BlobServiceClient(
+            'https://account.blob.core.windows.net',
+            transport=self.transport,
+            max_single_put_size=1024,
+            max_block_size=256,
+            max_single_get_size=512,
+            max_chunk_get_size=256)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_sync_context_manager_not_supported(self):
+        blob = self.service.get_blob_client('container', 'blob')
+        with self.assertRaises(TypeError):
+            with blob:
+                pass
+
+    def test_get_clients_are_async(self):
+        container = self.service.get_container_client('container')
+        blob = container.get_blob_client('blob')
+        self.assertIsInstance(container, ContainerClient)
+        self.assertIsInstance(blob, BlobClient)
+        self.assertIs(blob._pipeline, self.service._pipeline)
+
+    def test_upload_and_download_single_put(self):
+        async def _test():
+            blob = self.service.get_blob_client('container', 'small')
+            await blob.upload_blob(b'hello world', metadata={'hello': 'world'})
+            props = await blob.get_blob_properties()
+            downloader = await blob.download_blob()
+            content = await downloader.content_as_bytes()
+            return props, downloader, content
+
+        props, downloader, content = _run(_test())
+        self.assertEqual(content, b'hello world')
+        self.assertIsInstance(downloader, StorageStreamDownloader)
+        self.assertEqual(props.size, 11)
+        self.assertEqual(props.metadata, {'hello': 'world'})
+        self.assertEqual([r.method for r in self.transport.requests], ['PUT', 'HEAD', 'GET'])
+
+    def test_upload_chunked_parallel(self):
+        data = os.urandom(4000)
+
+        async def _test():
+            blob = self.service.get_blob_client('container', 'large')
+            await blob.upload_blob(data, max_connections=4)
+            downloader = await blob.download_blob()
+            return await downloader.content_as_bytes(max_connections=4)
+
+        content = _run(_test())
+        self.assertEqual(content, data)
+        stage_requests = [r for r in self.transport.requests if 'comp=block&' in r.url or r.url.endswith('comp=block')]
+        self.assertEqual(len(stage_requests), 16)
+        self.assertLessEqual(self.transport.max_in_flight, 4)
+        self.assertGreater(self.transport.max_in_flight, 1)
+
+    def test_upload_blob_from_path(self):
+        data = os.urandom(3000)
+        with tempfile.NamedTemporaryFile(delete=False) as temp:
+            temp.write(data)
+
+        async def _test():
+            blob = self.service.get_blob_client('container', 'from_path')
+            await blob.upload_blob_from_path(temp.name, max_connections=3)
+            downloader = await blob.download_blob()
+            return await downloader.content_as_bytes()
+
+        try:
+            content = _run(_test())
+        finally:
+            os.remove(temp.name)
+        self.assertEqual(content, data)
+        stage_requests = [r for r in self.transport.requests if 'comp=block&' in r.url or r.url.endswith('comp=block')]
+        self.assertEqual(len(stage_requests), 12)
+        self.assertTrue(all(isinstance(r.data, memoryview) for r in stage_requests))
+
+    def test_autotuned_upload_and_download(self):
+        data = os.urandom(20000)
+
+        async def _test():
+            blob = self.service.get_blob_client('container', 'autotuned')
+            response = await blob.upload_blob(data, max_connections=4, autotune=True)
+            downloader = await blob.download_blob(autotune=True)
+            content = await downloader.content_as_bytes(max_connections=4)
+            chunks = []
+            async for chunk in await blob.download_blob(autotune=True):
+                chunks.append(chunk)
+            return response, downloader, content, chunks
+
+        response, downloader, content, chunks = _run(_test())
+        self.assertEqual(content, data)
+        self.assertEqual(b''.join(chunks), data)
+        # The fake service responds at once, so the tuner grows the chunks
+        self.assertGreater(response['autotune_settings']['chunk_size'], 256)
+        self.assertGreater(downloader.autotune_settings['chunk_size'], 256)
+        self.assertGreater(max(len(c) for c in chunks), 256)
+        stage_requests = [r for r in self.transport.requests if 'comp=block&' in r.url or r.url.endswith('comp=block')]
+        self.assertGreater(len(set(len(r.data) for r in stage_requests)), 2)
+
+    def test_upload_no_overwrite(self):
+        async def _test():
+            blob = self.service.get_blob_client('container', 'existing')
+            await blob.upload_blob(b'first')
+            await blob.upload_blob(b'second')
+
+        with self.assertRaises(Exception):
+            _run(_test())
+
+    def test_ranged_download_and_iteration(self):
+        data = os.urandom(2000)
+
+        async def _test():
+            blob = self.service.get_blob_client('container', 'ranged')
+            await blob.upload_blob(data)
+            ranged = await blob.download_blob(offset=100, length=1299, validate_content=True)
+            ranged_content = await ranged.content_as_bytes()
+            chunks = []
+            downloader = await blob.download_blob()
+            async for chunk in downloader:
+                chunks.append(chunk)
+            return ranged_content, chunks
+
+        ranged_content, chunks = _run(_test())
+        self.assertEqual(ranged_content, data[100:1300])
+        self.assertEqual(b''.join(chunks), data)
+        self.assertGreater(len(chunks), 1)
+
+    def test_download_to_stream(self):
+        data = os.urandom(1500)
+
+        async def _test():
+            blob = self.service.get_blob_client('container', 'stream')
+            await blob.upload_blob(data)
+            stream = BytesIO()
+            downloader = await blob.download_blob()
+            props = await downloader.download_to_stream(stream, max_connections=3)
+            return props, stream.getvalue()
+
+        props, content = _run(_test())
+        self.assertEqual(content, data)
+        self.assertEqual(props.size, 1500)
+
+    def test_download_missing_blob(self):
+        blob = self.service.get_blob_client('container', 'missing')
+        with self.assertRaises(ResourceNotFoundError):
+            _run(blob.download_blob())
+
+    def test_list_blobs_paging(self):
+        async def _test():
+            container = self.service.get_container_client('listing')
+            await container.create_container()
+            for i in range(5):
+                await container.upload_blob('blob{}'.format(i), b'data')
+            names = []
+            async for item in container.list_blobs(name_starts_with='blob', results_per_page=2):
+                names.append((item.name, item.container, item.size))
+            return names
+
+        names = _run(_test())
+        self.assertEqual(names, [('blob{}'.format(i), 'listing', 4) for i in range(5)])
+        list_requests = [r for r in self.transport.requests if 'comp=list' in r.url]
+        self.assertEqual(len(list_requests), 3)
+
+    def test_lease(self):
+        async def _test():
+            blob = self.service.get_blob_client('container', 'leased')
+            await blob.upload_blob(b'data')
+            lease = await blob.acquire_lease()
+            lease_id = lease.id
+            held = dict(self.transport.leases)
+            await lease.release()
+            return lease, lease_id, held
+
+        lease, lease_id, held = _run(_test())
+        self.assertIsInstance(lease, LeaseClient)
+        self.assertEqual(list(held.values()), [lease_id])
+        self.assertEqual(self.transport.leases, {})
+
+    def test_delete_blob(self):
+        async def _test():
+            container = self.service.get_container_client('container')
+            await container.upload_blob('deleted', b'data')
+            await container.delete_blob('deleted')
+            await container.get_blob_client('deleted').get_blob_properties()
+
+        with self.assertRaises(ResourceNotFoundError):
+            _run(_test())
+
+
+# ------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import base64
+import os
+import threading
+import time
+import unittest
+import uuid
+import xml.etree.ElementTree as ET
+
+from requests.structures import CaseInsensitiveDict
+from azure.core.exceptions import HttpResponseError, ResourceModifiedError
+from azure.core.pipeline.transport import HttpTransport, HttpResponse
+
+try:
+    from urllib.parse import urlparse, parse_qs, unquote
+except ImportError:
+    from urlparse import urlparse, parse_qs # type: ignore
+    from urllib2 import unquote # type: ignore
+
+from azure.storage.blob import BlobClient, ContentSettings
+from azure.storage.blob._blob_utils import get_copy_blocks
+
+# ------------------------------------------------------------------------------
+_LAST_MODIFIED = 'Fri, 31 May 2019 12:00:00 GMT'
+_SOURCE_URL = 'https://source.blob.core.windows.net/container/source?sv=2018-03-28&sig=c2ln'
+
+
+class _FakeResponse(HttpResponse):
+
+    def __init__(self, request, status_code, headers=None, body=b''):
+        super(_FakeResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.headers.setdefault('x-ms-request-id', str(uuid.uuid4()))
+        self.content_type = self.headers['Content-Type'].split(';') if 'Content-Type' in self.headers else None
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+class _FakeCopyService(HttpTransport):
+    """Serves the source blob, and the block blob it is copied to with Put Block From URL."""
+
+    def __init__(self, source, delay=0, fail_offset=None):
+        self.source = {'content': source, 'etag': '"0x1"'}
+        self.delay = delay
+        self.fail_offset = fail_offset
+        self.on_stage = None
+        self.lock = threading.Lock()
+        self.blocks = {}
+        self.blob = None
+        self.heads = 0
+        self.staged = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        url = urlparse(request.url)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.netloc.startswith('source.'):
+            return self._head_source(request)
+        if request.method == 'PUT' and query.get('comp') == 'block':
+            return self._stage_block(request, query)
+        if request.method == 'GET' and query.get('comp') == 'blocklist':
+            return self._get_block_list(request)
+        if request.method == 'PUT' and query.get('comp') == 'blocklist':
+            return self._commit(request)
+        return _FakeResponse(request, 400, {'x-ms-error-code': 'UnsupportedHttpVerb'})
+
+    def _head_source(self, request):
+        with self.lock:
+            self.heads += 1
+        return _FakeResponse(request, 200, {
+            'Content-Length': str(len(self.source['content'])),
+            'Content-Type': 'application/octet-stream',
+            'ETag': self.source['etag'],
+            'Last-Modified': _LAST_MODIFIED,
+            'x-ms-blob-type': 'BlockBlob',
+            'x-ms-meta-origin': 'source',
+        })
+
+    def _stage_block(self, request, query):
+        assert request.headers['x-ms-copy-source'] == _SOURCE_URL
+        start, end = [int(x) for x in request.headers['x-ms-source-range'].split('=')[1].split('-')]
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if start == self.fail_offset:
+                self.fail_offset = None
+                return _FakeResponse(request, 400, {'x-ms-error-code': 'CannotVerifyCopySource'})
+            with self.lock:
+                self.staged.append(start)
+                self.blocks[query['blockid']] = self.source['content'][start:end + 1]
+            if self.on_stage:
+                self.on_stage()
+            return _FakeResponse(request, 201)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _get_block_list(self, request):
+        if self.blob is None and not self.blocks:
+            return _FakeResponse(request, 404, {'x-ms-error-code': 'BlobNotFound'})
+        root = ET.Element('BlockList')
+        ET.SubElement(root, 'CommittedBlocks')
+        uncommitted = ET.SubElement(root, 'UncommittedBlocks')
+        for block_id, content in self.blocks.items():
+            block = ET.SubElement(uncommitted, 'Block')
+            ET.SubElement(block, 'Name').text = block_id
+            ET.SubElement(block, 'Size').text = str(len(content))
+        return _FakeResponse(request, 200, {'Content-Type': 'application/xml'}, ET.tostring(root))
+
+    def _commit(self, request):
+        block_ids = [e.text for e in ET.fromstring(request.data)]
+        self.blob = {
+            'content': b''.join(self.blocks[i] for i in block_ids),
+            'block_ids': [base64.b64decode(i).decode('utf-8') for i in block_ids],
+            'content_type': request.headers.get('x-ms-blob-content-type'),
+            'metadata': dict((k[10:], v) for k, v in request.headers.items() if k.startswith('x-ms-meta-')),
+        }
+        self.blocks = {}
+        return _FakeResponse(request, 201, {'ETag': '"0x2"', 'Last-Modified': _LAST_MODIFIED})
+
+
+class StorageBlobCopyInBlocksTest(unittest.TestCase):
+
+    def _get_blob(self, service):
+        self.service = service
+        return BlobClient(
+            'https://account.blob.core.windows.net/container/blob',
+            credential='sv=2018-03-28&sig=ZGVzdA',
+            transport=service,
+            max_block_size=1024,
+            retry_total=0)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_copy_blob_from_url_in_blocks(self):
+        source = os.urandom(10 * 1024 + 100)
+        blob = self._get_blob(_FakeCopyService(source, delay=0.01))
+
+        response = blob.copy_blob_from_url_in_blocks(_SOURCE_URL, max_connections=4)
+
+        self.assertEqual(response['etag'], '"0x2"')
+        self.assertEqual(self.service.blob['content'], source)
+        self.assertEqual(len(self.service.blob['block_ids']), 11)
+        self.assertEqual(len(set(len(i) for i in self.service.blob['block_ids'])), 1)
+        self.assertEqual(self.service.blob['content_type'], 'application/octet-stream')
+        self.assertEqual(self.service.blob['metadata'], {'origin': 'source'})
+        self.assertGreater(self.service.max_in_flight, 1)
+        self.assertLessEqual(self.service.max_in_flight, 4)
+
+    def test_copy_blob_from_url_in_blocks_with_source_length(self):
+        source = os.urandom(3000)
+        blob = self._get_blob(_FakeCopyService(source))
+
+        blob.copy_blob_from_url_in_blocks(
+            _SOURCE_URL,
+            source_length=len(source),
+            block_size=2048,
+            content_settings=ContentSettings(content_type='text/plain'))
+
+        self.assertEqual(self.service.heads, 0)
+        self.assertEqual(self.service.blob['content'], source)
+        self.assertEqual(len(self.service.blob['block_ids']), 2)
+        self.assertEqual(self.service.blob['content_type'], 'text/plain')
+        self.assertEqual(self.service.blob['metadata'], {})
+
+    def test_copy_blob_from_url_in_blocks_resumes(self):
+        source = os.urandom(10 * 1024)
+        blob = self._get_blob(_FakeCopyService(source, fail_offset=6 * 1024))
+
+        with self.assertRaises(HttpResponseError):
+            blob.copy_blob_from_url_in_blocks(_SOURCE_URL, max_connections=1)
+        self.assertEqual(self.service.staged, [i * 1024 for i in range(6)])
+        self.assertIsNone(self.service.blob)
+
+        del self.service.staged[:]
+        blob.copy_blob_from_url_in_blocks(_SOURCE_URL, max_connections=2)
+
+        # Only the blocks missing were staged
+        self.assertEqual(sorted(self.service.staged), [i * 1024 for i in range(6, 10)])
+        self.assertEqual(self.service.blob['content'], source)
+
+    def test_copy_blob_from_url_in_blocks_source_modified(self):
+        source = os.urandom(4 * 1024)
+        blob = self._get_blob(_FakeCopyService(source))
+
+        def _modify_source():
+            self.service.source['etag'] = '"0x3"'
+        self.service.on_stage = _modify_source
+
+        with self.assertRaises(ResourceModifiedError):
+            blob.copy_blob_from_url_in_blocks(_SOURCE_URL)
+        self.assertIsNone(self.service.blob)
+
+    def test_copy_blob_from_url_in_blocks_empty_source(self):
+        blob = self._get_blob(_FakeCopyService(b''))
+
+        blob.copy_blob_from_url_in_blocks(_SOURCE_URL)
+
+        self.assertEqual(self.service.blob['content'], b'')
+        self.assertEqual(self.service.staged, [])
+
+    def test_get_copy_blocks(self):
+        blocks = get_copy_blocks(_SOURCE_URL, 2500, '"0x1"', 1024)
+        self.assertEqual([(offset, length) for _, offset, length in blocks], [(0, 1024), (1024, 1024), (2048, 452)])
+        self.assertEqual(blocks, get_copy_blocks(_SOURCE_URL.split('?')[0], 2500, '"0x1"', 1024))
+        self.assertNotEqual(blocks[0][0], get_copy_blocks(_SOURCE_URL, 2500, '"0x2"', 1024)[0][0])
+
+        # At most 50,000 blocks
+        blocks = get_copy_blocks(_SOURCE_URL, 50000 * 1024 + 1, None, 1024)
+        self.assertLessEqual(len(blocks), 50000)
+        self.assertEqual(sum(length for _, _, length in blocks), 50000 * 1024 + 1)
+
+        with self.assertRaises(ValueError):
+            get_copy_blocks(_SOURCE_URL, 1, None, 101 * 1024 * 1024)
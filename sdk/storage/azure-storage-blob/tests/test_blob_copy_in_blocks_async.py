@@ -0,0 +1,100 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import os
+import sys
+import unittest
+
+import pytest
+
+if sys.version_info < (3, 5):
+    pytest.skip("Async clients require Python 3.5+", allow_module_level=True)
+
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline.transport import AsyncHttpTransport
+
+from azure.storage.blob.aio import BlobClient
+
+from test_blob_copy_in_blocks import _FakeCopyService, _FakeResponse, _SOURCE_URL
+
+# ------------------------------------------------------------------------------
+
+
+class _FakeAsyncResponse(_FakeResponse):
+
+    async def load_body(self):
+        pass
+
+
+class _FakeAsyncCopyService(AsyncHttpTransport):
+
+    def __init__(self, source, **kwargs):
+        self.service = _FakeCopyService(source, **kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            response = self.service.send(request)
+            return _FakeAsyncResponse(request, response.status_code, response.headers, response.body())
+        finally:
+            self.in_flight -= 1
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class StorageBlobCopyInBlocksAsyncTest(unittest.TestCase):
+
+    def _get_blob(self, source, **kwargs):
+        self.transport = _FakeAsyncCopyService(source, **kwargs)
+        self.service = self.transport.service
+        return BlobClient(
+            'https://account.blob.core.windows.net/container/blob',
+            credential='sv=2018-03-28&sig=ZGVzdA',
+            transport=self.transport,
+            max_block_size=1024,
+            retry_total=0)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_copy_blob_from_url_in_blocks(self):
+        source = os.urandom(10 * 1024 + 100)
+        blob = self._get_blob(source)
+
+        _run(blob.copy_blob_from_url_in_blocks(_SOURCE_URL, max_connections=4))
+
+        self.assertEqual(self.service.blob['content'], source)
+        self.assertEqual(len(self.service.blob['block_ids']), 11)
+        self.assertEqual(self.service.blob['metadata'], {'origin': 'source'})
+        self.assertGreater(self.transport.max_in_flight, 1)
+        self.assertLessEqual(self.transport.max_in_flight, 4)
+
+    def test_copy_blob_from_url_in_blocks_resumes(self):
+        source = os.urandom(10 * 1024)
+        blob = self._get_blob(source, fail_offset=6 * 1024)
+
+        with self.assertRaises(HttpResponseError):
+            _run(blob.copy_blob_from_url_in_blocks(_SOURCE_URL, max_connections=1))
+        del self.service.staged[:]
+        _run(blob.copy_blob_from_url_in_blocks(_SOURCE_URL, max_connections=2))
+
+        self.assertEqual(sorted(self.service.staged), [i * 1024 for i in range(6, 10)])
+        self.assertEqual(self.service.blob['content'], source)
@@ -0,0 +1,219 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import base64
+import os
+import time
+import unittest
+from json import loads
+
+from azure.core.exceptions import HttpResponseError
+
+from azure.storage.blob import BlobClient
+from azure.storage.blob._shared.encryption import (
+    _EncryptedRegions,
+    _get_encrypted_blob_length,
+)
+
+from encryption_test_helper import KeyWrapper, KeyResolver
+from test_directory_sync import _FakeBlobService
+
+# ------------------------------------------------------------------------------
+_REGION = 4 * 1024 * 1024
+_ENCRYPTED_REGION = _REGION + 28
+
+
+class _FakeEncryptedBlobService(_FakeBlobService):
+    """Keeps the metadata of the blobs, and the requests made for them."""
+
+    def __init__(self, delay=0):
+        super(_FakeEncryptedBlobService, self).__init__()
+        self.delay = delay
+        self.ranges = []
+        self.staged = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def send(self, request, **kwargs):
+        if request.method == 'GET':
+            self.ranges.append(request.headers.get('x-ms-range'))
+        if 'comp=block&' in request.url or request.url.endswith('comp=block'):
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                self.staged.append(int(request.headers['Content-Length']))
+            time.sleep(self.delay)
+            with self.lock:
+                self.in_flight -= 1
+        return super(_FakeEncryptedBlobService, self).send(request, **kwargs)
+
+    def _put(self, request, blob, content):
+        response = super(_FakeEncryptedBlobService, self)._put(request, blob, content)
+        self.blobs[blob]['metadata'] = dict(
+            (k, v) for k, v in request.headers.items() if k.lower().startswith('x-ms-meta-'))
+        return response
+
+    def _get(self, request, props):
+        response = _FakeBlobService._get(request, props)
+        response.headers.update(props.get('metadata', {}))
+        return response
+
+
+class StorageBlobEncryptionRegionsTest(unittest.TestCase):
+
+    def _get_blob(self, service, **kwargs):
+        self.service = service
+        options = {
+            'credential': 'sv=2018-03-28&sig=c2ln',
+            'transport': service,
+            'key_encryption_key': KeyWrapper('key1'),
+            'encryption_version': '2.0',
+            'max_single_put_size': 1024 * 1024,
+            'max_block_size': 5 * 1024 * 1024,
+            'retry_total': 0,
+        }
+        options.update(kwargs)
+        return BlobClient('https://account.blob.core.windows.net/container/blob', **options)
+
+    def _stored(self):
+        return self.service.blobs['blob']
+
+    # --Test cases ---------------------------------------------------------------
+    def test_upload_blob_in_encrypted_regions(self):
+        data = os.urandom(2 * _REGION + 100)
+        blob = self._get_blob(_FakeEncryptedBlobService(delay=0.05))
+
+        blob.upload_blob(data, max_connections=3)
+
+        # Every block holds a whole region, and the blocks were encrypted and staged in parallel
+        self.assertEqual(self.service.staged.count(_ENCRYPTED_REGION), 2)
+        self.assertEqual(sorted(self.service.staged)[0], 100 + 28)
+        self.assertGreater(self.service.max_in_flight, 1)
+        self.assertEqual(len(self._stored()['content']), _get_encrypted_blob_length(len(data), '2.0'))
+
+        encryption_data = loads(self._stored()['metadata']['x-ms-meta-encryptiondata'])
+        self.assertEqual(encryption_data['EncryptionAgent']['Protocol'], '2.0')
+        self.assertEqual(encryption_data['EncryptionAgent']['EncryptionAlgorithm'], 'AES_GCM_256')
+        self.assertEqual(encryption_data['EncryptedRegionInfo'], {'DataLength': _REGION, 'NonceLength': 12})
+        self.assertNotIn('ContentEncryptionIV', encryption_data)
+
+        self.assertEqual(blob.download_blob().content_as_bytes(), data)
+
+    def test_download_blob_in_encrypted_regions(self):
+        data = os.urandom(3 * _REGION + 10)
+        blob = self._get_blob(
+            _FakeEncryptedBlobService(), max_single_get_size=1024 * 1024, max_chunk_get_size=1024 * 1024)
+        blob.upload_blob(data)
+        del self.service.ranges[:]
+
+        downloader = blob.download_blob()
+        content = downloader.content_as_bytes(max_connections=3)
+
+        self.assertEqual(content, data)
+        self.assertEqual(len(downloader), len(data))
+        self.assertEqual(downloader.properties.size, len(data))
+        # The initial response is too short for a region, and is downloaded again as a
+        # whole region. The chunks are rounded up to whole regions.
+        self.assertEqual(self.service.ranges[:2], ['bytes=0-1048575', 'bytes=0-{}'.format(_ENCRYPTED_REGION - 1)])
+        self.assertEqual(set(self.service.ranges[2:]), set(
+            'bytes={}-{}'.format(i * _ENCRYPTED_REGION, (i + 1) * _ENCRYPTED_REGION - 1) for i in range(1, 4)))
+
+        self.assertEqual(b"".join(blob.download_blob().chunks(max_connections=2)), data)
+
+    def test_download_blob_range_from_encrypted_regions(self):
+        data = os.urandom(3 * _REGION)
+        blob = self._get_blob(_FakeEncryptedBlobService())
+        blob.upload_blob(data)
+        del self.service.ranges[:]
+
+        # Random access only downloads the regions holding the range
+        offset, end = _REGION - 10, 2 * _REGION + 9
+        content = blob.download_blob(offset=offset, length=end).content_as_bytes()
+
+        self.assertEqual(content, data[offset:end + 1])
+        self.assertEqual(self.service.ranges[-1], 'bytes=0-{}'.format(3 * _ENCRYPTED_REGION - 1))
+
+        del self.service.ranges[:]
+        content = blob.download_blob(offset=_REGION + 1, length=_REGION + 100).content_as_bytes()
+        self.assertEqual(content, data[_REGION + 1:_REGION + 101])
+        self.assertEqual(
+            self.service.ranges[-1], 'bytes={}-{}'.format(_ENCRYPTED_REGION, 2 * _ENCRYPTED_REGION - 1))
+
+    def test_upload_small_blob_in_encrypted_region(self):
+        data = b'small blob of a single region'
+        blob = self._get_blob(_FakeEncryptedBlobService())
+
+        blob.upload_blob(data)
+
+        self.assertEqual(self.service.staged, [])
+        self.assertEqual(len(self._stored()['content']), len(data) + 28)
+        self.assertEqual(blob.download_blob().content_as_bytes(), data)
+
+        # A key resolver finds the key by the id stored with the blob
+        resolver = KeyResolver()
+        resolver.put_key(KeyWrapper('key1'))
+        reader = self._get_blob(self.service, key_encryption_key=None, key_resolver_function=resolver.resolve_key)
+        self.assertEqual(reader.download_blob().content_as_bytes(), data)
+
+    def test_download_modified_encrypted_region_fails(self):
+        data = os.urandom(2 * 1024)
+        blob = self._get_blob(_FakeEncryptedBlobService())
+        blob.upload_blob(data)
+
+        content = bytearray(self._stored()['content'])
+        content[100] ^= 1
+        self._stored()['content'] = bytes(content)
+
+        with self.assertRaises(HttpResponseError):
+            blob.download_blob().content_as_bytes()
+
+    def test_download_encrypted_regions_unversioned_key_fails(self):
+        blob = self._get_blob(_FakeEncryptedBlobService())
+        blob.upload_blob(b'data')
+
+        # The version is wrapped with the key, so a key wrapped without it is rejected
+        metadata = self._stored()['metadata']
+        encryption_data = loads(metadata['x-ms-meta-encryptiondata'])
+        unversioned = base64.b64encode(KeyWrapper('key1').wrap_key(os.urandom(32))).decode('utf-8')
+        metadata['x-ms-meta-encryptiondata'] = metadata['x-ms-meta-encryptiondata'].replace(
+            encryption_data['WrappedContentKey']['EncryptedKey'], unversioned)
+
+        with self.assertRaises(HttpResponseError):
+            blob.download_blob().content_as_bytes()
+
+    def test_version_1_blob_downloads_with_version_2_client(self):
+        data = os.urandom(3 * 1024 * 1024)
+        writer = self._get_blob(_FakeEncryptedBlobService(), encryption_version='1.0')
+        writer.upload_blob(data)
+        self.assertEqual(
+            loads(self._stored()['metadata']['x-ms-meta-encryptiondata'])['EncryptionAgent']['Protocol'], '1.0')
+
+        reader = self._get_blob(self.service)
+        self.assertEqual(reader.download_blob().content_as_bytes(), data)
+
+    def test_unsupported_encryption_version(self):
+        blob = self._get_blob(_FakeEncryptedBlobService(), encryption_version='3.0')
+        with self.assertRaises(ValueError):
+            blob.upload_blob(b'data')
+
+    def test_encrypted_regions(self):
+        regions = _EncryptedRegions(os.urandom(32), data_length=16)
+        data = os.urandom(100)
+
+        encrypted = regions.encrypt(data)
+
+        self.assertEqual(len(encrypted), 100 + 7 * 28)
+        self.assertEqual(regions.get_data_length(len(encrypted)), 100)
+        self.assertEqual(regions.decrypt(encrypted), data)
+        self.assertEqual(regions.get_range(20, 40), (44, 131, 4))
+
+        # Any range is decrypted from the regions that hold it
+        start, end, offset = regions.get_range(20, 40)
+        self.assertEqual(regions.decrypt(encrypted[start:end + 1])[offset:offset + 21], data[20:41])
+
+        with self.assertRaises(ValueError):
+            regions.get_data_length(44 + 28)
@@ -0,0 +1,106 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import os
+import sys
+import unittest
+
+import pytest
+
+if sys.version_info < (3, 5):
+    pytest.skip("Async clients require Python 3.5+", allow_module_level=True)
+
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline.transport import AsyncHttpTransport
+
+from azure.storage.blob.aio import BlobClient
+
+from encryption_test_helper import KeyWrapper
+from test_blob_encryption_regions import _FakeEncryptedBlobService, _REGION, _ENCRYPTED_REGION
+from test_directory_sync_async import _FakeAsyncResponse
+
+# ------------------------------------------------------------------------------
+
+
+class _FakeAsyncEncryptedBlobService(AsyncHttpTransport):
+
+    def __init__(self):
+        self.service = _FakeEncryptedBlobService()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            response = self.service.send(request)
+            return _FakeAsyncResponse(request, response.status_code, response.headers, response.body())
+        finally:
+            self.in_flight -= 1
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class StorageBlobEncryptionRegionsAsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = _FakeAsyncEncryptedBlobService()
+        self.service = self.transport.service
+        self.blob = BlobClient(
+            'https://account.blob.core.windows.net/container/blob',
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=self.transport,
+            key_encryption_key=KeyWrapper('key1'),
+            encryption_version='2.0',
+            max_single_put_size=1024 * 1024,
+            max_block_size=4 * 1024 * 1024,
+            max_single_get_size=1024 * 1024,
+            max_chunk_get_size=1024 * 1024,
+            retry_total=0)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_upload_download_blob_in_encrypted_regions(self):
+        data = os.urandom(2 * _REGION + 100)
+
+        _run(self.blob.upload_blob(data, max_connections=3))
+
+        self.assertEqual(sorted(self.service.staged), [128, _ENCRYPTED_REGION, _ENCRYPTED_REGION])
+        self.assertGreater(self.transport.max_in_flight, 1)
+
+        downloader = _run(self.blob.download_blob())
+        self.assertEqual(_run(downloader.content_as_bytes(max_connections=3)), data)
+
+        async def _read_range():
+            downloader = await self.blob.download_blob(offset=_REGION - 5, length=_REGION + 5)
+            chunks = []
+            async for chunk in downloader:
+                chunks.append(chunk)
+            return b"".join(chunks)
+        self.assertEqual(_run(_read_range()), data[_REGION - 5:_REGION + 6])
+
+    def test_download_modified_encrypted_region_fails(self):
+        _run(self.blob.upload_blob(b'data'))
+        content = bytearray(self.service.blobs['blob']['content'])
+        content[-1] ^= 1
+        self.service.blobs['blob']['content'] = bytes(content)
+
+        with self.assertRaises(HttpResponseError):
+            downloader = _run(self.blob.download_blob())
+            _run(downloader.content_as_bytes())
@@ -0,0 +1,249 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import json
+import random
+import threading
+import time
+import unittest
+import uuid
+import xml.etree.ElementTree as ET
+
+from requests.structures import CaseInsensitiveDict
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline.transport import HttpTransport, HttpResponse
+
+try:
+    from urllib.parse import urlparse, parse_qs
+except ImportError:
+    from urlparse import urlparse, parse_qs # type: ignore
+
+from azure.storage.blob import ContainerClient
+
+# ------------------------------------------------------------------------------
+_LAST_MODIFIED = 'Fri, 31 May 2019 12:00:00 GMT'
+
+
+class _FakeResponse(HttpResponse):
+
+    def __init__(self, request, status_code, headers=None, body=b''):
+        super(_FakeResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.headers.setdefault('x-ms-request-id', str(uuid.uuid4()))
+        self.content_type = self.headers['Content-Type'].split(';') if 'Content-Type' in self.headers else None
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+class _FakeListService(HttpTransport):
+    """Serves flat and hierarchical List Blobs requests over a set of blob names."""
+
+    def __init__(self, names, delay=0, fail_prefix=None):
+        self.names = sorted(names)
+        self.delay = delay
+        self.fail_prefix = fail_prefix
+        self.lock = threading.Lock()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        query = {k: v[0] for k, v in parse_qs(urlparse(request.url).query).items()}
+        with self.lock:
+            self.requests.append(query)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(random.random() * self.delay)
+            if self.fail_prefix is not None and query.get('prefix') == self.fail_prefix:
+                return _FakeResponse(
+                    request, 404, {'x-ms-error-code': 'ContainerNotFound'})
+            return self._list(request, query)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _entries(self, prefix, delimiter):
+        entries = []
+        for name in self.names:
+            if not name.startswith(prefix):
+                continue
+            index = name.find(delimiter, len(prefix)) if delimiter else -1
+            if index < 0:
+                entries.append(('blob', name))
+            elif not entries or entries[-1] != ('prefix', name[:index + len(delimiter)]):
+                entries.append(('prefix', name[:index + len(delimiter)]))
+        return entries
+
+    def _list(self, request, query):
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter')
+        entries = self._entries(prefix, delimiter)
+        marker = query.get('marker')
+        if marker:
+            entries = [e for e in entries if e[1] >= marker]
+        max_results = int(query.get('maxresults', 5000))
+        page, rest = entries[:max_results], entries[max_results:]
+
+        root = ET.Element('EnumerationResults', ServiceEndpoint='https://account.blob.core.windows.net/',
+                          ContainerName='container')
+        ET.SubElement(root, 'Prefix').text = prefix
+        ET.SubElement(root, 'MaxResults').text = str(max_results)
+        if delimiter:
+            ET.SubElement(root, 'Delimiter').text = delimiter
+        items = ET.SubElement(root, 'Blobs')
+        for kind, name in page:
+            if kind == 'prefix':
+                ET.SubElement(ET.SubElement(items, 'BlobPrefix'), 'Name').text = name
+                continue
+            item = ET.SubElement(items, 'Blob')
+            ET.SubElement(item, 'Name').text = name
+            props = ET.SubElement(item, 'Properties')
+            ET.SubElement(props, 'Last-Modified').text = _LAST_MODIFIED
+            ET.SubElement(props, 'Etag').text = '"0x1"'
+            ET.SubElement(props, 'Content-Length').text = '1'
+            ET.SubElement(props, 'BlobType').text = 'BlockBlob'
+        ET.SubElement(root, 'NextMarker').text = rest[0][1] if rest else ''
+        return _FakeResponse(request, 200, {'Content-Type': 'application/xml'}, ET.tostring(root))
+
+
+def _names():
+    names = ['root{}'.format(i) for i in range(7)] + ['z-root']
+    for directory in ['a', 'b', 'c', 'd', 'e']:
+        names.extend('{}/blob{:03}'.format(directory, i) for i in range(23))
+    names.append('b/nested/blob')
+    return names
+
+
+class StorageBlobListingTest(unittest.TestCase):
+
+    def _get_container(self, names, **kwargs):
+        self.service = _FakeListService(names, **kwargs)
+        return ContainerClient(
+            'https://account.blob.core.windows.net/container',
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=self.service)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_list_blobs_parallel_discovers_shards(self):
+        names = _names()
+        container = self._get_container(names, delay=0.01)
+
+        blobs = list(container.list_blobs_parallel(max_connections=3, results_per_page=5))
+
+        self.assertEqual(sorted(b.name for b in blobs), sorted(names))
+        self.assertEqual(len(blobs), len(names))
+        self.assertGreater(self.service.max_in_flight, 1)
+        self.assertLessEqual(self.service.max_in_flight, 4)
+
+    def test_list_blobs_parallel_lists_each_page_once(self):
+        names = _names()
+        for ordered in (False, True):
+            container = self._get_container(names)
+
+            blobs = list(container.list_blobs_parallel(ordered=ordered, max_connections=3, results_per_page=4))
+
+            self.assertEqual(sorted(b.name for b in blobs), sorted(names))
+            pages = [(q.get('prefix'), q.get('delimiter'), q.get('marker')) for q in self.service.requests]
+            self.assertEqual(len(pages), len(set(pages)))
+            # The shard of the blobs directly under the root finds the directories: 8 blobs and 5 prefixes
+            self.assertEqual(len([p for p in pages if p[1]]), 4)
+
+    def test_list_blobs_parallel_ordered(self):
+        names = _names()
+        container = self._get_container(names, delay=0.01)
+
+        blobs = list(container.list_blobs_parallel(ordered=True, max_connections=3, results_per_page=4))
+
+        self.assertEqual([b.name for b in blobs], sorted(names))
+        self.assertTrue(all(b.container == 'container' for b in blobs))
+
+    def test_list_blobs_parallel_name_starts_with(self):
+        names = _names()
+        container = self._get_container(names)
+
+        blobs = list(container.list_blobs_parallel('b/', ordered=True, results_per_page=4))
+
+        self.assertEqual([b.name for b in blobs], sorted(n for n in names if n.startswith('b/')))
+
+    def test_list_blobs_parallel_with_prefixes(self):
+        names = ['{:x}{}'.format(i % 16, uuid.uuid4().hex) for i in range(200)]
+        container = self._get_container(names)
+
+        listing = container.list_blobs_parallel(
+            prefixes=['{:x}'.format(i) for i in range(16)], ordered=True, max_connections=8, results_per_page=3)
+        blobs = list(listing)
+
+        self.assertEqual([b.name for b in blobs], sorted(names))
+        self.assertTrue(all(shard[2] is None for shard in listing.checkpoint))
+        # No hierarchical listing was needed
+        self.assertFalse(any('delimiter' in q for q in self.service.requests))
+
+    def test_list_blobs_parallel_overlapping_prefixes(self):
+        container = self._get_container([])
+        with self.assertRaises(ValueError):
+            container.list_blobs_parallel(prefixes=['a', 'ab'])
+
+    def test_list_blobs_parallel_snapshots_require_prefixes(self):
+        container = self._get_container([])
+        with self.assertRaises(ValueError):
+            container.list_blobs_parallel(include='snapshots')
+        with self.assertRaises(ValueError):
+            container.list_blobs_parallel(include=['snapshots'], checkpoint=[['', '/', 'marker']])
+
+        self.assertEqual(list(container.list_blobs_parallel(include=['snapshots'], prefixes=['a'])), [])
+        self.assertEqual(list(container.list_blobs_parallel(include=['snapshots'], delimiter=None)), [])
+
+    def test_list_blobs_parallel_resume_from_checkpoint(self):
+        names = _names()
+        for ordered in (False, True):
+            container = self._get_container(names)
+            listing = container.list_blobs_parallel(ordered=ordered, max_connections=2, results_per_page=4)
+            first = [next(listing) for _ in range(30)]
+            listing.close()
+            saved = json.loads(json.dumps(listing.checkpoint))
+
+            resumed = list(container.list_blobs_parallel(checkpoint=saved, results_per_page=4))
+
+            listed = set(b.name for b in first) | set(b.name for b in resumed)
+            self.assertEqual(listed, set(names))
+            # Only the pages being consumed when the listing stopped are listed again
+            self.assertLess(len(first) + len(resumed), len(names) + 4 * 3)
+
+    def test_list_blobs_parallel_checkpoint_tracks_consumed_pages(self):
+        container = self._get_container(['a/{}'.format(i) for i in range(10)])
+        listing = container.list_blobs_parallel(prefixes=['a/'], results_per_page=4)
+
+        self.assertEqual(listing.checkpoint, [['a/', None, '']])
+        [next(listing) for _ in range(4)]
+        # The first page is not checkpointed until the next blob is requested
+        self.assertEqual(listing.checkpoint, [['a/', None, '']])
+        next(listing)
+        self.assertEqual(listing.checkpoint, [['a/', None, 'a/4']])
+        list(listing)
+        self.assertEqual(listing.checkpoint, [['a/', None, None]])
+
+    def test_list_blobs_parallel_error(self):
+        container = self._get_container(_names(), fail_prefix='c/')
+        with self.assertRaises(ResourceNotFoundError):
+            list(container.list_blobs_parallel(ordered=True))
+        with self.assertRaises(ResourceNotFoundError):
+            list(container.list_blobs_parallel())
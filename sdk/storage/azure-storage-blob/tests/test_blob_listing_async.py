@@ -0,0 +1,141 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import json
+import random
+import sys
+import unittest
+
+import pytest
+
+if sys.version_info < (3, 5):
+    pytest.skip("Async clients require Python 3.5+", allow_module_level=True)
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline.transport import AsyncHttpTransport
+
+from azure.storage.blob.aio import ContainerClient
+
+from test_blob_listing import _FakeListService, _FakeResponse, _names
+
+# ------------------------------------------------------------------------------
+
+
+class _FakeAsyncResponse(_FakeResponse):
+
+    async def load_body(self):
+        pass
+
+
+class _FakeAsyncListService(AsyncHttpTransport):
+
+    def __init__(self, names, **kwargs):
+        self.service = _FakeListService(names, **kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(random.random() * 0.01)
+            response = self.service.send(request)
+            return _FakeAsyncResponse(request, response.status_code, response.headers, response.body())
+        finally:
+            self.in_flight -= 1
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+async def _collect(listing, count=None):
+    blobs = []
+    async for blob in listing:
+        blobs.append(blob)
+        if count and len(blobs) == count:
+            break
+    return blobs
+
+
+class StorageBlobListingAsyncTest(unittest.TestCase):
+
+    def _get_container(self, names, **kwargs):
+        self.transport = _FakeAsyncListService(names, **kwargs)
+        return ContainerClient(
+            'https://account.blob.core.windows.net/container',
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=self.transport)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_list_blobs_parallel(self):
+        names = _names()
+        container = self._get_container(names)
+
+        blobs = _run(_collect(container.list_blobs_parallel(max_connections=3, results_per_page=5)))
+
+        self.assertEqual(sorted(b.name for b in blobs), sorted(names))
+        self.assertEqual(len(blobs), len(names))
+        self.assertGreater(self.transport.max_in_flight, 1)
+        self.assertLessEqual(self.transport.max_in_flight, 4)
+
+    def test_list_blobs_parallel_lists_each_page_once(self):
+        names = _names()
+        for ordered in (False, True):
+            container = self._get_container(names)
+
+            blobs = _run(_collect(container.list_blobs_parallel(
+                ordered=ordered, max_connections=3, results_per_page=4)))
+
+            self.assertEqual(sorted(b.name for b in blobs), sorted(names))
+            requests = self.transport.service.requests
+            pages = [(q.get('prefix'), q.get('delimiter'), q.get('marker')) for q in requests]
+            self.assertEqual(len(pages), len(set(pages)))
+            self.assertEqual(len([p for p in pages if p[1]]), 4)
+
+    def test_list_blobs_parallel_ordered(self):
+        names = _names()
+        container = self._get_container(names)
+
+        blobs = _run(_collect(container.list_blobs_parallel(ordered=True, max_connections=3, results_per_page=4)))
+
+        self.assertEqual([b.name for b in blobs], sorted(names))
+
+    def test_list_blobs_parallel_resume_from_checkpoint(self):
+        names = _names()
+        container = self._get_container(names)
+        listing = container.list_blobs_parallel(ordered=True, max_connections=2, results_per_page=4)
+        first = _run(_collect(listing, count=30))
+        listing.close()
+        saved = json.loads(json.dumps(listing.checkpoint))
+
+        resumed = _run(_collect(container.list_blobs_parallel(checkpoint=saved, results_per_page=4)))
+
+        self.assertEqual(set(b.name for b in first) | set(b.name for b in resumed), set(names))
+        self.assertLess(len(first) + len(resumed), len(names) + 4 * 3)
+
+    def test_list_blobs_parallel_snapshots_require_prefixes(self):
+        container = self._get_container([])
+        with self.assertRaises(ValueError):
+            container.list_blobs_parallel(include='snapshots')
+
+        self.assertEqual(_run(_collect(container.list_blobs_parallel(include=['snapshots'], prefixes=['a']))), [])
+
+    def test_list_blobs_parallel_error(self):
+        container = self._get_container(_names(), fail_prefix='c/')
+        with self.assertRaises(ResourceNotFoundError):
+            _run(_collect(container.list_blobs_parallel(prefixes=['a/', 'b/', 'c/'])))
@@ -0,0 +1,115 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+import unittest
+import uuid
+
+from azure.core.pipeline.transport import HttpTransport
+from azure.core.polling import LROPollerManager
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse # type: ignore
+
+from azure.storage.blob import BlobClient
+from azure.storage.blob.polling import CopyBlobPolling
+
+from test_blob_copy_in_blocks import _FakeResponse, _LAST_MODIFIED
+
+# ------------------------------------------------------------------------------
+
+
+class _FakeCopyStatusService(HttpTransport):
+    """Serves the properties of blobs being copied, the copy of a blob completing after a number of polls."""
+
+    def __init__(self, polls, failed=()):
+        self.polls = polls
+        self.failed = failed
+        self.lock = threading.Lock()
+        self.heads = {}
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        name = urlparse(request.url).path.split('/')[-1]
+        with self.lock:
+            self.heads[name] = self.heads.get(name, 0) + 1
+            status = 'pending'
+            if self.heads[name] >= self.polls:
+                status = 'failed' if name in self.failed else 'success'
+        return _FakeResponse(request, 200, {
+            'Content-Length': '0',
+            'ETag': '"0x1"',
+            'Last-Modified': _LAST_MODIFIED,
+            'x-ms-blob-type': 'BlockBlob',
+            'x-ms-copy-id': name,
+            'x-ms-copy-status': status,
+            'x-ms-copy-status-description': 'Copy {}'.format(status),
+        })
+
+
+class StorageCopyPollingTest(unittest.TestCase):
+
+    def _get_blob(self, service, name):
+        return BlobClient(
+            'https://account.blob.core.windows.net/container/{}'.format(name),
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=service,
+            retry_total=0)
+
+    def _add_copy(self, manager, blob):
+        copy = {
+            'copy_id': str(uuid.uuid4()),
+            'copy_status': 'pending',
+            'etag': '"0x1"',
+            'last_modified': _LAST_MODIFIED,
+        }
+        return manager.add(blob, copy, None, CopyBlobPolling(0))
+
+    # --Test cases ---------------------------------------------------------------
+    def test_copy_polling_step_by_step(self):
+        service = _FakeCopyStatusService(polls=3, failed=['blob3'])
+        blobs = [self._get_blob(service, 'blob{}'.format(i)) for i in range(8)]
+
+        threads_before = threading.active_count()
+        with LROPollerManager(max_workers=2, polling_interval=0.01, timer_resolution=0) as manager:
+            pollers = [self._add_copy(manager, blob) for blob in blobs]
+            # The copies are polled step by step on the workers, not run on a thread each
+            self.assertLessEqual(threading.active_count() - threads_before, 3)
+
+            done, pending = manager.wait_all(timeout=10)
+
+        self.assertEqual(len(done), 8)
+        self.assertEqual(pending, [])
+        self.assertEqual(service.heads, dict(('blob{}'.format(i), 3) for i in range(8)))
+        for i, poller in enumerate(pollers):
+            if i == 3:
+                with self.assertRaises(ValueError):
+                    poller.result()
+                self.assertEqual(poller.status(), 'failed')
+            else:
+                self.assertEqual(poller.result().copy.status, 'success')
+
+    def test_update_status_returns_response(self):
+        service = _FakeCopyStatusService(polls=2)
+        method = CopyBlobPolling(0)
+        method.initialize(self._get_blob(service, 'blob'), 'blob', None)
+
+        response = method.update_status()
+
+        self.assertEqual(response.headers['x-ms-copy-status'], 'success')
+        self.assertTrue(method.finished())
+        self.assertEqual(service.heads['blob'], 2)
@@ -0,0 +1,101 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import sys
+import unittest
+import uuid
+
+import pytest
+
+if sys.version_info < (3, 5):
+    pytest.skip("Async clients require Python 3.5+", allow_module_level=True)
+
+from azure.core.pipeline.transport import AsyncHttpTransport
+from azure.core.polling import AsyncLROPollerManager
+
+from azure.storage.blob.aio import BlobClient
+from azure.storage.blob.aio.polling_async import AsyncCopyBlobPolling
+
+from test_blob_copy_in_blocks import _LAST_MODIFIED
+from test_blob_listing_async import _FakeAsyncResponse
+from test_copy_polling import _FakeCopyStatusService
+
+# ------------------------------------------------------------------------------
+
+
+class _FakeAsyncCopyStatusService(AsyncHttpTransport):
+
+    def __init__(self, polls, **kwargs):
+        self.service = _FakeCopyStatusService(polls, **kwargs)
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        response = self.service.send(request)
+        return _FakeAsyncResponse(request, response.status_code, response.headers, response.body())
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class StorageCopyPollingAsyncTest(unittest.TestCase):
+
+    def _get_blob(self, service, name):
+        return BlobClient(
+            'https://account.blob.core.windows.net/container/{}'.format(name),
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=service,
+            retry_total=0)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_copy_polling_step_by_step(self):
+        service = _FakeAsyncCopyStatusService(polls=3, failed=['blob3'])
+        blobs = [self._get_blob(service, 'blob{}'.format(i)) for i in range(8)]
+
+        async def _copy_all():
+            async with AsyncLROPollerManager(polling_interval=0.01, timer_resolution=0) as manager:
+                futures = []
+                for blob in blobs:
+                    copy = {
+                        'copy_id': str(uuid.uuid4()),
+                        'copy_status': 'pending',
+                        'etag': '"0x1"',
+                        'last_modified': _LAST_MODIFIED,
+                    }
+                    futures.append(manager.add(blob, copy, None, AsyncCopyBlobPolling(0)))
+                await manager.wait_all(futures, timeout=10)
+                return futures
+
+        futures = _run(_copy_all())
+
+        self.assertEqual(service.service.heads, dict(('blob{}'.format(i), 3) for i in range(8)))
+        for i, future in enumerate(futures):
+            if i == 3:
+                # A failed copy is not resolved as a success
+                with self.assertRaises(ValueError):
+                    future.result()
+            else:
+                self.assertEqual(future.result().copy.status, 'success')
+
+    def test_update_status_returns_response(self):
+        service = _FakeAsyncCopyStatusService(polls=1)
+        method = AsyncCopyBlobPolling(0)
+        method.initialize(self._get_blob(service, 'blob'), 'blob', None)
+
+        response = _run(method.update_status())
+
+        self.assertEqual(response.headers['x-ms-copy-status'], 'success')
+        self.assertTrue(method.finished())
@@ -0,0 +1,339 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+import xml.etree.ElementTree as ET
+from email.utils import formatdate
+
+from requests.structures import CaseInsensitiveDict
+from azure.core.pipeline.transport import HttpTransport, HttpResponse
+
+try:
+    from urllib.parse import urlparse, parse_qs, unquote
+except ImportError:
+    from urlparse import urlparse, parse_qs # type: ignore
+    from urllib2 import unquote # type: ignore
+
+from azure.storage.blob import ContainerClient
+
+# ------------------------------------------------------------------------------
+
+
+class _FakeStream(object):
+    """Iterator over a response body, mirroring the requests download generator."""
+
+    def __init__(self, response):
+        self.response = response
+        self._content = response.body()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._content is None:
+            raise StopIteration()
+        content, self._content = self._content, None
+        return content
+
+    next = __next__
+
+
+class _FakeResponse(HttpResponse):
+
+    def __init__(self, request, status_code, headers=None, body=b''):
+        super(_FakeResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.headers.setdefault('x-ms-request-id', str(uuid.uuid4()))
+        self.content_type = self.headers['Content-Type'].split(';') if 'Content-Type' in self.headers else None
+        self._body = body
+
+    def body(self):
+        return self._body
+
+    def stream_download(self, pipeline):
+        return _FakeStream(self)
+
+
+class _FakeBlobService(HttpTransport):
+    """A minimal in-memory block blob service, with flat and hierarchical listing."""
+
+    def __init__(self):
+        self.blobs = {}
+        self.blocks = {}
+        self.lock = threading.Lock()
+        self.writes = []
+        self.gets = []
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _read_body(request):
+        data = request.data
+        if data is None:
+            return b''
+        if hasattr(data, 'read'):
+            return data.read()
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return bytes(data)
+        return b''.join(data)
+
+    def send(self, request, **kwargs):
+        url = urlparse(request.url)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        _, _, blob = url.path.lstrip('/').partition('/')
+        blob = unquote(blob)
+        comp = query.get('comp')
+        with self.lock:
+            if comp == 'list':
+                return self._list(request, query)
+            if request.method == 'PUT' and comp == 'block':
+                self.blocks.setdefault(blob, {})[query['blockid']] = self._read_body(request)
+                return _FakeResponse(request, 201)
+            if request.method == 'PUT' and comp == 'blocklist':
+                staged = self.blocks.pop(blob, {})
+                ids = [e.text for e in ET.fromstring(self._read_body(request))]
+                return self._put(request, blob, b''.join(staged[i] for i in ids))
+            if request.method == 'PUT':
+                return self._put(request, blob, self._read_body(request))
+            if request.method == 'GET' and blob in self.blobs:
+                self.gets.append(blob)
+                return self._get(request, self.blobs[blob])
+        return _FakeResponse(request, 404, {'x-ms-error-code': 'BlobNotFound'})
+
+    def _put(self, request, blob, content):
+        self.writes.append(blob)
+        md5 = request.headers.get('x-ms-blob-content-md5')
+        self.blobs[blob] = {
+            'content': content,
+            'etag': '"0x{}"'.format(uuid.uuid4().hex[:8]),
+            'last_modified': formatdate(time.time(), usegmt=True),
+            'md5': md5,
+        }
+        return _FakeResponse(request, 201, {'ETag': self.blobs[blob]['etag'], 'Last-Modified': formatdate(usegmt=True)})
+
+    @staticmethod
+    def _get(request, props):
+        content = props['content']
+        headers = {
+            'ETag': props['etag'],
+            'Last-Modified': props['last_modified'],
+            'x-ms-blob-type': 'BlockBlob',
+        }
+        range_header = request.headers.get('x-ms-range')
+        if not range_header:
+            headers['Content-Length'] = str(len(content))
+            return _FakeResponse(request, 200, headers, content)
+        if not content:
+            return _FakeResponse(request, 416, {'x-ms-error-code': 'InvalidRange'})
+        start, _, end = range_header.split('=')[1].partition('-')
+        start, end = int(start), min(int(end), len(content) - 1)
+        headers['Content-Length'] = str(end - start + 1)
+        headers['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, len(content))
+        return _FakeResponse(request, 206, headers, content[start:end + 1])
+
+    def _list(self, request, query):
+        prefix = query.get('prefix', '')
+        delimiter = query.get('delimiter')
+        entries = []
+        for name in sorted(self.blobs):
+            if not name.startswith(prefix):
+                continue
+            index = name.find(delimiter, len(prefix)) if delimiter else -1
+            if index < 0:
+                entries.append(('blob', name))
+            elif not entries or entries[-1] != ('prefix', name[:index + len(delimiter)]):
+                entries.append(('prefix', name[:index + len(delimiter)]))
+
+        root = ET.Element('EnumerationResults', ServiceEndpoint='https://account.blob.core.windows.net/',
+                          ContainerName='container')
+        ET.SubElement(root, 'Prefix').text = prefix
+        items = ET.SubElement(root, 'Blobs')
+        for kind, name in entries:
+            if kind == 'prefix':
+                ET.SubElement(ET.SubElement(items, 'BlobPrefix'), 'Name').text = name
+                continue
+            props = self.blobs[name]
+            item = ET.SubElement(items, 'Blob')
+            ET.SubElement(item, 'Name').text = name
+            properties = ET.SubElement(item, 'Properties')
+            ET.SubElement(properties, 'Last-Modified').text = props['last_modified']
+            ET.SubElement(properties, 'Etag').text = props['etag']
+            ET.SubElement(properties, 'Content-Length').text = str(len(props['content']))
+            if props['md5']:
+                ET.SubElement(properties, 'Content-MD5').text = props['md5']
+            ET.SubElement(properties, 'BlobType').text = 'BlockBlob'
+        ET.SubElement(root, 'NextMarker').text = ''
+        return _FakeResponse(request, 200, {'Content-Type': 'application/xml'}, ET.tostring(root))
+
+
+_FILES = {
+    'a.txt': b'a' * 10,
+    'docs/b.txt': b'b' * 100,
+    'docs/deep/c.bin': os.urandom(3000),
+    'large/d.bin': os.urandom(5000),
+}
+
+
+class StorageDirectorySyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = _FakeBlobService()
+        self.container = ContainerClient(
+            'https://account.blob.core.windows.net/container',
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=self.service,
+            max_single_put_size=1024,
+            max_block_size=512,
+            max_single_get_size=1024,
+            max_chunk_get_size=512)
+        self.source = tempfile.mkdtemp()
+        self.destination = tempfile.mkdtemp()
+        # Files last modified in the past, before any upload
+        past = time.time() - 3600
+        for name, content in _FILES.items():
+            self._write(self.source, name, content, past)
+
+    def tearDown(self):
+        shutil.rmtree(self.source)
+        shutil.rmtree(self.destination)
+
+    @staticmethod
+    def _write(root, name, content, mtime=None):
+        path = os.path.join(root, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as stream:
+            stream.write(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    @staticmethod
+    def _read_tree(root):
+        files = {}
+        for directory, _, names in os.walk(root):
+            for name in names:
+                path = os.path.join(directory, name)
+                with open(path, 'rb') as stream:
+                    files[os.path.relpath(path, root).replace(os.sep, '/')] = stream.read()
+        return files
+
+    # --Test cases ---------------------------------------------------------------
+    def test_upload_directory(self):
+        progress = []
+        report = self.container.upload_directory(
+            self.source, name_starts_with='backup', max_connections=3,
+            progress_callback=lambda current, total: progress.append((current, total)))
+
+        self.assertEqual(sorted(report.changes), sorted((name, 'new') for name in _FILES))
+        self.assertEqual(report.total_bytes, sum(len(c) for c in _FILES.values()))
+        self.assertEqual(report.transferred_bytes, report.total_bytes)
+        self.assertEqual(progress[-1], (report.total_bytes, report.total_bytes))
+        self.assertEqual(len(progress), len(_FILES))
+        self.assertEqual(
+            dict((name, props['content']) for name, props in self.service.blobs.items()),
+            dict(('backup/' + name, content) for name, content in _FILES.items()))
+
+        # Nothing changed since
+        del self.service.writes[:]
+        report = self.container.upload_directory(self.source, name_starts_with='backup/')
+        self.assertEqual(report.changes, [])
+        self.assertEqual(sorted(report.skipped), sorted(_FILES))
+        self.assertEqual(self.service.writes, [])
+
+    def test_upload_directory_only_changed_files(self):
+        self.container.upload_directory(self.source)
+        del self.service.writes[:]
+        self._write(self.source, 'a.txt', b'resized')
+        self._write(self.source, 'docs/b.txt', b'c' * 100, time.time() + 10)
+        self._write(self.source, 'new.txt', b'new')
+
+        report = self.container.upload_directory(self.source)
+
+        self.assertEqual(
+            sorted(report.changes), [('a.txt', 'size'), ('docs/b.txt', 'modified'), ('new.txt', 'new')])
+        self.assertEqual(sorted(self.service.writes), ['a.txt', 'docs/b.txt', 'new.txt'])
+        self.assertEqual(self.service.blobs['docs/b.txt']['content'], b'c' * 100)
+
+    def test_upload_directory_dry_run(self):
+        report = self.container.upload_directory(self.source, dry_run=True)
+
+        self.assertTrue(report.dry_run)
+        self.assertEqual(len(report.changes), len(_FILES))
+        self.assertEqual(report.transferred_bytes, 0)
+        self.assertEqual(self.service.blobs, {})
+
+    def test_upload_directory_compare_content(self):
+        report = self.container.upload_directory(self.source, compare_content=True)
+        self.assertEqual(len(report.changes), len(_FILES))
+        for name, content in _FILES.items():
+            expected = base64.b64encode(hashlib.md5(content).digest()).decode('utf-8')
+            self.assertEqual(self.service.blobs[name]['md5'], expected)
+
+        # Touched, but with the same content
+        self._write(self.source, 'a.txt', _FILES['a.txt'], time.time() + 10)
+        self._write(self.source, 'docs/b.txt', b'x' * 100, time.time() + 10)
+        report = self.container.upload_directory(self.source, compare_content=True, dry_run=True)
+        self.assertEqual(report.changes, [('docs/b.txt', 'content')])
+
+    def test_download_directory(self):
+        self.container.upload_directory(self.source, name_starts_with='backup')
+        destination = os.path.join(self.destination, 'restored')
+
+        report = self.container.download_directory(destination, name_starts_with='backup', max_connections=3)
+
+        self.assertEqual(sorted(report.changes), sorted((name, 'new') for name in _FILES))
+        self.assertEqual(self._read_tree(destination), _FILES)
+
+        # The files get the modification time of their blobs, so nothing is downloaded again
+        del self.service.gets[:]
+        report = self.container.download_directory(destination, name_starts_with='backup')
+        self.assertEqual(report.changes, [])
+        self.assertEqual(self.service.gets, [])
+
+    def test_download_directory_only_changed_blobs(self):
+        self.container.upload_directory(self.source)
+        self.container.download_directory(self.destination)
+        os.remove(os.path.join(self.destination, 'a.txt'))
+        self._write(self.destination, 'docs/b.txt', b'local')
+        self._write(self.destination, 'local-only.txt', b'kept')
+        del self.service.gets[:]
+
+        report = self.container.download_directory(self.destination)
+
+        self.assertEqual(sorted(report.changes), [('a.txt', 'new'), ('docs/b.txt', 'size')])
+        self.assertEqual(sorted(set(self.service.gets)), ['a.txt', 'docs/b.txt'])
+        expected = dict(_FILES)
+        expected['local-only.txt'] = b'kept'
+        self.assertEqual(self._read_tree(self.destination), expected)
+
+    def test_download_directory_skips_unsafe_names(self):
+        self.service.blobs['../escape.txt'] = {
+            'content': b'x', 'etag': '"1"', 'last_modified': formatdate(usegmt=True), 'md5': None}
+        self.service.blobs['dir/'] = {
+            'content': b'', 'etag': '"1"', 'last_modified': formatdate(usegmt=True), 'md5': None}
+
+        report = self.container.download_directory(self.destination, dry_run=True)
+
+        self.assertEqual(report.changes, [])
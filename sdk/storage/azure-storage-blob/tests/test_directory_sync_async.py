@@ -0,0 +1,129 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+import pytest
+
+if sys.version_info < (3, 5):
+    pytest.skip("Async clients require Python 3.5+", allow_module_level=True)
+
+from azure.core.pipeline.transport import AsyncHttpTransport
+
+from azure.storage.blob.aio import ContainerClient
+
+from test_directory_sync import _FakeBlobService, _FakeResponse, _FILES, StorageDirectorySyncTest
+
+# ------------------------------------------------------------------------------
+
+
+class _FakeAsyncStream(object):
+
+    def __init__(self, response):
+        self.response = response
+        self._content = response.body()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._content is None:
+            raise StopAsyncIteration()
+        content, self._content = self._content, None
+        return content
+
+
+class _FakeAsyncResponse(_FakeResponse):
+
+    async def load_body(self):
+        pass
+
+    def stream_download(self, pipeline):
+        return _FakeAsyncStream(self)
+
+
+class _FakeAsyncBlobService(AsyncHttpTransport):
+
+    def __init__(self):
+        self.service = _FakeBlobService()
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send(self, request, **kwargs):
+        await asyncio.sleep(0)
+        response = self.service.send(request)
+        return _FakeAsyncResponse(request, response.status_code, response.headers, response.body())
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class StorageDirectorySyncAsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = _FakeAsyncBlobService()
+        self.service = self.transport.service
+        self.container = ContainerClient(
+            'https://account.blob.core.windows.net/container',
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=self.transport,
+            max_single_put_size=1024,
+            max_block_size=512,
+            max_single_get_size=1024,
+            max_chunk_get_size=512)
+        self.source = tempfile.mkdtemp()
+        self.destination = tempfile.mkdtemp()
+        past = time.time() - 3600
+        for name, content in _FILES.items():
+            StorageDirectorySyncTest._write(self.source, name, content, past)
+
+    def tearDown(self):
+        shutil.rmtree(self.source)
+        shutil.rmtree(self.destination)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_upload_directory(self):
+        report = _run(self.container.upload_directory(self.source, name_starts_with='backup', max_connections=3))
+
+        self.assertEqual(sorted(report.changes), sorted((name, 'new') for name in _FILES))
+        self.assertEqual(report.transferred_bytes, sum(len(c) for c in _FILES.values()))
+        self.assertEqual(
+            dict((name, props['content']) for name, props in self.service.blobs.items()),
+            dict(('backup/' + name, content) for name, content in _FILES.items()))
+
+        del self.service.writes[:]
+        StorageDirectorySyncTest._write(self.source, 'a.txt', b'resized')
+        report = _run(self.container.upload_directory(self.source, name_starts_with='backup'))
+        self.assertEqual(report.changes, [('a.txt', 'size')])
+        self.assertEqual(self.service.writes, ['backup/a.txt'])
+
+    def test_download_directory(self):
+        _run(self.container.upload_directory(self.source))
+
+        report = _run(self.container.download_directory(self.destination, max_connections=3))
+
+        self.assertEqual(sorted(report.changes), sorted((name, 'new') for name in _FILES))
+        self.assertEqual(StorageDirectorySyncTest._read_tree(self.destination), _FILES)
+
+        del self.service.gets[:]
+        report = _run(self.container.download_directory(self.destination))
+        self.assertEqual(report.changes, [])
+        self.assertEqual(self.service.gets, [])
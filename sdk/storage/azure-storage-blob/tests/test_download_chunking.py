@@ -0,0 +1,155 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import random
+import tempfile
+import threading
+import time
+
+from azure.storage.blob._blob_utils import StorageStreamDownloader
+from azure.storage.blob._shared.download_chunking import write_at
+
+from testcase import (
+    StorageTestCase,
+)
+
+# ------------------------------------------------------------------------------
+
+
+class _Config(object):
+    max_single_get_size = 2 * 1024
+    max_chunk_get_size = 1024
+
+
+class _BlobProperties(object):
+    def __init__(self, start, end, total):
+        self.content_range = 'bytes {}-{}/{}'.format(start, end, total)
+        self.size = end - start + 1
+        self.etag = '"etag"'
+
+
+class _Blob(object):
+    def __init__(self, data, start, end, total):
+        self.data = data
+        self.properties = _BlobProperties(start, end, total)
+
+    def __iter__(self):
+        return iter([self.data])
+
+
+class _RangedBlobService(object):
+    """Serves ranged downloads of a blob, with jitter so that parallel ranges complete out of order."""
+
+    def __init__(self, data, delay=0):
+        self.data = data
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.ranges = []
+
+    def download(self, range=None, **kwargs):  # pylint: disable=redefined-builtin
+        start, end = (int(i) for i in range[len('bytes='):].split('-'))
+        end = min(end, len(self.data) - 1)
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.ranges.append(start)
+        try:
+            if self.delay:
+                time.sleep(random.random() * self.delay)
+            return None, _Blob(self.data[start:end + 1], start, end, len(self.data))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class StorageBlobDownloadChunkingTest(StorageTestCase):
+
+    def _get_downloader(self, service):
+        return StorageStreamDownloader(
+            'blob', 'container', service, _Config(), None, None, False,
+            None, None, None, False, None, None)
+
+    def test_iter_chunks_in_order_in_parallel(self):
+        data = os.urandom(20 * 1024 + 100)
+        service = _RangedBlobService(data, delay=0.01)
+        downloader = self._get_downloader(service)
+
+        chunks = list(downloader.chunks(max_connections=4))
+
+        self.assertEqual(b''.join(chunks), data)
+        self.assertEqual([len(c) for c in chunks], [2 * 1024] + [1024] * 18 + [100])
+        self.assertGreater(service.max_in_flight, 1)
+        self.assertLessEqual(service.max_in_flight, 4)
+
+    def test_iter_chunks_reorder_buffer_is_bounded(self):
+        data = os.urandom(20 * 1024)
+        service = _RangedBlobService(data)
+        downloader = self._get_downloader(service)
+
+        chunks = downloader.chunks(max_connections=3)
+        first = [next(chunks), next(chunks)]
+        time.sleep(0.1)
+
+        # The initial request, the consumed chunk and at most three ranges ahead of the consumer
+        self.assertLessEqual(len(service.ranges), 1 + 1 + 3)
+        rest = list(chunks)
+        self.assertEqual(b''.join(first + rest), data)
+
+    def test_iter_is_sequential(self):
+        data = os.urandom(5 * 1024)
+        service = _RangedBlobService(data)
+        downloader = self._get_downloader(service)
+
+        self.assertEqual(b''.join(downloader), data)
+        self.assertEqual(service.ranges, [0, 2048, 3072, 4096])
+
+    def test_download_to_path_in_parallel(self):
+        data = os.urandom(20 * 1024 + 100)
+        service = _RangedBlobService(data, delay=0.01)
+        downloader = self._get_downloader(service)
+
+        with tempfile.NamedTemporaryFile(delete=False) as temp:
+            temp.write(b'previous content that is longer than the blob' * 1024)
+        try:
+            properties = downloader.download_to_path(temp.name, max_connections=4)
+            with open(temp.name, 'rb') as stream:
+                actual = stream.read()
+        finally:
+            os.remove(temp.name)
+
+        self.assertEqual(properties.size, len(data))
+        self.assertEqual(actual, data)
+        self.assertGreater(service.max_in_flight, 1)
+
+    def test_download_to_path_single_get(self):
+        data = os.urandom(1024)
+        downloader = self._get_downloader(_RangedBlobService(data))
+
+        with tempfile.NamedTemporaryFile(delete=False) as temp:
+            pass
+        try:
+            downloader.download_to_path(temp.name)
+            with open(temp.name, 'rb') as stream:
+                actual = stream.read()
+        finally:
+            os.remove(temp.name)
+        self.assertEqual(actual, data)
+
+    def test_write_at_does_not_move_file_position(self):
+        if not hasattr(os, 'pwrite'):
+            return
+        with tempfile.TemporaryFile() as stream:
+            stream.write(b'a' * 10)
+            stream.flush()
+            write_at(stream.fileno(), memoryview(b'bc'), 4)
+            self.assertEqual(stream.tell(), 10)
+            stream.seek(0)
+            self.assertEqual(stream.read(), b'aaaabcaaaa')
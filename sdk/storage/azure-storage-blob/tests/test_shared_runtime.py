@@ -0,0 +1,114 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import filecmp
+import os
+import unittest
+
+from azure.core.pipeline.transport import HttpRequest, RequestsTransport
+
+from azure.storage.blob import BlobServiceClient, BlobClient
+
+# ------------------------------------------------------------------------------
+_STORAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# The modules of the _shared package that are the same in every storage package. The models,
+# shared access signatures and client configuration of file have share specific additions.
+_SHARED_MODULES = {
+    'queue': [
+        '__init__.py',
+        'authentication.py',
+        'autotune.py',
+        'constants.py',
+        'download_chunking.py',
+        'encryption.py',
+        'models.py',
+        'policies.py',
+        'shared_access_signature.py',
+        'upload_chunking.py',
+        'utils.py',
+    ],
+    'file': [
+        '__init__.py',
+        'authentication.py',
+        'autotune.py',
+        'constants.py',
+        'download_chunking.py',
+        'encryption.py',
+        'policies.py',
+        'upload_chunking.py',
+    ],
+}
+
+
+def _shared_path(service):
+    return os.path.join(
+        _STORAGE_ROOT, 'azure-storage-{}'.format(service), 'azure', 'storage', service, '_shared')
+
+
+def _get_session(client):
+    transport = client._pipeline._transport  # pylint: disable=protected-access
+    return transport._get_session(HttpRequest('GET', client.url))  # pylint: disable=protected-access
+
+
+class StorageSharedRuntimeTest(unittest.TestCase):
+
+    def tearDown(self):
+        RequestsTransport.close_shared_sessions()
+
+    # --Test cases ---------------------------------------------------------------
+    def test_clients_share_session_per_host(self):
+        service = BlobServiceClient('https://account.blob.core.windows.net', credential='sv=2018-03-28&sig=c2ln')
+        blob = BlobClient(
+            'https://account.blob.core.windows.net/container/blob', credential='sv=2018-03-28&sig=c2ln')
+        other = BlobServiceClient('https://other.blob.core.windows.net', credential='sv=2018-03-28&sig=c2ln')
+
+        self.assertIsNot(service._pipeline._transport, blob._pipeline._transport)
+        self.assertIs(_get_session(service), _get_session(blob))
+        self.assertIs(_get_session(service), _get_session(service.get_container_client('container')))
+        self.assertIsNot(_get_session(service), _get_session(other))
+
+    def test_closing_client_keeps_shared_session(self):
+        service = BlobServiceClient('https://account.blob.core.windows.net', credential='sv=2018-03-28&sig=c2ln')
+        blob = BlobClient(
+            'https://account.blob.core.windows.net/container/blob', credential='sv=2018-03-28&sig=c2ln')
+        session = _get_session(blob)
+
+        with service:
+            pass
+
+        self.assertIs(_get_session(blob), session)
+
+    def test_client_opts_out_of_shared_session(self):
+        service = BlobServiceClient('https://account.blob.core.windows.net', credential='sv=2018-03-28&sig=c2ln')
+        own = BlobServiceClient(
+            'https://account.blob.core.windows.net', credential='sv=2018-03-28&sig=c2ln', shared_session=False)
+
+        with own:
+            self.assertIsNotNone(_get_session(own))
+            self.assertIsNot(_get_session(own), _get_session(service))
+
+    def test_clients_with_other_session_settings_do_not_share(self):
+        service = BlobServiceClient('https://account.blob.core.windows.net', credential='sv=2018-03-28&sig=c2ln')
+        large_pool = BlobServiceClient(
+            'https://account.blob.core.windows.net', credential='sv=2018-03-28&sig=c2ln', pool_maxsize=64)
+        no_env = BlobServiceClient(
+            'https://account.blob.core.windows.net', credential='sv=2018-03-28&sig=c2ln', use_env_settings=False)
+
+        self.assertIsNot(_get_session(large_pool), _get_session(service))
+        self.assertIsNot(_get_session(no_env), _get_session(service))
+        self.assertEqual(_get_session(large_pool).get_adapter('https://')._pool_maxsize, 64)
+        self.assertFalse(_get_session(no_env).trust_env)
+
+    def test_shared_modules_in_sync(self):
+        for service, modules in _SHARED_MODULES.items():
+            if not os.path.isdir(_shared_path(service)):
+                continue
+            _, mismatch, errors = filecmp.cmpfiles(
+                _shared_path('blob'), _shared_path(service), modules, shallow=False)
+            self.assertEqual(mismatch + errors, [], "_shared modules of azure-storage-{} differ "
+                             "from azure-storage-blob".format(service))
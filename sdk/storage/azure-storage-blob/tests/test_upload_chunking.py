@@ -9,8 +9,14 @@
 import pytest
 
 import os
-
-from azure.storage.blob._shared.upload_chunking import _SubStream
+import tempfile
+
+from azure.storage.blob._shared.upload_chunking import (
+    _SubStream,
+    BlockBlobChunkUploader,
+    upload_blob_substream_blocks,
+    memory_mapped_file)
+from azure.storage.blob._shared.policies import StorageContentValidation
 from threading import Lock
 from io import (BytesIO, SEEK_SET)
 
@@ -112,3 +118,55 @@ class StorageBlobUploadChunkingTest(StorageTestCase):
         finally:
             wrapped_stream.close()
             substream.close()
+
+    # this is a white box test that's designed to make sure the blocks of a memoryview
+    # are slices of the original buffer, and that no lock is shared by the uploads
+    def test_memoryview_blocks_are_zero_copy(self):
+        data = os.urandom(10 * 1024)
+        view = memoryview(data)
+        uploader = BlockBlobChunkUploader(
+            None, len(data), 4 * 1024, view, True, False, None, None, None, None, None)
+        self.assertIsNone(uploader.stream_lock)
+
+        blocks = list(uploader.get_substream_blocks())
+        self.assertEqual([len(b) for _, b in blocks], [4 * 1024, 4 * 1024, 2 * 1024])
+        for _, block in blocks:
+            self.assertIsInstance(block, memoryview)
+            self.assertIs(block.obj, data)
+        self.assertEqual(b''.join(b.tobytes() for _, b in blocks), data)
+
+    def test_memoryview_content_md5(self):
+        data = os.urandom(1024)
+        self.assertEqual(
+            StorageContentValidation.get_content_md5(memoryview(data)[100:200]),
+            StorageContentValidation.get_content_md5(data[100:200]))
+
+    def test_upload_memory_mapped_file_in_parallel(self):
+        data = os.urandom(64 * 1024 + 123)
+        staged = {}
+
+        class _BlockService(object):
+            def stage_block(self, block_id, length, body, **kwargs):
+                assert isinstance(body, memoryview)
+                assert len(body) == length
+                staged[block_id] = body.tobytes()
+
+        with tempfile.NamedTemporaryFile(delete=False) as temp:
+            temp.write(data)
+        try:
+            with open(temp.name, 'rb') as stream:
+                with memory_mapped_file(stream) as view:
+                    block_ids = upload_blob_substream_blocks(
+                        blob_service=_BlockService(),
+                        blob_size=len(data),
+                        block_size=4 * 1024,
+                        stream=view,
+                        max_connections=4,
+                        validate_content=False,
+                        access_conditions=None,
+                        uploader_class=BlockBlobChunkUploader)
+        finally:
+            os.remove(temp.name)
+
+        self.assertEqual(len(block_ids), 17)
+        self.assertEqual(b''.join(staged[i] for i in block_ids), data)
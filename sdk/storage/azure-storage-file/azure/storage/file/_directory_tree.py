@@ -0,0 +1,207 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import os
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING # pylint: disable=unused-import
+
+from azure.core.exceptions import ResourceExistsError
+
+if TYPE_CHECKING:
+    from .directory_client import DirectoryClient  # pylint: disable=unused-import
+
+
+def _join(*paths):
+    return '/'.join(p.strip('/') for p in paths if p)
+
+
+def makedirs(path):
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+
+
+class _BoundedPool(object):
+    """A thread pool which blocks the submitter while max_in_flight tasks are pending,
+    and keeps the first error raised by a task.
+    """
+
+    def __init__(self, max_connections, max_in_flight=None):
+        import concurrent.futures
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_connections)
+        self._slots = threading.BoundedSemaphore(max_in_flight or 2 * max_connections)
+        self._error = None  # type: Optional[BaseException]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._executor.shutdown(wait=True)
+
+    def _done(self, future):
+        self._slots.release()
+        error = future.exception()
+        if error is not None and self._error is None:
+            self._error = error
+
+    def check(self):
+        if self._error is not None:
+            raise self._error  # pylint: disable=raising-bad-type
+
+    def submit(self, function, *args):
+        self.check()
+        self._slots.acquire()
+        future = self._executor.submit(function, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def join(self):
+        self._executor.shutdown(wait=True)
+        self.check()
+
+
+class DirectoryTree(object):
+    """Recursive operations on a directory of a share, with a pool of max_connections workers.
+
+    The subdirectories are listed concurrently, one page of results per request, and the
+    results are handed on as they are listed: only the pages being listed and the paths of
+    the directories not yet listed are held in memory.
+
+    :param directory: The client of the directory at the root of the tree.
+    :param int max_connections: The size of the worker pool.
+    """
+
+    def __init__(self, directory, max_connections=4, **kwargs):
+        # type: (DirectoryClient, int, Any) -> None
+        self.directory = directory
+        self.max_connections = max(1, max_connections)
+        self.request_options = kwargs
+
+    def get_directory_client(self, path):
+        # type: (str) -> DirectoryClient
+        return self.directory.get_subdirectory_client(path) if path else self.directory
+
+    def _list_page(self, path, marker):
+        listing = self.get_directory_client(path).list_directories_and_files(marker=marker, **self.request_options)
+        page = next(listing.by_page(), [])
+        return page, listing.next_marker
+
+    def walk(self):
+        # type: () -> Iterator[Dict[str, Any]]
+        import concurrent.futures
+        pending = deque([('', None)])
+        running = {}  # type: Dict[Any, str]
+        executor = concurrent.futures.ThreadPoolExecutor(self.max_connections)
+        try:
+            while pending or running:
+                while pending and len(running) < self.max_connections:
+                    path, marker = pending.popleft()
+                    running[executor.submit(self._list_page, path, marker)] = path
+                done, _ = concurrent.futures.wait(list(running), return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    path = running.pop(future)
+                    page, next_marker = future.result()
+                    if next_marker:
+                        # The rest of a directory is listed before its subdirectories
+                        pending.appendleft((path, next_marker))
+                    for item in page:
+                        item['path'] = _join(path, item['name'])
+                        if item['is_directory']:
+                            pending.append((item['path'], None))
+                        yield item
+        finally:
+            executor.shutdown(wait=False)
+
+    def delete(self):
+        # type: () -> None
+        directories = []  # type: List[str]
+        with _BoundedPool(self.max_connections) as pool:
+            for item in self.walk():
+                if item['is_directory']:
+                    directories.append(item['path'])
+                else:
+                    pool.submit(self._delete_file, item['path'])
+            pool.join()
+
+        # The directories are deleted once empty, the deepest first
+        depths = {}  # type: Dict[int, List[str]]
+        for path in directories:
+            depths.setdefault(path.count('/'), []).append(path)
+        for depth in sorted(depths, reverse=True):
+            with _BoundedPool(self.max_connections) as pool:
+                for path in depths[depth]:
+                    pool.submit(self._delete_directory, path)
+                pool.join()
+        if self.directory.directory_path:
+            self.directory.delete_directory(**self.request_options)
+
+    def _delete_file(self, path):
+        self.directory.get_file_client(path).delete_file(**self.request_options)
+
+    def _delete_directory(self, path):
+        self.get_directory_client(path).delete_directory(**self.request_options)
+
+    def _create_directory(self, path, parent):
+        if parent is not None:
+            parent.result()
+        try:
+            self.get_directory_client(path).create_directory(**self.request_options)
+        except ResourceExistsError:
+            pass
+
+    def _upload_file(self, path, local_path, parent):
+        if parent is not None:
+            parent.result()
+        with open(local_path, 'rb') as data:
+            self.directory.get_file_client(path).upload_file(
+                data, length=os.path.getsize(local_path), **self.request_options)
+
+    def upload(self, local_path):
+        # type: (str) -> int
+        local_path = os.path.abspath(local_path)
+        if not os.path.isdir(local_path):
+            raise ValueError("{} is not a directory.".format(local_path))
+        # The creation of a directory is waited for by the tasks of its files and
+        # subdirectories. Tasks start in submission order, after their parent's.
+        created = {}  # type: Dict[str, Any]
+        uploaded = 0
+        with _BoundedPool(self.max_connections) as pool:
+            created[''] = pool.submit(self._create_directory, '', None)
+            for root, directories, files in os.walk(local_path):
+                path = '' if root == local_path else os.path.relpath(root, local_path).replace(os.sep, '/')
+                parent = created.pop(path)
+                for name in directories:
+                    child = _join(path, name)
+                    created[child] = pool.submit(self._create_directory, child, parent)
+                for name in files:
+                    pool.submit(self._upload_file, _join(path, name), os.path.join(root, name), parent)
+                    uploaded += 1
+            pool.join()
+        return uploaded
+
+    def _download_file(self, path, local_path):
+        with open(local_path, 'wb') as stream:
+            downloader = self.directory.get_file_client(path).download_file(**self.request_options)
+            downloader.download_to_stream(stream)
+
+    def download(self, local_path):
+        # type: (str) -> int
+        local_path = os.path.abspath(local_path)
+        makedirs(local_path)
+        downloaded = 0
+        with _BoundedPool(self.max_connections) as pool:
+            for item in self.walk():
+                target = os.path.join(local_path, *item['path'].split('/'))
+                if item['is_directory']:
+                    makedirs(target)
+                else:
+                    pool.submit(self._download_file, item['path'], target)
+                    downloaded += 1
+            pool.join()
+        return downloaded
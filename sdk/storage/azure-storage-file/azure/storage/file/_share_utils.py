@@ -16,7 +16,8 @@ from ._shared.download_chunking import (
     process_range_and_offset,
     process_content,
     ParallelFileChunkDownloader,
-    SequentialFileChunkDownloader)
+    SequentialFileChunkDownloader,
+    SparseFileChunkDownloader)
 
 
 def deserialize_metadata(response, obj, headers):  # pylint: disable=unused-argument
@@ -72,6 +73,7 @@ def upload_file_helper(
         timeout,
         max_connections,
         file_settings,
+        sparse=False,
         **kwargs):
     try:
         if size is None or size < 0:
@@ -94,6 +96,7 @@ def upload_file_helper(
             max_connections=max_connections,
             validate_content=validate_content,
             timeout=timeout,
+            sparse=sparse,
             **kwargs)
     except StorageErrorException as error:
         process_storage_error(error)
@@ -104,12 +107,17 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
 
     The stream downloader can iterated, or download to open file or stream
     over multiple threads.
+
+    A sparse download reads the valid ranges of the file instead of its content
+    in the initial request, and downloads only those ranges.
     """
 
     def __init__(
             self, share, file_name, file_path, service, config, offset,
-            length, validate_content, timeout, **kwargs):
+            length, validate_content, timeout, sparse=False, **kwargs):
         self.service = service
+        self.sparse = sparse
+        self.ranges = None
 
         self.config = config
         self.offset = offset
@@ -139,8 +147,12 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
 
         self.download_size = None
         self.file_size = None
-        self.file = self._initial_request()
-        self.properties = self.file.properties
+        if self.sparse:
+            self.file = None
+            self.properties = self._initial_sparse_request()
+        else:
+            self.file = self._initial_request()
+            self.properties = self.file.properties
         self.properties.name = file_name
         self.properties.share = share
         self.properties.path = file_path
@@ -161,6 +173,10 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         return self.download_size
 
     def __iter__(self):
+        if self.sparse:
+            for chunk in self._get_sparse_downloader(None).yield_chunks():
+                yield chunk
+            return
         if self.download_size == 0:
             content = b""
         else:
@@ -197,6 +213,47 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         for chunk in downloader.get_chunk_offsets():
             yield downloader.yield_chunk(chunk)
 
+    def _get_sparse_downloader(self, stream):
+        end_file = self.file_size
+        if self.length is not None:
+            # Use the length unless it is over the end of the file
+            end_file = min(self.file_size, self.length + 1)
+        return SparseFileChunkDownloader(
+            self.ranges,
+            file_service=self.service,
+            download_size=self.download_size,
+            chunk_size=self.config.max_chunk_get_size,
+            progress=0,
+            start_range=self.offset or 0,
+            end_range=end_file,
+            stream=stream,
+            validate_content=self.validate_content,
+            timeout=self.timeout,
+            cls=deserialize_file_stream,
+            **self.request_options)
+
+    def _initial_sparse_request(self):
+        try:
+            properties = self.service.get_properties(
+                timeout=self.timeout,
+                cls=deserialize_file_properties,
+                **self.request_options)
+            self.file_size = properties.size
+            start = self.offset or 0
+            end = self.file_size - 1 if self.length is None else min(self.length, self.file_size - 1)
+            self.ranges = []
+            if start <= end:
+                ranges = self.service.get_range_list(
+                    timeout=self.timeout,
+                    range='bytes={0}-{1}'.format(start, end),
+                    **self.request_options)
+                self.ranges = [{'start': r.start, 'end': r.end} for r in ranges]
+        except StorageErrorException as error:
+            process_storage_error(error)
+        self.download_size = max(0, end - start + 1)
+        self._download_complete = not self.ranges
+        return properties
+
     def _initial_request(self):
         range_header, range_validation = validate_and_format_range_headers(
             self.initial_range[0],
@@ -295,8 +352,8 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
         :returns: The properties of the downloaded file.
         :rtype: ~azure.storage.file.models.FileProperties
         """
-        # the stream must be seekable if parallel download is required
-        if max_connections > 1:
+        # the stream must be seekable if parallel or sparse download is required
+        if max_connections > 1 or self.sparse:
             error_message = "Target stream handle must be seekable."
             if sys.version_info >= (3,) and not stream.seekable():
                 raise ValueError(error_message)
@@ -306,6 +363,18 @@ class StorageStreamDownloader(object):  # pylint: disable=too-many-instance-attr
             except (NotImplementedError, AttributeError):
                 raise ValueError(error_message)
 
+        if self.sparse:
+            downloader = self._get_sparse_downloader(stream)
+            if max_connections > 1:
+                import concurrent.futures
+                executor = concurrent.futures.ThreadPoolExecutor(max_connections)
+                list(executor.map(downloader.process_chunk, downloader.get_chunk_offsets()))
+            else:
+                for chunk in downloader.get_chunk_offsets():
+                    downloader.process_chunk(chunk)
+            downloader.finish()
+            return self.properties
+
         if self.download_size == 0:
             content = b""
         else:
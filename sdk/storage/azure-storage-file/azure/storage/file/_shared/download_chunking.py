@@ -3,13 +3,19 @@
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
+import os
 import threading
+import time
+from collections import deque
+from io import SEEK_END
+from itertools import chain, islice
 
 from azure.core.exceptions import HttpResponseError
 
 from .models import ModifiedAccessConditions
 from .utils import validate_and_format_range_headers, process_storage_error
 from .encryption import _decrypt_blob
+from .autotune import tuned_map
 
 
 def process_range_and_offset(start_range, end_range, length, key_encryption_key, key_resolver_function):
@@ -54,6 +60,20 @@ def process_content(blob, start_offset, end_offset, require_encryption, key_encr
         return b"".join(list(blob))
 
 
+def process_encrypted_regions(blob, encrypted_regions, start_offset, length, encrypted_length=None):
+    # The content is made of whole regions of a blob encrypted with version 2.0, from which only
+    # the requested range is returned. Only the first encrypted_length bytes hold whole regions.
+    content = b"".join(list(blob))
+    try:
+        content = encrypted_regions.decrypt(content[:encrypted_length])
+    except Exception as error:
+        raise HttpResponseError(
+            message="Decryption failed.",
+            response=blob.response,
+            error=error)
+    return content[start_offset:start_offset + length]
+
+
 class _BlobChunkDownloader(object):  # pylint: disable=too-many-instance-attributes
 
     def __init__(
@@ -85,7 +105,9 @@ class _BlobChunkDownloader(object):  # pylint: disable=too-many-instance-attribu
         self.validate_content = validate_content
         self.access_conditions = access_conditions
         self.mod_conditions = mod_conditions
+        self.encrypted_regions = kwargs.pop('encrypted_regions', None)
         self.request_options = kwargs
+        self.tuner = None
 
     def _calculate_range(self, chunk_start):
         if chunk_start + self.chunk_size > self.blob_end:
@@ -100,16 +122,27 @@ class _BlobChunkDownloader(object):  # pylint: disable=too-many-instance-attribu
             yield index
             index += self.chunk_size
 
-    def process_chunk(self, chunk_start):
-        chunk_start, chunk_end = self._calculate_range(chunk_start)
+    def get_chunk_ranges(self):
+        # An autotuned download picks up the chunk size the tuner has chosen for every new chunk
+        index = self.start_index
+        while index < self.blob_end:
+            chunk_size = self.tuner.chunk_size if self.tuner else self.chunk_size
+            chunk_end = min(index + chunk_size, self.blob_end)
+            yield index, chunk_end
+            index = chunk_end
+
+    def process_chunk(self, chunk_start, chunk_end=None):
+        if chunk_end is None:
+            chunk_start, chunk_end = self._calculate_range(chunk_start)
         chunk_data = self._download_chunk(chunk_start, chunk_end)
         length = chunk_end - chunk_start
         if length > 0:
             self._write_to_stream(chunk_data, chunk_start)
             self._update_progress(length)
 
-    def yield_chunk(self, chunk_start):
-        chunk_start, chunk_end = self._calculate_range(chunk_start)
+    def yield_chunk(self, chunk_start, chunk_end=None):
+        if chunk_end is None:
+            chunk_start, chunk_end = self._calculate_range(chunk_start)
         return self._download_chunk(chunk_start, chunk_end)
 
     # should be provided by the subclass
@@ -121,17 +154,23 @@ class _BlobChunkDownloader(object):  # pylint: disable=too-many-instance-attribu
         pass
 
     def _download_chunk(self, chunk_start, chunk_end):
-        download_range, offset = process_range_and_offset(
-            chunk_start,
-            chunk_end,
-            chunk_end,
-            self.key_encryption_key,
-            self.key_resolver_function,
-        )
-        range_header, range_validation = validate_and_format_range_headers(
-            download_range[0],
-            download_range[1] - 1,
-            check_content_md5=self.validate_content)
+        if self.encrypted_regions is not None:
+            # Only the regions holding the chunk are downloaded. Every region is
+            # authenticated as it is decrypted, instead of with a transactional MD5.
+            region_start, region_end, start_offset = self.encrypted_regions.get_range(chunk_start, chunk_end - 1)
+            range_header, range_validation = validate_and_format_range_headers(region_start, region_end)
+        else:
+            download_range, offset = process_range_and_offset(
+                chunk_start,
+                chunk_end,
+                chunk_end,
+                self.key_encryption_key,
+                self.key_resolver_function,
+            )
+            range_header, range_validation = validate_and_format_range_headers(
+                download_range[0],
+                download_range[1] - 1,
+                check_content_md5=self.validate_content)
 
         try:
             _, response = self.blob_service.download(
@@ -147,13 +186,17 @@ class _BlobChunkDownloader(object):  # pylint: disable=too-many-instance-attribu
         except HttpResponseError as error:
             process_storage_error(error)
 
-        chunk_data = process_content(
-            response,
-            offset[0],
-            offset[1],
-            self.require_encryption,
-            self.key_encryption_key,
-            self.key_resolver_function)
+        if self.encrypted_regions is not None:
+            chunk_data = process_encrypted_regions(
+                response, self.encrypted_regions, start_offset, chunk_end - chunk_start)
+        else:
+            chunk_data = process_content(
+                response,
+                offset[0],
+                offset[1],
+                self.require_encryption,
+                self.key_encryption_key,
+                self.key_resolver_function)
 
         # This makes sure that if_match is set so that we can validate
         # that subsequent downloads are to an unmodified blob
@@ -203,6 +246,39 @@ class SequentialBlobChunkDownloader(_BlobChunkDownloader):
         self.stream.write(chunk_data)
 
 
+class PositionalBlobChunkDownloader(_BlobChunkDownloader):
+    """Writes each chunk at its own offset of an open file descriptor with os.pwrite.
+
+    The writes of parallel chunks do not share a file position, so they need no lock.
+    """
+    def __init__(
+            self, blob_service, download_size, chunk_size, progress, start_range, end_range,
+            stream, validate_content, access_conditions, mod_conditions, timeout,
+            require_encryption, key_encryption_key, key_resolver_function, **kwargs):
+        self.file_offset = kwargs.pop('file_offset', 0)
+        super(PositionalBlobChunkDownloader, self).__init__(
+            blob_service, download_size, chunk_size, progress, start_range, end_range,
+            stream, validate_content, access_conditions, mod_conditions, timeout,
+            require_encryption, key_encryption_key, key_resolver_function, **kwargs)
+        self.progress_lock = threading.Lock()
+
+    def _update_progress(self, length):
+        with self.progress_lock:
+            self.progress_total += length
+
+    def _write_to_stream(self, chunk_data, chunk_start):
+        write_at(self.stream, chunk_data, self.file_offset + (chunk_start - self.start_index))
+
+
+def write_at(fileno, data, position):
+    """Write all of data at the position of the file, without moving the file position."""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fileno, view, position)
+        view = view[written:]
+        position += written
+
+
 class _FileChunkDownloader(object):
     def __init__(self, file_service, download_size, chunk_size, progress,
                  start_range, end_range, stream, validate_content, timeout, **kwargs):
@@ -322,3 +398,124 @@ class SequentialFileChunkDownloader(_FileChunkDownloader):
     def _write_to_stream(self, chunk_data, chunk_start):
         # chunk_start is ignored in the case of sequential download since we cannot seek the destination stream
         self.stream.write(chunk_data)
+
+
+class SparseFileChunkDownloader(_FileChunkDownloader):
+    """Downloads only the valid ranges of a file, in chunks of at most chunk_size.
+
+    The chunks are written at their offsets in the stream, and the invalid ranges in
+    between are left as holes: the stream must be seekable, and must not already hold
+    data past its position. When iterated, the holes are yielded as zeros.
+    """
+
+    def __init__(self, ranges, *args, **kwargs):
+        super(SparseFileChunkDownloader, self).__init__(*args, **kwargs)
+        self.ranges = []
+        for valid_range in ranges:
+            start = max(valid_range['start'], self.start_index)
+            end = min(valid_range['end'] + 1, self.file_end)
+            if start < end:
+                self.ranges.append((start, end))
+        self.stream_start = self.stream.tell() if self.stream is not None else None
+        self.stream_lock = threading.Lock()
+        self.progress_lock = threading.Lock()
+
+    def get_chunk_offsets(self):
+        for start, end in self.ranges:
+            index = start
+            while index < end:
+                yield index, min(index + self.chunk_size, end)
+                index += self.chunk_size
+
+    def process_chunk(self, chunk):
+        chunk_start, chunk_end = chunk
+        chunk_data = self._download_chunk(chunk_start, chunk_end)
+        self._write_to_stream(chunk_data, chunk_start)
+        self._update_progress(chunk_end - chunk_start)
+
+    def yield_chunks(self):
+        index = self.start_index
+        for chunk_start, chunk_end in chain(self.get_chunk_offsets(), [(self.file_end, self.file_end)]):
+            while index < chunk_start:
+                size = min(self.chunk_size, chunk_start - index)
+                yield b'\x00' * size
+                index += size
+            if chunk_start < chunk_end:
+                yield self._download_chunk(chunk_start, chunk_end)
+                index = chunk_end
+
+    def finish(self):
+        # Extend the stream over a hole at the end of the range downloaded
+        end = self.stream_start + (self.file_end - self.start_index)
+        self.stream.seek(0, SEEK_END)
+        if self.stream.tell() < end:
+            self.stream.seek(end - 1)
+            self.stream.write(b'\x00')
+        self.stream.seek(end)
+
+    def _update_progress(self, length):
+        with self.progress_lock:
+            self.progress_total += length
+
+    def _write_to_stream(self, chunk_data, chunk_start):
+        with self.stream_lock:
+            self.stream.seek(self.stream_start + (chunk_start - self.start_index))
+            self.stream.write(chunk_data)
+
+
+def download_chunks(downloader, max_connections, tuner=None):
+    """Downloads the chunks of the downloader, with at most max_connections requests in flight.
+
+    With a tuner, the tuner picks the chunk size and the number of requests in flight.
+    """
+    if tuner:
+        downloader.tuner = tuner
+        tuned_map(tuner, lambda r: downloader.process_chunk(*r), downloader.get_chunk_ranges(), lambda r: r[1] - r[0])
+    elif max_connections > 1:
+        import concurrent.futures
+        executor = concurrent.futures.ThreadPoolExecutor(max_connections)
+        list(executor.map(downloader.process_chunk, downloader.get_chunk_offsets()))
+    else:
+        for chunk in downloader.get_chunk_offsets():
+            downloader.process_chunk(chunk)
+
+
+def download_chunks_in_order(downloader, max_connections, tuner=None):
+    """Yields the chunks of the downloader in order, keeping up to max_connections range
+    requests in flight.
+
+    Chunks that complete early wait in a reorder buffer, which holds at most
+    max_connections chunks, so memory use is bounded however slowly the
+    chunks are consumed. With a tuner, the tuner picks the chunk size and the
+    number of requests in flight, up to max_connections.
+    """
+    import concurrent.futures
+
+    def _download(chunk_range):
+        started = time.time()
+        chunk = downloader.yield_chunk(*chunk_range)
+        if tuner:
+            tuner.record(chunk_range[1] - chunk_range[0], started)
+        return chunk
+
+    downloader.tuner = tuner
+    ranges = downloader.get_chunk_ranges()
+    executor = concurrent.futures.ThreadPoolExecutor(max_connections)
+    pending = deque()
+
+    def _fill_window():
+        window = tuner.connections if tuner else max_connections
+        for chunk_range in islice(ranges, max(0, window - len(pending))):
+            pending.append(executor.submit(_download, chunk_range))
+
+    try:
+        _fill_window()
+        while pending:
+            chunk = pending.popleft().result()
+            # Refill the window before handing the chunk over, so downloads continue while it is consumed
+            _fill_window()
+            yield chunk
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -6,7 +6,7 @@
 
 import functools
 from typing import ( # pylint: disable=unused-import
-    Optional, Union, Any, Dict, TYPE_CHECKING
+    Optional, Union, Any, Dict, Iterator, TYPE_CHECKING
 )
 try:
     from urllib.parse import urlparse, quote, unquote
@@ -32,6 +32,7 @@ from ._shared.utils import (
     parse_connection_str)
 
 from ._share_utils import deserialize_directory_properties
+from ._directory_tree import DirectoryTree
 from .polling import CloseHandles
 
 if TYPE_CHECKING:
@@ -206,7 +207,9 @@ class DirectoryClient(StorageAccountHostsMixin):
                 :dedent: 12
                 :caption: Gets the subdirectory client.
         """
-        directory_path = self.directory_path.rstrip('/') + "/" + directory_name
+        directory_path = directory_name
+        if self.directory_path:
+            directory_path = self.directory_path.rstrip('/') + "/" + directory_name
         return DirectoryClient(
             self.url, directory_path=directory_path, snapshot=self.snapshot, credential=self.credential,
             _hosts=self._hosts, _configuration=self._config, _pipeline=self._pipeline,
@@ -302,6 +305,77 @@ class DirectoryClient(StorageAccountHostsMixin):
         return DirectoryPropertiesPaged(
             command, prefix=name_starts_with, results_per_page=results_per_page, marker=marker)
 
+    def walk_directory(self, max_connections=4, timeout=None, **kwargs):
+        # type: (int, Optional[int], **Any) -> Iterator[Dict[str, Any]]
+        """Lists the directories and files of the whole tree under the directory.
+
+        The subdirectories are listed concurrently, and the results are returned as they
+        are listed rather than once the whole tree is known. A directory is returned before
+        its contents, which are in no particular order.
+
+        :param int max_connections:
+            The maximum number of directories listed at the same time.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: An iterator of dicts with the keys 'name' (str), 'path' (str), the path
+            relative to this directory, and 'is_directory' (bool). Items that are files also
+            have a 'size' (int) key.
+        :rtype: iterator(dict(str, Any))
+        """
+        return DirectoryTree(self, max_connections=max_connections, timeout=timeout, **kwargs).walk()
+
+    def delete_directory_tree(self, max_connections=4, timeout=None, **kwargs):
+        # type: (int, Optional[int], **Any) -> None
+        """Deletes the directory along with all of its files and subdirectories.
+
+        The files are deleted concurrently as the tree is listed. The emptied
+        subdirectories are then deleted, the deepest first. The root directory
+        of a share is emptied, but not deleted.
+
+        :param int max_connections:
+            The maximum number of requests sent at the same time.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :rtype: None
+        """
+        DirectoryTree(self, max_connections=max_connections, timeout=timeout, **kwargs).delete()
+
+    def upload_directory(self, local_path, max_connections=4, timeout=None, **kwargs):
+        # type: (str, int, Optional[int], **Any) -> int
+        """Uploads a local directory tree into the directory.
+
+        The directory and its subdirectories are created where missing, and the files are
+        uploaded concurrently, overwriting the existing files of the same paths.
+
+        :param str local_path:
+            The local directory to upload.
+        :param int max_connections:
+            The maximum number of requests sent at the same time.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: The number of files uploaded.
+        :rtype: int
+        """
+        return DirectoryTree(self, max_connections=max_connections, timeout=timeout, **kwargs).upload(local_path)
+
+    def download_directory(self, local_path, max_connections=4, timeout=None, **kwargs):
+        # type: (str, int, Optional[int], **Any) -> int
+        """Downloads the directory tree into a local directory.
+
+        The files are downloaded concurrently as the tree is listed, overwriting the
+        existing local files of the same paths.
+
+        :param str local_path:
+            The local directory to download to. It is created if missing.
+        :param int max_connections:
+            The maximum number of requests sent at the same time.
+        :param int timeout:
+            The timeout parameter is expressed in seconds.
+        :returns: The number of files downloaded.
+        :rtype: int
+        """
+        return DirectoryTree(self, max_connections=max_connections, timeout=timeout, **kwargs).download(local_path)
+
     def list_handles(self, marker=None, recursive=False, timeout=None, **kwargs):
         """Lists opened handles on a directory or a file under the directory.
 
@@ -346,6 +346,7 @@ class FileClient(StorageAccountHostsMixin):
             max_connections=1,  # type: Optional[int]
             timeout=None, # type: Optional[int]
             encoding='UTF-8',  # type: str
+            sparse=False,  # type: bool
             **kwargs # type: Any
         ):
         # type: (...) -> Dict[str, Any]
@@ -373,6 +374,9 @@ class FileClient(StorageAccountHostsMixin):
             The timeout parameter is expressed in seconds.
         :param str encoding:
             Defaults to UTF-8.
+        :param bool sparse:
+            If true, the ranges of the data which are all zeros are not uploaded. They are
+            left as unallocated ranges of the new file, which read as zeros.
         :returns: File-updated property dict (Etag and last modified).
         :rtype: dict(str, Any)
 
@@ -412,6 +416,7 @@ class FileClient(StorageAccountHostsMixin):
             timeout,
             max_connections,
             self._config.data_settings,
+            sparse=sparse,
             **kwargs)
 
     def copy_file_from_url(
@@ -467,6 +472,7 @@ class FileClient(StorageAccountHostsMixin):
             length=None,  # type: Optional[int]
             validate_content=False,  # type: bool
             timeout=None,  # type: Optional[int]
+            sparse=False,  # type: bool
             **kwargs
         ):
         # type: (...) -> Iterable[bytes]
@@ -489,6 +495,11 @@ class FileClient(StorageAccountHostsMixin):
             entire blocks, and doing so defeats the purpose of the memory-efficient algorithm.
         :param int timeout:
             The timeout parameter is expressed in seconds.
+        :param bool sparse:
+            If true, only the valid ranges of the file, as returned by :func:`get_ranges`,
+            are downloaded. The unallocated ranges are yielded as zeros, or left as holes
+            when downloading to a stream, which must then be seekable and hold no data past
+            its position.
         :returns: A iterable data generator (stream)
 
         Example:
@@ -514,6 +525,7 @@ class FileClient(StorageAccountHostsMixin):
             length=length,
             validate_content=validate_content,
             timeout=timeout,
+            sparse=sparse,
             **kwargs)
 
     def delete_file(self, timeout=None, **kwargs):
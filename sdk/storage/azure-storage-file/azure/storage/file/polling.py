@@ -79,16 +79,32 @@ class CopyFile(PollingMethod):
         self.polling_interval = interval
         self.kwargs = kwargs
         self.file = None
+        self._response = None
+
+    def _deserialize_properties(self, response, obj, headers):
+        self._response = response
+        return deserialize_file_properties(response, obj, headers)
 
     def _update_status(self):
         try:
             self.file = self._client._client.file.get_properties(  # pylint: disable=protected-access
-                cls=deserialize_file_properties, **self.kwargs)
+                cls=self._deserialize_properties, **self.kwargs)
         except StorageErrorException as error:
             process_storage_error(error)
         self._status = self.file.copy.status
         self.etag = self.file.etag
         self.last_modified = self.file.last_modified
+        return self._response
+
+    def update_status(self):
+        # type: () -> Any
+        """Poll the status of the copy operation once.
+
+        This lets a :class:`~azure.core.polling.LROPollerManager` poll the operation step by step.
+
+        :returns: The response of the status request.
+        """
+        return self._update_status()
 
     def initialize(self, client, initial_status, _):  # pylint: disable=arguments-differ
         # type: (Any, Any, Callable) -> None
@@ -133,20 +149,36 @@ class CopyFile(PollingMethod):
 
 class CopyFilePolling(CopyFile):
 
+    def _check_status(self):
+        if str(self.status()).lower() == 'aborted':
+            raise ValueError("Copy operation aborted.")
+        if str(self.status()).lower() == 'failed':
+            raise ValueError("Copy operation failed: {}".format(self.file.copy.status_description))
+
     def run(self):
         # type: () -> None
         try:
             while not self.finished():
                 self._update_status()
                 time.sleep(self.polling_interval)
-            if str(self.status()).lower() == 'aborted':
-                raise ValueError("Copy operation aborted.")
-            if str(self.status()).lower() == 'failed':
-                raise ValueError("Copy operation failed: {}".format(self.file.copy.status_description))
+            self._check_status()
         except Exception as e:
             logger.warning(str(e))
             raise
 
+    def update_status(self):
+        # type: () -> Any
+        """Poll the status of the copy operation once.
+
+        This lets a :class:`~azure.core.polling.LROPollerManager` poll the operation step by step.
+
+        :returns: The response of the status request.
+        :raises: ValueError if the copy operation was aborted or failed.
+        """
+        response = self._update_status()
+        self._check_status()
+        return response
+
     def status(self):
         # type: () -> str
         """Return the current status as a string.
@@ -181,6 +213,14 @@ class CloseHandles(PollingMethod):
         self._status = status.get('marker')
         self.handles_closed += status['number_of_handles_closed']
 
+    def update_status(self):
+        # type: () -> None
+        """Close the next batch of handles.
+
+        This lets a :class:`~azure.core.polling.LROPollerManager` run the operation step by step.
+        """
+        self._update_status()
+
     def initialize(self, command, initial_status, _):  # pylint: disable=arguments-differ
         # type: (Any, Any, Callable) -> None
         self._command = command
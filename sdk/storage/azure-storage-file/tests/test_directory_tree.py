@@ -0,0 +1,337 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+import xml.etree.ElementTree as ET
+
+from requests.structures import CaseInsensitiveDict
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline.transport import HttpTransport, HttpResponse
+
+try:
+    from urllib.parse import urlparse, parse_qs, unquote
+except ImportError:
+    from urlparse import urlparse, parse_qs # type: ignore
+    from urllib2 import unquote # type: ignore
+
+from azure.storage.file import DirectoryClient
+
+# ------------------------------------------------------------------------------
+_LAST_MODIFIED = 'Fri, 31 May 2019 12:00:00 GMT'
+
+
+class _FakeStream(object):
+    """Iterator over a response body, mirroring the requests download generator."""
+
+    def __init__(self, response):
+        self._content = response.body()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._content is None:
+            raise StopIteration()
+        content, self._content = self._content, None
+        return content
+
+    next = __next__
+
+
+class _FakeResponse(HttpResponse):
+
+    def __init__(self, request, status_code, headers=None, body=b''):
+        super(_FakeResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.headers.setdefault('x-ms-request-id', str(uuid.uuid4()))
+        self.headers.setdefault('ETag', '"0x1"')
+        self.headers.setdefault('Last-Modified', _LAST_MODIFIED)
+        self.content_type = self.headers['Content-Type'].split(';') if 'Content-Type' in self.headers else None
+        self._body = body
+
+    def body(self):
+        return self._body
+
+    def stream_download(self, pipeline):
+        return _FakeStream(self)
+
+
+class _FakeFileService(HttpTransport):
+    """A minimal in-memory file share, listing a page of page_size entries at a time."""
+
+    def __init__(self, page_size=5, delay=0):
+        self.page_size = page_size
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.directories = set([''])
+        self.files = {}
+        self.lists = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def add(self, path, content=b''):
+        parts = path.split('/')
+        for i in range(1, len(parts)):
+            self.directories.add('/'.join(parts[:i]))
+        self.files[path] = content
+
+    def _children(self, path):
+        prefix = path + '/' if path else ''
+        directories = sorted(d for d in self.directories if d and d.rpartition('/')[0] == path)
+        files = sorted(f for f in self.files if f.rpartition('/')[0] == path)
+        return [d[len(prefix):] for d in directories], [f[len(prefix):] for f in files]
+
+    def send(self, request, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            with self.lock:
+                return self._send(request)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _send(self, request):
+        url = urlparse(request.url)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = unquote(url.path).strip('/').partition('/')[2]
+        if query.get('restype') == 'directory':
+            if request.method == 'GET' and query.get('comp') == 'list':
+                return self._list(request, path, query)
+            if request.method == 'PUT':
+                return self._create_directory(request, path)
+            if request.method == 'DELETE':
+                return self._delete_directory(request, path)
+        elif request.method == 'PUT' and query.get('comp') == 'range':
+            return self._put_range(request, path)
+        elif request.method == 'PUT':
+            return self._create_file(request, path)
+        elif request.method == 'GET':
+            return self._get_file(request, path)
+        elif request.method == 'DELETE':
+            if self.files.pop(path, None) is None:
+                return _FakeResponse(request, 404, {'x-ms-error-code': 'ResourceNotFound'})
+            return _FakeResponse(request, 202)
+        return _FakeResponse(request, 400, {'x-ms-error-code': 'UnsupportedHttpVerb'})
+
+    def _list(self, request, path, query):
+        if path not in self.directories:
+            return _FakeResponse(request, 404, {'x-ms-error-code': 'ResourceNotFound'})
+        self.lists += 1
+        directories, files = self._children(path)
+        entries = sorted([(name, True) for name in directories] + [(name, False) for name in files])
+        # The markers are names, as the entries may be deleted while they are listed
+        marker = query.get('marker')
+        start = len([e for e in entries if marker and e[0] < marker])
+        page = entries[start:start + self.page_size]
+        root = ET.Element('EnumerationResults', ServiceEndpoint='https://account.file.core.windows.net/')
+        ET.SubElement(root, 'Marker').text = query.get('marker')
+        segment = ET.SubElement(root, 'Entries')
+        for name, is_directory in page:
+            if is_directory:
+                ET.SubElement(ET.SubElement(segment, 'Directory'), 'Name').text = name
+            else:
+                item = ET.SubElement(segment, 'File')
+                ET.SubElement(item, 'Name').text = name
+                size = len(self.files[path + '/' + name if path else name])
+                ET.SubElement(ET.SubElement(item, 'Properties'), 'Content-Length').text = str(size)
+        if start + self.page_size < len(entries):
+            ET.SubElement(root, 'NextMarker').text = entries[start + self.page_size][0]
+        return _FakeResponse(request, 200, {'Content-Type': 'application/xml'}, ET.tostring(root))
+
+    def _create_directory(self, request, path):
+        if path.rpartition('/')[0] not in self.directories:
+            return _FakeResponse(request, 404, {'x-ms-error-code': 'ParentNotFound'})
+        if path in self.directories:
+            return _FakeResponse(request, 409, {'x-ms-error-code': 'ResourceAlreadyExists'})
+        self.directories.add(path)
+        return _FakeResponse(request, 201)
+
+    def _delete_directory(self, request, path):
+        directories, files = self._children(path)
+        if directories or files:
+            return _FakeResponse(request, 409, {'x-ms-error-code': 'DirectoryNotEmpty'})
+        self.directories.discard(path)
+        return _FakeResponse(request, 202)
+
+    def _create_file(self, request, path):
+        if path.rpartition('/')[0] not in self.directories:
+            return _FakeResponse(request, 404, {'x-ms-error-code': 'ParentNotFound'})
+        self.files[path] = b'\0' * int(request.headers['x-ms-content-length'])
+        return _FakeResponse(request, 201)
+
+    def _put_range(self, request, path):
+        start, end = [int(x) for x in request.headers['x-ms-range'].split('=')[1].split('-')]
+        content = self.files[path]
+        self.files[path] = content[:start] + request.data + content[end + 1:]
+        return _FakeResponse(request, 201)
+
+    def _get_file(self, request, path):
+        if path not in self.files:
+            return _FakeResponse(request, 404, {'x-ms-error-code': 'ResourceNotFound'})
+        content = self.files[path]
+        headers = {'x-ms-type': 'File', 'Content-Type': 'application/octet-stream'}
+        if 'x-ms-range' not in request.headers:
+            headers['Content-Length'] = str(len(content))
+            return _FakeResponse(request, 200, headers, content)
+        start, end = [int(x) for x in request.headers['x-ms-range'].split('=')[1].split('-')]
+        if start >= len(content):
+            return _FakeResponse(request, 416, {'x-ms-error-code': 'InvalidRange'})
+        body = content[start:end + 1]
+        headers['Content-Length'] = str(len(body))
+        headers['Content-Range'] = 'bytes {}-{}/{}'.format(start, start + len(body) - 1, len(content))
+        return _FakeResponse(request, 206, headers, body)
+
+
+class StorageDirectoryTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.local_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.local_path, ignore_errors=True)
+
+    def _get_directory(self, service, directory_path='tree'):
+        self.service = service
+        return DirectoryClient(
+            'https://account.file.core.windows.net/share',
+            directory_path=directory_path,
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=service,
+            retry_total=0)
+
+    def _add_tree(self, service, root='tree'):
+        service.directories.add(root)
+        for i in range(3):
+            for j in range(4):
+                service.add('{}/dir{}/sub{}/file{}'.format(root, i, j, j), os.urandom(i * 10 + j))
+            service.add('{}/dir{}/file'.format(root, i), b'file')
+        for i in range(7):
+            service.add('{}/top{}'.format(root, i), os.urandom(100))
+
+    # --Test cases ---------------------------------------------------------------
+    def test_walk_directory(self):
+        service = _FakeFileService(page_size=3, delay=0.01)
+        self._add_tree(service)
+        directory = self._get_directory(service)
+
+        items = list(directory.walk_directory(max_connections=4))
+
+        paths = [item['path'] for item in items]
+        self.assertEqual(len(paths), len(set(paths)))
+        expected_files = set(f[len('tree/'):] for f in service.files)
+        self.assertEqual(set(i['path'] for i in items if not i['is_directory']), expected_files)
+        self.assertEqual(
+            set(i['path'] for i in items if i['is_directory']),
+            set(d[len('tree/'):] for d in service.directories if d.startswith('tree/')))
+        self.assertEqual(
+            sum(i['size'] for i in items if not i['is_directory']), sum(len(c) for c in service.files.values()))
+        # A directory is found before its contents
+        for item in items:
+            parent = item['path'].rpartition('/')[0]
+            if parent:
+                self.assertLess(paths.index(parent), paths.index(item['path']))
+        self.assertGreater(service.max_in_flight, 1)
+        self.assertLessEqual(service.max_in_flight, 4)
+
+    def test_walk_directory_streams_results(self):
+        service = _FakeFileService(page_size=2)
+        self._add_tree(service)
+        directory = self._get_directory(service)
+
+        walk = directory.walk_directory(max_connections=1)
+        next(walk)
+
+        # Only the first page of the root was listed
+        self.assertEqual(service.lists, 1)
+        walk.close()
+
+    def test_delete_directory_tree(self):
+        service = _FakeFileService(delay=0.005)
+        self._add_tree(service)
+        service.add('other/file', b'kept')
+        directory = self._get_directory(service)
+
+        directory.delete_directory_tree(max_connections=4)
+
+        self.assertEqual(service.files, {'other/file': b'kept'})
+        self.assertEqual(service.directories, set(['', 'other']))
+        self.assertGreater(service.max_in_flight, 1)
+
+    def test_delete_directory_tree_share_root(self):
+        service = _FakeFileService()
+        self._add_tree(service)
+        directory = self._get_directory(service, directory_path='')
+
+        directory.delete_directory_tree()
+
+        self.assertEqual(service.files, {})
+        self.assertEqual(service.directories, set(['']))
+
+    def test_delete_directory_tree_missing(self):
+        directory = self._get_directory(_FakeFileService())
+        with self.assertRaises(ResourceNotFoundError):
+            directory.delete_directory_tree()
+
+    def test_upload_and_download_directory(self):
+        files = {}
+        for relative_path in ['a', 'b/c', 'b/d/e', 'b/d/f', 'g/h', '.hidden/i', 'empty']:
+            content = b'' if relative_path == 'empty' else os.urandom(len(relative_path) * 100)
+            path = os.path.join(self.local_path, 'source', *relative_path.split('/'))
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as stream:
+                stream.write(content)
+            files[relative_path] = content
+        os.makedirs(os.path.join(self.local_path, 'source', 'b', 'no files'))
+        service = _FakeFileService(delay=0.005)
+        directory = self._get_directory(service, directory_path='parent/tree')
+        service.directories.add('parent')
+
+        uploaded = directory.upload_directory(os.path.join(self.local_path, 'source'), max_connections=4)
+
+        self.assertEqual(uploaded, len(files))
+        self.assertEqual(service.files, dict(('parent/tree/' + k, v) for k, v in files.items()))
+        self.assertIn('parent/tree/b/no files', service.directories)
+        self.assertGreater(service.max_in_flight, 1)
+
+        # Uploading again overwrites the files of the existing tree
+        self.assertEqual(directory.upload_directory(os.path.join(self.local_path, 'source')), len(files))
+
+        target = os.path.join(self.local_path, 'target')
+        downloaded = directory.download_directory(target, max_connections=4)
+
+        self.assertEqual(downloaded, len(files))
+        for relative_path, content in files.items():
+            with open(os.path.join(target, *relative_path.split('/')), 'rb') as stream:
+                self.assertEqual(stream.read(), content)
+        self.assertTrue(os.path.isdir(os.path.join(target, 'b', 'no files')))
+
+    def test_upload_directory_not_a_directory(self):
+        directory = self._get_directory(_FakeFileService())
+        with self.assertRaises(ValueError):
+            directory.upload_directory(os.path.join(self.local_path, 'missing'))
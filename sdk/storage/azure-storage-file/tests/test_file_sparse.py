@@ -0,0 +1,170 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+try:
+    from urllib.parse import urlparse, parse_qs, unquote
+except ImportError:
+    from urlparse import urlparse, parse_qs # type: ignore
+    from urllib2 import unquote # type: ignore
+
+from azure.storage.file import FileClient
+
+from test_directory_tree import _FakeFileService, _FakeResponse
+
+# ------------------------------------------------------------------------------
+_KB = 1024
+
+
+class _FakeSparseFileService(_FakeFileService):
+    """Keeps the valid ranges of the files, and the ranges read and written."""
+
+    def __init__(self, **kwargs):
+        super(_FakeSparseFileService, self).__init__(**kwargs)
+        self.valid = {}
+        self.reads = []
+        self.writes = []
+
+    def write(self, path, size, ranges):
+        content = bytearray(size)
+        for start, data in ranges:
+            content[start:start + len(data)] = data
+            self.valid.setdefault(path, []).append((start, start + len(data) - 1))
+        self.files[path] = bytes(content)
+
+    def _send(self, request):
+        url = urlparse(request.url)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = unquote(url.path).strip('/').partition('/')[2]
+        if request.method == 'HEAD':
+            return _FakeResponse(request, 200, {
+                'Content-Length': str(len(self.files[path])), 'x-ms-type': 'File'})
+        if request.method == 'GET' and query.get('comp') == 'rangelist':
+            return self._get_range_list(request, path)
+        if request.method == 'GET':
+            self.reads.append(request.headers.get('x-ms-range'))
+        if request.method == 'PUT' and query.get('comp') == 'range':
+            start, end = [int(x) for x in request.headers['x-ms-range'].split('=')[1].split('-')]
+            self.writes.append((start, end))
+            self.valid.setdefault(path, []).append((start, end))
+        elif request.method == 'PUT':
+            self.valid[path] = []
+        return super(_FakeSparseFileService, self)._send(request)
+
+    def _get_range_list(self, request, path):
+        start, end = [int(x) for x in request.headers['x-ms-range'].split('=')[1].split('-')]
+        root = ET.Element('Ranges')
+        for range_start, range_end in sorted(self.valid.get(path, [])):
+            if range_end < start or range_start > end:
+                continue
+            item = ET.SubElement(root, 'Range')
+            ET.SubElement(item, 'Start').text = str(max(start, range_start))
+            ET.SubElement(item, 'End').text = str(min(end, range_end))
+        return _FakeResponse(request, 200, {
+            'Content-Type': 'application/xml',
+            'x-ms-content-length': str(len(self.files[path])),
+        }, ET.tostring(root))
+
+
+class StorageFileSparseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.local_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.local_path, ignore_errors=True)
+
+    def _get_file(self, service):
+        self.service = service
+        return FileClient(
+            'https://account.file.core.windows.net/share',
+            file_path='disk.vhd',
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=service,
+            max_range_size=4 * _KB,
+            max_chunk_get_size=4 * _KB,
+            retry_total=0)
+
+    def _add_sparse_file(self):
+        self.first = os.urandom(6 * _KB)
+        self.second = os.urandom(512)
+        self.service.write('disk.vhd', 64 * _KB, [(2 * _KB, self.first), (40 * _KB, self.second)])
+        return self.service.files['disk.vhd']
+
+    # --Test cases ---------------------------------------------------------------
+    def test_download_sparse_file(self):
+        file_client = self._get_file(_FakeSparseFileService(delay=0.005))
+        content = self._add_sparse_file()
+
+        downloader = file_client.download_file(sparse=True)
+        stream = BytesIO()
+        properties = downloader.download_to_stream(stream, max_connections=4)
+
+        self.assertEqual(stream.getvalue(), content)
+        self.assertEqual(properties.size, 64 * _KB)
+        # Only the valid ranges were read, in chunks of at most 4KB
+        self.assertEqual(sorted(self.service.reads), sorted([
+            'bytes=2048-6143', 'bytes=6144-8191', 'bytes=40960-41471']))
+        self.assertGreater(self.service.max_in_flight, 1)
+
+    def test_download_sparse_file_to_path_leaves_holes(self):
+        file_client = self._get_file(_FakeSparseFileService())
+        content = self._add_sparse_file()
+        path = os.path.join(self.local_path, 'disk.vhd')
+
+        with open(path, 'wb') as stream:
+            file_client.download_file(sparse=True).download_to_stream(stream, max_connections=2)
+
+        with open(path, 'rb') as stream:
+            self.assertEqual(stream.read(), content)
+
+    def test_download_sparse_file_iter_and_range(self):
+        file_client = self._get_file(_FakeSparseFileService())
+        content = self._add_sparse_file()
+
+        self.assertEqual(b''.join(file_client.download_file(sparse=True)), content)
+
+        del self.service.reads[:]
+        downloader = file_client.download_file(offset=5 * _KB, length=50 * _KB - 1, sparse=True)
+        self.assertEqual(len(downloader), 45 * _KB)
+        self.assertEqual(downloader.content_as_bytes(), content[5 * _KB:50 * _KB])
+        self.assertEqual(self.service.reads, ['bytes=5120-8191', 'bytes=40960-41471'])
+
+    def test_download_sparse_empty_file(self):
+        file_client = self._get_file(_FakeSparseFileService())
+        self.service.write('disk.vhd', 16 * _KB, [])
+
+        self.assertEqual(file_client.download_file(sparse=True).content_as_bytes(), b'\x00' * 16 * _KB)
+        self.assertEqual(self.service.reads, [])
+
+        self.service.write('disk.vhd', 0, [])
+        self.assertEqual(file_client.download_file(sparse=True).content_as_bytes(), b'')
+
+    def test_upload_sparse_file(self):
+        file_client = self._get_file(_FakeSparseFileService(delay=0.005))
+        data = bytearray(40 * _KB)
+        data[5 * _KB:5 * _KB + 10] = b'x' * 10
+        data[33 * _KB:] = os.urandom(7 * _KB)
+        data = bytes(data)
+
+        range_ids = file_client.upload_file(data, max_connections=4, sparse=True)
+
+        self.assertEqual(self.service.files['disk.vhd'], data)
+        # The chunks of zeros were skipped
+        self.assertEqual(sorted(self.service.writes), [(4096, 8191), (32768, 36863), (36864, 40959)])
+        self.assertEqual(sorted(range_ids), ['bytes=32768-36863', 'bytes=36864-40959', 'bytes=4096-8191'])
+
+        # Without sparse, every range is written
+        del self.service.writes[:]
+        file_client.upload_file(data, max_connections=4)
+        self.assertEqual(len(self.service.writes), 10)
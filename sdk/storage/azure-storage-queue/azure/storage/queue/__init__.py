@@ -7,6 +7,7 @@
 from .version import VERSION
 from .queue_client import QueueClient
 from .queue_service_client import QueueServiceClient
+from ._queue_worker import QueueWorker, QueueWorkerMetrics
 from ._shared.policies import ExponentialRetry, LinearRetry, NoRetry
 from ._shared.models import(
     LocationMode,
@@ -42,6 +43,8 @@ __version__ = VERSION
 __all__ = [
     'QueueClient',
     'QueueServiceClient',
+    'QueueWorker',
+    'QueueWorkerMetrics',
     'ExponentialRetry',
     'LinearRetry',
     'NoRetry',
@@ -0,0 +1,391 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import logging
+import threading
+import time
+from typing import (  # pylint: disable=unused-import
+    Any, Callable, Dict, Optional,
+    TYPE_CHECKING
+)
+
+from azure.core.exceptions import AzureError
+
+from ._shared.models import DictMixin
+
+if TYPE_CHECKING:
+    from .models import QueueMessage
+    from .queue_client import QueueClient
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAX_MESSAGES_PER_RECEIVE = 32
+_MIN_IDLE_WAIT = 0.1
+
+
+class QueueWorkerMetrics(DictMixin):
+    """The counters of the work done by a :class:`~azure.storage.queue.QueueWorker`.
+
+    :ivar int received:
+        The number of messages received from the queue.
+    :ivar int completed:
+        The number of messages the handler processed without raising.
+    :ivar int failed:
+        The number of messages the handler raised on. These messages are not deleted,
+        and become visible again when their visibility timeout expires.
+    :ivar int deleted:
+        The number of completed messages deleted from the queue.
+    :ivar int extended:
+        The number of times the visibility timeout of a message was extended.
+    :ivar int lost:
+        The number of messages whose pop receipt was no longer valid when their visibility
+        timeout was extended or they were deleted.
+    :ivar int receive_calls:
+        The number of receive requests made to the queue.
+    :ivar int empty_receives:
+        The number of receive requests which found no visible messages.
+    :ivar int receive_errors:
+        The number of receive requests which failed.
+    :ivar int in_flight:
+        The number of messages received and not yet completed or failed.
+    :ivar float elapsed:
+        The seconds since the worker was started.
+    :ivar float throughput:
+        The number of messages completed per second since the worker was started.
+    """
+
+    def __init__(self):
+        self.received = 0
+        self.completed = 0
+        self.failed = 0
+        self.deleted = 0
+        self.extended = 0
+        self.lost = 0
+        self.receive_calls = 0
+        self.empty_receives = 0
+        self.receive_errors = 0
+        self.in_flight = 0
+        self.elapsed = 0.0
+        self.throughput = 0.0
+
+
+class _Lease(object):
+    """A message received by the worker, with the local time its visibility timeout expires."""
+
+    def __init__(self, message, expires):
+        self.message = message
+        self.expires = expires
+        self.lock = threading.Lock()
+        self.extending = False
+        self.settled = False
+
+
+class QueueWorker(object):  # pylint: disable=too-many-instance-attributes
+    """Processes the messages of a queue with a pool of threads.
+
+    A receiver thread keeps a buffer of up to `prefetch` messages received from the queue,
+    asking for as many messages in a request as the buffer has room for. The messages are
+    passed to the handler on a pool of `max_workers` threads. While a message is buffered or
+    being handled, its visibility timeout is extended before it expires, so that the message
+    is not received again by another worker. When the handler returns, the message is deleted
+    from the queue on a separate pool of threads, so that the handlers are not held up by the
+    deletes. When the handler raises, the message is left to become visible again once its
+    visibility timeout expires.
+
+    When the queue is empty, the receiver waits before trying again, doubling the wait after
+    each empty receive up to `max_idle_wait` seconds.
+
+    The worker is created with :func:`~azure.storage.queue.QueueClient.create_worker`.
+
+    :param ~azure.storage.queue.QueueClient queue_client:
+        The client of the queue to process the messages of.
+    :param callable handler:
+        The function which processes a message. It is called with the
+        :class:`~azure.storage.queue.QueueMessage`, and must be thread safe.
+    :param int max_workers:
+        The number of threads to call the handler on. The default is 4.
+    :param int prefetch:
+        The maximum number of messages received and not yet processed. It must be at least
+        `max_workers`. The default is twice `max_workers`.
+    :param int visibility_timeout:
+        The visibility timeout of the received messages, in seconds. The visibility timeout
+        is extended by this value when a third of it is left. The default is 30.
+    :param float max_idle_wait:
+        The longest wait, in seconds, between the receives of an empty queue. The default is 30.
+    :param callable on_error:
+        A function called with the message and the error when the handler raises, or with
+        None and the error when receiving messages fails. By default the errors are logged.
+    :param int timeout:
+        The server timeout of the requests, expressed in seconds.
+    """
+
+    def __init__(
+            self, queue_client,  # type: QueueClient
+            handler,  # type: Callable[[QueueMessage], Any]
+            max_workers=4,  # type: int
+            prefetch=None,  # type: Optional[int]
+            visibility_timeout=30,  # type: int
+            max_idle_wait=30,  # type: float
+            on_error=None,  # type: Optional[Callable[[Optional[QueueMessage], Exception], Any]]
+            timeout=None,  # type: Optional[int]
+        ):
+        # type: (...) -> None
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        prefetch = prefetch or 2 * max_workers
+        if prefetch < max_workers:
+            raise ValueError("prefetch must be at least max_workers.")
+        if visibility_timeout < 1:
+            raise ValueError("visibility_timeout must be at least 1 second.")
+        self._client = queue_client
+        self._handler = handler
+        self._max_workers = max_workers
+        self._prefetch = prefetch
+        self._visibility_timeout = visibility_timeout
+        self._extend_margin = visibility_timeout / 3.0
+        self._max_idle_wait = max(max_idle_wait, _MIN_IDLE_WAIT)
+        self._on_error = on_error
+        self._timeout = timeout
+
+        self._lock = threading.Condition()
+        self._leases = {}  # type: Dict[str, _Lease]
+        self._outstanding = 0
+        self._metrics = QueueWorkerMetrics()
+        self._started = None  # type: Optional[float]
+        self._until_empty = False
+        self._stopping = threading.Event()
+        self._leases_changed = threading.Event()
+        self._lease_keeper_done = False
+        self._receiver = None  # type: Optional[threading.Thread]
+        self._lease_keeper = None  # type: Optional[threading.Thread]
+        self._handlers = None  # type: Any
+        self._settlers = None  # type: Any
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def metrics(self):
+        # type: () -> QueueWorkerMetrics
+        """A snapshot of the counters of the work done by the worker.
+
+        :rtype: ~azure.storage.queue.QueueWorkerMetrics
+        """
+        metrics = QueueWorkerMetrics()
+        with self._lock:
+            metrics.update(self._metrics)
+            metrics.in_flight = self._outstanding
+        if self._started is not None:
+            metrics.elapsed = time.time() - self._started
+            if metrics.elapsed > 0:
+                metrics.throughput = metrics.completed / metrics.elapsed
+        return metrics
+
+    def start(self):
+        # type: () -> QueueWorker
+        """Starts receiving and processing messages in the background.
+
+        :returns: The worker.
+        :rtype: ~azure.storage.queue.QueueWorker
+        """
+        import concurrent.futures
+        if self._started is not None:
+            raise ValueError("The worker has already been started.")
+        self._started = time.time()
+        self._handlers = concurrent.futures.ThreadPoolExecutor(self._max_workers)
+        self._settlers = concurrent.futures.ThreadPoolExecutor(self._max_workers)
+        self._lease_keeper = threading.Thread(target=self._keep_leases)
+        self._lease_keeper.daemon = True
+        self._lease_keeper.start()
+        self._receiver = threading.Thread(target=self._receive)
+        self._receiver.daemon = True
+        self._receiver.start()
+        return self
+
+    def stop(self):
+        # type: () -> None
+        """Stops receiving messages, and waits for the messages already received to be processed."""
+        self._stopping.set()
+        with self._lock:
+            self._lock.notify_all()
+        self.join()
+
+    def join(self):
+        # type: () -> None
+        """Waits for the worker to stop, and the messages received to be processed.
+
+        The worker stops when :func:`stop` is called, or when the queue is found empty
+        if it was started with :func:`run` and `until_empty`.
+        """
+        if self._started is None:
+            return
+        while self._receiver.is_alive():
+            self._receiver.join(1)
+        self._handlers.shutdown(wait=True)
+        # The deletes were submitted by the handlers. Once the lease keeper stops
+        # no extensions are submitted, and the settlers can be shut down.
+        with self._lock:
+            self._lease_keeper_done = True
+        self._leases_changed.set()
+        self._lease_keeper.join()
+        self._settlers.shutdown(wait=True)
+
+    def run(self, until_empty=False):
+        # type: (bool) -> QueueWorkerMetrics
+        """Receives and processes messages until stopped.
+
+        :param bool until_empty:
+            Whether to stop once the queue is found empty and the messages received have
+            been processed. By default the worker runs until it is interrupted.
+        :returns: The counters of the work done.
+        :rtype: ~azure.storage.queue.QueueWorkerMetrics
+        """
+        self._until_empty = until_empty
+        self.start()
+        try:
+            self.join()
+        except KeyboardInterrupt:
+            self.stop()
+        return self.metrics
+
+    def _report_error(self, message, error):
+        if self._on_error is not None:
+            try:
+                self._on_error(message, error)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Queue worker error callback failed.")
+        elif message is not None:
+            _LOGGER.warning("Queue worker failed to process message %s: %r", message.id, error)
+        else:
+            _LOGGER.warning("Queue worker failed to receive messages: %r", error)
+
+    def _receive(self):
+        idle_wait = 0.0
+        while not self._stopping.is_set():
+            with self._lock:
+                while self._outstanding >= self._prefetch and not self._stopping.is_set():
+                    self._lock.wait(1)
+                count = min(_MAX_MESSAGES_PER_RECEIVE, self._prefetch - self._outstanding)
+                self._metrics.receive_calls += 1
+            if self._stopping.is_set():
+                break
+            try:
+                pages = self._client.receive_messages(
+                    messages_per_page=count,
+                    visibility_timeout=self._visibility_timeout,
+                    timeout=self._timeout).by_page()
+                messages = list(next(pages, []))
+            except AzureError as error:
+                with self._lock:
+                    self._metrics.receive_errors += 1
+                self._report_error(None, error)
+                messages = []
+            if not messages:
+                with self._lock:
+                    self._metrics.empty_receives += 1
+                    if self._until_empty and self._outstanding == 0:
+                        break
+                idle_wait = min(self._max_idle_wait, idle_wait * 2 or _MIN_IDLE_WAIT)
+                self._stopping.wait(idle_wait)
+                continue
+            idle_wait = 0.0
+            expires = time.time() + self._visibility_timeout
+            with self._lock:
+                self._metrics.received += len(messages)
+                self._outstanding += len(messages)
+                leases = [_Lease(message, expires) for message in messages]
+                for lease in leases:
+                    self._leases[lease.message.id] = lease
+            self._leases_changed.set()
+            for lease in leases:
+                self._handlers.submit(self._process, lease)
+
+    def _process(self, lease):
+        try:
+            self._handler(lease.message)
+        except Exception as error:  # pylint: disable=broad-except
+            # Stop extending the lease, so the message becomes visible again.
+            with lease.lock:
+                lease.settled = True
+            self._release(lease, failed=True)
+            self._report_error(lease.message, error)
+        else:
+            self._release(lease, failed=False)
+            self._settlers.submit(self._delete, lease)
+
+    def _release(self, lease, failed):
+        with self._lock:
+            self._outstanding -= 1
+            if failed:
+                self._metrics.failed += 1
+                self._leases.pop(lease.message.id, None)
+            else:
+                self._metrics.completed += 1
+            self._lock.notify_all()
+
+    def _delete(self, lease):
+        with lease.lock:
+            lease.settled = True
+            try:
+                self._client.delete_message(lease.message, timeout=self._timeout)
+                deleted = True
+            except AzureError as error:
+                _LOGGER.warning("Queue worker failed to delete message %s: %r", lease.message.id, error)
+                deleted = False
+        with self._lock:
+            if deleted:
+                self._metrics.deleted += 1
+            else:
+                self._metrics.lost += 1
+            self._leases.pop(lease.message.id, None)
+
+    def _extend(self, lease):
+        with lease.lock:
+            try:
+                if lease.settled:
+                    return
+                updated = self._client.update_message(
+                    lease.message.id,
+                    pop_receipt=lease.message.pop_receipt,
+                    visibility_timeout=self._visibility_timeout,
+                    timeout=self._timeout)
+                lease.message.pop_receipt = updated.pop_receipt
+                lease.message.time_next_visible = updated.time_next_visible
+                lease.expires = time.time() + self._visibility_timeout
+                with self._lock:
+                    self._metrics.extended += 1
+            except AzureError as error:
+                # The message was received again, or deleted, by someone else.
+                _LOGGER.warning("Queue worker failed to extend message %s: %r", lease.message.id, error)
+                lease.settled = True
+                with self._lock:
+                    self._metrics.lost += 1
+            finally:
+                lease.extending = False
+        self._leases_changed.set()
+
+    def _keep_leases(self):
+        while True:
+            self._leases_changed.clear()
+            now = time.time()
+            wait = self._extend_margin
+            with self._lock:
+                if self._lease_keeper_done:
+                    return
+                leases = list(self._leases.values())
+            for lease in leases:
+                if lease.settled or lease.extending:
+                    continue
+                due = lease.expires - self._extend_margin - now
+                if due <= 0:
+                    lease.extending = True
+                    self._settlers.submit(self._extend, lease)
+                else:
+                    wait = min(wait, due)
+            self._leases_changed.wait(wait)
@@ -79,53 +79,68 @@ class AzureSigningError(ClientAuthenticationError):
     """
 
 
+# The standard headers signed, in the order of the string-to-sign
+_HEADERS_TO_SIGN = (
+    'content-encoding', 'content-language', 'content-length',
+    'content-md5', 'content-type', 'date', 'if-modified-since',
+    'if-match', 'if-none-match', 'if-unmodified-since', 'byte_range'
+)
+
+
 # pylint: disable=no-self-use
 class SharedKeyCredentialPolicy(SansIOHTTPPolicy):
 
     def __init__(self, account_name, account_key):
         self.account_name = account_name
         self.account_key = account_key
+        # (account key, HMAC keyed with it), set up on the first request
+        self._signer = None
         super(SharedKeyCredentialPolicy, self).__init__()
 
-    def _get_headers(self, request, headers_to_sign):
-        headers = dict((name.lower(), value) for name, value in request.http_request.headers.items() if value)
-        if 'content-length' in headers and headers['content-length'] == '0':
-            del headers['content-length']
-        return '\n'.join(headers.get(x, '') for x in headers_to_sign) + '\n'
-
-    def _get_verb(self, request):
-        return request.http_request.method + '\n'
-
-    def _get_canonicalized_resource(self, request):
-        uri_path = urlparse(request.http_request.url).path
-        return '/' + self.account_name + uri_path
-
-    def _get_canonicalized_headers(self, request):
-        string_to_sign = ''
+    def _get_signer(self):
+        # The base64 decoding of the key and the HMAC key schedule are done once,
+        # and the keyed HMAC copied for each request. A new key is picked up.
+        account_key = self.account_key
+        signer = self._signer
+        if signer is None or signer[0] != account_key:
+            key = _decode_base64_to_bytes(account_key)
+            signer = (account_key, hmac.HMAC(key, digestmod=hashlib.sha256))
+            self._signer = signer
+        return signer[1].copy()
+
+    def _get_string_to_sign(self, request):
+        http_request = request.http_request
+        headers = {}
         x_ms_headers = []
-        for name, value in request.http_request.headers.items():
+        for name, value in http_request.headers.items():
             if name.startswith('x-ms-'):
-                x_ms_headers.append((name.lower(), value))
+                if value is not None:
+                    x_ms_headers.append((name.lower(), value))
+            elif value:
+                headers[name.lower()] = value
+        if headers.get('content-length') == '0':
+            del headers['content-length']
         x_ms_headers.sort()
-        for name, value in x_ms_headers:
-            if value is not None:
-                string_to_sign += ''.join([name, ':', value, '\n'])
-        return string_to_sign
-
-    def _get_canonicalized_resource_query(self, request):
-        sorted_queries = [(name, value) for name, value in request.http_request.query.items()]
-        sorted_queries.sort()
+        queries = [(name, value) for name, value in http_request.query.items() if value is not None]
+        queries.sort()
 
-        string_to_sign = ''
-        for name, value in sorted_queries:
-            if value is not None:
-                string_to_sign += '\n' + name.lower() + ':' + unquote(value)
-
-        return string_to_sign
+        parts = [http_request.method, '\n']
+        for name in _HEADERS_TO_SIGN:
+            parts.extend((headers.get(name, ''), '\n'))
+        for name, value in x_ms_headers:
+            parts.extend((name, ':', value, '\n'))
+        parts.extend(('/', self.account_name, urlparse(http_request.url).path))
+        for name, value in queries:
+            parts.extend(('\n', name.lower(), ':', unquote(value)))
+        return ''.join(parts)
 
     def _add_authorization_header(self, request, string_to_sign):
         try:
-            signature = _sign_string(self.account_key, string_to_sign)
+            signer = self._get_signer()
+            if isinstance(string_to_sign, _unicode_type):
+                string_to_sign = string_to_sign.encode('utf-8')
+            signer.update(string_to_sign)
+            signature = _encode_base64(signer.digest())
             auth_string = 'SharedKey ' + self.account_name + ':' + signature
             request.http_request.headers['Authorization'] = auth_string
         except Exception as ex:
@@ -134,19 +149,6 @@ class SharedKeyCredentialPolicy(SansIOHTTPPolicy):
             raise _wrap_exception(ex, AzureSigningError)
 
     def on_request(self, request, **kwargs):
-        string_to_sign = \
-            self._get_verb(request) + \
-            self._get_headers(
-                request,
-                [
-                    'content-encoding', 'content-language', 'content-length',
-                    'content-md5', 'content-type', 'date', 'if-modified-since',
-                    'if-match', 'if-none-match', 'if-unmodified-since', 'byte_range'
-                ]
-            ) + \
-            self._get_canonicalized_headers(request) + \
-            self._get_canonicalized_resource(request) + \
-            self._get_canonicalized_resource_query(request)
-
+        string_to_sign = self._get_string_to_sign(request)
         self._add_authorization_header(request, string_to_sign)
         #logger.debug("String_to_sign=%s", string_to_sign)
@@ -0,0 +1,157 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import threading
+import time
+
+
+_MIN_CHUNK_SIZE = 1024 * 1024
+_MAX_CHUNK_SIZE = 64 * 1024 * 1024
+_TARGET_LATENCY = 2.0
+
+
+class TransferTuner(object):  # pylint: disable=too-many-instance-attributes
+    """Adjusts the chunk size and the number of requests in flight of a transfer, as it runs.
+
+    The tuner is told about every completed chunk and re-evaluates the transfer after each
+    round, that is once as many chunks as there are requests in flight have completed.
+    The number of requests in flight grows the way a TCP congestion window does: it doubles
+    while the throughput keeps improving, grows by one past the slow start threshold, and is
+    halved when the throughput drops. The chunk size is halved when chunks take longer than
+    the target latency, to avoid timeouts and retries on slow links, and doubled when they
+    complete well within it, to spend fewer round trips on fast links.
+
+    :param int chunk_size: The initial chunk size.
+    :param int max_connections: The upper bound of requests in flight.
+    :param int min_chunk_size: The lower bound of the chunk size. When given, the initial
+        chunk size is raised to it. Defaults to 1MiB, or to the initial chunk size if smaller.
+    :param int max_chunk_size: The upper bound of the chunk size.
+    :param float target_latency: The per-chunk latency, in seconds, that the chunk size aims for.
+    """
+
+    def __init__(self, chunk_size, max_connections, min_chunk_size=None, max_chunk_size=None,
+                 target_latency=_TARGET_LATENCY):
+        if min_chunk_size:
+            # An explicit lower bound is a hard limit, that the initial chunk size must meet too.
+            chunk_size = max(chunk_size, min_chunk_size)
+        else:
+            min_chunk_size = min(chunk_size, _MIN_CHUNK_SIZE)
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max(chunk_size, max_chunk_size or _MAX_CHUNK_SIZE)
+        self.max_connections = max(1, max_connections)
+        self.connections = 1
+        self.threshold = self.max_connections
+        self.target_latency = target_latency
+        self.throughput = None
+        self._lock = threading.Lock()
+        self._reset_round(None)
+
+    def _reset_round(self, now):
+        self._round_start = now
+        self._round_bytes = 0
+        self._round_latency = 0.0
+        self._round_chunks = 0
+
+    def record(self, length, started):
+        """Record a completed chunk.
+
+        :param int length: The size of the chunk.
+        :param float started: When the request for the chunk was sent, as returned by time.time().
+        """
+        finished = time.time()
+        with self._lock:
+            if self._round_start is None or started < self._round_start:
+                self._round_start = started
+            self._round_bytes += length
+            self._round_latency += finished - started
+            self._round_chunks += 1
+            if self._round_chunks >= self.connections:
+                self._adjust(finished)
+
+    def _adjust(self, now):
+        throughput = self._round_bytes / max(now - self._round_start, 1e-6)
+        latency = self._round_latency / self._round_chunks
+
+        if self.throughput is None or throughput > self.throughput * 1.1:
+            # Still gaining: grow exponentially up to the threshold, then linearly.
+            self.throughput = throughput
+            if self.connections < self.threshold:
+                self.connections = min(self.max_connections, self.connections * 2)
+            else:
+                self.connections = min(self.max_connections, self.connections + 1)
+        elif throughput < self.throughput * 0.8:
+            # Congested: back off, and only probe linearly from here on.
+            self.threshold = max(1, self.connections // 2)
+            self.connections = self.threshold
+            self.throughput = throughput
+
+        if latency > self.target_latency:
+            self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+        elif latency * 4 < self.target_latency:
+            self.chunk_size = min(self.max_chunk_size, self.chunk_size * 2)
+        self._reset_round(now)
+
+    def settings(self):
+        """The parameters the tuner has settled on so far.
+
+        :returns: The chunk size, the number of requests in flight and the best
+            measured throughput in bytes per second, or None if no round completed.
+        :rtype: dict(str, Any)
+        """
+        with self._lock:
+            return {
+                'chunk_size': self.chunk_size,
+                'max_connections': self.connections,
+                'throughput': self.throughput,
+            }
+
+
+def tuned_map(tuner, func, items, length_of):
+    """Call func with each item, with as many calls in flight as the tuner allows.
+
+    The items are consumed lazily, so the chunk size the tuner has chosen is used for
+    each new item. Returns the results in the order of the items.
+    """
+    def _run(item):
+        # The length is taken first, as func may release the chunk
+        length = length_of(item)
+        started = time.time()
+        result = func(item)
+        tuner.record(length, started)
+        return result
+
+    if tuner.max_connections <= 1:
+        return [_run(item) for item in items]
+
+    import concurrent.futures
+    executor = concurrent.futures.ThreadPoolExecutor(tuner.max_connections)
+    futures = []
+    running = set()
+    items = iter(items)
+    try:
+        while True:
+            # Wait for a free slot before taking the next item, so that it uses the latest chunk size.
+            while len(running) >= tuner.connections:
+                done, running = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                # Check for exceptions and fail fast.
+                for future in done:
+                    future.result()
+            try:
+                item = next(items)
+            except StopIteration:
+                break
+            future = executor.submit(_run, item)
+            futures.append(future)
+            running.add(future)
+        return [f.result() for f in futures]
+    except BaseException:
+        for future in running:
+            future.cancel()
+        raise
+    finally:
+        executor.shutdown(wait=False)
@@ -14,6 +14,7 @@ from collections import OrderedDict
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.ciphers.algorithms import AES
 from cryptography.hazmat.primitives.ciphers.modes import CBC
 from cryptography.hazmat.primitives.padding import PKCS7
@@ -25,6 +26,10 @@ from .authentication import _encode_base64, _decode_base64_to_bytes
 
 
 _ENCRYPTION_PROTOCOL_V1 = '1.0'
+_ENCRYPTION_PROTOCOL_V2 = '2.0'
+_GCM_REGION_DATA_LENGTH = 4 * 1024 * 1024
+_GCM_NONCE_LENGTH = 12
+_GCM_TAG_LENGTH = 16
 _ERROR_VALUE_NONE = '{0} should not be None.'
 _ERROR_OBJECT_INVALID = \
     '{0} does not define a complete interface. Value of {1} is either missing or invalid.'
@@ -32,6 +37,7 @@ _ERROR_DATA_NOT_ENCRYPTED = 'Encryption required, but received data does not con
                             'Data was either not encrypted or metadata has been lost.'
 _ERROR_UNSUPPORTED_ENCRYPTION_ALGORITHM = \
     'Specified encryption algorithm is not supported.'
+_ERROR_UNSUPPORTED_ENCRYPTION_VERSION = 'Specified encryption version is not supported.'
 
 
 def _validate_not_none(param_name, param):
@@ -54,6 +60,12 @@ class _EncryptionAlgorithm(object):
     Specifies which client encryption algorithm is used.
     '''
     AES_CBC_256 = 'AES_CBC_256'
+    AES_GCM_256 = 'AES_GCM_256'
+
+
+def _validate_encryption_version(encryption_version):
+    if encryption_version not in (_ENCRYPTION_PROTOCOL_V1, _ENCRYPTION_PROTOCOL_V2):
+        raise ValueError(_ERROR_UNSUPPORTED_ENCRYPTION_VERSION)
 
 
 class _WrappedContentKey:
@@ -101,16 +113,42 @@ class _EncryptionAgent:
         self.protocol = protocol
 
 
+class _EncryptedRegionInfo:
+    '''
+    Represents the length of the regions of a version 2.0 encrypted blob, which are
+    each encrypted and authenticated on their own.
+    '''
+
+    def __init__(self, data_length, nonce_length, tag_length):
+        '''
+        :param int data_length:
+            The length of the plain text of a region.
+        :param int nonce_length:
+            The length of the nonce stored at the start of every encrypted region.
+        :param int tag_length:
+            The length of the authentication tag stored at the end of every encrypted region.
+        '''
+
+        _validate_not_none('data_length', data_length)
+        _validate_not_none('nonce_length', nonce_length)
+        _validate_not_none('tag_length', tag_length)
+
+        self.data_length = data_length
+        self.nonce_length = nonce_length
+        self.tag_length = tag_length
+
+
 class _EncryptionData:
     '''
     Represents the encryption data that is stored on the service.
     '''
 
     def __init__(self, content_encryption_IV, encryption_agent, wrapped_content_key,
-                 key_wrapping_metadata):
+                 key_wrapping_metadata, encrypted_region_info=None):
         '''
         :param bytes content_encryption_IV:
-            The content encryption initialization vector.
+            The content encryption initialization vector. None for version 2.0,
+            where every region has a nonce of its own.
         :param _EncryptionAgent encryption_agent:
             The encryption agent.
         :param _WrappedContentKey wrapped_content_key:
@@ -118,30 +156,41 @@ class _EncryptionData:
             and the encrypted key bytes.
         :param dict key_wrapping_metadata:
             A dict containing metadata related to the key wrapping.
+        :param _EncryptedRegionInfo encrypted_region_info:
+            The length of the encrypted regions. Only used by version 2.0.
         '''
 
-        _validate_not_none('content_encryption_IV', content_encryption_IV)
         _validate_not_none('encryption_agent', encryption_agent)
         _validate_not_none('wrapped_content_key', wrapped_content_key)
+        if encryption_agent.protocol == _ENCRYPTION_PROTOCOL_V2:
+            _validate_not_none('encrypted_region_info', encrypted_region_info)
+        else:
+            _validate_not_none('content_encryption_IV', content_encryption_IV)
 
         self.content_encryption_IV = content_encryption_IV
         self.encryption_agent = encryption_agent
         self.wrapped_content_key = wrapped_content_key
         self.key_wrapping_metadata = key_wrapping_metadata
+        self.encrypted_region_info = encrypted_region_info
 
 
-def _generate_encryption_data_dict(kek, cek, iv):
+def _generate_encryption_data_dict(kek, cek, iv, encryption_version=_ENCRYPTION_PROTOCOL_V1):
     '''
     Generates and returns the encryption metadata as a dict.
 
     :param object kek: The key encryption key. See calling functions for more information.
     :param bytes cek: The content encryption key.
-    :param bytes iv: The initialization vector.
+    :param bytes iv: The initialization vector. None for version 2.0.
+    :param str encryption_version: The version of the encryption protocol.
     :return: A dict containing all the encryption metadata.
     :rtype: dict
     '''
-    # Encrypt the cek.
-    wrapped_cek = kek.wrap_key(cek)
+    # Encrypt the cek. Version 2.0 wraps the version along with the key, so that
+    # the version in the metadata cannot be changed.
+    if encryption_version == _ENCRYPTION_PROTOCOL_V2:
+        wrapped_cek = kek.wrap_key(_get_versioned_key_prefix(encryption_version) + cek)
+    else:
+        wrapped_cek = kek.wrap_key(cek)
 
     # Build the encryption_data dict.
     # Use OrderedDict to comply with Java's ordering requirement.
@@ -151,18 +200,32 @@ def _generate_encryption_data_dict(kek, cek, iv):
     wrapped_content_key['Algorithm'] = kek.get_key_wrap_algorithm()
 
     encryption_agent = OrderedDict()
-    encryption_agent['Protocol'] = _ENCRYPTION_PROTOCOL_V1
-    encryption_agent['EncryptionAlgorithm'] = _EncryptionAlgorithm.AES_CBC_256
+    encryption_agent['Protocol'] = encryption_version
+    if encryption_version == _ENCRYPTION_PROTOCOL_V2:
+        encryption_agent['EncryptionAlgorithm'] = _EncryptionAlgorithm.AES_GCM_256
+    else:
+        encryption_agent['EncryptionAlgorithm'] = _EncryptionAlgorithm.AES_CBC_256
 
     encryption_data_dict = OrderedDict()
     encryption_data_dict['WrappedContentKey'] = wrapped_content_key
     encryption_data_dict['EncryptionAgent'] = encryption_agent
-    encryption_data_dict['ContentEncryptionIV'] = _encode_base64(iv)
+    if encryption_version == _ENCRYPTION_PROTOCOL_V2:
+        encrypted_region_info = OrderedDict()
+        encrypted_region_info['DataLength'] = _GCM_REGION_DATA_LENGTH
+        encrypted_region_info['NonceLength'] = _GCM_NONCE_LENGTH
+        encryption_data_dict['EncryptedRegionInfo'] = encrypted_region_info
+    else:
+        encryption_data_dict['ContentEncryptionIV'] = _encode_base64(iv)
     encryption_data_dict['KeyWrappingMetadata'] = {'EncryptionLibrary': 'Python ' + VERSION}
 
     return encryption_data_dict
 
 
+def _get_versioned_key_prefix(encryption_version):
+    # The version, padded to 8 bytes, that version 2.0 wraps in front of the content encryption key.
+    return encryption_version.encode('utf-8').ljust(8, b'\0')
+
+
 def _dict_to_encryption_data(encryption_data_dict):
     '''
     Converts the specified dictionary to an EncryptionData object for
@@ -174,7 +237,8 @@ def _dict_to_encryption_data(encryption_data_dict):
     :rtype: _EncryptionData
     '''
     try:
-        if encryption_data_dict['EncryptionAgent']['Protocol'] != _ENCRYPTION_PROTOCOL_V1:
+        protocol = encryption_data_dict['EncryptionAgent']['Protocol']
+        if protocol not in (_ENCRYPTION_PROTOCOL_V1, _ENCRYPTION_PROTOCOL_V2):
             raise ValueError("Unsupported encryption version.")
     except KeyError:
         raise ValueError("Unsupported encryption version.")
@@ -192,10 +256,22 @@ def _dict_to_encryption_data(encryption_data_dict):
     else:
         key_wrapping_metadata = None
 
-    encryption_data = _EncryptionData(_decode_base64_to_bytes(encryption_data_dict['ContentEncryptionIV']),
+    content_encryption_IV = None
+    if 'ContentEncryptionIV' in encryption_data_dict:
+        content_encryption_IV = _decode_base64_to_bytes(encryption_data_dict['ContentEncryptionIV'])
+
+    encrypted_region_info = None
+    if 'EncryptedRegionInfo' in encryption_data_dict:
+        encrypted_region_info = encryption_data_dict['EncryptedRegionInfo']
+        encrypted_region_info = _EncryptedRegionInfo(encrypted_region_info['DataLength'],
+                                                     encrypted_region_info['NonceLength'],
+                                                     _GCM_TAG_LENGTH)
+
+    encryption_data = _EncryptionData(content_encryption_IV,
                                       encryption_agent,
                                       wrapped_content_key,
-                                      key_wrapping_metadata)
+                                      key_wrapping_metadata,
+                                      encrypted_region_info)
 
     return encryption_data
 
@@ -232,11 +308,14 @@ def _validate_and_unwrap_cek(encryption_data, key_encryption_key=None, key_resol
     :rtype: bytes[]
     '''
 
-    _validate_not_none('content_encryption_IV', encryption_data.content_encryption_IV)
-    _validate_not_none('encrypted_key', encryption_data.wrapped_content_key.encrypted_key)
-
-    if _ENCRYPTION_PROTOCOL_V1 != encryption_data.encryption_agent.protocol:
+    protocol = encryption_data.encryption_agent.protocol
+    if protocol == _ENCRYPTION_PROTOCOL_V1:
+        _validate_not_none('content_encryption_IV', encryption_data.content_encryption_IV)
+    elif protocol == _ENCRYPTION_PROTOCOL_V2:
+        _validate_not_none('encrypted_region_info', encryption_data.encrypted_region_info)
+    else:
         raise ValueError('Encryption version is not supported.')
+    _validate_not_none('encrypted_key', encryption_data.wrapped_content_key.encrypted_key)
 
     content_encryption_key = None
 
@@ -256,12 +335,20 @@ def _validate_and_unwrap_cek(encryption_data, key_encryption_key=None, key_resol
                                                            encryption_data.wrapped_content_key.algorithm)
     _validate_not_none('content_encryption_key', content_encryption_key)
 
+    if protocol == _ENCRYPTION_PROTOCOL_V2:
+        # The version wrapped with the key must match the version in the metadata
+        prefix = _get_versioned_key_prefix(protocol)
+        if content_encryption_key[:len(prefix)] != prefix:
+            raise ValueError('The encryption metadata is not valid and may have been modified.')
+        content_encryption_key = content_encryption_key[len(prefix):]
+
     return content_encryption_key
 
 
-def _encrypt_blob(blob, key_encryption_key):
+def _encrypt_blob(blob, key_encryption_key, encryption_version=_ENCRYPTION_PROTOCOL_V1):
     '''
-    Encrypts the given blob using AES256 in CBC mode with 128 bit padding.
+    Encrypts the given blob using AES256 in CBC mode with 128 bit padding, or for version 2.0,
+    in independently encrypted regions using AES256 in GCM mode.
     Wraps the generated content-encryption-key using the user-provided key-encryption-key (kek).
     Returns a json-formatted string containing the encryption metadata. This method should
     only be used when a blob is small enough for single shot upload. Encrypting larger blobs
@@ -274,6 +361,8 @@ def _encrypt_blob(blob, key_encryption_key):
         wrap_key(key)--wraps the specified key using an algorithm of the user's choice.
         get_key_wrap_algorithm()--returns the algorithm used to wrap the specified symmetric key.
         get_kid()--returns a string key id for this key-encryption-key.
+    :param str encryption_version:
+        The version of the encryption protocol, '1.0' or '2.0'.
     :return: A tuple of json-formatted string containing the encryption metadata and the encrypted blob data.
     :rtype: (str, bytes)
     '''
@@ -281,6 +370,15 @@ def _encrypt_blob(blob, key_encryption_key):
     _validate_not_none('blob', blob)
     _validate_not_none('key_encryption_key', key_encryption_key)
     _validate_key_encryption_key_wrap(key_encryption_key)
+    _validate_encryption_version(encryption_version)
+
+    if encryption_version == _ENCRYPTION_PROTOCOL_V2:
+        content_encryption_key = _EncryptedRegions.generate_key()
+        encrypted_data = _EncryptedRegions(content_encryption_key).encrypt(blob)
+        encryption_data = _generate_encryption_data_dict(key_encryption_key, content_encryption_key,
+                                                         None, encryption_version)
+        encryption_data['EncryptionMode'] = 'FullBlob'
+        return dumps(encryption_data), encrypted_data
 
     # AES256 uses 256 bit (32 byte) keys and always with 16 byte blocks
     content_encryption_key = urandom(32)
@@ -302,12 +400,15 @@ def _encrypt_blob(blob, key_encryption_key):
     return dumps(encryption_data), encrypted_data
 
 
-def _generate_blob_encryption_data(key_encryption_key):
+def _generate_blob_encryption_data(key_encryption_key, encryption_version=_ENCRYPTION_PROTOCOL_V1):
     '''
     Generates the encryption_metadata for the blob.
 
     :param bytes key_encryption_key:
         The key-encryption-key used to wrap the cek associate with this blob.
+    :param str encryption_version:
+        The version of the encryption protocol, '1.0' or '2.0'. Version 2.0 has
+        no initialization vector, as every region is encrypted with a nonce of its own.
     :return: A tuple containing the cek and iv for this blob as well as the
         serialized encryption metadata for the blob.
     :rtype: (bytes, bytes, str)
@@ -317,17 +418,161 @@ def _generate_blob_encryption_data(key_encryption_key):
     initialization_vector = None
     if key_encryption_key:
         _validate_key_encryption_key_wrap(key_encryption_key)
+        _validate_encryption_version(encryption_version)
         content_encryption_key = urandom(32)
-        initialization_vector = urandom(16)
+        if encryption_version == _ENCRYPTION_PROTOCOL_V1:
+            initialization_vector = urandom(16)
         encryption_data = _generate_encryption_data_dict(key_encryption_key,
                                                          content_encryption_key,
-                                                         initialization_vector)
+                                                         initialization_vector,
+                                                         encryption_version)
         encryption_data['EncryptionMode'] = 'FullBlob'
         encryption_data = dumps(encryption_data)
 
     return content_encryption_key, initialization_vector, encryption_data
 
 
+def _get_encrypted_blob_length(length, encryption_version=_ENCRYPTION_PROTOCOL_V1):
+    '''
+    Returns the length of a blob of the given length once it is encrypted.
+
+    :param int length: The length of the plain text.
+    :param str encryption_version: The version of the encryption protocol, '1.0' or '2.0'.
+    :rtype: int
+    '''
+    if encryption_version == _ENCRYPTION_PROTOCOL_V2:
+        regions = (length + _GCM_REGION_DATA_LENGTH - 1) // _GCM_REGION_DATA_LENGTH
+        return length + regions * (_GCM_NONCE_LENGTH + _GCM_TAG_LENGTH)
+    # PKCS7 padding always adds between 1 and 16 bytes
+    return length + (16 - (length % 16))
+
+
+class _EncryptedRegions(object):
+    '''
+    Encrypts and decrypts the regions of a version 2.0 encrypted blob.
+
+    The plain text is split into regions of data_length bytes, and every region is encrypted
+    with AES256 in GCM mode with a random nonce. An encrypted region is stored as the nonce,
+    followed by the cipher text and the authentication tag, so it is region_length bytes,
+    except for the last region of the blob. As the regions do not depend on each other, they
+    can be encrypted and decrypted in parallel, and any range of the blob can be decrypted
+    from the regions that hold it.
+    '''
+
+    def __init__(self, content_encryption_key, data_length=_GCM_REGION_DATA_LENGTH,
+                 nonce_length=_GCM_NONCE_LENGTH, tag_length=_GCM_TAG_LENGTH):
+        '''
+        :param bytes content_encryption_key:
+            The 32 byte content encryption key.
+        :param int data_length:
+            The length of the plain text of a region.
+        :param int nonce_length:
+            The length of the nonce of a region.
+        :param int tag_length:
+            The length of the authentication tag of a region. AES GCM always uses 16 byte tags.
+        '''
+        if tag_length != _GCM_TAG_LENGTH:
+            raise ValueError(_ERROR_UNSUPPORTED_ENCRYPTION_ALGORITHM)
+        self._cipher = AESGCM(content_encryption_key)
+        self.data_length = data_length
+        self.nonce_length = nonce_length
+        self.tag_length = tag_length
+        self.region_length = data_length + nonce_length + tag_length
+
+    @staticmethod
+    def generate_key():
+        return urandom(32)
+
+    @classmethod
+    def from_encryption_data(cls, encryption_data, key_encryption_key=None, key_resolver=None):
+        '''
+        Unwraps the content encryption key of a version 2.0 encrypted blob.
+
+        :param _EncryptionData encryption_data:
+            The encryption metadata of the blob.
+        :rtype: _EncryptedRegions
+        '''
+        if encryption_data.encryption_agent.encryption_algorithm != _EncryptionAlgorithm.AES_GCM_256:
+            raise ValueError(_ERROR_UNSUPPORTED_ENCRYPTION_ALGORITHM)
+        content_encryption_key = _validate_and_unwrap_cek(encryption_data, key_encryption_key, key_resolver)
+        region_info = encryption_data.encrypted_region_info
+        return cls(content_encryption_key, region_info.data_length, region_info.nonce_length, region_info.tag_length)
+
+    def get_data_length(self, encrypted_length):
+        regions, remainder = divmod(encrypted_length, self.region_length)
+        if remainder:
+            remainder -= self.nonce_length + self.tag_length
+            if remainder <= 0:
+                raise ValueError('The length of the encrypted blob is not valid.')
+        return regions * self.data_length + remainder
+
+    def get_range(self, start, end):
+        '''
+        Maps a range of the plain text onto the whole encrypted regions that hold it.
+
+        :param int start: The first byte of the plain text range.
+        :param int end: The last byte of the plain text range, inclusive.
+        :return: The first and last byte of the encrypted regions, inclusive, and the offset of
+            the plain text range in the plain text of those regions.
+        :rtype: (int, int, int)
+        '''
+        first_region = start // self.data_length
+        last_region = end // self.data_length
+        return (first_region * self.region_length,
+                (last_region + 1) * self.region_length - 1,
+                start - first_region * self.data_length)
+
+    def encrypt(self, data):
+        '''
+        Encrypts plain text, which must start on a region boundary.
+
+        :param bytes data: The plain text of one or more regions.
+        :rtype: bytes
+        '''
+        regions = []
+        for index in range(0, len(data), self.data_length):
+            nonce = urandom(self.nonce_length)
+            regions.append(nonce)
+            regions.append(self._cipher.encrypt(nonce, data[index:index + self.data_length], None))
+        return b"".join(regions)
+
+    def decrypt(self, data):
+        '''
+        Decrypts and authenticates whole encrypted regions.
+
+        :param bytes data: One or more encrypted regions.
+        :raises ~cryptography.exceptions.InvalidTag: If any region fails authentication.
+        :rtype: bytes
+        '''
+        regions = []
+        for index in range(0, len(data), self.region_length):
+            region = data[index:index + self.region_length]
+            regions.append(self._cipher.decrypt(region[:self.nonce_length], region[self.nonce_length:], None))
+        return b"".join(regions)
+
+
+def _get_blob_encrypted_regions(require_encryption, key_encryption_key, key_resolver, headers):
+    '''
+    Returns the _EncryptedRegions to decrypt a version 2.0 encrypted blob with, or None if the
+    blob was encrypted with version 1.0. Blobs which are not encrypted are rejected if encryption
+    is required, and otherwise also return None.
+
+    :param headers:
+        The response headers of a download request.
+    :rtype: _EncryptedRegions or None
+    '''
+    try:
+        encryption_data = _dict_to_encryption_data(loads(headers['x-ms-meta-encryptiondata']))
+    except:  # pylint: disable=bare-except
+        if require_encryption:
+            raise ValueError(_ERROR_DATA_NOT_ENCRYPTED)
+        return None
+
+    if encryption_data.encryption_agent.protocol != _ENCRYPTION_PROTOCOL_V2:
+        return None
+    return _EncryptedRegions.from_encryption_data(encryption_data, key_encryption_key, key_resolver)
+
+
 def _decrypt_blob(require_encryption, key_encryption_key, key_resolver,
                   response, start_offset, end_offset):
     '''
@@ -349,11 +594,30 @@ def _decrypt_blob(require_encryption, key_encryption_key, key_resolver,
     if response is None:
         raise ValueError("Response cannot be None.")
     content = b"".join(list(response))
+    return _decrypt_blob_content(
+        require_encryption, key_encryption_key, key_resolver,
+        content, response.response.headers, start_offset, end_offset)
+
+
+def _decrypt_blob_content(require_encryption, key_encryption_key, key_resolver,
+                          content, headers, start_offset, end_offset):
+    '''
+    Decrypts already downloaded blob contents and returns only the requested range.
+    Shared by the sync and async download paths, which differ only in how the
+    raw content is read from the response.
+
+    :param bytes content:
+        The raw (encrypted) blob content.
+    :param headers:
+        The response headers of the download request.
+    :return: The decrypted blob content.
+    :rtype: bytes
+    '''
     if not content:
         return content
 
     try:
-        encryption_data = _dict_to_encryption_data(loads(response.response.headers['x-ms-meta-encryptiondata']))
+        encryption_data = _dict_to_encryption_data(loads(headers['x-ms-meta-encryptiondata']))
     except:  # pylint: disable=bare-except
         if require_encryption:
             raise ValueError(_ERROR_DATA_NOT_ENCRYPTED)
@@ -363,12 +627,12 @@ def _decrypt_blob(require_encryption, key_encryption_key, key_resolver,
     if encryption_data.encryption_agent.encryption_algorithm != _EncryptionAlgorithm.AES_CBC_256:
         raise ValueError(_ERROR_UNSUPPORTED_ENCRYPTION_ALGORITHM)
 
-    blob_type = response.response.headers['x-ms-blob-type']
+    blob_type = headers['x-ms-blob-type']
 
     iv = None
     unpad = False
-    if 'content-range' in response.response.headers:
-        content_range = response.response.headers['content-range']
+    if 'content-range' in headers:
+        content_range = headers['content-range']
         # Format: 'bytes x-y/size'
 
         # Ignore the word 'bytes'
@@ -6,7 +6,7 @@
 
 import functools
 from typing import (  # pylint: disable=unused-import
-    Union, Optional, Any, IO, Iterable, AnyStr, Dict, List, Tuple,
+    Union, Optional, Any, IO, Iterable, AnyStr, Dict, List, Set, Tuple, Callable,
     TYPE_CHECKING)
 try:
     from urllib.parse import urlparse, quote, unquote
@@ -16,6 +16,8 @@ except ImportError:
 
 import six
 
+from azure.core.exceptions import AzureError
+
 from ._shared.shared_access_signature import QueueSharedAccessSignature
 from ._shared.utils import (
     StorageAccountHostsMixin,
@@ -37,6 +39,7 @@ from ._generated.models import StorageErrorException, SignedIdentifier
 from ._generated.models import QueueMessage as GenQueueMessage
 
 from .models import QueueMessage, AccessPolicy, MessagesPaged
+from ._queue_worker import QueueWorker
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -492,8 +495,16 @@ class QueueClient(StorageAccountHostsMixin):
             self.key_encryption_key,
             self.key_resolver_function)
         content = self._config.message_encode_policy(content)
+        return self._enqueue_encoded(
+            content,
+            visibility_timeout=visibility_timeout,
+            time_to_live=time_to_live,
+            timeout=timeout,
+            **kwargs)
+
+    def _enqueue_encoded(self, content, visibility_timeout=None, time_to_live=None, timeout=None, **kwargs):
+        # type: (str, Optional[int], Optional[int], Optional[int], Any) -> QueueMessage
         new_message = GenQueueMessage(message_text=content)
-
         try:
             enqueued = self._client.messages.enqueue(
                 queue_message=new_message,
@@ -511,6 +522,95 @@ class QueueClient(StorageAccountHostsMixin):
         except StorageErrorException as error:
             process_storage_error(error)
 
+    def enqueue_messages(
+            self, messages,  # type: Iterable[Any]
+            visibility_timeout=None,  # type: Optional[int]
+            time_to_live=None,  # type: Optional[int]
+            concurrency=8,  # type: int
+            timeout=None,  # type: Optional[int]
+            **kwargs  # type: Any
+        ):
+        # type: (...) -> List[Union[QueueMessage, Exception]]
+        """Adds many messages to the back of the message queue.
+
+        The messages are encoded as they are read from the iterable, and sent with up to
+        `concurrency` requests in flight on the connection pool of the client. The
+        iterable is not read further ahead than that, so it can be a generator of any
+        number of messages. A message which could not be encoded or added does not stop
+        the others from being added; its error is returned in its place.
+
+        If the key-encryption-key field is set on the local service object, this method will
+        encrypt the content of each message before uploading.
+
+        :param messages:
+            The contents of the messages. Allowed type is determined by the encode_function
+            set on the service. Default is str. Each encoded message can be up to 64KB in size.
+        :type messages: iterable(obj)
+        :param int visibility_timeout:
+            If not specified, the default value is 0. Specifies the
+            new visibility timeout value of the messages, in seconds, relative to server time.
+            The value must be larger than or equal to 0, and cannot be
+            larger than 7 days.
+        :param int time_to_live:
+            Specifies the time-to-live interval for the messages, in
+            seconds. The time-to-live may be any positive number or -1 for infinity. If this
+            parameter is omitted, the default time-to-live is 7 days.
+        :param int concurrency:
+            The maximum number of messages being added at the same time. The default is 8.
+        :param int timeout:
+            The server timeout, expressed in seconds.
+        :return:
+            For each message, in order, a :class:`~azure.storage.queue.models.QueueMessage`
+            with its id and pop receipt, or the error it failed with.
+        :rtype: list(~azure.storage.queue.models.QueueMessage or Exception)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self._config.message_encode_policy.configure(
+            self.require_encryption,
+            self.key_encryption_key,
+            self.key_resolver_function)
+        encode = self._config.message_encode_policy
+
+        def _enqueue(content):
+            try:
+                return self._enqueue_encoded(
+                    content,
+                    visibility_timeout=visibility_timeout,
+                    time_to_live=time_to_live,
+                    timeout=timeout,
+                    **kwargs)
+            except AzureError as error:
+                return error
+
+        if concurrency == 1:
+            results = []  # type: List[Any]
+            for content in messages:
+                try:
+                    results.append(_enqueue(encode(content)))
+                except (TypeError, ValueError) as error:
+                    results.append(error)
+            return results
+
+        import concurrent.futures
+        futures = []  # type: List[Any]
+        running = set()  # type: Set[Any]
+        with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+            for content in messages:
+                try:
+                    encoded = encode(content)
+                except (TypeError, ValueError) as error:
+                    future = concurrent.futures.Future()  # type: Any
+                    future.set_result(error)
+                    futures.append(future)
+                    continue
+                if len(running) >= concurrency:
+                    _, running = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                future = executor.submit(_enqueue, encoded)
+                running.add(future)
+                futures.append(future)
+        return [future.result() for future in futures]
+
     def receive_messages(self, messages_per_page=None, visibility_timeout=None, timeout=None, **kwargs): # type: ignore
         # type: (Optional[int], Optional[int], Optional[int], Optional[Any]) -> QueueMessage
         """Removes one or more messages from the front of the queue.
@@ -782,3 +882,50 @@ class QueueClient(StorageAccountHostsMixin):
             )
         except StorageErrorException as error:
             process_storage_error(error)
+
+    def create_worker(
+            self, handler,  # type: Callable[[QueueMessage], Any]
+            max_workers=4,  # type: int
+            prefetch=None,  # type: Optional[int]
+            visibility_timeout=30,  # type: int
+            max_idle_wait=30,  # type: float
+            on_error=None,  # type: Optional[Callable[[Optional[QueueMessage], Exception], Any]]
+            timeout=None,  # type: Optional[int]
+        ):
+        # type: (...) -> QueueWorker
+        """Creates a worker which processes the messages of the queue with a pool of threads.
+
+        The worker receives the messages ahead of the handler into a buffer, and extends
+        their visibility timeout until they are processed. A message is deleted once the
+        handler returns, and becomes visible again if the handler raises. Use the worker
+        as a context manager, or call :func:`~azure.storage.queue.QueueWorker.run`.
+
+        :param callable handler:
+            The function which processes a message. It is called with the
+            :class:`~azure.storage.queue.QueueMessage`, and must be thread safe.
+        :param int max_workers:
+            The number of threads to call the handler on. The default is 4.
+        :param int prefetch:
+            The maximum number of messages received and not yet processed. It must be at least
+            `max_workers`. The default is twice `max_workers`.
+        :param int visibility_timeout:
+            The visibility timeout of the received messages, in seconds. The visibility timeout
+            is extended by this value when a third of it is left. The default is 30.
+        :param float max_idle_wait:
+            The longest wait, in seconds, between the receives of an empty queue. The default is 30.
+        :param callable on_error:
+            A function called with the message and the error when the handler raises, or with
+            None and the error when receiving messages fails. By default the errors are logged.
+        :param int timeout:
+            The server timeout of the requests, expressed in seconds.
+        :returns: A queue worker.
+        :rtype: ~azure.storage.queue.QueueWorker
+        """
+        return QueueWorker(
+            self, handler,
+            max_workers=max_workers,
+            prefetch=prefetch,
+            visibility_timeout=visibility_timeout,
+            max_idle_wait=max_idle_wait,
+            on_error=on_error,
+            timeout=timeout)
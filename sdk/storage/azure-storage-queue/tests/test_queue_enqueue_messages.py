@@ -0,0 +1,99 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+import time
+import unittest
+
+from azure.core.exceptions import HttpResponseError
+
+from azure.storage.queue import QueueClient, BinaryBase64EncodePolicy
+
+from test_queue_worker import _FakeQueueService
+
+# ------------------------------------------------------------------------------
+
+
+class _FakeConcurrentQueueService(_FakeQueueService):
+    """Records how many messages are being added at the same time."""
+
+    def __init__(self, delay=0.01):
+        super(_FakeConcurrentQueueService, self).__init__()
+        self.enqueue_delay = delay
+        self.count_lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def send(self, request, **kwargs):
+        with self.count_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.enqueue_delay)
+            return super(_FakeConcurrentQueueService, self).send(request, **kwargs)
+        finally:
+            with self.count_lock:
+                self.in_flight -= 1
+
+
+class StorageQueueEnqueueMessagesTest(unittest.TestCase):
+
+    def _get_queue(self, service, **kwargs):
+        self.service = service
+        return QueueClient(
+            'https://account.queue.core.windows.net/queue',
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=service,
+            retry_total=0,
+            **kwargs)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_enqueue_messages(self):
+        queue = self._get_queue(_FakeConcurrentQueueService())
+        contents = ['message {}'.format(i) for i in range(40)]
+
+        results = queue.enqueue_messages(iter(contents), concurrency=4, visibility_timeout=0)
+
+        # The results are in the order of the messages
+        self.assertEqual([r.content for r in results], contents)
+        self.assertEqual([self.service.messages[r.id]['content'] for r in results], contents)
+        self.assertEqual([self.service.messages[r.id]['receipt'] for r in results], [r.pop_receipt for r in results])
+        self.assertGreater(self.service.max_in_flight, 1)
+        self.assertLessEqual(self.service.max_in_flight, 4)
+
+    def test_enqueue_messages_reports_failures(self):
+        queue = self._get_queue(_FakeConcurrentQueueService(), message_encode_policy=BinaryBase64EncodePolicy())
+        contents = [b'first', u'not bytes', b'second']
+
+        results = queue.enqueue_messages(contents, concurrency=2)
+
+        self.assertEqual(len(results), 3)
+        self.assertIsInstance(results[1], TypeError)
+        self.assertEqual(len(self.service.messages), 2)
+
+        queue = self._get_queue(_FakeConcurrentQueueService(delay=0))
+        results = queue.enqueue_messages(['first', 'fail', 'second'], concurrency=1)
+
+        self.assertIsInstance(results[1], HttpResponseError)
+        self.assertEqual(
+            sorted(m['content'] for m in self.service.messages.values()), ['first', 'second'])
+        self.assertEqual(results[2].content, 'second')
+
+    def test_enqueue_messages_bounded_read_ahead(self):
+        queue = self._get_queue(_FakeConcurrentQueueService(delay=0.02))
+        read = []
+
+        def _messages():
+            for i in range(20):
+                # The messages are read no further ahead than the requests in flight
+                self.assertLessEqual(len(read) - len(self.service.messages), 3)
+                read.append(i)
+                yield str(i)
+
+        results = queue.enqueue_messages(_messages(), concurrency=3)
+
+        self.assertEqual([r.content for r in results], [str(i) for i in range(20)])
@@ -0,0 +1,263 @@
+# coding: utf-8
+
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import threading
+import time
+import unittest
+import uuid
+import xml.etree.ElementTree as ET
+
+from requests.structures import CaseInsensitiveDict
+from azure.core.pipeline.transport import HttpTransport, HttpResponse
+
+try:
+    from urllib.parse import urlparse, parse_qs
+except ImportError:
+    from urlparse import urlparse, parse_qs # type: ignore
+
+from azure.storage.queue import QueueClient
+
+# ------------------------------------------------------------------------------
+_DATE = 'Fri, 31 May 2019 12:00:00 GMT'
+
+
+class _FakeResponse(HttpResponse):
+
+    def __init__(self, request, status_code, headers=None, body=b''):
+        super(_FakeResponse, self).__init__(request, None)
+        self.status_code = status_code
+        self.reason = 'OK' if status_code < 400 else 'Error'
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.headers.setdefault('x-ms-request-id', str(uuid.uuid4()))
+        self.content_type = self.headers['Content-Type'].split(';') if 'Content-Type' in self.headers else None
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+class _FakeQueueService(HttpTransport):
+    """Serves a queue, hiding the received messages until their visibility timeout expires."""
+
+    def __init__(self, messages=(), delay=0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.messages = {}
+        self.receives = []
+        self.updates = 0
+        self.deletes = 0
+        for content in messages:
+            self.add(content)
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def add(self, content):
+        with self.lock:
+            message_id = str(uuid.uuid4())
+            self.messages[message_id] = {'content': content, 'visible': 0, 'receipt': None, 'count': 0}
+
+    def send(self, request, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        url = urlparse(request.url)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path.strip('/').split('/')
+        with self.lock:
+            if request.method == 'GET' and path[-1] == 'messages':
+                return self._dequeue(request, query)
+            if request.method == 'POST' and path[-1] == 'messages':
+                return self._enqueue(request, query)
+            if request.method == 'PUT' and len(path) == 3:
+                return self._update(request, path[-1], query)
+            if request.method == 'DELETE' and len(path) == 3:
+                return self._delete(request, path[-1], query)
+        return _FakeResponse(request, 400, {'x-ms-error-code': 'UnsupportedHttpVerb'})
+
+    def _dequeue(self, request, query):
+        count = int(query.get('numofmessages', 1))
+        assert 1 <= count <= 32
+        self.receives.append(count)
+        now = time.time()
+        root = ET.Element('QueueMessagesList')
+        for message_id, message in self.messages.items():
+            if len(root) == count:
+                break
+            if message['visible'] > now:
+                continue
+            message['visible'] = now + int(query['visibilitytimeout'])
+            message['receipt'] = str(uuid.uuid4())
+            message['count'] += 1
+            item = ET.SubElement(root, 'QueueMessage')
+            for name, value in [
+                    ('MessageId', message_id),
+                    ('InsertionTime', _DATE),
+                    ('ExpirationTime', _DATE),
+                    ('PopReceipt', message['receipt']),
+                    ('TimeNextVisible', _DATE),
+                    ('DequeueCount', str(message['count'])),
+                    ('MessageText', message['content'])]:
+                ET.SubElement(item, name).text = value
+        return _FakeResponse(request, 200, {'Content-Type': 'application/xml'}, ET.tostring(root))
+
+    def _enqueue(self, request, query):
+        content = ET.fromstring(request.data).find('MessageText').text
+        if content == 'fail':
+            return _FakeResponse(request, 400, {'x-ms-error-code': 'InvalidXmlDocument'})
+        message_id = str(uuid.uuid4())
+        receipt = str(uuid.uuid4())
+        visible = time.time() + int(query.get('visibilitytimeout', 0))
+        self.messages[message_id] = {'content': content, 'visible': visible, 'receipt': receipt, 'count': 0}
+        root = ET.Element('QueueMessagesList')
+        item = ET.SubElement(root, 'QueueMessage')
+        for name, value in [
+                ('MessageId', message_id),
+                ('InsertionTime', _DATE),
+                ('ExpirationTime', _DATE),
+                ('PopReceipt', receipt),
+                ('TimeNextVisible', _DATE)]:
+            ET.SubElement(item, name).text = value
+        return _FakeResponse(request, 201, {'Content-Type': 'application/xml'}, ET.tostring(root))
+
+    def _get_leased(self, request, message_id, query):
+        message = self.messages.get(message_id)
+        if message is None:
+            return None, _FakeResponse(request, 404, {'x-ms-error-code': 'MessageNotFound'})
+        if message['receipt'] != query['popreceipt'] or message['visible'] <= time.time():
+            return None, _FakeResponse(request, 400, {'x-ms-error-code': 'PopReceiptMismatch'})
+        return message, None
+
+    def _update(self, request, message_id, query):
+        message, error = self._get_leased(request, message_id, query)
+        if error:
+            return error
+        assert not request.data
+        self.updates += 1
+        message['visible'] = time.time() + int(query['visibilitytimeout'])
+        message['receipt'] = str(uuid.uuid4())
+        return _FakeResponse(request, 204, {
+            'x-ms-popreceipt': message['receipt'],
+            'x-ms-time-next-visible': _DATE,
+        })
+
+    def _delete(self, request, message_id, query):
+        _, error = self._get_leased(request, message_id, query)
+        if error:
+            return error
+        self.deletes += 1
+        del self.messages[message_id]
+        return _FakeResponse(request, 204)
+
+
+class StorageQueueWorkerTest(unittest.TestCase):
+
+    def _get_queue(self, service):
+        self.service = service
+        return QueueClient(
+            'https://account.queue.core.windows.net/queue',
+            credential='sv=2018-03-28&sig=c2ln',
+            transport=service,
+            retry_total=0)
+
+    # --Test cases ---------------------------------------------------------------
+    def test_worker_processes_messages(self):
+        contents = ['message {}'.format(i) for i in range(50)]
+        queue = self._get_queue(_FakeQueueService(contents, delay=0.005))
+        processed = []
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def _handle(message):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+                processed.append(message.content)
+
+        metrics = queue.create_worker(_handle, max_workers=4, prefetch=10).run(until_empty=True)
+
+        self.assertEqual(sorted(processed), sorted(contents))
+        self.assertEqual(self.service.messages, {})
+        self.assertGreater(in_flight[1], 1)
+        self.assertLessEqual(in_flight[1], 4)
+        # The receives ask for the room left in the buffer
+        self.assertLessEqual(max(self.service.receives), 10)
+        self.assertEqual(metrics.received, 50)
+        self.assertEqual(metrics.completed, 50)
+        self.assertEqual(metrics.deleted, 50)
+        self.assertEqual(metrics.failed, 0)
+        self.assertEqual(metrics.in_flight, 0)
+        self.assertGreater(metrics.throughput, 0)
+        self.assertLess(metrics.receive_calls, 50)
+
+    def test_worker_extends_visibility_timeout(self):
+        queue = self._get_queue(_FakeQueueService(['slow']))
+        dequeue_counts = []
+
+        def _handle(message):
+            dequeue_counts.append(message.dequeue_count)
+            time.sleep(1.5)
+
+        metrics = queue.create_worker(_handle, visibility_timeout=1).run(until_empty=True)
+
+        # The message was not received again while it was handled
+        self.assertEqual(dequeue_counts, [1])
+        self.assertGreaterEqual(metrics.extended, 1)
+        self.assertEqual(metrics.extended, self.service.updates)
+        self.assertEqual(metrics.deleted, 1)
+        self.assertEqual(self.service.messages, {})
+
+    def test_worker_leaves_failed_messages(self):
+        queue = self._get_queue(_FakeQueueService(['good', 'bad']))
+        errors = []
+
+        def _handle(message):
+            if message.content == 'bad':
+                raise ValueError('bad message')
+
+        metrics = queue.create_worker(
+            _handle, on_error=lambda message, error: errors.append((message.content, error))).run(until_empty=True)
+
+        self.assertEqual(metrics.completed, 1)
+        self.assertEqual(metrics.failed, 1)
+        self.assertEqual(metrics.deleted, 1)
+        self.assertEqual([content for content, _ in errors], ['bad'])
+        self.assertIsInstance(errors[0][1], ValueError)
+        self.assertEqual([m['content'] for m in self.service.messages.values()], ['bad'])
+
+    def test_worker_backs_off_empty_queue(self):
+        queue = self._get_queue(_FakeQueueService())
+        processed = []
+
+        with queue.create_worker(processed.append, max_idle_wait=0.4) as worker:
+            time.sleep(1)
+            empty_receives = worker.metrics.empty_receives
+            self.service.add('late')
+            time.sleep(0.6)
+
+        # 0.1, 0.2, 0.4, 0.4 seconds between the receives
+        self.assertLessEqual(empty_receives, 5)
+        self.assertEqual([m.content for m in processed], ['late'])
+        self.assertEqual(worker.metrics.deleted, 1)
+
+    def test_worker_options(self):
+        queue = self._get_queue(_FakeQueueService())
+        with self.assertRaises(ValueError):
+            queue.create_worker(lambda m: None, max_workers=0)
+        with self.assertRaises(ValueError):
+            queue.create_worker(lambda m: None, max_workers=4, prefetch=2)
+        with self.assertRaises(ValueError):
+            queue.create_worker(lambda m: None, visibility_timeout=0)
+        self.assertEqual(queue.create_worker(lambda m: None).metrics.received, 0)